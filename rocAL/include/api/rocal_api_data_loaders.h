@@ -47,6 +47,12 @@ THE SOFTWARE.
  * \param max_width The maximum width of the decoded images, larger or smaller will be resized to closest
  * \param max_height The maximum height of the decoded images, larger or smaller will be resized to closest
  * \param rocal_decoder_type Determines the decoder_type, tjpeg or hwdec
+ * \param cache_size Host memory in MB for caching decoded images across epochs, 0 disables the cache
+ * \param cache_type Determines which images stay in the cache once it is full, least recently used or the first ones decoded
+ * \param cache_threshold Decoded images smaller than this many bytes are not cached
+ * \param cache_batch_copy Copies the cached images of a batch in parallel with the decodes of the remaining ones
+ * \param cache_spill_path Directory for a memory mapped file backing the cache, empty keeps the cache in anonymous memory
+ * \param index_path Directory of the dataset listing manifest, loaded instead of walking the dataset folders while they are unchanged. Empty disables the manifest
  * \return Reference to the output image
  */
 extern "C" RocalImage ROCAL_API_CALL rocalJpegFileSource(RocalContext context,
@@ -57,7 +63,10 @@ extern "C" RocalImage ROCAL_API_CALL rocalJpegFileSource(RocalContext context,
                                                          bool shuffle = false,
                                                          bool loop = false,
                                                          RocalImageSizeEvaluationPolicy decode_size_policy = ROCAL_USE_MOST_FREQUENT_SIZE,
-                                                         unsigned max_width = 0, unsigned max_height = 0, RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG);
+                                                         unsigned max_width = 0, unsigned max_height = 0, RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG,
+                                                         unsigned cache_size = 0, RocalImageCacheType cache_type = ROCAL_IMAGE_CACHE_LRU,
+                                                         unsigned cache_threshold = 0, bool cache_batch_copy = true, const char *cache_spill_path = "",
+                                                         const char *index_path = "");
 
 /*!
  * \brief Creates JPEG image reader and decoder. It allocates the resources and objects required to read and decode Jpeg images stored on the file systems. It accepts external sharding information to load a singe shard. only
@@ -74,6 +83,12 @@ extern "C" RocalImage ROCAL_API_CALL rocalJpegFileSource(RocalContext context,
  * \param max_width The maximum width of the decoded images, larger or smaller will be resized to closest
  * \param max_height The maximum height of the decoded images, larger or smaller will be resized to closest
  * \param rocal_decoder_type Determines the decoder_type, tjpeg or hwdec
+ * \param cache_size Host memory in MB for caching decoded images across epochs, 0 disables the cache
+ * \param cache_type Determines which images stay in the cache once it is full, least recently used or the first ones decoded
+ * \param cache_threshold Decoded images smaller than this many bytes are not cached
+ * \param cache_batch_copy Copies the cached images of a batch in parallel with the decodes of the remaining ones
+ * \param cache_spill_path Directory for a memory mapped file backing the cache, empty keeps the cache in anonymous memory
+ * \param index_path Directory of the dataset listing manifest, loaded instead of walking the dataset folders while they are unchanged. Empty disables the manifest
  * \return Reference to the output image
  */
 extern "C" RocalImage ROCAL_API_CALL rocalJpegFileSourceSingleShard(RocalContext context,
@@ -85,7 +100,10 @@ extern "C" RocalImage ROCAL_API_CALL rocalJpegFileSourceSingleShard(RocalContext
                                                                     bool shuffle = false,
                                                                     bool loop = false,
                                                                     RocalImageSizeEvaluationPolicy decode_size_policy = ROCAL_USE_MOST_FREQUENT_SIZE,
-                                                                    unsigned max_width = 0, unsigned max_height = 0, RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG);
+                                                                    unsigned max_width = 0, unsigned max_height = 0, RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG,
+                                                                    unsigned cache_size = 0, RocalImageCacheType cache_type = ROCAL_IMAGE_CACHE_LRU,
+                                                                    unsigned cache_threshold = 0, bool cache_batch_copy = true, const char *cache_spill_path = "",
+                                                                    const char *index_path = "");
 
 /*!
  * \brief Creates JPEG image reader and decoder. Reads [Frames] sequences from a directory representing a collection of streams.
@@ -155,6 +173,12 @@ extern "C" RocalImage ROCAL_API_CALL rocalSequenceReaderSingleShard(RocalContext
  * \param max_width The maximum width of the decoded images, larger or smaller will be resized to closest
  * \param max_height The maximum height of the decoded images, larger or smaller will be resized to closest
  * \param rocal_decoder_type Determines the decoder_type, tjpeg or hwdec
+ * \param cache_size Host memory in MB for caching decoded images across epochs, 0 disables the cache
+ * \param cache_type Determines which images stay in the cache once it is full, least recently used or the first ones decoded
+ * \param cache_threshold Decoded images smaller than this many bytes are not cached
+ * \param cache_batch_copy Copies the cached images of a batch in parallel with the decodes of the remaining ones
+ * \param cache_spill_path Directory for a memory mapped file backing the cache, empty keeps the cache in anonymous memory
+ * \param index_path Directory of the dataset listing manifest, loaded instead of walking the dataset folders while they are unchanged. Empty disables the manifest
  * \return Reference to the output image
  */
 extern "C" RocalImage ROCAL_API_CALL rocalJpegCOCOFileSource(RocalContext context,
@@ -167,7 +191,10 @@ extern "C" RocalImage ROCAL_API_CALL rocalJpegCOCOFileSource(RocalContext contex
                                                              bool loop = false,
                                                              RocalImageSizeEvaluationPolicy decode_size_policy = ROCAL_USE_MOST_FREQUENT_SIZE,
                                                              unsigned max_width = 0, unsigned max_height = 0,
-                                                             RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG);
+                                                             RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG,
+                                                             unsigned cache_size = 0, RocalImageCacheType cache_type = ROCAL_IMAGE_CACHE_LRU,
+                                                             unsigned cache_threshold = 0, bool cache_batch_copy = true, const char *cache_spill_path = "",
+                                                             const char *index_path = "");
 
 /*!
  * \brief Creates JPEG image reader and partial decoder. It allocates the resources and objects required to read and decode COCO Jpeg images stored on the file systems. It has internal sharding capability to load/decode in parallel is user wants.
@@ -246,6 +273,12 @@ extern "C" RocalImage ROCAL_API_CALL rocalJpegCOCOFileSourcePartialSingleShard(R
  * \param max_width The maximum width of the decoded images, larger or smaller will be resized to closest
  * \param max_height The maximum height of the decoded images, larger or smaller will be resized to closest
  * \param rocal_decoder_type Determines the decoder_type, tjpeg or hwdec
+ * \param cache_size Host memory in MB for caching decoded images across epochs, 0 disables the cache
+ * \param cache_type Determines which images stay in the cache once it is full, least recently used or the first ones decoded
+ * \param cache_threshold Decoded images smaller than this many bytes are not cached
+ * \param cache_batch_copy Copies the cached images of a batch in parallel with the decodes of the remaining ones
+ * \param cache_spill_path Directory for a memory mapped file backing the cache, empty keeps the cache in anonymous memory
+ * \param index_path Directory of the dataset listing manifest, loaded instead of walking the dataset folders while they are unchanged. Empty disables the manifest
  * \return Reference to the output image
  */
 extern "C" RocalImage ROCAL_API_CALL rocalJpegCOCOFileSourceSingleShard(RocalContext context,
@@ -259,7 +292,10 @@ extern "C" RocalImage ROCAL_API_CALL rocalJpegCOCOFileSourceSingleShard(RocalCon
                                                                         bool loop = false,
                                                                         RocalImageSizeEvaluationPolicy decode_size_policy = ROCAL_USE_MOST_FREQUENT_SIZE,
                                                                         unsigned max_width = 0, unsigned max_height = 0,
-                                                                        RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG);
+                                                                        RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG,
+                                                                        unsigned cache_size = 0, RocalImageCacheType cache_type = ROCAL_IMAGE_CACHE_LRU,
+                                                                        unsigned cache_threshold = 0, bool cache_batch_copy = true, const char *cache_spill_path = "",
+                                                                        const char *index_path = "");
 
 /*!
  * \brief Creates JPEG image reader and decoder for Caffe LMDB records. It allocates the resources and objects required to read and decode Jpeg images stored in Caffe LMDB Records. It has internal sharding capability to load/decode in parallel is user wants.
@@ -509,6 +545,7 @@ extern "C" RocalImage ROCAL_API_CALL rocalFusedJpegCropSingleShard(RocalContext
  * \param max_width The maximum width of the decoded images, larger or smaller will be resized to closest
  * \param max_height The maximum height of the decoded images, larger or smaller will be resized to closest
  * \param rocal_decoder_type Determines the decoder_type, tjpeg or hwdec
+ * \param index_path A NULL terminated char string pointing to the folder the record offset indices are kept in, if empty they are kept in the rocAL cache folder ($XDG_CACHE_HOME/rocal or ~/.cache/rocal)
  * \return Reference to the output image
  */
 extern "C" RocalImage ROCAL_API_CALL rocalJpegTFRecordSource(RocalContext context,
@@ -522,7 +559,8 @@ extern "C" RocalImage ROCAL_API_CALL rocalJpegTFRecordSource(RocalContext contex
                                                              bool loop = false,
                                                              RocalImageSizeEvaluationPolicy decode_size_policy = ROCAL_USE_MOST_FREQUENT_SIZE,
                                                              unsigned max_width = 0, unsigned max_height = 0,
-                                                             RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG);
+                                                             RocalDecoderType rocal_decoder_type = RocalDecoderType::ROCAL_DECODER_TJPEG,
+                                                             const char *index_path = "");
 
 /*!
  * \brief Creates TensorFlow records JPEG image reader and decoder. It allocates the resources and objects required to read and decode Jpeg images stored on the file systems. It accepts external sharding information to load a singe shard. only
@@ -564,6 +602,8 @@ extern "C" RocalImage ROCAL_API_CALL rocalJpegTFRecordSourceSingleShard(RocalCon
  * \param loop: repeat data loading
  * \param out_width The output_width of raw image
  * \param out_height The output height of raw image
+ * \param record_name_prefix : if nonempty reader will only read records with certain prefix
+ * \param index_path A NULL terminated char string pointing to the folder the record offset indices are kept in, if empty they are kept in the rocAL cache folder ($XDG_CACHE_HOME/rocal or ~/.cache/rocal)
  * \return
  */
 extern "C" RocalImage ROCAL_API_CALL rocalRawTFRecordSource(RocalContext p_context,
@@ -575,7 +615,8 @@ extern "C" RocalImage ROCAL_API_CALL rocalRawTFRecordSource(RocalContext p_conte
                                                             bool shuffle = false,
                                                             bool loop = false,
                                                             unsigned out_width = 0, unsigned out_height = 0,
-                                                            const char *record_name_prefix = "");
+                                                            const char *record_name_prefix = "",
+                                                            const char *index_path = "");
 
 /*!
  * \brief Creates Raw image loader. It allocates the resources and objects required to load images stored on the file systems.
@@ -619,6 +660,7 @@ extern "C" RocalImage ROCAL_API_CALL rocalRawTFRecordSourceSingleShard(RocalCont
  * \param step: Frame interval between each sequence.
  * \param stride: Frame interval between frames in a sequence.
  * \param file_list_frame_num: Determines if the user wants to read frame number or timestamps if a text file is passed in the source_path.
+ * \param decode_threads: Frame and slice threads of each software decoder, 0 takes half of the CPU cores of the pipeline from its host processing and splits their threads between the decoders of the videos decoded in parallel.
  * \return
  */
 extern "C" RocalImage ROCAL_API_CALL rocalVideoFileSource(RocalContext context,
@@ -632,7 +674,8 @@ extern "C" RocalImage ROCAL_API_CALL rocalVideoFileSource(RocalContext context,
                                                           bool loop = false,
                                                           unsigned step = 0,
                                                           unsigned stride = 0,
-                                                          bool file_list_frame_num = true);
+                                                          bool file_list_frame_num = true,
+                                                          unsigned decode_threads = 0);
 
 /*!
  * \brief Creates a video reader and decoder as a source. It allocates the resources and objects required to read and decode mp4 videos stored on the file systems. It accepts external sharding information to load a singe shard only.
@@ -651,6 +694,7 @@ extern "C" RocalImage ROCAL_API_CALL rocalVideoFileSource(RocalContext context,
  * \param step: Frame interval between each sequence.
  * \param stride: Frame interval between frames in a sequence.
  * \param file_list_frame_num: Determines if the user wants to read frame number or timestamps if a text file is passed in the source_path.
+ * \param decode_threads: Frame and slice threads of each software decoder, 0 takes half of the CPU cores of the pipeline from its host processing and splits their threads between the decoders of the videos decoded in parallel.
  * \return
  */
 extern "C" RocalImage ROCAL_API_CALL rocalVideoFileSourceSingleShard(RocalContext context,
@@ -665,7 +709,8 @@ extern "C" RocalImage ROCAL_API_CALL rocalVideoFileSourceSingleShard(RocalContex
                                                                      bool loop = false,
                                                                      unsigned step = 0,
                                                                      unsigned stride = 0,
-                                                                     bool file_list_frame_num = true);
+                                                                     bool file_list_frame_num = true,
+                                                                     unsigned decode_threads = 0);
 
 /*!
  * \brief Creates a video reader and decoder as a source. It allocates the resources and objects required to read and decode mp4 videos stored on the file systems. Resizes the decoded frames to the dest width and height.
@@ -685,6 +730,7 @@ extern "C" RocalImage ROCAL_API_CALL rocalVideoFileSourceSingleShard(RocalContex
  * \param step: Frame interval between each sequence.
  * \param stride: Frame interval between frames in a sequence.
  * \param file_list_frame_num: Determines if the user wants to read frame number or timestamps if a text file is passed in the source_path.
+ * \param decode_threads: Frame and slice threads of each software decoder, 0 takes half of the CPU cores of the pipeline from its host processing and splits their threads between the decoders of the videos decoded in parallel.
  * \return
  */
 extern "C" RocalImage ROCAL_API_CALL rocalVideoFileResize(RocalContext context,
@@ -705,7 +751,8 @@ extern "C" RocalImage ROCAL_API_CALL rocalVideoFileResize(RocalContext context,
                                                           std::vector<unsigned> max_size = {},
                                                           unsigned resize_shorter = 0,
                                                           unsigned resize_longer = 0,
-                                                          RocalResizeInterpolationType interpolation_type = ROCAL_LINEAR_INTERPOLATION);
+                                                          RocalResizeInterpolationType interpolation_type = ROCAL_LINEAR_INTERPOLATION,
+                                                          unsigned decode_threads = 0);
 
 /*!
  * \brief Creates a video reader and decoder as a source. It allocates the resources and objects required to read and decode mp4 videos stored on the file systems. Resizes the decoded frames to the dest width and height. It accepts external sharding information to load a singe shard only.
@@ -726,6 +773,7 @@ extern "C" RocalImage ROCAL_API_CALL rocalVideoFileResize(RocalContext context,
  * \param step: Frame interval between each sequence.
  * \param stride: Frame interval between frames in a sequence.
  * \param file_list_frame_num: Determines if the user wants to read frame number or timestamps if a text file is passed in the source_path.
+ * \param decode_threads: Frame and slice threads of each software decoder, 0 takes half of the CPU cores of the pipeline from its host processing and splits their threads between the decoders of the videos decoded in parallel.
  * \return
  */
 extern "C" RocalImage ROCAL_API_CALL rocalVideoFileResizeSingleShard(RocalContext context,
@@ -747,7 +795,8 @@ extern "C" RocalImage ROCAL_API_CALL rocalVideoFileResizeSingleShard(RocalContex
                                                                      std::vector<unsigned> max_size = {},
                                                                      unsigned resize_shorter = 0,
                                                                      unsigned resize_longer = 0,
-                                                                     RocalResizeInterpolationType interpolation_type = ROCAL_LINEAR_INTERPOLATION);
+                                                                     RocalResizeInterpolationType interpolation_type = ROCAL_LINEAR_INTERPOLATION,
+                                                                     unsigned decode_threads = 0);
 
 /*!
  * \brief Creates CIFAR10 raw data reader and loader. It allocates the resources and objects required to read raw data stored on the file systems.
@@ -776,6 +825,27 @@ extern "C" RocalImage ROCAL_API_CALL rocalRawCIFAR10Source(RocalContext context,
  */
 extern "C" RocalStatus ROCAL_API_CALL rocalResetLoaders(RocalContext context);
 
+/*!
+ * \brief Sets the size of the cache of compressed image data shared by the file, COCO, TFRecord, Caffe, Caffe2 and MXNet readers of the process.
+ * Readers created after this call keep the bytes of the items they read in the cache and serve them from memory in the following epochs, the least recently used items are evicted once the cache is full.
+ * \ingroup group_rocal_data_loaders
+ * \param context Rocal context
+ * \param cache_size Size of the cache in MB, 0 disables caching for readers created afterwards
+ * \return A \ref RocalStatus - A status code indicating the success or failure
+ */
+extern "C" RocalStatus ROCAL_API_CALL rocalSetReaderCacheSize(RocalContext context, unsigned cache_size);
+
+/*!
+ * \brief Sets the size of the cache of decoded frames shared by the video loaders of the process.
+ * Sequences read with a step smaller than their length copy the frames they share with earlier sequences from the cache instead of decoding them again, the least recently used frames are evicted once the cache is full.
+ * The frames served from and missing in the cache are reported in the cache_hits and cache_misses of \ref rocalGetTimingInfo.
+ * \ingroup group_rocal_data_loaders
+ * \param context Rocal context
+ * \param cache_size Size of the cache in MB, 0 disables the cache
+ * \return A \ref RocalStatus - A status code indicating the success or failure
+ */
+extern "C" RocalStatus ROCAL_API_CALL rocalSetVideoFrameCacheSize(RocalContext context, unsigned cache_size);
+
 /*!
  * \brief Creates JPEG image reader and partial decoder for Caffe LMDB records. It allocates the resources and objects required to read and decode Jpeg images stored in Caffe2 LMDB Records. It has internal sharding capability to load/decode in parallel is user wants.
  * \ingroup group_rocal_data_loaders
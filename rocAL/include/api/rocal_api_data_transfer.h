@@ -79,6 +79,45 @@ extern "C" RocalStatus ROCAL_API_CALL rocalToTensor(RocalContext rocal_context,
                                                     float multiplier0, float multiplier1, float multiplier2, float offset0,
                                                     float offset1, float offset2,
                                                     bool reverse_channels, RocalOutputMemType output_mem_type);
+/*!
+ * \brief  rocalGetOutputBuffers gives the U8 buffers of the output images of the batch from the last rocalRun without copying them, they are valid till the next rocalRun
+ * \ingroup group_rocal_data_transfer
+ *
+ * \param [in] context
+ * \param [out] buffers one pointer per output image to batch size images of the output height, width and channels, HWC or CHW for RGB_PLANAR, on the device for HIP
+ * \return A \ref RocalStatus - A status code indicating the success or failure
+ */
+extern "C" RocalStatus ROCAL_API_CALL rocalGetOutputBuffers(RocalContext rocal_context, void **buffers);
+
+/*!
+ * \brief  rocalToExportedTensor converts the batch from the last rocalRun like rocalToTensor but to a tensor rocAL owns, which is overwritten by the next call
+ * \ingroup group_rocal_data_transfer
+ *
+ * \param [in] context
+ * \param [out] out_ptr the tensor of all the output images, on the device for HIP
+ * \return A \ref RocalStatus - A status code indicating the success or failure
+ */
+extern "C" RocalStatus ROCAL_API_CALL rocalToExportedTensor(RocalContext rocal_context, void **out_ptr,
+                                                            RocalTensorLayout tensor_format, RocalTensorOutputType tensor_output_type,
+                                                            float multiplier0, float multiplier1, float multiplier2, float offset0,
+                                                            float offset1, float offset2, bool reverse_channels);
+
+/*!
+ * \brief  rocalRunMany runs the pipeline for up to batch_count batches and copies each of them into consecutive tensors of out_ptr, like rocalRun followed by rocalToTensor and rocalGetImageLabels per batch but in one call
+ * \ingroup group_rocal_data_transfer
+ *
+ * \param [in] context
+ * \param [in] batch_count number of batches to run
+ * \param [out] out_ptr buffer of batch_count output tensors of the batch, the same tensor rocalToTensor writes
+ * \param [out] labels buffer of batch_count x batch size labels, nullptr to skip the labels
+ * \return The number of batches copied, less than batch_count when the data ran out or on failure
+ */
+extern "C" unsigned ROCAL_API_CALL rocalRunMany(RocalContext rocal_context, unsigned batch_count, void *out_ptr,
+                                                RocalTensorLayout tensor_format, RocalTensorOutputType tensor_output_type,
+                                                float multiplier0, float multiplier1, float multiplier2, float offset0,
+                                                float offset1, float offset2,
+                                                bool reverse_channels, RocalOutputMemType output_mem_type, int *labels);
+
 /*!
  * \brief  TBD
  * \ingroup group_rocal_data_transfer
@@ -37,9 +37,10 @@ THE SOFTWARE.
  * \ingroup group_rocal_meta_data
  * \param rocal_context
  * \param source_path path to the folder that contains the dataset or metadata file
+ * \param index_path folder of the dataset listing manifest shared with the file source, the dataset folders are walked every time if empty
  * \return RocalMetaData object, can be used to inquire about the rocal's output (processed) tensors
  */
-extern "C" RocalMetaData ROCAL_API_CALL rocalCreateLabelReader(RocalContext rocal_context, const char *source_path);
+extern "C" RocalMetaData ROCAL_API_CALL rocalCreateLabelReader(RocalContext rocal_context, const char *source_path, const char *index_path = "");
 
 /*!
  * \brief  rocalCreateVideoLabelReader
@@ -174,6 +175,7 @@ extern "C" unsigned ROCAL_API_CALL rocalGetImageNameLen(RocalContext rocal_conte
  * \ingroup group_rocal_meta_data
  * \param meta_data RocalMetaData object that contains info about the images and labels
  * \param buf user's buffer that will be filled with labels. Its needs to be at least of size batch_size.
+ * \param output_mem_type With ROCAL_MEMCPY_GPU and the GPU backend the labels are already on the device, the call only enqueues a device to device copy on the null stream and returns without waiting for it.
  */
 extern "C" void ROCAL_API_CALL rocalGetImageLabels(RocalContext rocal_context, void *buf, RocalOutputMemType output_mem_type = RocalOutputMemType::ROCAL_MEMCPY_HOST);
 
@@ -278,6 +280,7 @@ extern "C" void ROCAL_API_CALL rocalCopyEncodedBoxesAndLables(RocalContext p_con
  * \ingroup group_rocal_meta_data
  * \param boxes_buf  ptr to user's buffer that will be filled with encoded bounding boxes . Its needs to be at least of size batch_size.
  * \param labels_buf  user's buffer that will be filled with encoded labels . Its needs to be at least of size batch_size.
+ * The pointers are device memory for HIP pipelines and host memory otherwise, valid till the next run.
  */
 extern "C" void ROCAL_API_CALL rocalGetEncodedBoxesAndLables(RocalContext p_context, float **boxes_buf_ptr, int **labels_buf_ptr, int num_encoded_boxes);
 
@@ -297,4 +300,14 @@ extern "C" void ROCAL_API_CALL rocalGetImageId(RocalContext p_context, int *buf)
  */
 extern "C" void ROCAL_API_CALL rocalGetJointsDataPtr(RocalContext p_context, RocalJointsData **joints_data);
 
+/*!
+ * \brief  rocalGetBatchMetaData
+ * \ingroup group_rocal_meta_data
+ * \param rocal_context
+ * \return The names, ids, labels, bounding boxes and image sizes of the images in the output batch, packed in one buffer owned by rocAL.
+ * The buffer is built once per batch and stays valid till the next call to rocalRun(), so it can replace the rocalGetImageName,
+ * rocalGetImageId, rocalGetImageLabels, rocalGetBoundingBox* and rocalGetImageSizes calls without copying.
+ */
+extern "C" const RocalBatchMetaData *ROCAL_API_CALL rocalGetBatchMetaData(RocalContext p_context);
+
 #endif // MIVISIONX_ROCAL_API_META_DATA_H
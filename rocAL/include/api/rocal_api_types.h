@@ -88,6 +88,10 @@ struct TimingInfo
     long long unsigned decode_time;
     long long unsigned process_time;
     long long unsigned transfer_time;
+    long long unsigned cache_hits;
+    long long unsigned cache_misses;
+    long long unsigned decoder_opens;  //!< Videos opened by the video decoders in the current epoch
+    long long unsigned decoder_closes; //!< Videos closed to reopen their decoder for another video in the current epoch
 };
 
 /*! \brief rocAL Joints Data struct - HRNet training expects meta data (joints_data) in below format, so added here as a type for exposing to user
@@ -106,6 +110,26 @@ struct RocalJointsData
     RotationBatch rotation_batch;
 };
 
+/*! \brief rocAL Batch Meta Data struct - the meta data of the last processed batch packed in a single buffer, valid till the next run
+ * \ingroup group_rocal_types
+ */
+struct RocalBatchMetaData
+{
+    unsigned batch_size;
+    unsigned total_boxes;
+    const char *names;          //!< Image names of the batch back to back, without terminators
+    const int *name_offsets;    //!< batch_size + 1 offsets, the name of image i is names[name_offsets[i], name_offsets[i+1])
+    const int *image_ids;       //!< batch_size ids parsed from the image names, -1 if a name doesn't start with a number
+    const int *labels;          //!< batch_size labels, NULL if the reader doesn't load labels
+    const int *box_counts;      //!< batch_size box counts, NULL if the reader doesn't load bounding boxes
+    const int *box_offsets;     //!< batch_size + 1 offsets, the boxes of image i are [box_offsets[i], box_offsets[i+1])
+    const float *boxes;         //!< total_boxes boxes as l, t, r, b
+    const int *box_labels;      //!< total_boxes box labels
+    const int *image_sizes;     //!< batch_size image sizes as w, h, NULL if the reader doesn't load them
+    const void *buffer;         //!< The packed buffer all the pointers above point into
+    size_t buffer_size;
+};
+
 /*! \brief  rocAL Status enum
  * \ingroup group_rocal_types
  */
@@ -259,6 +283,19 @@ enum RocalDecoderType
     ROCAL_DECODER_VIDEO_FFMPEG_HW = 4
 };
 
+/*! \brief rocAL Image Cache Type enum
+ * \ingroup group_rocal_types
+ */
+enum RocalImageCacheType
+{
+    /*! \brief AMD ROCAL_IMAGE_CACHE_LRU - evicts the least recently used image once the cache is full
+     */
+    ROCAL_IMAGE_CACHE_LRU = 0,
+    /*! \brief AMD ROCAL_IMAGE_CACHE_FIRST_N - caches images until the cache is full, never evicts
+     */
+    ROCAL_IMAGE_CACHE_FIRST_N = 1
+};
+
 /*! \brief rocAL Output Mem Type enum
  * \ingroup group_rocal_types
  */
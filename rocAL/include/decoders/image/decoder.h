@@ -25,6 +25,7 @@ THE SOFTWARE.
 #include <cstddef>
 #include <iostream>
 #include <vector>
+#include <string>
 #include "parameter_factory.h"
 #include "parameter_random_crop_decoder.h"
 
@@ -38,6 +39,22 @@ enum class DecoderType
     OVX_FFMPEG,//!< Uses FFMPEG to decode video streams, can decode up to 4 video streams simultaneously
 };
 
+enum class ImageCachePolicy
+{
+    LRU = 0,//!< Evicts the least recently used sample once the cache is full
+    FIRST_N = 1,//!< Caches samples until the cache is full, never evicts
+};
+
+//! Decoded image cache settings, the cache is disabled when size is zero
+struct ImageCacheConfig
+{
+    size_t size = 0; //!< Host memory budget of the cache in bytes
+    ImageCachePolicy policy = ImageCachePolicy::LRU;
+    size_t threshold = 0; //!< Decoded images smaller than this many bytes are not cached
+    bool batch_copy = true; //!< Copies the cached samples of a batch in parallel along with the decodes
+    std::string spill_path; //!< If set the cache is backed by a memory mapped file in this directory instead of anonymous memory
+};
+
 
 class DecoderConfig
 {
@@ -54,8 +71,11 @@ public:
     unsigned get_num_attempts() { return _num_attempts; }
     void set_seed(int seed) { _seed = seed; }
     int get_seed() { return _seed; }
+    void set_cache_config(const ImageCacheConfig &cache_config) { _cache_config = cache_config; }
+    ImageCacheConfig get_cache_config() { return _cache_config; }
 private:
     std::vector<float> _random_area, _random_aspect_ratio;
+    ImageCacheConfig _cache_config;
     unsigned _num_attempts = 10;
     int _seed = std::time(0); //seed for decoder random crop
 };
@@ -28,10 +28,11 @@ THE SOFTWARE.
 class FFmpegVideoDecoder : public VideoDecoder
 {
 public:
-    //! Default constructor
-    FFmpegVideoDecoder();
+    //! Decodes with thread_count frame and slice threads
+    explicit FFmpegVideoDecoder(unsigned thread_count = 1);
     VideoDecoder::Status Initialize(const char *src_filename) override;
     VideoDecoder::Status Decode(unsigned char *output_buffer, unsigned seek_frame_number, size_t sequence_length, size_t stride, int out_width, int out_height, int out_stride, AVPixelFormat out_format) override;
+    VideoDecoder::Status DecodeSequences(std::vector<Sequence> &sequences, size_t stride, int out_width, int out_height, int out_stride, AVPixelFormat out_format) override;
     int seek_frame(AVRational avg_frame_rate, AVRational time_base, unsigned frame_number) override;
     void release() override;
     ~FFmpegVideoDecoder() override;
@@ -44,5 +45,6 @@ private:
     int _video_stream_idx = -1;
     AVPixelFormat _dec_pix_fmt;
     int _codec_width, _codec_height;
+    unsigned _thread_count;
 };
 #endif
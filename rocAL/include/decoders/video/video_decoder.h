@@ -56,7 +56,16 @@ public:
     VideoDecoderConfig() {}
     explicit VideoDecoderConfig(VideoDecoderType type) : _type(type) {}
     virtual VideoDecoderType type() { return _type; };
+    //! Threads of each software decoder, 0 splits the thread budget between the decoders running in parallel
+    void set_thread_count(unsigned thread_count) { _thread_count = thread_count; }
+    unsigned thread_count() { return _thread_count; }
+    //! CPU threads the pipeline gives the decoders of a loader, the OpenMP host paths of the pipeline use the same count
+    void set_thread_budget(size_t thread_budget) { _thread_budget = thread_budget; }
+    size_t thread_budget() { return _thread_budget; }
     VideoDecoderType _type = VideoDecoderType::FFMPEG_SOFTWARE_DECODE;
+private:
+    unsigned _thread_count = 0;
+    size_t _thread_budget = 1;
 };
 
 #ifdef ROCAL_VIDEO
@@ -80,6 +89,29 @@ public:
     };
     virtual VideoDecoder::Status Initialize(const char *src_filename) = 0;
     virtual VideoDecoder::Status Decode(unsigned char *output_buffer, unsigned seek_frame_number, size_t sequence_length, size_t stride, int out_width, int out_height, int out_stride, AVPixelFormat out_format) = 0;
+    //! A sequence to decode, its length frames are written one after the other to buffer
+    struct Sequence
+    {
+        unsigned char *buffer;
+        unsigned start_frame;
+        size_t length;
+        size_t decoded = 0; // Set to the number of frames written to buffer, fewer than length if the video ends first
+    };
+    //! Decodes sequences of the video sorted by start frame, decoders that can decode them in one pass from the first one override it
+    /*!
+     Returns OK at the end of the video even if the sequences are not filled, their decoded count tells how many frames were
+     written. The default implementation can't tell how far Decode got and leaves it at 0.
+    */
+    virtual VideoDecoder::Status DecodeSequences(std::vector<Sequence> &sequences, size_t stride, int out_width, int out_height, int out_stride, AVPixelFormat out_format)
+    {
+        for (auto &sequence : sequences)
+        {
+            auto status = Decode(sequence.buffer, sequence.start_frame, sequence.length, stride, out_width, out_height, out_stride, out_format);
+            if (status != Status::OK)
+                return status;
+        }
+        return Status::OK;
+    }
     virtual int seek_frame(AVRational avg_frame_rate, AVRational time_base, unsigned frame_number) = 0;
     virtual void release() = 0;
     virtual ~VideoDecoder() = default;
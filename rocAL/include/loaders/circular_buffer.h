@@ -33,6 +33,7 @@ THE SOFTWARE.
 struct decoded_image_info
 {
     std::vector<std::string> _image_names;
+    std::vector<int> _sample_ids; //!< Ids of the images in the meta data reader's SampleIndex, -1 if unknown, empty if the loader doesn't report them
     std::vector<uint32_t> _roi_width;
     std::vector<uint32_t> _roi_height;
     std::vector<uint32_t> _original_width;
@@ -68,6 +69,7 @@ public:
     void reset();// sets the buffer level to 0
     void block_if_empty();// blocks the caller if the buffer is empty
     void block_if_full();// blocks the caller if the buffer is full
+    void block_until_writer_unblocked();// blocks the writer thread until unblock_writer() is called, used when there is no more data to write till a reset
 
 private:
     void increment_read_ptr();
@@ -105,4 +107,5 @@ private:
     size_t _write_ptr;
     size_t _read_ptr;
     size_t _level;
+    bool _writer_unblocked = false;
 };
\ No newline at end of file
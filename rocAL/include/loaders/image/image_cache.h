@@ -0,0 +1,72 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#pragma once
+#include <list>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "decoder.h"
+
+//! Keeps decoded images across epochs so that cached samples skip both the read and the decode
+/// Entries are keyed by the reader's sample id and each one occupies a fixed size slot of the loader's per image output size.
+/// All slots live in a single anonymous mapping, or in a mapping of a file under ImageCacheConfig::spill_path so that
+/// the kernel can page cold entries out to that file instead of to swap.
+class ImageCache
+{
+public:
+    ImageCache(const ImageCacheConfig &config, size_t slot_size);
+    ~ImageCache();
+    //! Pins the sample if it is cached so that it can't be evicted before get() copies it out, returns false on a miss
+    bool acquire(const std::string &sample_id);
+    //! Copies a sample pinned by acquire() into dst and unpins it
+    void get(const std::string &sample_id, unsigned char *dst, size_t &roi_width, size_t &roi_height, size_t &original_width, size_t &original_height);
+    //! Unpins a sample pinned by acquire() that is not going to be copied out
+    void release(const std::string &sample_id);
+    //! Copies size bytes of the decoded sample into the cache, returns false if the sample is not cached
+    bool put(const std::string &sample_id, const unsigned char *src, size_t size, size_t roi_width, size_t roi_height, size_t original_width, size_t original_height);
+    //! Returns the number of slots, zero if the budget can't hold a single image
+    size_t capacity() const { return _slot_count; }
+    long long unsigned hits();
+    long long unsigned misses();
+
+private:
+    struct Entry
+    {
+        size_t slot;
+        size_t size;
+        size_t roi_width, roi_height, original_width, original_height;
+        unsigned pin_count = 0;
+        std::list<std::string>::iterator lru_pos;
+    };
+    bool evict_one();
+    ImageCacheConfig _config;
+    size_t _slot_size, _slot_count = 0, _mapped_size = 0;
+    unsigned char *_storage = nullptr;
+    std::unordered_map<std::string, Entry> _entries;
+    std::list<std::string> _lru; //!< Most recently used sample ids first, maintained only for the LRU policy
+    std::vector<size_t> _free_slots;
+    std::mutex _lock;
+    long long unsigned _hits = 0, _misses = 0;
+};
@@ -24,12 +24,17 @@ THE SOFTWARE.
 #include <dirent.h>
 #include <vector>
 #include <memory>
+#include <queue>
+#include <thread>
+#include <mutex>
+#include <condition_variable>
 #include "commons.h"
 #include "turbo_jpeg_decoder.h"
 #include "reader_factory.h"
 #include "timing_debug.h"
 #include "loader_module.h"
 #include "parameter_random_crop_decoder.h"
+#include "image_cache.h"
 
 /**
  * Compute the scaled value of <tt>dimension</tt> using the given scaling
@@ -56,6 +61,7 @@ public:
     //! Loads a decompressed batch of images into the buffer indicated by buff
     /// \param buff User's buffer provided to be filled with decoded image samples
     /// \param names User's buffer provided to be filled with name of the images decoded
+    /// \param sample_ids User's buffer provided to be filled with the ids of the images decoded in the meta data reader's index, -1 if unknown
     /// \param max_decoded_width User's buffer maximum width per decoded image. User expects the decoder to downscale the image if image's original width is bigger than max_width
     /// \param max_decoded_height user's buffer maximum height per decoded image. User expects the decoder to downscale the image if image's original height is bigger than max_height
     /// \param roi_width is set by the load() function tp the width of the region that decoded image is located. It's less than max_width and is either equal to the original image width if original image width is smaller than max_width or downscaled if necessary to fit the max_width criterion.
@@ -64,6 +70,7 @@ public:
     LoaderModuleStatus load(
             unsigned char* buff,
             std::vector<std::string>& names,
+            std::vector<int>& sample_ids,
             const size_t  max_decoded_width,
             const size_t max_decoded_height,
             std::vector<uint32_t> &roi_width,
@@ -77,21 +84,53 @@ public:
     Timing timing();
 
 private:
+    //! Holds the compressed bytes of one batch read ahead of the decoder
+    struct CompressedBatch
+    {
+        std::vector<std::vector<unsigned char>> compressed_buff;
+        std::vector<size_t> actual_read_size;
+        std::vector<std::string> image_names;
+        std::vector<std::string> cache_keys;
+        std::vector<int> sample_ids;
+        std::vector<size_t> compressed_image_size;
+        std::vector<bool> cache_hit;
+        size_t file_count = 0;
+    };
+    size_t read_compressed_batch(std::vector<std::vector<unsigned char>> &compressed_buff, std::vector<size_t> &actual_read_size,
+                                 std::vector<std::string> &image_names, std::vector<std::string> &cache_keys, std::vector<int> &sample_ids,
+                                 std::vector<size_t> &compressed_image_size, std::vector<bool> &cache_hit);
+    void release_cached(const std::vector<std::string> &cache_keys, const std::vector<bool> &cache_hit, size_t file_count);
+    void start_read_ahead();
+    void stop_read_ahead();
+    void read_ahead_routine();
     std::vector<std::shared_ptr<Decoder>> _decoder;
     std::shared_ptr<Reader> _reader;
     std::vector<std::vector<unsigned char>> _compressed_buff;
     std::vector<size_t> _actual_read_size;
     std::vector<std::string> _image_names;
+    std::vector<std::string> _cache_keys; //!< Reader::unique_id() of the samples of the current batch, image names may repeat across folders
+    std::vector<int> _sample_ids;
     std::vector<size_t> _compressed_image_size;
+    std::vector<bool> _cache_hit; //!< Samples of the current batch served from _image_cache, their compressed bytes are not read
     std::vector<unsigned char*> _decompressed_buff_ptrs;
     std::vector<size_t> _actual_decoded_width;
     std::vector<size_t> _actual_decoded_height;
     std::vector<size_t> _original_width;
     std::vector<size_t> _original_height;
     static const size_t MAX_COMPRESSED_SIZE = 1*1024*1024; // 1 Meg
-    TimingDBG _file_load_time, _decode_time;
+    TimingDBG _file_load_time, _decode_time, _read_ahead_time;
     size_t _batch_size, _shard_count, _num_threads;
+    size_t _read_ahead_depth = 0; //!< Number of batches read ahead of the decoder, 0 reads each batch in load()
+    std::thread _read_ahead_thread;
+    std::mutex _read_ahead_mutex, _reader_mutex;
+    std::condition_variable _batch_ready, _batch_free;
+    std::queue<std::shared_ptr<CompressedBatch>> _ready_batches, _free_batches;
+    size_t _staged_file_count = 0;
+    bool _read_ahead_running = false;
+    bool _read_ahead_eof = false;
     DecoderConfig _decoder_config;
+    ImageCacheConfig _cache_config;
+    std::unique_ptr<ImageCache> _image_cache; //!< Created by the first load() once the decoded image size is known
     bool decoder_keep_original;
     std::vector<std::vector <float>> _bbox_coords, _crop_coords_batch;
     std::shared_ptr<RandomBBoxCrop_MetaDataReader> _randombboxcrop_meta_data_reader = nullptr;
@@ -40,7 +40,8 @@ public:
     /// The loader will repeat sequences if necessary to be able to have sequences in multiples of the load_batch_count,
     /// for example if there are 10 sequences in the dataset and load_batch_count is 3, the loader repeats 2 sequences as if there are 12 sequences available.
     void init(unsigned internal_shard_count, const std::string &source_path, VideoStorageType storage_type, VideoDecoderType decoder_type, DecodeMode decoder_mode,
-              unsigned sequence_length, unsigned step, unsigned stride, VideoProperties &video_prop, bool shuffle, bool loop, size_t load_batch_count, RocalMemType mem_type);
+              unsigned sequence_length, unsigned step, unsigned stride, VideoProperties &video_prop, bool shuffle, bool loop, size_t load_batch_count, RocalMemType mem_type,
+              unsigned decode_threads, size_t decode_thread_budget);
     std::shared_ptr<VideoLoaderModule> get_loader_module();
 protected:
     void create_node() override{};
@@ -0,0 +1,65 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#pragma once
+#include <list>
+#include <memory>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "video_decoder.h"
+
+#ifdef ROCAL_VIDEO
+//! Decoders of a video loader with their video opened, the least recently used one is reopened for a video without one
+/// A batch takes one decoder for each of its videos and keeps it till end_batch(). A video keeps its decoder after that, so
+/// that the sequences of a video spread over consecutive batches don't open it again.
+class VideoDecoderPool
+{
+public:
+    void create(VideoDecoderConfig decoder_config, size_t capacity);
+    //! Returns the index of the decoder with the video opened for the batch, -1 if it can't be opened
+    int acquire(const std::string &video_path);
+    //! Lets the decoders taken by the batch be reopened for other videos
+    void end_batch();
+    //! Logs the opens and closes of the epoch and restarts counting them
+    void end_epoch();
+    std::shared_ptr<VideoDecoder> &decoder(int index) { return _slots[index].decoder; }
+    size_t capacity() const { return _slots.size(); }
+    long long unsigned epoch_opens() const { return _epoch_opens; }
+    long long unsigned epoch_closes() const { return _epoch_closes; }
+private:
+    struct Slot
+    {
+        std::shared_ptr<VideoDecoder> decoder;
+        std::string video_path; //!< Empty when the decoder has no video opened
+        bool in_batch = false;
+        std::list<int>::iterator lru_pos;
+    };
+    void touch(int index);
+    VideoDecoderConfig _decoder_config;
+    std::vector<Slot> _slots;
+    std::unordered_map<std::string, int> _video_slots;
+    std::list<int> _lru; //!< Least recently used decoders first
+    long long unsigned _epoch_opens = 0, _epoch_closes = 0;
+    size_t _epoch = 0;
+};
+#endif
@@ -0,0 +1,59 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#pragma once
+#include <list>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+//! Process wide LRU cache of decoded video frames keyed by video and frame number, bounded by a byte budget
+/// Sequences read with a step smaller than their length share most of their frames, the video loaders copy the frames
+/// they find here instead of decoding and converting them again.
+class VideoFrameCache
+{
+public:
+    typedef std::shared_ptr<const std::vector<unsigned char>> Frame;
+    //! Returns the cache shared by every video loader of the process
+    static VideoFrameCache &instance();
+    //! Sets the byte budget, evicting the least recently used frames if it shrinks
+    void set_capacity(size_t capacity);
+    size_t capacity();
+    //! Returns the frame or nullptr if it's not cached
+    /// \param video_key identifies the video and the size and pixel format the frames were converted to
+    Frame get(const std::string &video_key, unsigned frame_number);
+    void put(const std::string &video_key, unsigned frame_number, const unsigned char *data, size_t size);
+private:
+    VideoFrameCache() = default;
+    void evict(size_t size);
+    struct Entry
+    {
+        Frame data;
+        std::list<std::string>::iterator lru_pos;
+    };
+    std::unordered_map<std::string, Entry> _entries;
+    std::list<std::string> _lru; //!< Most recently used keys first
+    size_t _capacity = 0, _used = 0;
+    std::mutex _lock;
+};
@@ -23,14 +23,18 @@ THE SOFTWARE.
 #pragma once
 #include <dirent.h>
 #include <vector>
+#include <algorithm>
+#include <thread>
 #include <memory>
 #include <iterator>
 #include <cstring>
 #include <map>
 #include <tuple>
+#include <atomic>
 #include <boost/filesystem.hpp>
 #include "commons.h"
 #include "ffmpeg_video_decoder.h"
+#include "video_decoder_pool.h"
 #include "video_reader_factory.h"
 #include "timing_debug.h"
 #include "video_loader_module.h"
@@ -49,12 +53,8 @@ public:
     size_t count();
     void reset();
     void create(VideoReaderConfig reader_config, VideoDecoderConfig decoder_config, int batch_size);
-    void set_video_process_count(size_t video_count)
-    {
-        _video_process_count = (video_count <= _max_video_count) ? video_count : _max_video_count;
-    }
     float convert_framenum_to_timestamp(size_t frame_number);
-    void decode_sequence(size_t sequence_index);
+    void decode_pass(size_t pass_index);
 
     //! Loads a decompressed batch of sequence of frames into the buffer indicated by buff
     /// \param buff User's buffer provided to be filled with decoded sequence samples
@@ -82,24 +82,17 @@ public:
     //! returns timing info or other status information
     Timing timing();
 private:
-    struct video_map
-    {
-        int _video_map_idx;
-        bool _is_decoder_instance;
-    };
-    std::vector<std::shared_ptr<VideoDecoder>> _video_decoder;
+    VideoDecoderPool _decoder_pool;
     std::shared_ptr<VideoReader> _video_reader;
-    size_t _max_video_count = 50;
-    size_t _video_process_count;
     VideoProperties _video_prop;
-    std::vector<std::string> _video_names;
-    std::map<std::string, video_map> _video_file_name_map;
     std::vector<unsigned char *> _decompressed_buff_ptrs;
     std::vector<size_t> _actual_decoded_width;
     std::vector<size_t> _actual_decoded_height;
     std::vector<size_t> _sequence_start_frame_num;
     std::vector<std::string> _sequence_video_path;
-    std::vector<int> _sequence_video_idx;
+    std::vector<std::vector<size_t>> _decode_passes; //!< Sequences of the batch decoded with one seek, each sorted by start frame
+    std::vector<int> _decode_pass_decoder_idx;
+    std::atomic<long long unsigned> _frame_cache_hits{0}, _frame_cache_misses{0};
     TimingDBG _file_load_time, _decode_time;
     size_t _batch_size;
     size_t _sequence_count;
@@ -112,5 +105,6 @@ private:
     size_t _max_decoded_stride;
     AVPixelFormat _out_pix_fmt;
     VideoDecoderConfig _video_decoder_config;
+    void schedule_decode_passes(std::map<int, std::vector<size_t>> &video_sequences);
 };
 #endif
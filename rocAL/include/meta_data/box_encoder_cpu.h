@@ -0,0 +1,55 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#pragma once
+#include <vector>
+#include "meta_data.h"
+
+//! Encodes the ground truth boxes of a batch against a fixed set of anchors on the CPU, the host counterpart of BoxEncoderGpu
+/*!
+ Every anchor gets the box it overlaps most if their IoU is above the criteria, and every box is given at least its best anchor.
+ The anchors are laid out once as separate l, t, r, b and area arrays, the IoUs of a box with all the anchors are computed
+ eight anchors at a time with AVX2 and folded right away into the best box and IoU of every anchor, without keeping a
+ boxes x anchors matrix. The output is written straight to the caller's buffers, anchors x 4 floats and anchors labels per sample.
+*/
+class BoxEncoderCpu
+{
+public:
+    BoxEncoderCpu(const std::vector<float> &anchors, float criteria, const std::vector<float> &means, const std::vector<float> &stds, bool offset, float scale);
+    //! Encodes every sample of the batch, the boxes of sample i go to encoded_boxes + i * anchors * 4 as xcycwh and the labels to encoded_labels + i * anchors
+    void Run(pMetaDataBatch full_batch_meta_data, float *encoded_boxes, int *encoded_labels);
+    //! Encodes the boxes of a single sample
+    void encode_sample(const BoundingBoxCord *boxes, const int *labels, unsigned count, float *encoded_boxes, int *encoded_labels);
+    unsigned anchor_count() const { return _anchor_count; }
+    //! Returns the instruction set the IoUs are computed with, "avx2" or "scalar"
+    static const char *isa();
+private:
+    void match_boxes(const BoundingBoxCord *boxes, unsigned count, float *best_iou, int *best_box);
+    unsigned _anchor_count;
+    float _criteria;
+    bool _offset;
+    float _scale;
+    float _means[4], _inv_stds[4];
+    std::vector<float> _anchors_l, _anchors_t, _anchors_r, _anchors_b, _anchors_area;
+    std::vector<float> _anchors_xcycwh; //!< The anchors as xcycwh, written for the unmatched anchors when offsets aren't computed
+    std::vector<float> _scaled_anchors_xcycwh; //!< The anchors as xcycwh multiplied by the scale, the base the offsets are computed from
+};
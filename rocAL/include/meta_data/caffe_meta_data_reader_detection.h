@@ -38,6 +38,9 @@ class CaffeMetaDataReaderDetection: public MetaDataReader
 public :
     void init(const MetaDataConfig& cfg) override;
     void lookup(const std::vector<std::string>& image_names) override;
+    void lookup_by_id(const std::vector<std::string>& image_names, const std::vector<int>& sample_ids) override;
+    int sample_id(const std::string &image_name) override { return _sample_index.id(image_name); }
+    MetaData *sample(const std::string &image_name, int sample_id) override { return _sample_index.get(image_name, sample_id); }
     void read_all(const std::string& path) override;
     void release(std::string image_name);
     void release() override;
@@ -54,6 +57,7 @@ private:
     bool _last_rec;
     void read_lmdb_record(std::string file_name, uint file_size);
     std::map<std::string, std::shared_ptr<MetaData>> _map_content;
+    SampleIndex _sample_index; //!< Built from _map_content once it's read
     std::map<std::string, std::shared_ptr<MetaData>>::iterator _itr;
     std::string _path;
     BoundingBoxBatch* _output;
@@ -0,0 +1,59 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#pragma once
+#include <array>
+#include <cstdint>
+#include <map>
+#include <memory>
+#include <string>
+#include "meta_data.h"
+
+//! Binary cache of the meta data a COCO reader parsed from an annotations json
+/*!
+ The first run over an annotations file saves the parsed map content next to it as <annotations>.cache, later runs map
+ the cache and fill the map content from it instead of parsing the json. The cache holds the names, image sizes and
+ either the normalized boxes with their continuous labels or the key point joints data, laid out in flat arrays so it
+ can be read in place. It records the size and modification time of the json and the reader settings its values depend
+ on, a cache that doesn't match them is rebuilt.
+*/
+class COCOAnnotationCache
+{
+public:
+    enum class Content : uint32_t
+    {
+        BOUNDING_BOXES = 1,
+        KEY_POINTS = 2
+    };
+    //! \param params Reader settings the cached values depend on, e.g. the output size the key point scales are computed for
+    COCOAnnotationCache(const std::string &annotations_path, Content content, std::array<uint32_t, 2> params = {});
+    //! Fills map_content from the cache, returns false if there is no valid cache for the annotations file
+    bool load(std::map<std::string, std::shared_ptr<MetaData>> &map_content);
+    //! Writes map_content to the cache, failing to write only costs parsing the json again on the next run
+    void save(const std::map<std::string, std::shared_ptr<MetaData>> &map_content);
+    const std::string &path() const { return _cache_path; }
+private:
+    std::string _annotations_path;
+    std::string _cache_path;
+    Content _content;
+    std::array<uint32_t, 2> _params;
+};
@@ -32,6 +32,9 @@ class COCOMetaDataReader: public MetaDataReader
 public:
     void init(const MetaDataConfig& cfg) override;
     void lookup(const std::vector<std::string>& image_names) override;
+    void lookup_by_id(const std::vector<std::string>& image_names, const std::vector<int>& sample_ids) override;
+    int sample_id(const std::string &image_name) override { return _sample_index.id(image_name); }
+    MetaData *sample(const std::string &image_name, int sample_id) override { return _sample_index.get(image_name, sample_id); }
     void read_all(const std::string& path) override;
     void release(std::string image_name);
     void release() override;
@@ -48,6 +51,7 @@ private:
     void add(std::string image_name, BoundingBoxCords bbox, BoundingBoxLabels b_labels, ImgSize image_size);
     bool exists(const std::string &image_name) override;
     std::map<std::string, std::shared_ptr<MetaData>> _map_content;
+    SampleIndex _sample_index; //!< Built from _map_content once it's read
     std::map<std::string, std::shared_ptr<MetaData>>::iterator _itr;
     std::map<std::string, ImgSize> _map_img_sizes;
     std::map<std::string, ImgSize> ::iterator itr;
@@ -26,6 +26,7 @@ THE SOFTWARE.
 #include "commons.h"
 #include "meta_data.h"
 #include "meta_data_reader.h"
+#include "dataset_listing.h"
 
 class LabelReaderFolders: public MetaDataReader
 {
@@ -49,8 +50,8 @@ private:
     std::map<std::string, std::shared_ptr<MetaData>>::iterator _itr;
     std::string _path;
     LabelBatch* _output;
-    DIR *_src_dir, *_sub_dir;
-    struct dirent *_entity;
+    std::string _index_path;
+    DatasetListing _listing;
     std::vector<std::string> _file_names;
     std::vector<std::string> _subfolder_file_names;
 };
\ No newline at end of file
@@ -147,6 +147,61 @@ struct KeyPoint : public MetaData
     void set_joints_data(JointsData *joints_data) { _joints_data = std::move(*joints_data); }
 };
 
+//! Bounding boxes of a batch stored flat, the boxes and labels of sample i are at [offsets[i], offsets[i + 1]) of cords and labels
+/*!
+ Clearing keeps the capacity of the arrays, so that refilling them every batch doesn't allocate once they are large enough.
+ Samples are added in order, either whole with add_sample() or box by box with push_back() followed by end_sample().
+*/
+struct BatchBoundingBoxes
+{
+    BoundingBoxCords cords;
+    BoundingBoxLabels labels;
+    std::vector<unsigned> offsets = {0};
+    unsigned samples() const { return offsets.size() - 1; }
+    unsigned count(unsigned sample) const { return offsets[sample + 1] - offsets[sample]; }
+    unsigned total() const { return offsets.back(); }
+    BoundingBoxCord *cords_of(unsigned sample) { return cords.data() + offsets[sample]; }
+    int *labels_of(unsigned sample) { return labels.data() + offsets[sample]; }
+    void clear()
+    {
+        cords.clear();
+        labels.clear();
+        offsets.resize(1);
+    }
+    //! Sets the batch to samples samples of count boxes each, left for the caller to fill
+    void resize(unsigned samples, unsigned count = 0)
+    {
+        cords.resize(samples * count);
+        labels.resize(samples * count);
+        offsets.resize(samples + 1);
+        for (unsigned i = 0; i <= samples; i++)
+            offsets[i] = i * count;
+    }
+    //! Appends a box to the sample being built, the one end_sample() closes
+    void push_back(const BoundingBoxCord &cord, int label)
+    {
+        cords.push_back(cord);
+        labels.push_back(label);
+    }
+    //! Number of boxes pushed to the sample being built
+    unsigned pending() const { return cords.size() - offsets.back(); }
+    void end_sample() { offsets.push_back(cords.size()); }
+    void add_sample(const BoundingBoxCord *sample_cords, const int *sample_labels, unsigned count)
+    {
+        cords.insert(cords.end(), sample_cords, sample_cords + count);
+        labels.insert(labels.end(), sample_labels, sample_labels + count);
+        end_sample();
+    }
+    void append(const BatchBoundingBoxes &other)
+    {
+        unsigned base = total();
+        cords.insert(cords.end(), other.cords.begin(), other.cords.end());
+        labels.insert(labels.end(), other.labels.begin(), other.labels.end());
+        for (unsigned i = 1; i < other.offsets.size(); i++)
+            offsets.push_back(base + other.offsets[i]);
+    }
+};
+
 struct MetaDataBatch
 {
     virtual ~MetaDataBatch() = default;
@@ -160,17 +215,29 @@ struct MetaDataBatch
         return this;
     }
     virtual std::shared_ptr<MetaDataBatch> clone()  = 0;
+    //! Copies the meta data of other into this batch, reusing the capacity of its arrays
+    void copy(const MetaDataBatch& other)
+    {
+        _label_id = other._label_id;
+        _bb = other._bb;
+        _img_sizes = other._img_sizes;
+        _joints_data = other._joints_data;
+    }
     std::vector<int>& get_label_batch() { return _label_id; }
-    std::vector<BoundingBoxCords>& get_bb_cords_batch() { return _bb_cords; }
-    std::vector<BoundingBoxCords_xcycwh>& get_bb_cords_batch_xcycxwh() { return _bb_cords_xcycwh; }
-    std::vector<BoundingBoxLabels>& get_bb_labels_batch() { return _bb_label_ids; }
+    BatchBoundingBoxes& get_bb_batch() { return _bb; }
+    //! Cleared boxes a meta node writes the updated boxes of the batch to, swap_bb_batch() then makes them the boxes of the batch
+    BatchBoundingBoxes& get_bb_batch_scratch()
+    {
+        _bb_scratch.clear();
+        return _bb_scratch;
+    }
+    void swap_bb_batch() { std::swap(_bb, _bb_scratch); }
     ImgSizes & get_img_sizes_batch() { return _img_sizes; }
     JointsDataBatch & get_joints_data_batch() { return _joints_data; }
 protected:
     std::vector<int> _label_id = {}; // For label use only
-    std::vector<BoundingBoxCords> _bb_cords = {};
-    std::vector<BoundingBoxCords_xcycwh> _bb_cords_xcycwh = {};
-    std::vector<BoundingBoxLabels> _bb_label_ids = {};
+    BatchBoundingBoxes _bb = {};
+    BatchBoundingBoxes _bb_scratch = {};
     std::vector<ImgSize> _img_sizes = {};
     JointsDataBatch _joints_data = {};
 };
@@ -209,30 +276,29 @@ struct BoundingBoxBatch: public MetaDataBatch
 {
     void clear() override
     {
-        _bb_cords.clear();
-        _bb_label_ids.clear();
+        _bb.clear();
         _img_sizes.clear();
     }
     MetaDataBatch&  operator += (MetaDataBatch& other) override
     {
-        _bb_cords.insert(_bb_cords.end(), other.get_bb_cords_batch().begin(), other.get_bb_cords_batch().end());
-        _bb_label_ids.insert(_bb_label_ids.end(), other.get_bb_labels_batch().begin(), other.get_bb_labels_batch().end());
+        _bb.append(other.get_bb_batch());
         _img_sizes.insert(_img_sizes.end(), other.get_img_sizes_batch().begin(), other.get_img_sizes_batch().end());
         return *this;
     }
     void resize(int batch_size) override
     {
-        _bb_cords.resize(batch_size);
-        _bb_label_ids.resize(batch_size);
+        _bb.resize(batch_size);
         _img_sizes.resize(batch_size);
     }
     int size() override
     {
-        return _bb_cords.size();
+        return _bb.samples();
     }
     std::shared_ptr<MetaDataBatch> clone() override
     {
-        return std::make_shared<BoundingBoxBatch>(*this);
+        auto batch = std::make_shared<BoundingBoxBatch>();
+        batch->copy(*this);
+        return batch;
     }
 };
 
@@ -242,8 +308,7 @@ struct KeyPointBatch : public MetaDataBatch
     {
         _img_sizes.clear();
         _joints_data = {};
-        _bb_cords.clear();
-        _bb_label_ids.clear();
+        _bb.clear();
     }
     MetaDataBatch&  operator += (MetaDataBatch& other) override
     {
@@ -268,8 +333,7 @@ struct KeyPointBatch : public MetaDataBatch
         _joints_data.joints_visibility_batch.resize(batch_size);
         _joints_data.score_batch.resize(batch_size);
         _joints_data.rotation_batch.resize(batch_size);
-        _bb_cords.resize(batch_size);
-        _bb_label_ids.resize(batch_size);
+        _bb.resize(batch_size);
     }
     int size() override
     {
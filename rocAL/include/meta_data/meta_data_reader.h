@@ -26,6 +26,7 @@ THE SOFTWARE.
 #include <memory>
 #include <map>
 #include "meta_data.h"
+#include "sample_index.h"
 
 enum class MetaDataReaderType
 {
@@ -63,6 +64,7 @@ private:
     unsigned _frame_stride;
     unsigned _out_img_width;
     unsigned _out_img_height;
+    std::string _index_path;            // folder of the dataset listing manifest (used by the folder based label reader)
 
 public:
     MetaDataConfig(const MetaDataType& type, const MetaDataReaderType& reader_type, const std::string& path, const std::map<std::string, std::string> &feature_key_map=std::map<std::string, std::string>(), const std::string file_prefix=std::string(), const unsigned& sequence_length = 3, const unsigned& frame_step = 3, const unsigned& frame_stride = 1)
@@ -80,6 +82,8 @@ public:
     unsigned out_img_height() const { return _out_img_height; }
     void set_out_img_width(unsigned out_img_width) { _out_img_width = out_img_width; }
     void set_out_img_height(unsigned out_img_height) { _out_img_height = out_img_height; }
+    std::string index_path() const { return _index_path; }
+    void set_index_path(const std::string &index_path) { _index_path = index_path; }
 };
 
 
@@ -99,5 +103,16 @@ public:
     virtual const std::map<std::string, std::shared_ptr<MetaData>> & get_map_content()=0;
     virtual bool exists(const std::string &image_name) = 0;
     virtual bool set_timestamp_mode() = 0;
+    //! Returns the id of image_name in the reader's SampleIndex, -1 if the reader doesn't index its samples or has no meta data for it
+    virtual int sample_id(const std::string &image_name) { return -1; }
+    //! Returns the meta data of image_name, found by sample_id if it's a valid id and by name otherwise, nullptr if there is none
+    virtual MetaData *sample(const std::string &image_name, int sample_id)
+    {
+        auto &content = get_map_content();
+        auto it = content.find(image_name);
+        return it == content.end() ? nullptr : it->second.get();
+    }
+    //! Same as lookup(), finding the samples by the ids the image reader reported for them, sample_ids may be empty
+    virtual void lookup_by_id(const std::vector<std::string>& image_names, const std::vector<int>& sample_ids) { lookup(image_names); }
 };
 
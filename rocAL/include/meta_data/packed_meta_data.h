@@ -0,0 +1,45 @@
+/*
+Copyright (c) 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#pragma once
+#include <vector>
+#include "meta_data.h"
+#include "rocal_api_types.h"
+
+//! Packs the names and the meta data of a batch in a single buffer described by a RocalBatchMetaData
+/*!
+ The buffer is rebuilt only after invalidate() is called, so every meta data query of a batch shares one packing pass,
+ and it is reused across batches, growing only when a batch needs more room.
+*/
+class PackedMetaData
+{
+public:
+    const RocalBatchMetaData &pack(const ImageNameBatch &names, const pMetaDataBatch &meta_data);
+    void invalidate() { _valid = false; }
+    bool valid() const { return _valid; }
+    const RocalBatchMetaData &get() const { return _view; }
+private:
+    std::vector<unsigned char> _buffer;
+    RocalBatchMetaData _view = {};
+    bool _valid = false;
+};
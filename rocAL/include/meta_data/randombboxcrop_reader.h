@@ -74,7 +74,7 @@ class RandomBBoxCropReader: public RandomBBoxCrop_MetaDataReader
 public:
     void init(const RandomBBoxCrop_MetaDataConfig& cfg) override;
     void lookup(const std::vector<std::string>& image_names) override;
-    std::vector<std::vector <float>>  get_batch_crop_coords(const std::vector<std::string>& image_names) override ;
+    std::vector<std::vector <float>>  get_batch_crop_coords(const std::vector<std::string>& image_names, const std::vector<int>& sample_ids) override ;
     void read_all() override;
     void release() override;
     void print_map_contents();
@@ -88,7 +88,6 @@ public:
 
 private:
     std::shared_ptr<MetaDataReader> _meta_data_reader = nullptr;
-    std::map<std::string, std::shared_ptr<MetaData>> _meta_bbox_map_content;
     bool _all_boxes_overlap;
     bool _no_crop;
     bool _has_shape;
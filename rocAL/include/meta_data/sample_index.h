@@ -0,0 +1,128 @@
+/*
+Copyright (c) 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#pragma once
+#include <algorithm>
+#include <cstdlib>
+#include <map>
+#include <memory>
+#include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
+#include "meta_data.h"
+
+//! Dense integer ids of the samples a meta data reader has meta data for
+/*!
+ The reader builds it once after reading the annotations, the image readers then resolve the names they list to ids once
+ and report the id of every item they open, so that the meta data of a batch is found by indexing instead of by name.
+ The entries point into the reader's map content and are valid till the reader releases it.
+*/
+class SampleIndex
+{
+public:
+    //! Gives the entries of content the ids 0 to content.size() - 1 in the order of content
+    template <typename T>
+    void build(const std::map<std::string, std::shared_ptr<T>> &content)
+    {
+        clear();
+        _ids.reserve(content.size());
+        _entries.reserve(content.size());
+        for (auto &elem : content)
+        {
+            _ids.emplace(elem.first, _entries.size());
+            _entries.push_back(elem.second.get());
+        }
+    }
+    void clear()
+    {
+        _ids.clear();
+        _entries.clear();
+    }
+    //! Drops name from the index, the ids of the other samples don't change
+    void erase(const std::string &name)
+    {
+        auto it = _ids.find(name);
+        if (it == _ids.end())
+            return;
+        _entries[it->second] = nullptr;
+        _ids.erase(it);
+    }
+    size_t size() const { return _entries.size(); }
+    //! Returns the id of name, -1 if it's not in the index
+    int id(const std::string &name) const
+    {
+        auto it = _ids.find(name);
+        return it == _ids.end() ? -1 : it->second;
+    }
+    //! Returns the meta data of the sample with the given id, or of name if the id is not valid (-1), nullptr if there is none
+    MetaData *get(const std::string &name, int id) const
+    {
+        if (id >= 0 && (size_t)id < _entries.size())
+            return _entries[id];
+        id = this->id(name);
+        return id < 0 ? nullptr : _entries[id];
+    }
+private:
+    std::unordered_map<std::string, int> _ids;
+    std::vector<MetaData *> _entries;
+};
+
+//! Sample ids of the items an image reader lists, parallel to its list of names
+class SampleIds
+{
+public:
+    //! Resolves the ids of names with sample_id, which returns -1 for a name without an id; all -1 ids are dropped
+    template <typename F>
+    void resolve(const std::vector<std::string> &names, F sample_id)
+    {
+        _ids.resize(names.size());
+        bool any = false;
+        for (size_t i = 0; i < names.size(); i++)
+        {
+            _ids[i] = sample_id(names[i]);
+            any |= (_ids[i] >= 0);
+        }
+        if (!any)
+            _ids.clear();
+    }
+    //! Shuffles names and their ids with the same permutation, a drop-in for std::random_shuffle of the names
+    void shuffle(std::vector<std::string> &names)
+    {
+        if (_ids.size() != names.size())
+        {
+            std::random_shuffle(names.begin(), names.end());
+            return;
+        }
+        for (size_t i = names.size(); i > 1; i--)
+        {
+            size_t j = std::rand() % i;
+            std::swap(names[i - 1], names[j]);
+            std::swap(_ids[i - 1], _ids[j]);
+        }
+    }
+    //! Returns the id of the idx-th name, -1 if it's unknown
+    int operator[](size_t idx) const { return idx < _ids.size() ? _ids[idx] : -1; }
+private:
+    std::vector<int> _ids;
+};
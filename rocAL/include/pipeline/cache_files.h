@@ -0,0 +1,38 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#pragma once
+#include <string>
+
+//! Path of the file caching data about path in the rocAL cache folder, $XDG_CACHE_HOME/rocal or $HOME/.cache/rocal
+/*!
+ \param path The file or folder the cached data is about, its absolute path names the cache file
+ \param prefix Kind of the cached data, the cache file is named <prefix>_<hash of the path>.txt
+*/
+std::string rocal_cache_file_path(const std::string &path, const std::string &prefix);
+
+//! Creates an empty file with a unique name next to path for writing path aside and renaming it into place
+/*!
+ The name is unique across the processes and the threads writing path at the same time.
+ \return The path of the created file, empty if it can't be created
+*/
+std::string create_temp_file(const std::string &path);
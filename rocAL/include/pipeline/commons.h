@@ -43,7 +43,8 @@ enum class RocalTensorFormat
 enum class RocalTensorDataType
 {
     FP32 = 0,
-    FP16
+    FP16,
+    UINT8
 };
 enum class RocalAffinity
 {
@@ -87,6 +88,7 @@ struct Timing
 {
     // The following timings are accumulated timing not just the most recent activity
     long long unsigned image_read_time= 0;
+    long long unsigned image_read_ahead_time= 0;
     long long unsigned image_decode_time= 0;
     long long unsigned to_device_xfer_time= 0;
     long long unsigned from_device_xfer_time= 0;
@@ -100,4 +102,10 @@ struct Timing
     long long unsigned video_read_time= 0;
     long long unsigned video_decode_time= 0;
     long long unsigned video_process_time= 0;
+    long long unsigned image_cache_hits= 0;
+    long long unsigned image_cache_misses= 0;
+    long long unsigned video_frame_cache_hits = 0;
+    long long unsigned video_frame_cache_misses = 0;
+    long long unsigned video_decoder_opens = 0;
+    long long unsigned video_decoder_closes = 0;
 };
\ No newline at end of file
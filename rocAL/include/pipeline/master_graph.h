@@ -38,6 +38,8 @@ THE SOFTWARE.
 #include "node_cifar10_loader.h"
 #include "meta_data_reader.h"
 #include "meta_data_graph.h"
+#include "box_encoder_cpu.h"
+#include "packed_meta_data.h"
 #if ENABLE_HIP
 #include "device_manager_hip.h"
 #include "box_encoder_hip.h"
@@ -56,6 +58,11 @@ public:
     MasterGraph::Status to_tensor(void *out_ptr, RocalTensorFormat format, float multiplier0, float multiplier1, float multiplier2,
                     float offset0, float offset1, float offset2, bool reverse_channels, RocalTensorDataType output_data_type, RocalOutputMemType output_mem_type);
     Status copy_output(unsigned char* out_ptr, size_t out_size_in_bytes);
+    //! Converts the batch being read to a tensor rocAL owns, overwritten by the next call and released with the pipeline
+    Status to_exported_tensor(void **out_ptr, RocalTensorFormat format, float multiplier0, float multiplier1, float multiplier2,
+                    float offset0, float offset1, float offset2, bool reverse_channels, RocalTensorDataType output_data_type);
+    //! U8 buffers of the output images of the batch being read, one per output image
+    std::vector<void*> output_buffers();
     Status copy_out_tensor_planar(void *out_ptr, RocalTensorFormat format, float multiplier0, float multiplier1, float multiplier2,
                     float offset0, float offset1, float offset2, bool reverse_channels, RocalTensorDataType output_data_type);
     size_t output_width();
@@ -77,7 +84,7 @@ public:
     template <typename T, typename M> std::shared_ptr<T> meta_add_node(std::shared_ptr<M> node);
     Image *create_image(const ImageInfo &info, bool is_output);
     Image *create_loader_output_image(const ImageInfo &info);
-    MetaDataBatch *create_label_reader(const char *source_path, MetaDataReaderType reader_type);
+    MetaDataBatch *create_label_reader(const char *source_path, MetaDataReaderType reader_type, const char *index_path = "");
     MetaDataBatch *create_video_label_reader(const char *source_path, MetaDataReaderType reader_type, unsigned sequence_length, unsigned frame_step, unsigned frame_stride, bool file_list_frame_num = true);
     MetaDataBatch *create_coco_meta_data_reader(const char *source_path, bool is_output, MetaDataReaderType reader_type , MetaDataType label_type, float sigma = 0.0, unsigned pose_output_width = 0, unsigned pose_output_height = 0);
     MetaDataBatch *create_tf_record_meta_data_reader(const char *source_path, MetaDataReaderType reader_type,  MetaDataType label_type, const std::map<std::string, std::string> feature_key_map);
@@ -88,6 +95,7 @@ public:
     void box_encoder(std::vector<float> &anchors, float criteria, const std::vector<float> &means, const std::vector<float> &stds, bool offset, float scale);
     void create_randombboxcrop_reader(RandomBBoxCrop_MetaDataReaderType reader_type, RandomBBoxCrop_MetaDataType label_type, bool all_boxes_overlap, bool no_crop, FloatParam* aspect_ratio, bool has_shape, int crop_width, int crop_height, int num_attempts, FloatParam* scaling, int total_num_attempts, int64_t seed=0);
     const std::pair<ImageNameBatch,pMetaDataBatch>& meta_data();
+    const RocalBatchMetaData& packed_meta_data();
     void set_loop(bool val) { _loop = val; }
     void set_output_images(const std::vector<Image*> &output_images, unsigned int num_of_outputs)
     {
@@ -96,6 +104,8 @@ public:
     }
     void set_output(Image* output_image);
     size_t calculate_cpu_num_threads(size_t shard_count);
+    //! Takes half of the CPU cores of the pipeline for a loader running its own threads, returns the number of threads it can run
+    size_t reserve_cpu_threads(size_t shard_count);
     bool empty() { return (remaining_count() < (_is_sequence_reader_output ? _sequence_batch_size : _user_batch_size)); }
     size_t sequence_batch_size() { return _sequence_batch_size; }
     std::shared_ptr<MetaDataGraph> meta_data_graph() { return _meta_data_graph; }
@@ -111,6 +121,10 @@ public:
         _sequence_batch_size = _user_batch_size * sequence_length;
     }
     Status get_bbox_encoded_buffers(float **boxes_buf_ptr, int **labels_buf_ptr, size_t num_encoded_boxes);
+    //! Copies the encoded boxes and labels of the batch being read to host buffers of batch size x anchors boxes, a null buffer is skipped
+    Status copy_bbox_encoded_buffers(float *boxes_buf, int *labels_buf);
+    //! Copies the labels the output routine staged on the device to the device buffer, NOT_IMPLEMENTED if they weren't staged
+    Status copy_staged_labels(void *buf, size_t count);
     size_t bounding_box_batch_count(int* buf, pMetaDataBatch meta_data_batch);
 #if ENABLE_OPENCL
     cl_command_queue get_ocl_cmd_q() { return _device.resources()->cmd_queue; }
@@ -131,8 +145,12 @@ private:
     void notify_user_thread();
     /// no_more_processed_data() is logically linked to the notify_user_thread() and is used to tell the user they've already consumed all the processed images
     bool no_more_processed_data();
+    /// copy_augmented_meta_data() returns a copy of _augmented_meta_data in a batch of the _meta_data_pool that is no longer referenced by the ring buffer or the user
+    pMetaDataBatch copy_augmented_meta_data();
     RingBuffer _ring_buffer;//!< The queue that keeps the images that have benn processed by the internal thread (_output_thread) asynchronous to the user's thread
+    PackedMetaData _packed_meta_data;//!< The meta data of the batch at the front of the _ring_buffer packed for rocalGetBatchMetaData, invalidated at every run() and reset()
     MetaDataBatch* _augmented_meta_data = nullptr;//!< The output of the meta_data_graph,
+    std::vector<pMetaDataBatch> _meta_data_pool;//!< The meta data batches handed to the _ring_buffer, reused once released so that their box arrays keep their capacity
     CropCordBatch* _random_bbox_crop_cords_data = nullptr;
     std::thread _output_thread;
     ImageInfo _output_image_info;//!< Keeps the information about ROCAL's output image , it includes all images of a batch stacked on top of each other
@@ -143,6 +161,8 @@ private:
     std::list<std::shared_ptr<Node>> _meta_data_nodes;//!< List of nodes where meta data has to be updated after augmentation
     std::map<Image*, std::shared_ptr<Node>> _image_map;//!< key: image, value : Parent node
     void * _output_tensor;//!< In the GPU processing case , is used to convert the U8 samples to float32 before they are being transfered back to host
+    void * _exported_tensor = nullptr;//!< Converted outputs handed out by to_exported_tensor(), on the device if the memory type is HIP
+    size_t _exported_tensor_size = 0;
 #if ENABLE_HIP
     DeviceManagerHip   _device;//!< Keeps the device related constructs needed for running on GPU
 #elif ENABLE_OPENCL
@@ -180,12 +200,8 @@ private:
     bool _is_sequence_reader_output = false; //!< Set to true if Sequence Reader is invoked.
     // box encoder variables
     bool _is_box_encoder = false; //bool variable to set the box encoder
-    std::vector<float> _anchors; // Anchors to be used for encoding, as the array of floats is in the ltrb format of size 8732x4
     size_t _num_anchors;       // number of bbox anchors
-    float _criteria = 0.5; // Threshold IoU for matching bounding boxes with anchors. The value needs to be between 0 and 1.
-    float _scale; // Rescales the box and anchor values before the offset is calculated (for example, to return to the absolute values).
-    bool _offset; // Returns normalized offsets ((encoded_bboxes*scale - anchors*scale) - mean) / stds in EncodedBBoxes that use std and the mean and scale arguments if offset="True"
-    std::vector<float> _means, _stds; //_means:  [x y w h] mean values for normalization _stds: [x y w h] standard deviations for offset normalization.
+    std::unique_ptr<BoxEncoderCpu> _box_encoder_cpu; // Encodes the boxes to the ring buffer's host box encoder buffers unless the memory type is HIP
 #if ENABLE_HIP
     BoxEncoderGpu *_box_encoder_gpu = nullptr;
 #endif
@@ -47,12 +47,22 @@ public:
     ///\param sub_buffer_count
     void init(RocalMemType mem_type, void *dev, unsigned sub_buffer_size, unsigned sub_buffer_count);
     void initBoxEncoderMetaData(RocalMemType mem_type, size_t encoded_bbox_size, size_t encoded_labels_size);
+    ///\param labels_size size in bytes of the labels of a batch
+    void initLabelsMetaData(size_t labels_size);
     void release_gpu_res();
     std::vector<void*> get_read_buffers() ;
     void* get_host_master_read_buffer();
     std::vector<void*> get_write_buffers();
     std::pair<void*, void*> get_box_encode_write_buffers();
     std::pair<void*, void*> get_box_encode_read_buffers();
+    //! Copies the labels of the batch being written to the device on the labels stream, does not wait for the copy
+    void stage_labels(const int *labels, size_t count);
+#if ENABLE_HIP
+    //! Device labels staged for the batch being read, nullptr if its labels weren't staged
+    ///\param stream the stream reading the labels, it waits for their copy and their next copy waits for its work enqueued before release_labels_read_buffer()
+    void* get_labels_read_buffer(hipStream_t stream);
+    void release_labels_read_buffer(hipStream_t stream);
+#endif
     MetaDataNamePair& get_meta_data();
     void set_meta_data(ImageNameBatch names, pMetaDataBatch meta_data);
     void reset();
@@ -64,6 +74,7 @@ public:
     RocalMemType mem_type() { return _mem_type; }
     void block_if_empty();
     void block_if_full();
+    void block_until_writer_unblocked();// blocks the writer thread until unblock_writer() is called, used when there is no more data to write till a reset
     void release_if_empty();
 private:
     std::queue<MetaDataNamePair> _meta_ring_buffer;
@@ -82,7 +93,19 @@ private:
     std::vector<std::vector<void*>> _host_sub_buffers;
     std::vector<void *> _dev_bbox_buffer;
     std::vector<void *> _dev_labels_buffer;
+    std::vector<void *> _host_bbox_buffer; //!< Encoded boxes of the CPU box encoder, one per buffer depth like the device buffers
+    std::vector<void *> _host_labels_buffer;
+    size_t _labels_size = 0;
+    std::vector<size_t> _labels_staged; //!< Count of the labels staged in each buffer, 0 if they weren't
+#if ENABLE_HIP
+    std::vector<void *> _pinned_labels_buffer; //!< Pinned staging buffers of the labels copied to _dev_image_labels_buffer
+    std::vector<void *> _dev_image_labels_buffer;
+    std::vector<hipEvent_t> _labels_copied; //!< Recorded on _labels_stream after the copy of the labels of a buffer
+    std::vector<hipEvent_t> _labels_consumed; //!< Recorded on the reader's stream after it used the labels of a buffer
+    hipStream_t _labels_stream = nullptr;
+#endif
     bool _dont_block = false;
+    bool _writer_unblocked = false;
     RocalMemType _mem_type;
     void *_dev;
     size_t _write_ptr;
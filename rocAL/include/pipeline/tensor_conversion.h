@@ -0,0 +1,47 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#pragma once
+#include <cstddef>
+#include "commons.h"
+
+//! Converts a batch of U8 images to a normalized tensor, out = in * multiplier[channel] + offset[channel]
+/*!
+ The conversion runs on AVX-512 or AVX2 if the CPU supports it, picked once at runtime, and splits every image in tiles
+ of rows converted in parallel, so that batches smaller than the thread count still use all the threads.
+ \param in The images, each one interleaved (HWC) or planar (CHW) depending on planar_input
+ \param out The tensor of data_type elements laid out in format
+ \param n Number of images
+ \param planar_input True if the images are planar (CHW), false if they are interleaved (HWC)
+ \param reverse_channels Writes the channels of every pixel in reverse order, RGB images as BGR
+ \param num_threads Number of threads the tiles are converted on
+*/
+void convert_u8_to_tensor(const unsigned char *in, void *out, size_t n, size_t h, size_t w, size_t c, bool planar_input,
+                          RocalTensorFormat format, RocalTensorDataType data_type, const float multiplier[3], const float offset[3],
+                          bool reverse_channels, unsigned num_threads);
+
+//! Returns the size in bytes of one element of a tensor of data_type
+size_t tensor_element_size(RocalTensorDataType data_type);
+
+//! Returns the instruction set convert_u8_to_tensor runs on, "avx512", "avx2" or "scalar"
+const char *tensor_conversion_isa();
@@ -0,0 +1,86 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#pragma once
+#include <list>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+#include <vector>
+#include "image_reader.h"
+
+//! Process wide LRU cache of the compressed bytes read by the readers, bounded by a byte budget shared by all of them
+class ReaderCache
+{
+public:
+    typedef std::shared_ptr<const std::vector<unsigned char>> Item;
+    //! Returns the cache shared by every reader of the process
+    static ReaderCache &instance();
+    //! Sets the byte budget, evicting the least recently used items if it shrinks
+    void set_capacity(size_t capacity);
+    size_t capacity();
+    //! Returns the cached bytes of the item or nullptr if it's not cached
+    Item get(const std::string &key);
+    void put(const std::string &key, const unsigned char *data, size_t size);
+    long long unsigned hits();
+    long long unsigned misses();
+private:
+    ReaderCache() = default;
+    void evict(size_t size);
+    struct Entry
+    {
+        Item data;
+        std::list<std::string>::iterator lru_pos;
+    };
+    std::unordered_map<std::string, Entry> _entries;
+    std::list<std::string> _lru; //!< Most recently used keys first
+    size_t _capacity = 0, _used = 0;
+    long long unsigned _hits = 0, _misses = 0;
+    std::mutex _lock;
+};
+
+//! Serves the items of the wrapped reader from the ReaderCache once they've been read
+/// Items are keyed by the storage path, the item id and its size, so readers of different datasets or shards can share the cache.
+class CachedReader : public Reader
+{
+public:
+    CachedReader(std::shared_ptr<Reader> reader, const std::string &storage_path);
+    //! The wrapped reader is expected to be initialized already
+    Reader::Status initialize(ReaderConfig desc) override { return Reader::Status::OK; }
+    size_t open() override;
+    size_t read_data(unsigned char *buf, size_t read_size) override;
+    void skip_data() override;
+    int close() override;
+    void reset() override { _reader->reset(); }
+    std::string id() override { return _reader->id(); }
+    std::string unique_id() override { return _reader->unique_id(); }
+    int sample_id() override { return _reader->sample_id(); }
+    unsigned count_items() override { return _reader->count_items(); }
+private:
+    std::shared_ptr<Reader> _reader;
+    std::string _key_prefix;
+    std::string _key;
+    size_t _size = 0;
+    ReaderCache::Item _cached = nullptr;
+};
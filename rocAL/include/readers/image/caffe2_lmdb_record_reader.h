@@ -49,6 +49,8 @@ public:
      \return Size of the loaded resource
     */
     size_t read_data(unsigned char* buf, size_t max_size) override;
+    //! Advances past the opened item without reading it
+    void skip_data() override { incremenet_read_ptr(); }
     //! Opens the next file in the folder
     /*!
      \return The size of the next file, 0 if couldn't access it
@@ -59,6 +61,7 @@ public:
 
     //! Returns the id of the latest file opened
     std::string id() override { return _last_id;};
+    int sample_id() override { return _last_sample_id; }
 
     unsigned count_items() override;
 
@@ -82,6 +85,9 @@ private:
     unsigned  _curr_file_idx;
     unsigned _current_file_size;
     std::string _last_id;
+    int _last_sample_id = -1;
+    SampleIds _sample_ids; //!< Ids of _file_names in the meta data reader's index, shuffled along with them
+    std::shared_ptr<MetaDataReader> _meta_data_reader = nullptr;
     std::string _last_file_name;
     unsigned int _last_file_size;
     size_t _shard_id = 0;
@@ -105,16 +111,12 @@ private:
     void incremenet_file_id() { _file_id++; }
     void replicate_last_image_to_fill_last_shard();
     void replicate_last_batch_to_pad_partial_shard();
-    void read_image(unsigned char* buff, std::string file_name);
+    void read_image(unsigned char* buff, const std::string &file_name, size_t max_size);
     void read_image_names();
-    std::map <std::string, uint> _image_record_starting;
-    int _open_env = 1;
-    int rc;
+    std::map<std::string, const unsigned char *> _image_data; //!< Image bytes of each record inside the LMDB memory map
     MDB_env* _read_mdb_env;
     MDB_dbi _read_mdb_dbi;
-    MDB_val _read_mdb_key, _read_mdb_value;
-    MDB_txn* _read_mdb_txn;
-    MDB_cursor* _read_mdb_cursor;
+    MDB_txn* _read_mdb_txn; //!< Read transaction kept open for the lifetime of the reader so that _image_data stays mapped
     void open_env_for_read_image();
 };
 
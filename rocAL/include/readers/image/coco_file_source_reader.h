@@ -27,6 +27,7 @@ THE SOFTWARE.
 #include <fstream>
 #include <dirent.h>
 #include "image_reader.h"
+#include "dataset_listing.h"
 #include "meta_data_reader.h"
 #include "meta_data_graph.h"
 #include "timing_debug.h"
@@ -57,6 +58,8 @@ public:
 
     //! Returns the name of the latest file opened
     std::string id() override { return _last_id;};
+    std::string unique_id() override { return _last_file_path; }
+    int sample_id() override { return _last_sample_id; }
 
     unsigned count_items() override;
 
@@ -73,9 +76,8 @@ private:
     Reader::Status subfolder_reading();
     std::string _folder_path;
     std::string _json_path;
-    DIR *_src_dir;
-    DIR *_sub_dir;
-    struct dirent *_entity;
+    std::string _index_path; //!< Folder of the dataset listing manifest, the folders are walked on every run if empty
+    DatasetListing _listing;
     std::vector<std::string> _file_names;
     std::vector<std::string> _files;
     unsigned  _curr_file_idx;
@@ -83,6 +85,9 @@ private:
     std::ifstream _current_ifs;
     unsigned _current_file_size;
     std::string _last_id;
+    std::string _last_file_path;
+    int _last_sample_id = -1;
+    SampleIds _sample_ids; //!< Ids of _file_names in the meta data reader's index, shuffled along with them
     std::string _last_file_name;
     size_t _shard_id = 0;
     size_t _shard_count = 1;// equivalent of batch size
@@ -0,0 +1,60 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#pragma once
+#include <map>
+#include <string>
+#include <utility>
+#include <vector>
+
+//! Listing of a folder based dataset: the entries of its root folder and the regular files of the root and of each sub folder
+/// Walking an ImageNet sized tree takes minutes, so the listing can be kept in a manifest file and loaded from it instead.
+/// The manifest is checked against the modification time of every listed folder, adding, removing or renaming a file changes
+/// the modification time of its folder and makes the listing walk the tree again and rewrite the manifest.
+class DatasetListing
+{
+public:
+    //! Lists root, loading the listing from the manifest in manifest_dir if it's still valid and writing it there otherwise
+    /*!
+     \param root Root folder of the dataset
+     \param manifest_dir Folder of the manifest files, the listing doesn't use a manifest if empty
+    */
+    void load(const std::string &root, const std::string &manifest_dir = "");
+    //! Returns the names of the entries of the root folder sorted by name, paired with true for directories
+    const std::vector<std::pair<std::string, bool>> &root_entries() const { return _root_entries; }
+    //! Returns the names of the regular files of the root folder or of one of its sub folders in directory order
+    const std::vector<std::string> &files(const std::string &folder_path) const;
+private:
+    struct Folder
+    {
+        long long mtime_sec = 0, mtime_nsec = 0;
+        std::vector<std::string> file_names;
+    };
+    void walk();
+    bool load_manifest(const std::string &manifest_file);
+    void save_manifest(const std::string &manifest_file);
+    std::string _root;
+    long long _root_mtime_sec = 0, _root_mtime_nsec = 0;
+    std::vector<std::pair<std::string, bool>> _root_entries;
+    std::map<std::string, Folder> _folders; //!< Keyed by the path relative to the root, "." for the root itself
+};
@@ -26,6 +26,7 @@ THE SOFTWARE.
 #include <memory>
 #include <dirent.h>
 #include "image_reader.h"
+#include "dataset_listing.h"
 #include "commons.h"
 #include "timing_debug.h"
 
@@ -54,6 +55,7 @@ public:
 
     //! Returns the name of the latest file opened
     std::string id() override { return _last_id;};
+    std::string unique_id() override { return _last_file_path; }
 
     unsigned count_items() override;
 
@@ -68,14 +70,14 @@ private:
     Reader::Status open_folder();
     Reader::Status subfolder_reading();
     std::string _folder_path;
-    DIR *_src_dir;
-    DIR *_sub_dir;
-    struct dirent *_entity;
+    std::string _index_path; //!< Folder of the dataset listing manifest, the folders are walked on every run if empty
+    DatasetListing _listing;
     std::vector<std::string> _file_names;
     unsigned  _curr_file_idx;
     FILE* _current_fPtr;
     unsigned _current_file_size;
     std::string _last_id;
+    std::string _last_file_path;
     std::string _last_file_name;
     size_t _shard_id = 0;
     size_t _shard_count = 1;// equivalent of batch size
@@ -58,6 +58,7 @@ struct ReaderConfig
     void set_shard_count(size_t shard_count) { _shard_count = shard_count; }
     void set_cpu_num_threads(size_t cpu_num_threads) { _cpu_num_threads = cpu_num_threads; }
     void set_json_path(const std::string &json_path) { _json_path = json_path; }
+    void set_index_path(const std::string &index_path) { _index_path = index_path; }
     /// \param read_batch_count Tells the reader it needs to read the images in multiples of load_batch_count. If available images not divisible to load_batch_count,
     /// the reader will repeat images to make available images an even multiple of this load_batch_count
     void set_batch_count(size_t read_batch_count) { _batch_count = read_batch_count; }
@@ -70,6 +71,8 @@ struct ReaderConfig
     void set_sequence_length(unsigned sequence_length) { _sequence_length = sequence_length; }
     void set_frame_step(unsigned step) { _step = step; }
     void set_frame_stride(unsigned stride) { _stride = stride; }
+    /// \param read_ahead_depth Number of batches the loader reads ahead of the decoder on a background I/O thread, 0 disables read-ahead
+    void set_read_ahead_depth(size_t read_ahead_depth) { _read_ahead_depth = read_ahead_depth; }
     size_t get_shard_count() { return _shard_count; }
     size_t get_shard_id() { return _shard_id; }
     size_t get_cpu_num_threads() { return _cpu_num_threads; }
@@ -77,8 +80,10 @@ struct ReaderConfig
     size_t get_sequence_length() { return _sequence_length; }
     size_t get_frame_step() { return _step; }
     size_t get_frame_stride() { return _stride; }
+    size_t get_read_ahead_depth() { return _read_ahead_depth; }
     std::string path() { return _path; }
     std::string json_path() { return _json_path; }
+    std::string index_path() { return _index_path; }
     std::map<std::string, std::string> feature_key_map() { return _feature_key_map; }
     void set_file_prefix(const std::string &prefix) { _file_prefix = prefix; }
     std::string file_prefix() { return _file_prefix; }
@@ -87,6 +92,7 @@ private:
     StorageType _type = StorageType::FILE_SYSTEM;
     std::string _path = "";
     std::string _json_path = "";
+    std::string _index_path = ""; //!< Folder of the TFRecord offset indices and of the dataset listing manifests of the file and COCO readers
     std::map<std::string, std::string> _feature_key_map;
     size_t _shard_count = 1;
     size_t _shard_id = 0;
@@ -95,6 +101,7 @@ private:
     size_t _sequence_length = 1; // Video reader module sequence length
     size_t _step;
     size_t _stride = 1;
+    size_t _read_ahead_depth = 1;
     bool _shuffle = false;
     bool _loop = false;
     std::string _file_prefix = ""; //!< to read only files with prefix. supported only for cifar10_data_reader and tf_record_reader
@@ -142,6 +149,12 @@ public:
     //! Copies the data of the opened item to the buf
     virtual size_t read_data(unsigned char *buf, size_t read_size) = 0;
 
+    //! Moves past the opened item without copying its data, used when the item's data is served from a cache
+    /*!
+     Readers that advance to the next item in read_data() instead of open() must advance here
+    */
+    virtual void skip_data() {}
+
     //! Closes the opened item
     virtual int close() = 0;
 
@@ -150,6 +163,10 @@ public:
 
     //! Returns the name/identifier of the last item opened in this resource
     virtual std::string id() = 0;
+    //! Returns an identifier of the last item opened that is unique among the items of this resource (e.g. the full path of a file)
+    virtual std::string unique_id() { return id(); }
+    //! Returns the id of the last item opened in the SampleIndex of the meta data reader, -1 if it's unknown
+    virtual int sample_id() { return -1; }
     //! Returns the number of items remained in this resource
     virtual unsigned count_items() = 0;
     
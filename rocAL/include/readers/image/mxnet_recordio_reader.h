@@ -45,6 +45,8 @@ public:
      \return Size of the loaded resource
     */
     size_t read_data(unsigned char* buf, size_t max_size) override;
+    //! Advances past the opened item without reading it
+    void skip_data() override { incremenet_read_ptr(); }
     //! Opens the next file in the folder
     /*!
      \return The size of the next file, 0 if couldn't access it
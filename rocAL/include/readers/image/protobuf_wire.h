@@ -0,0 +1,127 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#pragma once
+#include <cstddef>
+#include <cstdint>
+
+//! Reads a base 128 varint of the protobuf wire format, returns false if it runs past end
+inline bool protobuf_read_varint(const uint8_t *&ptr, const uint8_t *end, uint64_t &value)
+{
+    value = 0;
+    for (unsigned shift = 0; ptr < end && shift < 64; shift += 7) {
+        uint8_t byte = *ptr++;
+        value |= static_cast<uint64_t>(byte & 0x7F) << shift;
+        if (!(byte & 0x80))
+            return true;
+    }
+    return false;
+}
+
+//! Advances ptr to the next length delimited (bytes, string or message) field in [ptr, end), skipping the fields of the other wire types
+/*!
+ \param ptr Position in the serialized message, left after the returned field. Set to nullptr if the message is malformed
+ \param end End of the serialized message
+ \param field_number Set to the number of the field in the .proto definition
+ \param field Set to the start of the field's bytes
+ \param field_size Set to the size of the field's bytes
+ \return False at the end of the message or if it's malformed
+*/
+inline bool protobuf_next_length_delimited(const uint8_t *&ptr, const uint8_t *end, uint32_t &field_number,
+                                           const uint8_t *&field, size_t &field_size)
+{
+    while (ptr < end) {
+        uint64_t tag, value;
+        if (!protobuf_read_varint(ptr, end, tag)) {
+            ptr = nullptr;
+            return false;
+        }
+        switch (tag & 0x7) {
+            case 0: // varint
+                if (!protobuf_read_varint(ptr, end, value)) {
+                    ptr = nullptr;
+                    return false;
+                }
+                break;
+            case 1: // 64 bit
+                if (end - ptr < 8) {
+                    ptr = nullptr;
+                    return false;
+                }
+                ptr += 8;
+                break;
+            case 2: // length delimited
+                if (!protobuf_read_varint(ptr, end, value) || value > static_cast<uint64_t>(end - ptr)) {
+                    ptr = nullptr;
+                    return false;
+                }
+                field_number = tag >> 3;
+                field = ptr;
+                field_size = value;
+                ptr += value;
+                return true;
+            case 5: // 32 bit
+                if (end - ptr < 4) {
+                    ptr = nullptr;
+                    return false;
+                }
+                ptr += 4;
+                break;
+            default: // groups are deprecated and not used by the caffe, caffe2 and tensorflow protos
+                ptr = nullptr;
+                return false;
+        }
+    }
+    return false;
+}
+
+//! Finds a length delimited (bytes, string or message) field of a serialized message without parsing the message
+/*!
+ \param data The serialized message
+ \param size Size of the serialized message
+ \param field_number Number of the field in the .proto definition
+ \param first Returns the first occurrence of the field (element 0 of a repeated field) instead of the last one,
+ the one a parser keeps for a singular field
+ \param field Set to the start of the field's bytes inside data
+ \param field_size Set to the size of the field's bytes
+ \return False if the field is missing or the message is malformed
+*/
+inline bool protobuf_find_length_delimited(const uint8_t *data, size_t size, uint32_t field_number, bool first,
+                                           const uint8_t *&field, size_t &field_size)
+{
+    const uint8_t *ptr = data, *end = data + size;
+    const uint8_t *next_field;
+    size_t next_field_size;
+    uint32_t next_field_number;
+    bool found = false;
+    while (protobuf_next_length_delimited(ptr, end, next_field_number, next_field, next_field_size)) {
+        if (next_field_number != field_number)
+            continue;
+        field = next_field;
+        field_size = next_field_size;
+        found = true;
+        if (first)
+            return true;
+    }
+    return found && ptr;
+}
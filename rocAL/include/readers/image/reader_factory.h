@@ -25,4 +25,8 @@ THE SOFTWARE.
 #include <exception>
 #include "image_reader.h"
 
+//! Creates the reader of the storage type, wrapped in a CachedReader if the process wide reader cache has a budget
 std::shared_ptr<Reader> create_reader(ReaderConfig config);
+
+//! Sets the byte budget of the compressed data cache shared by the readers of the process, 0 disables it for readers created afterwards
+void set_reader_cache_size(size_t cache_size);
@@ -28,11 +28,8 @@ THE SOFTWARE.
 #include <map>
 #include <iterator>
 #include <algorithm>
-#include <google/protobuf/message_lite.h>
 #include "image_reader.h"
 #include "timing_debug.h"
-#include "example.pb.h"
-#include "feature.pb.h"
 
 
 class TFRecordReader : public Reader
@@ -49,6 +46,8 @@ public:
      \return Size of the loaded resource
     */
     size_t read_data(unsigned char* buf, size_t max_size) override;
+    //! Advances past the opened item without reading it
+    void skip_data() override { incremenet_read_ptr(); }
     //! Opens the next file in the folder
     /*!
      \return The size of the next file, 0 if couldn't access it
@@ -59,6 +58,8 @@ public:
 
     //! Returns the id of the latest file opened
     std::string id() override { return _last_id;};
+    std::string unique_id() override { return _last_file_path; }
+    int sample_id() override { return _last_sample_id; }
 
     unsigned count_items() override;
 
@@ -68,6 +69,13 @@ public:
 
     TFRecordReader();
 private:
+    //! Location of a single sample's encoded bytes inside a record file, as stored in the record file's index
+    struct RecordIndexEntry
+    {
+        size_t encoded_offset;
+        size_t encoded_size;
+        std::string file_name;
+    };
     //! opens the folder containnig the images
     Reader::Status tf_record_reader();
     Reader::Status folder_reading();
@@ -76,6 +84,7 @@ private:
     std::map<std::string, std::string> _feature_key_map;
     std::string _encoded_key;
     std::string _filename_key;
+    std::string _index_path; //!< Folder the record indices are persisted in, the rocAL cache folder if empty
     DIR *_src_dir;
     DIR *_sub_dir;
     struct dirent *_entity;
@@ -84,11 +93,14 @@ private:
     unsigned  _curr_file_idx;
     unsigned _current_file_size;
     std::string _last_id;
+    std::string _last_file_path;
+    int _last_sample_id = -1;
+    SampleIds _sample_ids; //!< Ids of _file_names in the meta data reader's index, shuffled along with them
+    std::shared_ptr<MetaDataReader> _meta_data_reader = nullptr;
     std::string _last_file_name;
     unsigned int _last_file_size;
     size_t _shard_id = 0;
     size_t _shard_count = 1;// equivalent of batch size
-    bool _last_rec;
     //!< _batch_count Defines the quantum count of the images to be read. It's usually equal to the user's batch size.
     /// The loader will repeat images if necessary to be able to have images available in multiples of the load_batch_count,
     /// for instance if there are 10 images in the dataset and _batch_count is 3, the loader repeats 2 images as if there are 12 images available.
@@ -101,17 +113,24 @@ private:
     size_t  _file_count_all_shards;
     //!< _record_name_prefix tells the reader to read only files with the prefix
     std::string _record_name_prefix;
-    // protobuf message objects
-    tensorflow::Example _single_example;
-    tensorflow::Features _features;
-    tensorflow::Feature _single_feature;
+    //!< Memory mapped record files, the encoded samples are copied straight out of these
+    std::vector<std::pair<unsigned char *, size_t>> _mapped_records;
+    //!< Start of the encoded bytes of each sample in the mapped record files
+    std::map<std::string, const unsigned char *> _encoded_data;
     void incremenet_read_ptr();
     int release();
     size_t get_file_shard_id();
     void incremenet_file_id() { _file_id++; }
     void replicate_last_image_to_fill_last_shard();
     void replicate_last_batch_to_pad_partial_shard();
-    Reader::Status read_image(unsigned char* buff, std::string record_file_name, uint file_size);
-    Reader::Status read_image_names(std::ifstream &file_contents, uint file_size);
-    std::map <std::string, uint> _image_record_starting;
+    void unmap_records();
+    std::string record_index_file(const std::string &record_file);
+    bool load_record_index(const std::string &index_file, const std::string &record_file, std::vector<RecordIndexEntry> &entries);
+    void save_record_index(const std::string &index_file, const std::string &record_file, const std::vector<RecordIndexEntry> &entries);
+    void build_record_index(const unsigned char *records, size_t records_size, std::vector<RecordIndexEntry> &entries);
+    Reader::Status read_image_names(const unsigned char *records, const std::vector<RecordIndexEntry> &entries);
 };
+
+//! True for the record indices and the temporary files of the ones being written, which an index_path set to the
+//! records folder puts next to the records. The readers listing the records skip them.
+bool is_tf_record_index_file(const std::string &file_name);
@@ -0,0 +1,52 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#pragma once
+#include <string>
+#include <vector>
+#ifdef ROCAL_VIDEO
+extern "C"
+{
+#include <libavformat/avformat.h>
+}
+
+//! Frame numbers of the keyframes of a video
+/*!
+ The index is built by demuxing the video stream without decoding it, the video manifest keeps it with the other
+ properties of the video so it's built once per video. The frame numbers are computed from the packet timestamps and
+ the average frame rate like the frame numbers the decoders seek to, so the index tells which sequences of a video share
+ a group of pictures and can be decoded in the same forward pass.
+*/
+class VideoKeyframeIndex
+{
+public:
+    //! Builds the index from the packets of the video stream, reading the rest of fmt_ctx's packets
+    void build(AVFormatContext *fmt_ctx, int video_stream_idx);
+    const std::vector<unsigned> &keyframes() const { return _keyframes; }
+    std::vector<unsigned> release() { return std::move(_keyframes); }
+private:
+    std::vector<unsigned> _keyframes;
+};
+
+//! The last keyframe at or before frame_number in the sorted keyframes, 0 when there are none
+unsigned keyframe_at_or_before(const std::vector<unsigned> &keyframes, unsigned frame_number);
+#endif
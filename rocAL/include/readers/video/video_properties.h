@@ -48,15 +48,27 @@ typedef struct VideoProperties
     std::vector<std::tuple<unsigned, unsigned>> start_end_frame_num;
     std::vector<std::tuple<float, float>> start_end_timestamps;
     std::vector<int> labels;
+    std::vector<std::vector<unsigned>> keyframes; // Keyframe frame numbers of every video, empty if they are unknown
 } VideoProperties;
 
 typedef struct Properties
 {
     unsigned width, height, frames_count, avg_frame_rate_num, avg_frame_rate_den;
+    int time_base_num = 0, time_base_den = 1;
+    std::vector<unsigned> keyframes;
 } Properties;
 
 void substring_extraction(std::string const &str, const char delim, std::vector<std::string> &out);
+//! Opens the video to read its properties and keyframes, returns false if it's not a readable video
+bool probe_video_context(const char *video_file_path, Properties &props);
+//! Same as probe_video_context but exits if the video can't be opened
 void open_video_context(const char *video_file_path, Properties &props);
+//! Loads the properties of the videos of source_path from its manifest and probes the missing or changed ones in parallel
+/// The source is a video, a folder of videos or of folders of videos, or a text file listing videos. The properties are kept
+/// for the process and saved in <source_path>.rocal_video_manifest, which is checked against the size and modification time of every video.
+void probe_source_videos(const char *source_path);
+//! Returns the properties of the video kept by probe_source_videos, opening the video if it was not probed or changed since
+void get_video_properties(const char *video_file_path, Properties &props);
 void get_video_properties_from_txt_file(VideoProperties &video_props, const char *file_path, bool file_list_frame_num);
 void find_video_properties(VideoProperties &video_props, const char *source_path, bool file_list_frame_num);
 #endif
@@ -236,26 +236,20 @@ void BoxEncoderGpu::Run(pMetaDataBatch full_batch_meta_data, float *encoded_boxe
         THROW("BoxEncoderGpu::Run Invalid input metadata");
     const auto buffers = ResetBuffers();    // reset temp buffers
 //    auto dims = CalculateDims(boxes_input);     // todo:: if we store output in tensorlist
-    int total_num_boxes = 0;
-    for (int i = 0; i < _cur_batch_size; i++) {
-        auto sample = &_samples_host_buf[i];
-        sample->in_box_count = full_batch_meta_data->get_bb_labels_batch()[i].size();
-        total_num_boxes += sample->in_box_count;
-    }
+    auto &bb = full_batch_meta_data->get_bb_batch();
+    int total_num_boxes = bb.total();
     if (total_num_boxes > MAX_NUM_BOXES_TOTAL)
         THROW("BoxEncoderGpu::Run total_num_boxes exceeds max");
-    float *boxes_in_temp = _boxes_in_dev; int *labels_in_temp = _labels_in_dev;
+    // the boxes and labels of the batch are contiguous on the host, so each goes to the device in one copy
+    HIP_ERROR_CHECK_STATUS( hipMemcpyHtoDAsync((void *)_boxes_in_dev, bb.cords.data(), total_num_boxes*sizeof(float)*4, _stream));
+    HIP_ERROR_CHECK_STATUS( hipMemcpyHtoDAsync((void *)_labels_in_dev, bb.labels.data(), total_num_boxes*sizeof(int), _stream));
     for (int sample_idx = 0; sample_idx < _cur_batch_size; sample_idx++) {
         auto sample = &_samples_host_buf[sample_idx];
-        //sample->in_box_count = full_batch_meta_data->get_bb_labels_batch()[sample_idx].size();
-        HIP_ERROR_CHECK_STATUS( hipMemcpyHtoDAsync((void *)boxes_in_temp, full_batch_meta_data->get_bb_cords_batch()[sample_idx].data(), sample->in_box_count*sizeof(float)*4, _stream));
-        HIP_ERROR_CHECK_STATUS( hipMemcpyHtoDAsync((void *)labels_in_temp, full_batch_meta_data->get_bb_labels_batch()[sample_idx].data(), sample->in_box_count*sizeof(int), _stream));
-        sample->boxes_in = reinterpret_cast<const float4 *>(boxes_in_temp);
-        sample->labels_in = reinterpret_cast<const int *>(labels_in_temp);
+        sample->in_box_count = bb.count(sample_idx);
+        sample->boxes_in = reinterpret_cast<const float4 *>(_boxes_in_dev + bb.offsets[sample_idx]*4);
+        sample->labels_in = reinterpret_cast<const int *>(_labels_in_dev + bb.offsets[sample_idx]);
         sample->boxes_out = reinterpret_cast<float4 *>(encoded_boxes_data + sample_idx*_anchor_count*4);
         sample->labels_out = reinterpret_cast<int *>(encoded_labels_data + sample_idx*_anchor_count);
-        boxes_in_temp += sample->in_box_count*4;
-        labels_in_temp += sample->in_box_count;
         _output_shape.push_back(std::vector<size_t>(1,_anchor_count));
     }
     const auto means_data = reinterpret_cast<const float *>(_means.data());
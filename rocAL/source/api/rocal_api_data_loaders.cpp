@@ -39,12 +39,15 @@ THE SOFTWARE.
 #include "node_fused_jpeg_crop_single_shard.h"
 #include "node_resize.h"
 #include "meta_node_resize.h"
+#include "reader_factory.h"
+#include "video_frame_cache.h"
 
 namespace filesys = boost::filesystem;
 
 std::tuple<unsigned, unsigned>
 evaluate_image_data_set(RocalImageSizeEvaluationPolicy decode_size_policy, StorageType storage_type,
-                        DecoderType decoder_type, const std::string &source_path, const std::string &json_path)
+                        DecoderType decoder_type, const std::string &source_path, const std::string &json_path,
+                        const std::string &index_path = "")
 {
     auto translate_image_size_policy = [](RocalImageSizeEvaluationPolicy decode_size_policy)
     {
@@ -62,7 +65,9 @@ evaluate_image_data_set(RocalImageSizeEvaluationPolicy decode_size_policy, Stora
 
     ImageSourceEvaluator source_evaluator;
     source_evaluator.set_size_evaluation_policy(translate_image_size_policy(decode_size_policy));
-    if(source_evaluator.create(ReaderConfig(storage_type, source_path, json_path), DecoderConfig(decoder_type)) != ImageSourceEvaluatorStatus::OK)
+    auto reader_cfg = ReaderConfig(storage_type, source_path, json_path);
+    reader_cfg.set_index_path(index_path);
+    if(source_evaluator.create(reader_cfg, DecoderConfig(decoder_type)) != ImageSourceEvaluatorStatus::OK)
         THROW("Initializing file source input evaluator failed ")
     auto max_width = source_evaluator.max_width();
     auto max_height = source_evaluator.max_height();
@@ -107,6 +112,27 @@ auto convert_decoder_mode= [](RocalDecodeDevice decode_mode)
     }
 };
 
+auto convert_image_cache_config = [](unsigned cache_size, RocalImageCacheType cache_type, unsigned cache_threshold,
+                                     bool cache_batch_copy, const char* cache_spill_path)
+{
+    ImageCacheConfig cache_config;
+    cache_config.size = static_cast<size_t>(cache_size) * 1024 * 1024;
+    switch(cache_type){
+        case ROCAL_IMAGE_CACHE_LRU:
+            cache_config.policy = ImageCachePolicy::LRU;
+            break;
+        case ROCAL_IMAGE_CACHE_FIRST_N:
+            cache_config.policy = ImageCachePolicy::FIRST_N;
+            break;
+        default:
+            THROW("Unsupported image cache type" + TOSTR(cache_type))
+    }
+    cache_config.threshold = cache_threshold;
+    cache_config.batch_copy = cache_batch_copy;
+    cache_config.spill_path = cache_spill_path ? cache_spill_path : "";
+    return cache_config;
+};
+
 RocalImage  ROCAL_API_CALL
 rocalJpegFileSourceSingleShard(
         RocalContext p_context,
@@ -120,7 +146,13 @@ rocalJpegFileSourceSingleShard(
         RocalImageSizeEvaluationPolicy decode_size_policy,
         unsigned max_width,
         unsigned max_height,
-        RocalDecoderType dec_type)
+        RocalDecoderType dec_type,
+        unsigned cache_size,
+        RocalImageCacheType cache_type,
+        unsigned cache_threshold,
+        bool cache_batch_copy,
+        const char* cache_spill_path,
+        const char* index_path)
 {
     Image* output = nullptr;
     auto context = static_cast<Context*>(p_context);
@@ -131,6 +163,7 @@ rocalJpegFileSourceSingleShard(
         DecoderType decType = DecoderType::TURBO_JPEG; // default
         if (dec_type == ROCAL_DECODER_OPENCV) decType = DecoderType::OPENCV_DEC;
         if (dec_type == ROCAL_DECODER_HW_JPEG) decType = DecoderType::HW_JPEG_DEC;
+        auto cache_config = convert_image_cache_config(cache_size, cache_type, cache_threshold, cache_batch_copy, cache_spill_path);
 
         if(shard_count < 1 )
             THROW("Shard count should be bigger than 0")
@@ -149,7 +182,7 @@ rocalJpegFileSourceSingleShard(
 
         auto [width, height] = use_input_dimension? std::make_tuple(max_width, max_height):
                                evaluate_image_data_set(decode_size_policy, StorageType::FILE_SYSTEM, DecoderType::TURBO_JPEG,
-                                                       source_path, "");
+                                                       source_path, "", index_path);
         auto [color_format, num_of_planes] = convert_color_format(rocal_color_format);
 
 
@@ -173,8 +206,10 @@ rocalJpegFileSourceSingleShard(
                                                                                         context->user_batch_size(),
                                                                                         context->master_graph->mem_type(),
                                                                                         context->master_graph->meta_data_reader(),
-                                                                                        decoder_keep_original
-                                                                                        );
+                                                                                        decoder_keep_original,
+                                                                                        std::map<std::string, std::string>(),
+                                                                                        0, 0, 0, index_path,
+                                                                                        cache_config);
         context->master_graph->set_loop(loop);
 
         if(is_output)
@@ -204,7 +239,13 @@ rocalJpegFileSource(
         RocalImageSizeEvaluationPolicy decode_size_policy,
         unsigned max_width,
         unsigned max_height,
-        RocalDecoderType dec_type)
+        RocalDecoderType dec_type,
+        unsigned cache_size,
+        RocalImageCacheType cache_type,
+        unsigned cache_threshold,
+        bool cache_batch_copy,
+        const char* cache_spill_path,
+        const char* index_path)
 {
     Image* output = nullptr;
     auto context = static_cast<Context*>(p_context);
@@ -215,6 +256,7 @@ rocalJpegFileSource(
         DecoderType decType = DecoderType::TURBO_JPEG; // default
         if (dec_type == ROCAL_DECODER_OPENCV) decType = DecoderType::OPENCV_DEC;
         if (dec_type == ROCAL_DECODER_HW_JPEG) decType = DecoderType::HW_JPEG_DEC;
+        auto cache_config = convert_image_cache_config(cache_size, cache_type, cache_threshold, cache_batch_copy, cache_spill_path);
 
         if(internal_shard_count < 1 )
             THROW("Shard count should be bigger than 0")
@@ -229,7 +271,7 @@ rocalJpegFileSource(
         }
 
         auto [width, height] = use_input_dimension? std::make_tuple(max_width, max_height):
-                               evaluate_image_data_set(decode_size_policy, StorageType::FILE_SYSTEM, DecoderType::TURBO_JPEG, source_path, "");
+                               evaluate_image_data_set(decode_size_policy, StorageType::FILE_SYSTEM, DecoderType::TURBO_JPEG, source_path, "", index_path);
 
         auto [color_format, num_of_planes] = convert_color_format(rocal_color_format);
 
@@ -255,7 +297,9 @@ rocalJpegFileSource(
                                                                           context->user_batch_size(),
                                                                           context->master_graph->mem_type(),
                                                                           context->master_graph->meta_data_reader(),
-                                                                          decoder_keep_original);
+                                                                          decoder_keep_original,
+                                                                          "", 0, 0, 0, index_path,
+                                                                          cache_config);
         context->master_graph->set_loop(loop);
 
         if(is_output)
@@ -1201,7 +1245,13 @@ rocalJpegCOCOFileSource(
                       RocalImageSizeEvaluationPolicy decode_size_policy,
                       unsigned max_width,
                       unsigned max_height,
-                      RocalDecoderType dec_type)
+                      RocalDecoderType dec_type,
+                      unsigned cache_size,
+                      RocalImageCacheType cache_type,
+                      unsigned cache_threshold,
+                      bool cache_batch_copy,
+                      const char* cache_spill_path,
+                      const char* index_path)
 {
     Image* output = nullptr;
     auto context = static_cast<Context*>(p_context);
@@ -1212,6 +1262,7 @@ rocalJpegCOCOFileSource(
         DecoderType decType = DecoderType::TURBO_JPEG; // default
         if (dec_type == ROCAL_DECODER_OPENCV) decType = DecoderType::OPENCV_DEC;
         if (dec_type == ROCAL_DECODER_HW_JPEG) decType = DecoderType::HW_JPEG_DEC;
+        auto cache_config = convert_image_cache_config(cache_size, cache_type, cache_threshold, cache_batch_copy, cache_spill_path);
 
         if(internal_shard_count < 1 )
             THROW("Shard count should be bigger than 0")
@@ -1226,7 +1277,7 @@ rocalJpegCOCOFileSource(
         }
 
         auto [width, height] = use_input_dimension? std::make_tuple(max_width, max_height):
-                               evaluate_image_data_set(decode_size_policy, StorageType::COCO_FILE_SYSTEM, DecoderType::TURBO_JPEG, source_path, json_path);
+                               evaluate_image_data_set(decode_size_policy, StorageType::COCO_FILE_SYSTEM, DecoderType::TURBO_JPEG, source_path, json_path, index_path);
 
         auto [color_format, num_of_planes] = convert_color_format(rocal_color_format);
         INFO("Internal buffer size width = "+ TOSTR(width)+ " height = "+ TOSTR(height) + " depth = "+ TOSTR(num_of_planes))
@@ -1249,7 +1300,9 @@ rocalJpegCOCOFileSource(
                                                                             context->user_batch_size(),
                                                                             context->master_graph->mem_type(),
                                                                             context->master_graph->meta_data_reader(),
-                                                                            decoder_keep_original);
+                                                                            decoder_keep_original,
+                                                                            "", 0, 0, 0, index_path,
+                                                                            cache_config);
 
         context->master_graph->set_loop(loop);
 
@@ -1282,7 +1335,13 @@ rocalJpegCOCOFileSourceSingleShard(
         RocalImageSizeEvaluationPolicy decode_size_policy,
         unsigned max_width,
         unsigned max_height,
-        RocalDecoderType dec_type)
+        RocalDecoderType dec_type,
+        unsigned cache_size,
+        RocalImageCacheType cache_type,
+        unsigned cache_threshold,
+        bool cache_batch_copy,
+        const char* cache_spill_path,
+        const char* index_path)
 {
     Image* output = nullptr;
     auto context = static_cast<Context*>(p_context);
@@ -1293,6 +1352,7 @@ rocalJpegCOCOFileSourceSingleShard(
         DecoderType decType = DecoderType::TURBO_JPEG; // default
         if (dec_type == ROCAL_DECODER_OPENCV) decType = DecoderType::OPENCV_DEC;
         if (dec_type == ROCAL_DECODER_HW_JPEG) decType = DecoderType::HW_JPEG_DEC;
+        auto cache_config = convert_image_cache_config(cache_size, cache_type, cache_threshold, cache_batch_copy, cache_spill_path);
 
         if(shard_count < 1 )
             THROW("Shard count should be bigger than 0")
@@ -1311,7 +1371,7 @@ rocalJpegCOCOFileSourceSingleShard(
 
         auto [width, height] = use_input_dimension? std::make_tuple(max_width, max_height):
                                evaluate_image_data_set(decode_size_policy, StorageType::COCO_FILE_SYSTEM, DecoderType::TURBO_JPEG,
-                                                       source_path, json_path);
+                                                       source_path, json_path, index_path);
         auto [color_format, num_of_planes] = convert_color_format(rocal_color_format);
         INFO("Internal buffer size width = "+ TOSTR(width)+ " height = "+ TOSTR(height) + " depth = "+ TOSTR(num_of_planes))
 
@@ -1332,7 +1392,10 @@ rocalJpegCOCOFileSourceSingleShard(
                                                                                         context->user_batch_size(),
                                                                                         context->master_graph->mem_type(),
                                                                                         context->master_graph->meta_data_reader(),
-                                                                                        decoder_keep_original);
+                                                                                        decoder_keep_original,
+                                                                                        std::map<std::string, std::string>(),
+                                                                                        0, 0, 0, index_path,
+                                                                                        cache_config);
         context->master_graph->set_loop(loop);
 
         if(is_output)
@@ -1599,7 +1662,8 @@ rocalJpegTFRecordSource(
         RocalImageSizeEvaluationPolicy decode_size_policy,
         unsigned max_width,
         unsigned max_height,
-        RocalDecoderType dec_type) 
+        RocalDecoderType dec_type,
+        const char* index_path)
 {
     Image* output = nullptr;
     auto context = static_cast<Context*>(p_context);
@@ -1653,7 +1717,8 @@ rocalJpegTFRecordSource(
                                                                              loop,
                                                                              context->user_batch_size(),
                                                                              context->master_graph->mem_type(),
-                                                                             context->master_graph->meta_data_reader());
+                                                                             context->master_graph->meta_data_reader(),
+                                                                             false, "", 0, 0, 0, index_path);
         context->master_graph->set_loop(loop);
 
         if(is_output)
@@ -1762,7 +1827,8 @@ rocalRawTFRecordSource(
         bool loop,
         unsigned out_width,
         unsigned out_height,
-        const char* record_name_prefix)
+        const char* record_name_prefix,
+        const char* index_path)
 {
     Image* output = nullptr;
     if (p_context == nullptr) {
@@ -1807,7 +1873,7 @@ rocalRawTFRecordSource(
                                                                              context->user_batch_size(),
                                                                              context->master_graph->mem_type(),
                                                                              context->master_graph->meta_data_reader(),
-                                                                             false, record_name_prefix);
+                                                                             false, record_name_prefix, 0, 0, 0, index_path);
         context->master_graph->set_loop(loop);
 
         if(is_output)
@@ -1985,7 +2051,8 @@ rocalVideoFileSource(
         bool loop,
         unsigned step,
         unsigned stride,
-        bool file_list_frame_num)
+        bool file_list_frame_num,
+        unsigned decode_threads)
 {
     Image* output = nullptr;
     if (p_context == nullptr) {
@@ -2020,6 +2087,8 @@ rocalVideoFileSource(
                               context->master_graph->mem_type(),
                               color_format );
 
+        // The internal shards run in this process and split the threads the decoders take from the pipeline
+        size_t decode_thread_budget = decode_threads ? 1 : context->master_graph->reserve_cpu_threads(1);
         output = context->master_graph->create_loader_output_image(info);
 
         context->master_graph->add_node<VideoLoaderNode>({}, {output})->init(internal_shard_count,
@@ -2034,7 +2103,9 @@ rocalVideoFileSource(
                                                                             shuffle,
                                                                             loop,
                                                                             context->user_batch_size(),
-                                                                            context->master_graph->mem_type());
+                                                                            context->master_graph->mem_type(),
+                                                                            decode_threads,
+                                                                            decode_thread_budget);
         context->master_graph->set_loop(loop);
 
         if(is_output)
@@ -2069,7 +2140,8 @@ rocalVideoFileSourceSingleShard(
         bool loop,
         unsigned step,
         unsigned stride,
-        bool file_list_frame_num)
+        bool file_list_frame_num,
+        unsigned decode_threads)
 {
     Image* output = nullptr;
     if (p_context == nullptr) {
@@ -2110,6 +2182,8 @@ rocalVideoFileSourceSingleShard(
                               context->master_graph->mem_type(),
                               color_format );
 
+        // The decoders take their threads from the ones of the pipeline, unless decode_threads sets their count
+        size_t decode_thread_budget = decode_threads ? 1 : context->master_graph->reserve_cpu_threads(shard_count);
         output = context->master_graph->create_loader_output_image(info);
 
         context->master_graph->add_node<VideoLoaderSingleShardNode>({}, {output})->init(shard_id, shard_count,
@@ -2124,7 +2198,9 @@ rocalVideoFileSourceSingleShard(
                                                                                         shuffle,
                                                                                         loop,
                                                                                         context->user_batch_size(),
-                                                                                        context->master_graph->mem_type());
+                                                                                        context->master_graph->mem_type(),
+                                                                                        decode_threads,
+                                                                                        decode_thread_budget);
         context->master_graph->set_loop(loop);
 
         if(is_output)
@@ -2165,7 +2241,8 @@ rocalVideoFileResize(
         std::vector<unsigned> max_size,
         unsigned resize_shorter,
         unsigned resize_longer,
-        RocalResizeInterpolationType interpolation_type)
+        RocalResizeInterpolationType interpolation_type,
+        unsigned decode_threads)
 {
     Image* resize_output = nullptr;
     if (p_context == nullptr) {
@@ -2201,6 +2278,8 @@ rocalVideoFileResize(
                               context->master_graph->mem_type(),
                               color_format );
 
+        // The internal shards run in this process and split the threads the decoders take from the pipeline
+        size_t decode_thread_budget = decode_threads ? 1 : context->master_graph->reserve_cpu_threads(1);
         Image* output = context->master_graph->create_loader_output_image(info);
         context->master_graph->add_node<VideoLoaderNode>({}, {output})->init(internal_shard_count,
                                                                             source_path,
@@ -2214,7 +2293,9 @@ rocalVideoFileResize(
                                                                             shuffle,
                                                                             loop,
                                                                             context->user_batch_size(),
-                                                                            context->master_graph->mem_type());
+                                                                            context->master_graph->mem_type(),
+                                                                            decode_threads,
+                                                                            decode_thread_budget);
         context->master_graph->set_loop(loop);
 
         if(dest_width != video_prop.width && dest_height != video_prop.height)
@@ -2339,7 +2420,8 @@ rocalVideoFileResizeSingleShard(
         std::vector<unsigned> max_size,
         unsigned resize_shorter,
         unsigned resize_longer,
-        RocalResizeInterpolationType interpolation_type)
+        RocalResizeInterpolationType interpolation_type,
+        unsigned decode_threads)
 {
     Image* resize_output = nullptr;
     if (p_context == nullptr) {
@@ -2381,6 +2463,8 @@ rocalVideoFileResizeSingleShard(
                               context->master_graph->mem_type(),
                               color_format );
 
+        // The decoders take their threads from the ones of the pipeline, unless decode_threads sets their count
+        size_t decode_thread_budget = decode_threads ? 1 : context->master_graph->reserve_cpu_threads(shard_count);
         Image* output = context->master_graph->create_loader_output_image(info);
         context->master_graph->add_node<VideoLoaderSingleShardNode>({}, {output})->init(shard_id, shard_count,
                                                                                         source_path,
@@ -2394,7 +2478,9 @@ rocalVideoFileResizeSingleShard(
                                                                                         shuffle,
                                                                                         loop,
                                                                                         context->user_batch_size(),
-                                                                                        context->master_graph->mem_type());
+                                                                                        context->master_graph->mem_type(),
+                                                                                        decode_threads,
+                                                                                        decode_thread_budget);
         context->master_graph->set_loop(loop);
 
         if(dest_width != video_prop.width && dest_height != video_prop.height)
@@ -2574,3 +2660,37 @@ rocalResetLoaders(RocalContext p_context)
     }
     return ROCAL_OK;
 }
+
+RocalStatus ROCAL_API_CALL
+rocalSetReaderCacheSize(RocalContext p_context, unsigned cache_size)
+{
+    auto context = static_cast<Context*>(p_context);
+    try
+    {
+        set_reader_cache_size(static_cast<size_t>(cache_size) * 1024 * 1024);
+    }
+    catch(const std::exception& e)
+    {
+        context->capture_error(e.what());
+        ERR(e.what())
+        return ROCAL_RUNTIME_ERROR;
+    }
+    return ROCAL_OK;
+}
+
+RocalStatus ROCAL_API_CALL
+rocalSetVideoFrameCacheSize(RocalContext p_context, unsigned cache_size)
+{
+    auto context = static_cast<Context*>(p_context);
+    try
+    {
+        VideoFrameCache::instance().set_capacity(static_cast<size_t>(cache_size) * 1024 * 1024);
+    }
+    catch(const std::exception& e)
+    {
+        context->capture_error(e.what());
+        ERR(e.what())
+        return ROCAL_RUNTIME_ERROR;
+    }
+    return ROCAL_OK;
+}
@@ -23,6 +23,7 @@ THE SOFTWARE.
 #include "commons.h"
 #include "context.h"
 #include "rocal_api.h"
+#include "tensor_conversion.h"
 #if ENABLE_OPENCL
 #include "CL/cl.h"
 #endif
@@ -80,7 +81,14 @@ rocalToTensor(RocalContext p_context, void *out_ptr, RocalTensorLayout tensor_fo
     try
     {
         auto tensor_layout = (tensor_format == ROCAL_NHWC) ?  RocalTensorFormat::NHWC : RocalTensorFormat::NCHW;
-        auto tensor_output_data_type = (tensor_output_type == ROCAL_FP32) ? RocalTensorDataType::FP32 : RocalTensorDataType::FP16;
+        RocalTensorDataType tensor_output_data_type;
+        switch(tensor_output_type)
+        {
+            case ROCAL_FP32: tensor_output_data_type = RocalTensorDataType::FP32; break;
+            case ROCAL_FP16: tensor_output_data_type = RocalTensorDataType::FP16; break;
+            case ROCAL_U8: tensor_output_data_type = RocalTensorDataType::UINT8; break;
+            default: THROW("Unsupported tensor output type " + TOSTR(tensor_output_type))
+        }
         context->master_graph->to_tensor(out_ptr, tensor_layout, multiplier0, multiplier1, multiplier2,
                 offset0, offset1, offset2, reverse_channels, tensor_output_data_type, output_mem_type);
     }
@@ -94,6 +102,94 @@ rocalToTensor(RocalContext p_context, void *out_ptr, RocalTensorLayout tensor_fo
 }
 
 
+RocalStatus ROCAL_API_CALL
+rocalGetOutputBuffers(RocalContext p_context, void **buffers)
+{
+    auto context = static_cast<Context*>(p_context);
+    try
+    {
+        auto output_buffers = context->master_graph->output_buffers();
+        if(output_buffers.empty())
+            return ROCAL_RUNTIME_ERROR;
+        std::copy(output_buffers.begin(), output_buffers.end(), buffers);
+    }
+    catch(const std::exception& e)
+    {
+        context->capture_error(e.what());
+        ERR(e.what())
+        return ROCAL_RUNTIME_ERROR;
+    }
+    return ROCAL_OK;
+}
+
+RocalStatus ROCAL_API_CALL
+rocalToExportedTensor(RocalContext p_context, void **out_ptr, RocalTensorLayout tensor_format, RocalTensorOutputType tensor_output_type, float multiplier0,
+                       float multiplier1, float multiplier2, float offset0, float offset1, float offset2,
+                       bool reverse_channels)
+{
+    auto context = static_cast<Context*>(p_context);
+    try
+    {
+        auto tensor_layout = (tensor_format == ROCAL_NHWC) ?  RocalTensorFormat::NHWC : RocalTensorFormat::NCHW;
+        RocalTensorDataType tensor_output_data_type;
+        switch(tensor_output_type)
+        {
+            case ROCAL_FP32: tensor_output_data_type = RocalTensorDataType::FP32; break;
+            case ROCAL_FP16: tensor_output_data_type = RocalTensorDataType::FP16; break;
+            case ROCAL_U8: tensor_output_data_type = RocalTensorDataType::UINT8; break;
+            default: THROW("Unsupported tensor output type " + TOSTR(tensor_output_type))
+        }
+        if(context->master_graph->to_exported_tensor(out_ptr, tensor_layout, multiplier0, multiplier1, multiplier2,
+                offset0, offset1, offset2, reverse_channels, tensor_output_data_type) != MasterGraph::Status::OK)
+            return ROCAL_RUNTIME_ERROR;
+    }
+    catch(const std::exception& e)
+    {
+        context->capture_error(e.what());
+        ERR(e.what())
+        return ROCAL_RUNTIME_ERROR;
+    }
+    return ROCAL_OK;
+}
+
+unsigned ROCAL_API_CALL
+rocalRunMany(RocalContext p_context, unsigned batch_count, void *out_ptr, RocalTensorLayout tensor_format, RocalTensorOutputType tensor_output_type,
+                       float multiplier0, float multiplier1, float multiplier2, float offset0, float offset1, float offset2,
+                       bool reverse_channels, RocalOutputMemType output_mem_type, int *labels)
+{
+    auto context = static_cast<Context*>(p_context);
+    unsigned batches = 0;
+    try
+    {
+        auto tensor_layout = (tensor_format == ROCAL_NHWC) ?  RocalTensorFormat::NHWC : RocalTensorFormat::NCHW;
+        RocalTensorDataType tensor_output_data_type;
+        switch(tensor_output_type)
+        {
+            case ROCAL_FP32: tensor_output_data_type = RocalTensorDataType::FP32; break;
+            case ROCAL_FP16: tensor_output_data_type = RocalTensorDataType::FP16; break;
+            case ROCAL_U8: tensor_output_data_type = RocalTensorDataType::UINT8; break;
+            default: THROW("Unsupported tensor output type " + TOSTR(tensor_output_type))
+        }
+        auto master_graph = context->master_graph;
+        const size_t batch_tensor_size = master_graph->output_sample_size() * master_graph->augmentation_branch_count() * tensor_element_size(tensor_output_data_type);
+        for(; batches < batch_count; batches++)
+        {
+            if(master_graph->run() != MasterGraph::Status::OK)
+                break;
+            master_graph->to_tensor(static_cast<unsigned char *>(out_ptr) + batches * batch_tensor_size, tensor_layout, multiplier0, multiplier1, multiplier2,
+                    offset0, offset1, offset2, reverse_channels, tensor_output_data_type, output_mem_type);
+            if(labels && master_graph->meta_data().second)
+                rocalGetImageLabels(p_context, labels + batches * context->user_batch_size(), output_mem_type);
+        }
+    }
+    catch(const std::exception& e)
+    {
+        context->capture_error(e.what());
+        ERR(e.what())
+    }
+    return batches;
+}
+
 RocalStatus ROCAL_API_CALL
 rocalCopyToOutput(
         RocalContext p_context,
@@ -122,9 +122,11 @@ TimingInfo
     auto info = context->timing();
     // INFO("bbencode time "+ TOSTR(info.bb_process_time)); //to display time taken for bbox encoder
     if (context->master_graph->is_video_loader())
-        return {info.video_read_time, info.video_decode_time, info.video_process_time, info.copy_to_output};
+        return {info.video_read_time, info.video_decode_time, info.video_process_time, info.copy_to_output,
+                info.video_frame_cache_hits, info.video_frame_cache_misses, info.video_decoder_opens, info.video_decoder_closes};
     else
-        return {info.image_read_time, info.image_decode_time, info.image_process_time, info.copy_to_output};
+        return {info.image_read_time, info.image_decode_time, info.image_process_time, info.copy_to_output,
+                info.image_cache_hits, info.image_cache_misses, 0, 0};
 }
 
 RocalMetaData
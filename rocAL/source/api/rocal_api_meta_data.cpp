@@ -57,12 +57,12 @@ ROCAL_API_CALL rocalRandomBBoxCrop(RocalContext p_context, bool all_boxes_overla
 }
 
 RocalMetaData
-ROCAL_API_CALL rocalCreateLabelReader(RocalContext p_context, const char* source_path) {
+ROCAL_API_CALL rocalCreateLabelReader(RocalContext p_context, const char* source_path, const char* index_path) {
     if (!p_context)
         THROW("Invalid rocal context passed to rocalCreateLabelReader")
     auto context = static_cast<Context*>(p_context);
 
-    return context->master_graph->create_label_reader(source_path, MetaDataReaderType::FOLDER_BASED_LABEL_READER);
+    return context->master_graph->create_label_reader(source_path, MetaDataReaderType::FOLDER_BASED_LABEL_READER, index_path);
 
 }
 
@@ -168,7 +168,7 @@ ROCAL_API_CALL rocalGetImageName(RocalContext p_context,  char* buf)
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetImageName")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
+    auto &meta_data = context->master_graph->meta_data();
     size_t meta_data_batch_size = meta_data.first.size();
     if(context->user_batch_size() != meta_data_batch_size)
         THROW("meta data batch size is wrong " + TOSTR(meta_data_batch_size) + " != "+ TOSTR(context->user_batch_size() ))
@@ -186,7 +186,7 @@ ROCAL_API_CALL rocalGetImageNameLen(RocalContext p_context, int* buf)
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetImageNameLen")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
+    auto &meta_data = context->master_graph->meta_data();
     size_t meta_data_batch_size = meta_data.first.size();
     if(context->user_batch_size() != meta_data_batch_size)
         THROW("meta data batch size is wrong " + TOSTR(meta_data_batch_size) + " != "+ TOSTR(context->user_batch_size() ))
@@ -204,15 +204,10 @@ ROCAL_API_CALL rocalGetImageId(RocalContext p_context,  int* buf)
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetImageId")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
-    size_t meta_data_batch_size = meta_data.first.size();
-    if(context->user_batch_size() != meta_data_batch_size)
-        THROW("meta data batch size is wrong " + TOSTR(meta_data_batch_size) + " != "+ TOSTR(context->user_batch_size() ))
-    for(unsigned int i = 0; i < meta_data_batch_size; i++)
-    {
-        std::string str_id = meta_data.first[i].erase(0, meta_data.first[i].find_first_not_of('0'));
-        buf[i] = stoi(str_id);
-    }
+    auto &meta_data = context->master_graph->packed_meta_data();
+    if(context->user_batch_size() != meta_data.batch_size)
+        THROW("meta data batch size is wrong " + TOSTR(meta_data.batch_size) + " != "+ TOSTR(context->user_batch_size() ))
+    memcpy(buf, meta_data.image_ids, sizeof(int) * meta_data.batch_size);
 }
 
 void
@@ -222,7 +217,7 @@ ROCAL_API_CALL rocalGetImageLabels(RocalContext p_context, void* buf, RocalOutpu
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetImageLabels")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
+    auto &meta_data = context->master_graph->meta_data();
     if(!meta_data.second) {
         WRN("No label has been loaded for this output image")
         return;
@@ -250,6 +245,9 @@ ROCAL_API_CALL rocalGetImageLabels(RocalContext p_context, void* buf, RocalOutpu
     {
 #if ENABLE_HIP
         if(output_mem_type == RocalOutputMemType::ROCAL_MEMCPY_GPU) {
+            // Labels staged on the device by the output routine only need a device to device copy
+            if(context->master_graph->copy_staged_labels(buf, meta_data_batch_size) == MasterGraph::Status::OK)
+                return;
             hipError_t err = hipMemcpy(buf, meta_data.second->get_label_batch().data(), sizeof(int) * meta_data_batch_size, hipMemcpyHostToDevice);
             if (err != hipSuccess)
                 THROW("Invalid Data Pointer: Error copying to device memory")
@@ -275,10 +273,10 @@ ROCAL_API_CALL rocalGetBoundingBoxCount(RocalContext p_context, int* buf)
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetBoundingBoxCount")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
+    auto &meta_data = context->master_graph->meta_data();
     if(!meta_data.second)
         THROW("No label has been loaded for this output image")
-    size_t meta_data_batch_size = meta_data.second->get_bb_labels_batch().size();
+    size_t meta_data_batch_size = meta_data.second->get_bb_batch().samples();
     if(context->user_batch_size() != meta_data_batch_size)
         THROW("meta data batch size is wrong " + TOSTR(meta_data_batch_size) + " != "+ TOSTR(context->user_batch_size() ))
     return context->master_graph->bounding_box_batch_count(buf, meta_data.second);
@@ -290,8 +288,8 @@ ROCAL_API_CALL rocalGetBoundingBoxLabel(RocalContext p_context, int* buf)
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetBoundingBoxLabel")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
-    size_t meta_data_batch_size = meta_data.second->get_bb_labels_batch().size();
+    auto &meta_data = context->master_graph->meta_data();
+    size_t meta_data_batch_size = meta_data.second->get_bb_batch().samples();
     if(context->user_batch_size() != meta_data_batch_size)
         THROW("meta data batch size is wrong " + TOSTR(meta_data_batch_size) + " != "+ TOSTR(context->user_batch_size() ))
     if(!meta_data.second)
@@ -299,12 +297,11 @@ ROCAL_API_CALL rocalGetBoundingBoxLabel(RocalContext p_context, int* buf)
         WRN("No label has been loaded for this output image")
         return;
     }
-    for(unsigned i = 0; i < meta_data_batch_size; i++)
-    {
-        unsigned bb_count = meta_data.second->get_bb_labels_batch()[i].size();
-        memcpy(buf, meta_data.second->get_bb_labels_batch()[i].data(),  sizeof(int) * bb_count);
-        buf += bb_count;
-    }
+    // With the box encoder the count is the number of anchors of every image, the labels of the encoded boxes match it
+    if (context->master_graph->copy_bbox_encoded_buffers(nullptr, buf) == MasterGraph::Status::OK)
+        return;
+    auto &bb = meta_data.second->get_bb_batch();
+    memcpy(buf, bb.labels.data(), sizeof(int) * bb.total());
 }
 
 void
@@ -313,7 +310,7 @@ ROCAL_API_CALL rocalGetOneHotImageLabels(RocalContext p_context, void* buf, int
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetOneHotImageLabels")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
+    auto &meta_data = context->master_graph->meta_data();
     if(!meta_data.second) {
         WRN("No label has been loaded for this output image")
         return;
@@ -364,8 +361,8 @@ ROCAL_API_CALL rocalGetBoundingBoxCords(RocalContext p_context, float* buf)
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetBoundingBoxCords")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
-    size_t meta_data_batch_size = meta_data.second->get_bb_cords_batch().size();
+    auto &meta_data = context->master_graph->meta_data();
+    size_t meta_data_batch_size = meta_data.second->get_bb_batch().samples();
     if(context->user_batch_size() != meta_data_batch_size)
         THROW("meta data batch size is wrong " + TOSTR(meta_data_batch_size) + " != "+ TOSTR(context->user_batch_size() ))
     if(!meta_data.second)
@@ -373,12 +370,11 @@ ROCAL_API_CALL rocalGetBoundingBoxCords(RocalContext p_context, float* buf)
         WRN("No label has been loaded for this output image")
         return;
     }
-    for(unsigned i = 0; i < meta_data_batch_size; i++)
-    {
-        unsigned bb_count = meta_data.second->get_bb_cords_batch()[i].size();
-        memcpy(buf, meta_data.second->get_bb_cords_batch()[i].data(), bb_count * sizeof(BoundingBoxCord));
-        buf += (bb_count * 4);
-    }
+    // With the box encoder the count is the number of anchors of every image, the encoded boxes match it
+    if (context->master_graph->copy_bbox_encoded_buffers(buf, nullptr) == MasterGraph::Status::OK)
+        return;
+    auto &bb = meta_data.second->get_bb_batch();
+    memcpy(buf, bb.cords.data(), sizeof(BoundingBoxCord) * bb.total());
 }
 
 void
@@ -387,7 +383,7 @@ ROCAL_API_CALL rocalGetImageSizes(RocalContext p_context, int* buf)
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetImageSizes")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
+    auto &meta_data = context->master_graph->meta_data();
     size_t meta_data_batch_size = meta_data.second->get_img_sizes_batch().size();
 
 
@@ -456,8 +452,11 @@ ROCAL_API_CALL rocalCopyEncodedBoxesAndLables(RocalContext p_context, float* box
     if (!p_context)
         THROW("Invalid rocal context passed to rocalCopyEncodedBoxesAndLables")
     auto context = static_cast<Context *>(p_context);
-    auto meta_data = context->master_graph->meta_data();
-    size_t meta_data_batch_size = meta_data.second->get_bb_labels_batch().size();
+    // the box encoder writes the encoded boxes to the ring buffer, the meta data keeps the boxes it was given
+    if (context->master_graph->copy_bbox_encoded_buffers(boxes_buf, labels_buf) == MasterGraph::Status::OK)
+        return;
+    auto &meta_data = context->master_graph->meta_data();
+    size_t meta_data_batch_size = meta_data.second->get_bb_batch().samples();
     if (context->user_batch_size() != meta_data_batch_size)
         THROW("meta data batch size is wrong " + TOSTR(meta_data_batch_size) + " != " + TOSTR(context->user_batch_size()))
     if (!meta_data.second)
@@ -465,23 +464,9 @@ ROCAL_API_CALL rocalCopyEncodedBoxesAndLables(RocalContext p_context, float* box
         WRN("No encoded labels and bounding boxes has been loaded for this output image")
         return;
     }
-    unsigned sum = 0;
-    unsigned bb_offset[meta_data_batch_size];
-    for (unsigned i = 0; i < meta_data_batch_size; i++)
-    {
-        bb_offset[i] = sum;
-        sum += meta_data.second->get_bb_labels_batch()[i].size();
-    }
-    // copy labels buffer & bboxes buffer parallely
-    #pragma omp parallel for
-    for (unsigned i = 0; i < meta_data_batch_size; i++)
-    {
-        unsigned bb_count = meta_data.second->get_bb_labels_batch()[i].size();
-        int *temp_labels_buf = labels_buf + bb_offset[i];
-        float *temp_bbox_buf = boxes_buf + (bb_offset[i] * 4);
-        memcpy(temp_labels_buf, meta_data.second->get_bb_labels_batch()[i].data(), sizeof(int) * bb_count);
-        memcpy(temp_bbox_buf, meta_data.second->get_bb_cords_batch()[i].data(), sizeof(BoundingBoxCord) * bb_count);
-    }
+    auto &bb = meta_data.second->get_bb_batch();
+    memcpy(labels_buf, bb.labels.data(), sizeof(int) * bb.total());
+    memcpy(boxes_buf, bb.cords.data(), sizeof(BoundingBoxCord) * bb.total());
 }
 
 void
@@ -504,7 +489,7 @@ ROCAL_API_CALL rocalGetJointsDataPtr(RocalContext p_context, RocalJointsData **j
     if (!p_context)
         THROW("Invalid rocal context passed to rocalGetBoundingBoxCords")
     auto context = static_cast<Context*>(p_context);
-    auto meta_data = context->master_graph->meta_data();
+    auto &meta_data = context->master_graph->meta_data();
     size_t meta_data_batch_size = meta_data.second->get_joints_data_batch().center_batch.size();
 
     if(context->user_batch_size() != meta_data_batch_size)
@@ -518,3 +503,14 @@ ROCAL_API_CALL rocalGetJointsDataPtr(RocalContext p_context, RocalJointsData **j
     *joints_data = (RocalJointsData *)(&(meta_data.second->get_joints_data_batch()));
 }
 
+const RocalBatchMetaData *
+ROCAL_API_CALL rocalGetBatchMetaData(RocalContext p_context)
+{
+    if (!p_context)
+        THROW("Invalid rocal context passed to rocalGetBatchMetaData")
+    auto context = static_cast<Context*>(p_context);
+    auto &meta_data = context->master_graph->packed_meta_data();
+    if(context->user_batch_size() != meta_data.batch_size)
+        THROW("meta data batch size is wrong " + TOSTR(meta_data.batch_size) + " != "+ TOSTR(context->user_batch_size() ))
+    return &meta_data;
+}
@@ -21,11 +21,12 @@ THE SOFTWARE.
 */
 
 #include <stdio.h>
+#include <algorithm>
 #include <commons.h>
 #include "ffmpeg_video_decoder.h"
 
 #ifdef ROCAL_VIDEO
-FFmpegVideoDecoder::FFmpegVideoDecoder(){};
+FFmpegVideoDecoder::FFmpegVideoDecoder(unsigned thread_count) : _thread_count(thread_count) {};
 
 int FFmpegVideoDecoder::seek_frame(AVRational avg_frame_rate, AVRational time_base, unsigned frame_number)
 {
@@ -42,8 +43,20 @@ int FFmpegVideoDecoder::seek_frame(AVRational avg_frame_rate, AVRational time_ba
 
 // Seeks to the frame_number in the video file and decodes each frame in the sequence.
 VideoDecoder::Status FFmpegVideoDecoder::Decode(unsigned char *out_buffer, unsigned seek_frame_number, size_t sequence_length, size_t stride, int out_width, int out_height, int out_stride, AVPixelFormat out_pix_format)
+{
+    std::vector<Sequence> sequences = {{out_buffer, seek_frame_number, sequence_length}};
+    return DecodeSequences(sequences, stride, out_width, out_height, out_stride, out_pix_format);
+}
+
+// Seeks to the first sequence and decodes the frames up to the end of the last one in one pass, each decoded frame is
+// written to every sequence it belongs to
+VideoDecoder::Status FFmpegVideoDecoder::DecodeSequences(std::vector<Sequence> &sequences, size_t stride, int out_width, int out_height, int out_stride, AVPixelFormat out_pix_format)
 {
     VideoDecoder::Status status = Status::OK;
+    if (sequences.empty())
+        return status;
+    for (auto &sequence : sequences)
+        sequence.decoded = 0;
 
     // Initialize the SwsContext
     SwsContext *swsctx = nullptr;
@@ -57,15 +70,20 @@ VideoDecoder::Status FFmpegVideoDecoder::Decode(unsigned char *out_buffer, unsig
             return Status::FAILED;
         }
     }
-    int select_frame_pts = seek_frame(_video_stream->avg_frame_rate, _video_stream->time_base, seek_frame_number);
+    const unsigned first_frame = sequences.front().start_frame;
+    unsigned end_frame = 0;
+    for (auto &sequence : sequences)
+        end_frame = std::max(end_frame, (unsigned)(sequence.start_frame + (sequence.length - 1) * stride + 1));
+    int select_frame_pts = seek_frame(_video_stream->avg_frame_rate, _video_stream->time_base, first_frame);
     if (select_frame_pts < 0)
     {
         ERR("Error in seeking frame..Unable to seek the given frame in a video");
+        sws_freeContext(swsctx);
         return Status::FAILED;
     }
     unsigned frame_count = 0;
     bool end_of_stream = false;
-    bool sequence_filled = false;
+    bool sequences_filled = false;
     uint8_t *dst_data[4] = {0};
     int dst_linesize[4] = {0};
     int image_size = out_height * out_stride * sizeof(unsigned char);
@@ -74,6 +92,7 @@ VideoDecoder::Status FFmpegVideoDecoder::Decode(unsigned char *out_buffer, unsig
     if (!dec_frame)
     {
         ERR("Could not allocate dec_frame");
+        sws_freeContext(swsctx);
         return Status::NO_MEMORY;
     }
     do
@@ -87,7 +106,11 @@ VideoDecoder::Status FFmpegVideoDecoder::Decode(unsigned char *out_buffer, unsig
             status = Status::FAILED;
             break;
         }
-        if (ret == 0 && pkt.stream_index != _video_stream_idx) continue;
+        if (ret == 0 && pkt.stream_index != _video_stream_idx)
+        {
+            av_packet_unref(&pkt);
+            continue;
+        }
         end_of_stream = (ret == AVERROR_EOF);
         if (end_of_stream)
         {
@@ -111,29 +134,43 @@ VideoDecoder::Status FFmpegVideoDecoder::Decode(unsigned char *out_buffer, unsig
             ret = avcodec_receive_frame(_video_dec_ctx, dec_frame);
             if (ret == AVERROR(EAGAIN) || ret == AVERROR_EOF) break;
             if ((dec_frame->pts < select_frame_pts) || (ret < 0)) continue;
-            if (frame_count % stride == 0)
+            const unsigned frame_number = first_frame + frame_count;
+            unsigned char *written_frame = nullptr;
+            for (auto &sequence : sequences)
             {
-                dst_data[0] = out_buffer;
-                dst_linesize[0] = out_stride;
-                if (swsctx)
+                if (frame_number < sequence.start_frame) break;
+                unsigned offset = frame_number - sequence.start_frame;
+                if ((offset % stride != 0) || (offset / stride >= sequence.length)) continue;
+                unsigned char *out_buffer = sequence.buffer + (offset / stride) * image_size;
+                if (written_frame)
+                {
+                    // Sequences that overlap get a copy of the frame converted for the first of them
+                    memcpy(out_buffer, written_frame, image_size);
+                }
+                else if (swsctx)
+                {
+                    dst_data[0] = out_buffer;
+                    dst_linesize[0] = out_stride;
                     sws_scale(swsctx, dec_frame->data, dec_frame->linesize, 0, dec_frame->height, dst_data, dst_linesize);
+                }
                 else
                 {
                     // copy from frame to out_buffer
                     memcpy(out_buffer, dec_frame->data[0], dec_frame->linesize[0] * out_height);
                 }
-                out_buffer = out_buffer + image_size;
+                written_frame = out_buffer;
+                sequence.decoded = offset / stride + 1;
             }
             ++frame_count;
             av_frame_unref(dec_frame);
-            if (frame_count == sequence_length * stride)
+            if (first_frame + frame_count == end_frame)
             {
-                sequence_filled = true;
+                sequences_filled = true;
                 break;
             }
         }
         av_packet_unref(&pkt);
-        if (sequence_filled)  break;
+        if (sequences_filled)  break;
     } while (!end_of_stream);
     avcodec_flush_buffers(_video_dec_ctx);
     av_frame_free(&dec_frame);
@@ -202,6 +239,10 @@ VideoDecoder::Status FFmpegVideoDecoder::Initialize(const char *src_filename)
         return Status::FAILED;
     }
 
+    // Frame threads decode consecutive frames and slice threads the slices of a frame in parallel, the codec uses the kinds it supports
+    _video_dec_ctx->thread_count = _thread_count;
+    _video_dec_ctx->thread_type = FF_THREAD_FRAME | FF_THREAD_SLICE;
+
     // Init the decoders
     if ((ret = avcodec_open2(_video_dec_ctx, _decoder, &opts)) < 0)
     {
@@ -20,6 +20,7 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 */
 #include "video_decoder_factory.h"
+#include <algorithm>
 #include <video_decoder.h>
 #include <ffmpeg_video_decoder.h>
 #include <hardware_video_decoder.h>
@@ -31,7 +32,7 @@ std::shared_ptr<VideoDecoder> create_video_decoder(VideoDecoderConfig config)
     switch (config.type())
     {
         case VideoDecoderType::FFMPEG_SOFTWARE_DECODE:
-            return std::make_shared<FFmpegVideoDecoder>();
+            return std::make_shared<FFmpegVideoDecoder>(std::max(config.thread_count(), 1u));
         case VideoDecoderType::FFMPEG_HARDWARE_DECODE:
             return std::make_shared<HardWareVideoDecoder>();
         default:
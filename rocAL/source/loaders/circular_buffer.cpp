@@ -42,6 +42,7 @@ void CircularBuffer::reset()
     _write_ptr = 0;
     _read_ptr = 0;
     _level = 0;
+    _writer_unblocked = false;
     while(!_circ_image_info.empty())
         _circ_image_info.pop();
     if (random_bbox_crop_flag == true)
@@ -55,7 +56,9 @@ void CircularBuffer::unblock_reader()
 {
     if(!_initialized)
         return;
-    // Wake up the reader thread in case it's waiting for a load
+    // Wake up the reader thread in case it's waiting for a load, the lock makes sure a reader
+    // that just found the buffer empty is already waiting and does not miss the notification
+    std::unique_lock<std::mutex> lock(_lock);
     _wait_for_load.notify_one();
 }
 
@@ -63,8 +66,18 @@ void CircularBuffer::unblock_writer()
 {
     if(!_initialized)
         return;
-    // Wake up the writer thread in case it's waiting for an unload
-    _wait_for_unload.notify_one();
+    // Wake up the writer thread in case it's waiting for an unload or for being unblocked
+    std::unique_lock<std::mutex> lock(_lock);
+    _writer_unblocked = true;
+    _wait_for_unload.notify_all();
+}
+
+void CircularBuffer::block_until_writer_unblocked()
+{
+    if(!_initialized)
+        return;
+    std::unique_lock<std::mutex> lock(_lock);
+    _wait_for_unload.wait(lock, [this] { return _writer_unblocked; });
 }
 
 
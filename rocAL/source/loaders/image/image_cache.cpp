@@ -0,0 +1,182 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#include <cstring>
+#include <cstdlib>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <unistd.h>
+#include "image_cache.h"
+#include "commons.h"
+#include "exception.h"
+
+ImageCache::ImageCache(const ImageCacheConfig &config, size_t slot_size):
+    _config(config),
+    _slot_size(slot_size)
+{
+    _slot_count = (_slot_size > 0) ? _config.size / _slot_size : 0;
+    if (_slot_count == 0) {
+        WRN("Image cache of " + std::to_string(_config.size) + " bytes can't hold a single image of " + std::to_string(_slot_size) + " bytes, caching is disabled")
+        return;
+    }
+    _mapped_size = _slot_count * _slot_size;
+    if (_config.spill_path.empty()) {
+        _storage = static_cast<unsigned char *>(mmap(nullptr, _mapped_size, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS | MAP_NORESERVE, -1, 0));
+    } else {
+        std::string file_template = _config.spill_path + "/rocal_image_cache_XXXXXX";
+        int fd = mkstemp(&file_template[0]);
+        if (fd < 0)
+            THROW("Could not create the image cache spill file in " + _config.spill_path)
+        // The file is unlinked right away so that it goes away with the mapping whichever way the process exits
+        unlink(file_template.c_str());
+        if (ftruncate(fd, _mapped_size) != 0) {
+            ::close(fd);
+            THROW("Could not grow the image cache spill file to " + std::to_string(_mapped_size) + " bytes")
+        }
+        _storage = static_cast<unsigned char *>(mmap(nullptr, _mapped_size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0));
+        ::close(fd);
+    }
+    if (_storage == MAP_FAILED)
+        THROW("Could not map " + std::to_string(_mapped_size) + " bytes for the image cache")
+    _free_slots.reserve(_slot_count);
+    for (size_t i = _slot_count; i > 0; i--)
+        _free_slots.push_back(i - 1);
+    _entries.reserve(_slot_count);
+}
+
+ImageCache::~ImageCache()
+{
+    if (_storage && _storage != MAP_FAILED)
+        munmap(_storage, _mapped_size);
+}
+
+bool
+ImageCache::acquire(const std::string &sample_id)
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    auto it = _entries.find(sample_id);
+    if (it == _entries.end()) {
+        _misses++;
+        return false;
+    }
+    it->second.pin_count++;
+    if (_config.policy == ImageCachePolicy::LRU)
+        _lru.splice(_lru.begin(), _lru, it->second.lru_pos);
+    _hits++;
+    return true;
+}
+
+void
+ImageCache::get(const std::string &sample_id, unsigned char *dst, size_t &roi_width, size_t &roi_height, size_t &original_width, size_t &original_height)
+{
+    const unsigned char *src;
+    size_t size;
+    {
+        std::lock_guard<std::mutex> lock(_lock);
+        auto it = _entries.find(sample_id);
+        if (it == _entries.end() || it->second.pin_count == 0)
+            THROW("Image cache entry " + sample_id + " was not acquired before get()")
+        src = _storage + it->second.slot * _slot_size;
+        size = it->second.size;
+        roi_width = it->second.roi_width;
+        roi_height = it->second.roi_height;
+        original_width = it->second.original_width;
+        original_height = it->second.original_height;
+    }
+    // Pinned entries are never evicted, the copy does not need to hold the lock
+    memcpy(dst, src, size);
+    release(sample_id);
+}
+
+void
+ImageCache::release(const std::string &sample_id)
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    auto it = _entries.find(sample_id);
+    if (it != _entries.end() && it->second.pin_count > 0)
+        it->second.pin_count--;
+}
+
+bool
+ImageCache::evict_one()
+{
+    // Least recently used entries are at the back, entries pinned by an upcoming batch are skipped
+    for (auto it = _lru.rbegin(); it != _lru.rend(); ++it) {
+        auto entry = _entries.find(*it);
+        if (entry->second.pin_count > 0)
+            continue;
+        _free_slots.push_back(entry->second.slot);
+        _lru.erase(std::next(it).base());
+        _entries.erase(entry);
+        return true;
+    }
+    return false;
+}
+
+bool
+ImageCache::put(const std::string &sample_id, const unsigned char *src, size_t size, size_t roi_width, size_t roi_height, size_t original_width, size_t original_height)
+{
+    if (_slot_count == 0 || size > _slot_size || size < _config.threshold)
+        return false;
+    unsigned char *dst;
+    {
+        std::lock_guard<std::mutex> lock(_lock);
+        if (_entries.find(sample_id) != _entries.end())
+            return false;
+        if (_free_slots.empty() && (_config.policy != ImageCachePolicy::LRU || !evict_one()))
+            return false;
+        Entry entry;
+        entry.slot = _free_slots.back();
+        entry.size = size;
+        entry.roi_width = roi_width;
+        entry.roi_height = roi_height;
+        entry.original_width = original_width;
+        entry.original_height = original_height;
+        // Stays pinned while it is being filled
+        entry.pin_count = 1;
+        if (_config.policy == ImageCachePolicy::LRU) {
+            _lru.push_front(sample_id);
+            entry.lru_pos = _lru.begin();
+        }
+        _free_slots.pop_back();
+        dst = _storage + entry.slot * _slot_size;
+        _entries.emplace(sample_id, entry);
+    }
+    memcpy(dst, src, size);
+    release(sample_id);
+    return true;
+}
+
+long long unsigned
+ImageCache::hits()
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    return _hits;
+}
+
+long long unsigned
+ImageCache::misses()
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    return _misses;
+}
@@ -126,9 +126,9 @@ void ImageLoader::stop_internal_thread()
     _stopped = true;
     _circ_buff.unblock_reader();
     _circ_buff.unblock_writer();
-    _circ_buff.reset();
     if (_load_thread.joinable())
         _load_thread.join();
+    _circ_buff.reset();
 }
 
 void ImageLoader::initialize(ReaderConfig reader_cfg, DecoderConfig decoder_cfg, RocalMemType mem_type, unsigned batch_size, bool decoder_keep_original)
@@ -160,6 +160,7 @@ void ImageLoader::initialize(ReaderConfig reader_cfg, DecoderConfig decoder_cfg,
         throw;
     }
     _decoded_img_info._image_names.resize(_batch_size);
+    _decoded_img_info._sample_ids.resize(_batch_size);
     _decoded_img_info._roi_height.resize(_batch_size);
     _decoded_img_info._roi_width.resize(_batch_size);
     _decoded_img_info._original_height.resize(_batch_size);
@@ -198,6 +199,7 @@ ImageLoader::load_routine()
         {
             load_status = _image_loader->load(data,
                                               _decoded_img_info._image_names,
+                                              _decoded_img_info._sample_ids,
                                               _output_image->info().width(),
                                               _output_image->info().height_single(),
                                               _decoded_img_info._roi_width,
@@ -239,10 +241,10 @@ ImageLoader::load_routine()
             // read semaphore using release() call
             // , and calls the release() allows the reader thread to wake up and handle
             // the out-of-data case properly
-            // It also slows down the reader thread since there is no more data to read,
-            // till program ends or till reset is called
+            // There is no more data to read till program ends or till reset is called, both
+            // unblock the writer, so the thread waits for that instead of polling the reader
             _circ_buff.unblock_reader();
-            std::this_thread::sleep_for(std::chrono::seconds(1));
+            _circ_buff.block_until_writer_unblocked();
         }
     }
     return LoaderModuleStatus::OK;
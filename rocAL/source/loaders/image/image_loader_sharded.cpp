@@ -95,6 +95,10 @@ ImageLoaderSharded::initialize(ReaderConfig reader_cfg, DecoderConfig decoder_cf
         loader->set_prefetch_queue_depth(_prefetch_queue_depth);
         _loaders.push_back(loader);
     }
+    // The image cache budget is shared by the shards, each loader caches the samples of its own shard
+    auto cache_cfg = decoder_cfg.get_cache_config();
+    cache_cfg.size /= _shard_count;
+    decoder_cfg.set_cache_config(cache_cfg);
     // Initialize loader modules
     for(size_t idx = 0; idx < _shard_count; idx++)
     {
@@ -171,6 +175,7 @@ Timing ImageLoaderSharded::timing()
     Timing t;
     long long unsigned  max_decode_time = 0;
     long long unsigned  max_read_time = 0;
+    long long unsigned  max_read_ahead_time = 0;
     long long unsigned  swap_handle_time = 0;
 
     // image read and decode runs in parallel using multiple loaders, and the observable latency that the ImageLoaderSharded user
@@ -179,11 +184,15 @@ Timing ImageLoaderSharded::timing()
     {
         auto info = loader->timing();
         max_read_time = (info.image_read_time > max_read_time) ?  info.image_read_time : max_read_time;
+        max_read_ahead_time = (info.image_read_ahead_time > max_read_ahead_time) ? info.image_read_ahead_time : max_read_ahead_time;
         max_decode_time = (info.image_decode_time > max_decode_time) ? info.image_decode_time : max_decode_time;
         swap_handle_time += info.image_process_time;
+        t.image_cache_hits += info.image_cache_hits;
+        t.image_cache_misses += info.image_cache_misses;
     }
     t.image_decode_time = max_decode_time;
     t.image_read_time = max_read_time;
+    t.image_read_ahead_time = max_read_ahead_time;
     t.image_process_time = swap_handle_time;
     return t;
 }
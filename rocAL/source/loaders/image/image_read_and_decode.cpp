@@ -51,17 +51,24 @@ ImageReadAndDecode::timing()
     Timing t;
     t.image_decode_time = _decode_time.get_timing();
     t.image_read_time = _file_load_time.get_timing();
+    t.image_read_ahead_time = _read_ahead_time.get_timing();
+    if (_image_cache) {
+        t.image_cache_hits = _image_cache->hits();
+        t.image_cache_misses = _image_cache->misses();
+    }
     return t;
 }
 
 ImageReadAndDecode::ImageReadAndDecode():
     _file_load_time("FileLoadTime", DBG_TIMING ),
-    _decode_time("DecodeTime", DBG_TIMING)
+    _decode_time("DecodeTime", DBG_TIMING),
+    _read_ahead_time("ReadAheadTime", DBG_TIMING)
 {
 }
 
 ImageReadAndDecode::~ImageReadAndDecode()
 {
+    stop_read_ahead();
     _reader = nullptr;
     _decoder.clear();
 }
@@ -75,13 +82,17 @@ ImageReadAndDecode::create(ReaderConfig reader_config, DecoderConfig decoder_con
     _decoder.resize(batch_size);
     _actual_read_size.resize(batch_size);
     _image_names.resize(batch_size);
+    _cache_keys.resize(batch_size);
+    _sample_ids.resize(batch_size);
     _compressed_image_size.resize(batch_size);
+    _cache_hit.resize(batch_size);
     _decompressed_buff_ptrs.resize(_batch_size);
     _actual_decoded_width.resize(_batch_size);
     _actual_decoded_height.resize(_batch_size);
     _original_height.resize(_batch_size);
     _original_width.resize(_batch_size);
     _decoder_config = decoder_config;
+    _cache_config = decoder_config.get_cache_config();
     _random_crop_dec_param = nullptr;
     if (_decoder_config._type == DecoderType::FUSED_TURBO_JPEG) {
       auto random_aspect_ratio = decoder_config.get_random_aspect_ratio();
@@ -98,12 +109,29 @@ ImageReadAndDecode::create(ReaderConfig reader_config, DecoderConfig decoder_con
         }
     }
     _num_threads = reader_config.get_cpu_num_threads();
+    // Skip decode reads straight into the output buffer, there is no decode stage to overlap the reads with
+    _read_ahead_depth = (_decoder_config._type != DecoderType::SKIP_DECODE) ? reader_config.get_read_ahead_depth() : 0;
+    for (size_t i = 0; i < _read_ahead_depth; i++) {
+        auto batch = std::make_shared<CompressedBatch>();
+        batch->compressed_buff.resize(batch_size);
+        for (auto &buff : batch->compressed_buff)
+            buff.resize(MAX_COMPRESSED_SIZE);
+        batch->actual_read_size.resize(batch_size);
+        batch->image_names.resize(batch_size);
+        batch->cache_keys.resize(batch_size);
+        batch->sample_ids.resize(batch_size);
+        batch->compressed_image_size.resize(batch_size);
+        batch->cache_hit.resize(batch_size);
+        _free_batches.push(batch);
+    }
     _reader = create_reader(reader_config);
 }
 
 void
 ImageReadAndDecode::reset()
 {
+    // Batches already read ahead belong to the previous pass over the reader and are dropped
+    stop_read_ahead();
     // TODO: Reload images from the folder if needed
     _reader->reset();
 }
@@ -111,7 +139,116 @@ ImageReadAndDecode::reset()
 size_t
 ImageReadAndDecode::count()
 {
-    return _reader->count_items();
+    std::lock_guard<std::mutex> reader_lock(_reader_mutex);
+    std::lock_guard<std::mutex> lock(_read_ahead_mutex);
+    return _reader->count_items() + _staged_file_count;
+}
+
+size_t
+ImageReadAndDecode::read_compressed_batch(std::vector<std::vector<unsigned char>> &compressed_buff, std::vector<size_t> &actual_read_size,
+                                          std::vector<std::string> &image_names, std::vector<std::string> &cache_keys, std::vector<int> &sample_ids,
+                                          std::vector<size_t> &compressed_image_size, std::vector<bool> &cache_hit)
+{
+    size_t file_counter = 0;
+    while ((file_counter != _batch_size) && _reader->count_items() > 0) {
+        size_t fsize = _reader->open();
+        if (fsize == 0) {
+            WRN("Opened file " + _reader->id() + " of size 0");
+            continue;
+        }
+        // Samples found in the cache stay pinned until load() copies them out, their compressed bytes are not needed
+        if (_image_cache)
+            cache_keys[file_counter] = _reader->unique_id();
+        cache_hit[file_counter] = _image_cache && _image_cache->acquire(cache_keys[file_counter]);
+        if (cache_hit[file_counter]) {
+            actual_read_size[file_counter] = 0;
+            image_names[file_counter] = _reader->id();
+            sample_ids[file_counter] = _reader->sample_id();
+            _reader->skip_data();
+            _reader->close();
+            compressed_image_size[file_counter] = 0;
+            file_counter++;
+            continue;
+        }
+        if (compressed_buff[file_counter].size() < fsize)
+            compressed_buff[file_counter].resize(fsize);
+        actual_read_size[file_counter] = _reader->read_data(compressed_buff[file_counter].data(), fsize);
+        image_names[file_counter] = _reader->id();
+        sample_ids[file_counter] = _reader->sample_id();
+        _reader->close();
+        compressed_image_size[file_counter] = fsize;
+        file_counter++;
+    }
+    return file_counter;
+}
+
+void
+ImageReadAndDecode::release_cached(const std::vector<std::string> &cache_keys, const std::vector<bool> &cache_hit, size_t file_count)
+{
+    if (!_image_cache)
+        return;
+    for (size_t i = 0; i < file_count; i++)
+        if (cache_hit[i])
+            _image_cache->release(cache_keys[i]);
+}
+
+void
+ImageReadAndDecode::start_read_ahead()
+{
+    _read_ahead_running = true;
+    _read_ahead_thread = std::thread(&ImageReadAndDecode::read_ahead_routine, this);
+}
+
+void
+ImageReadAndDecode::stop_read_ahead()
+{
+    {
+        std::lock_guard<std::mutex> lock(_read_ahead_mutex);
+        _read_ahead_running = false;
+    }
+    _batch_free.notify_all();
+    if (_read_ahead_thread.joinable())
+        _read_ahead_thread.join();
+    while (!_ready_batches.empty()) {
+        auto batch = _ready_batches.front();
+        release_cached(batch->cache_keys, batch->cache_hit, batch->file_count);
+        _free_batches.push(batch);
+        _ready_batches.pop();
+    }
+    _staged_file_count = 0;
+    _read_ahead_eof = false;
+}
+
+void
+ImageReadAndDecode::read_ahead_routine()
+{
+    // Reads the compressed bytes of the upcoming batches while load() decodes the current one
+    while (true) {
+        std::shared_ptr<CompressedBatch> batch;
+        {
+            std::unique_lock<std::mutex> lock(_read_ahead_mutex);
+            _batch_free.wait(lock, [this] { return !_read_ahead_running || !_free_batches.empty(); });
+            if (!_read_ahead_running)
+                break;
+            batch = _free_batches.front();
+            _free_batches.pop();
+        }
+        _read_ahead_time.start();// Debug timing
+        {
+            std::lock_guard<std::mutex> reader_lock(_reader_mutex);
+            // An empty batch tells load() that the reader is out of data
+            batch->file_count = (_reader->count_items() < _batch_size) ? 0 :
+                                read_compressed_batch(batch->compressed_buff, batch->actual_read_size, batch->image_names, batch->cache_keys, batch->sample_ids,
+                                                      batch->compressed_image_size, batch->cache_hit);
+            std::lock_guard<std::mutex> lock(_read_ahead_mutex);
+            _ready_batches.push(batch);
+            _staged_file_count += batch->file_count;
+        }
+        _read_ahead_time.end();// Debug timing
+        _batch_ready.notify_one();
+        if (batch->file_count == 0)
+            break;
+    }
 }
 
 void ImageReadAndDecode::set_random_bbox_data_reader(std::shared_ptr<RandomBBoxCrop_MetaDataReader> randombboxcrop_meta_data_reader)
@@ -135,6 +272,7 @@ ImageReadAndDecode::set_batch_random_bbox_crop_coords(std::vector<std::vector<fl
 LoaderModuleStatus
 ImageReadAndDecode::load(unsigned char* buff,
                          std::vector<std::string>& names,
+                         std::vector<int>& sample_ids,
                          const size_t max_decoded_width,
                          const size_t max_decoded_height,
                          std::vector<uint32_t> &roi_width,
@@ -148,7 +286,9 @@ ImageReadAndDecode::load(unsigned char* buff,
         THROW("Zero image dimension is not valid")
     if(!buff)
         THROW("Null pointer passed as output buffer")
-    if(_reader->count_items() < _batch_size)
+    if(_read_ahead_depth == 0 && _reader->count_items() < _batch_size)
+        return LoaderModuleStatus::NO_MORE_DATA_TO_READ;
+    if(_read_ahead_eof)
         return LoaderModuleStatus::NO_MORE_DATA_TO_READ;
     // load images/frames from the disk and push them as a large image onto the buff
     unsigned file_counter = 0;
@@ -158,8 +298,23 @@ ImageReadAndDecode::load(unsigned char* buff,
     const bool keep_original = decoder_keep_original;
     const size_t image_size = max_decoded_width * max_decoded_height * output_planes * sizeof(unsigned char);
 
+    if (_cache_config.size > 0 && !_image_cache && _decoder_config._type != DecoderType::SKIP_DECODE) {
+        if (_randombboxcrop_meta_data_reader || _random_crop_dec_param) {
+            // Partial decodes crop a different window every epoch, there is nothing to reuse
+            WRN("Image cache is not supported with partial decoding, caching is disabled")
+        } else {
+            _image_cache = std::make_unique<ImageCache>(_cache_config, image_size);
+            if (_image_cache->capacity() == 0)
+                _image_cache.reset();
+        }
+        if (!_image_cache)
+            _cache_config.size = 0;
+    }
+
     // Decode with the height and size equal to a single image
-    // File read is done serially since I/O parallelization does not work very well.
+    // Files are read serially through the reader, either here or ahead of time on the read-ahead thread
+    // so that the reads of the next batch overlap the decode of this one. _file_load_time is the read time
+    // the decode stage is actually exposed to.
     _file_load_time.start();// Debug timing
     if (_decoder_config._type == DecoderType::SKIP_DECODE) {
         while ((file_counter != _batch_size) && _reader->count_items() > 0)
@@ -176,9 +331,11 @@ ImageReadAndDecode::load(unsigned char* buff,
                 LOG("Reader read less than requested bytes of size: " + _actual_read_size[file_counter]);
 
             _image_names[file_counter] = _reader->id();
+            _sample_ids[file_counter] = _reader->sample_id();
             _reader->close();
            // _compressed_image_size[file_counter] = fsize;
             names[file_counter] = _image_names[file_counter];
+            sample_ids[file_counter] = _sample_ids[file_counter];
             roi_width[file_counter] = max_decoded_width;
             roi_height[file_counter] = max_decoded_height;
             actual_width[file_counter] = max_decoded_width;
@@ -188,22 +345,43 @@ ImageReadAndDecode::load(unsigned char* buff,
         //_file_load_time.end();// Debug timing
         //return LoaderModuleStatus::OK;
     } else {
-        while ((file_counter != _batch_size) && _reader->count_items() > 0) {
-            size_t fsize = _reader->open();
-            if (fsize == 0) {
-                WRN("Opened file " + _reader->id() + " of size 0");
-                continue;
+        if (_read_ahead_depth > 0) {
+            if (!_read_ahead_thread.joinable())
+                start_read_ahead();
+            std::shared_ptr<CompressedBatch> batch;
+            {
+                std::unique_lock<std::mutex> lock(_read_ahead_mutex);
+                _batch_ready.wait(lock, [this] { return !_ready_batches.empty(); });
+                batch = _ready_batches.front();
+                _ready_batches.pop();
+                _staged_file_count -= batch->file_count;
             }
-            _compressed_buff[file_counter].reserve(fsize);
-            _actual_read_size[file_counter] = _reader->read_data(_compressed_buff[file_counter].data(), fsize);
-            _image_names[file_counter] = _reader->id();
-            _reader->close();
-            _compressed_image_size[file_counter] = fsize;
-            file_counter++;
+            if (batch->file_count == 0) {
+                _read_ahead_eof = true;
+                std::lock_guard<std::mutex> lock(_read_ahead_mutex);
+                _free_batches.push(batch);
+                _file_load_time.end();// Debug timing
+                return LoaderModuleStatus::NO_MORE_DATA_TO_READ;
+            }
+            // Take over the batch's buffers and hand the previous ones back to the read-ahead thread
+            std::swap(_compressed_buff, batch->compressed_buff);
+            std::swap(_actual_read_size, batch->actual_read_size);
+            std::swap(_image_names, batch->image_names);
+            std::swap(_cache_keys, batch->cache_keys);
+            std::swap(_sample_ids, batch->sample_ids);
+            std::swap(_compressed_image_size, batch->compressed_image_size);
+            std::swap(_cache_hit, batch->cache_hit);
+            {
+                std::lock_guard<std::mutex> lock(_read_ahead_mutex);
+                _free_batches.push(batch);
+            }
+            _batch_free.notify_one();
+        } else {
+            read_compressed_batch(_compressed_buff, _actual_read_size, _image_names, _cache_keys, _sample_ids, _compressed_image_size, _cache_hit);
         }
         if (_randombboxcrop_meta_data_reader) {
             //Fetch the crop co-ordinates for a batch of images
-            _bbox_coords = _randombboxcrop_meta_data_reader->get_batch_crop_coords(_image_names);
+            _bbox_coords = _randombboxcrop_meta_data_reader->get_batch_crop_coords(_image_names, _sample_ids);
             set_batch_random_bbox_crop_coords(_bbox_coords);
         } else if (_random_crop_dec_param) {
             _random_crop_dec_param->generate_random_seeds();
@@ -217,9 +395,24 @@ ImageReadAndDecode::load(unsigned char* buff,
         for (size_t i = 0; i < _batch_size; i++)
             _decompressed_buff_ptrs[i] = buff + image_size * i;
 
+        // Cached samples are copied along with the decodes unless the batch copy is turned off
+        const bool cache_batch_copy = _cache_config.batch_copy;
+        if (_image_cache && !cache_batch_copy) {
+            for (size_t i = 0; i < _batch_size; i++)
+                if (_cache_hit[i])
+                    _image_cache->get(_cache_keys[i], _decompressed_buff_ptrs[i], _actual_decoded_width[i], _actual_decoded_height[i],
+                                      _original_width[i], _original_height[i]);
+        }
+
 #pragma omp parallel for num_threads(_num_threads)  // default(none) TBD: option disabled in Ubuntu 20.04
         for (size_t i = 0; i < _batch_size; i++)
         {
+            if (_cache_hit[i]) {
+                if (cache_batch_copy)
+                    _image_cache->get(_cache_keys[i], _decompressed_buff_ptrs[i], _actual_decoded_width[i], _actual_decoded_height[i],
+                                      _original_width[i], _original_height[i]);
+                continue;
+            }
             // initialize the actual decoded height and width with the maximum
             _actual_decoded_width[i] = max_decoded_width;
             _actual_decoded_height[i] = max_decoded_height;
@@ -230,10 +423,12 @@ ImageReadAndDecode::load(unsigned char* buff,
                     int j = ((i + 1) != _batch_size) ? _batch_size - 1 : _batch_size - 2;
                     while ((j >= 0)) 
                     {
-                        if (_decoder[i]->decode_info(_compressed_buff[j].data(), _actual_read_size[j], &original_width, &original_height,
+                        if (!_cache_hit[j] && _decoder[i]->decode_info(_compressed_buff[j].data(), _actual_read_size[j], &original_width, &original_height,
                             &jpeg_sub_samp) == Decoder::Status::OK) 
                         {
                                 _image_names[i] =  _image_names[j];
+                                _cache_keys[i] =  _cache_keys[j];
+                                _sample_ids[i] =  _sample_ids[j];
                                 _compressed_buff[i] =  _compressed_buff[j];
                                 _actual_read_size[i] =  _actual_read_size[j];
                                 _compressed_image_size[i] =  _compressed_image_size[j];
@@ -270,8 +465,16 @@ ImageReadAndDecode::load(unsigned char* buff,
             _actual_decoded_width[i] = scaledw;
             _actual_decoded_height[i] = scaledh;
         }
+        if (_image_cache) {
+            // Only the rows holding the decoded image are kept
+            for (size_t i = 0; i < _batch_size; i++)
+                if (!_cache_hit[i])
+                    _image_cache->put(_cache_keys[i], _decompressed_buff_ptrs[i], _actual_decoded_height[i] * max_decoded_width * output_planes,
+                                      _actual_decoded_width[i], _actual_decoded_height[i], _original_width[i], _original_height[i]);
+        }
         for (size_t i = 0; i < _batch_size; i++) {
             names[i] = _image_names[i];
+            sample_ids[i] = _sample_ids[i];
             roi_width[i] = _actual_decoded_width[i];
             roi_height[i] = _actual_decoded_height[i];
             actual_width[i] = _original_width[i];
@@ -31,7 +31,8 @@ ImageLoaderNode::ImageLoaderNode(Image *output, void *device_resources):
 
 
 void ImageLoaderNode::init(unsigned internal_shard_count, unsigned cpu_num_threads, const std::string &source_path, const std::string &json_path, const std::map<std::string, std::string> feature_key_map, StorageType storage_type, DecoderType decoder_type, bool shuffle, bool loop,
-                           size_t load_batch_count, RocalMemType mem_type, std::shared_ptr<MetaDataReader> meta_data_reader, bool decoder_keep_orig, const char* file_prefix, unsigned sequence_length, unsigned step, unsigned stride)
+                           size_t load_batch_count, RocalMemType mem_type, std::shared_ptr<MetaDataReader> meta_data_reader, bool decoder_keep_orig, const char* file_prefix, unsigned sequence_length, unsigned step, unsigned stride,
+                           const std::string &index_path, const ImageCacheConfig &cache_config)
 {
     if(!_loader_module)
         THROW("ERROR: loader module is not set for ImageLoaderNode, cannot initialize")
@@ -49,7 +50,11 @@ void ImageLoaderNode::init(unsigned internal_shard_count, unsigned cpu_num_threa
     reader_cfg.set_sequence_length(sequence_length);
     reader_cfg.set_frame_step(step);
     reader_cfg.set_frame_stride(stride);
-    _loader_module->initialize(reader_cfg, DecoderConfig(decoder_type),
+    // index_path is used by the TFRecordReader and the dataset listing of the file and COCO readers
+    reader_cfg.set_index_path(index_path);
+    auto decoder_cfg = DecoderConfig(decoder_type);
+    decoder_cfg.set_cache_config(cache_config);
+    _loader_module->initialize(reader_cfg, decoder_cfg,
                               mem_type,
                               _batch_size, decoder_keep_orig);
     _loader_module->start_loading();
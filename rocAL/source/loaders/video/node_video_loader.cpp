@@ -33,7 +33,8 @@ VideoLoaderNode::VideoLoaderNode(Image *output, void *device_resources):
 }
 
 void VideoLoaderNode::init(unsigned internal_shard_count, const std::string &source_path, VideoStorageType storage_type, VideoDecoderType decoder_type, DecodeMode decoder_mode,
-                           unsigned sequence_length, unsigned step, unsigned stride, VideoProperties &video_prop, bool shuffle, bool loop, size_t load_batch_count, RocalMemType mem_type)
+                           unsigned sequence_length, unsigned step, unsigned stride, VideoProperties &video_prop, bool shuffle, bool loop, size_t load_batch_count, RocalMemType mem_type,
+                           unsigned decode_threads, size_t decode_thread_budget)
 {
     _decode_mode = decoder_mode;
     if (!_loader_module)
@@ -49,7 +50,11 @@ void VideoLoaderNode::init(unsigned internal_shard_count, const std::string &sou
     reader_cfg.set_frame_step(step);
     reader_cfg.set_frame_stride(stride);
     reader_cfg.set_video_properties(video_prop);
-    _loader_module->initialize(reader_cfg, VideoDecoderConfig(decoder_type), mem_type, _batch_size);
+    auto decoder_cfg = VideoDecoderConfig(decoder_type);
+    decoder_cfg.set_thread_count(decode_threads);
+    // Every internal shard loads with its own decoders
+    decoder_cfg.set_thread_budget(std::max<size_t>(decode_thread_budget / internal_shard_count, 1));
+    _loader_module->initialize(reader_cfg, decoder_cfg, mem_type, _batch_size);
     _loader_module->start_loading();
 }
 
@@ -0,0 +1,100 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#include "video_decoder_pool.h"
+#include "video_decoder_factory.h"
+#include "commons.h"
+
+#ifdef ROCAL_VIDEO
+void VideoDecoderPool::create(VideoDecoderConfig decoder_config, size_t capacity)
+{
+    _decoder_config = decoder_config;
+    _slots.clear();
+    _video_slots.clear();
+    _lru.clear();
+    _slots.resize(capacity);
+    for (size_t i = 0; i < capacity; i++)
+        _slots[i].lru_pos = _lru.insert(_lru.end(), i);
+}
+
+void VideoDecoderPool::touch(int index)
+{
+    _lru.splice(_lru.end(), _lru, _slots[index].lru_pos);
+}
+
+int VideoDecoderPool::acquire(const std::string &video_path)
+{
+    auto it = _video_slots.find(video_path);
+    if (it != _video_slots.end())
+    {
+        touch(it->second);
+        _slots[it->second].in_batch = true;
+        return it->second;
+    }
+    // The decoders of the batch were touched last, so the first decoder not in the batch is found near the front
+    int index = -1;
+    for (auto pos : _lru)
+    {
+        if (!_slots[pos].in_batch)
+        {
+            index = pos;
+            break;
+        }
+    }
+    if (index < 0)
+        THROW("VideoDecoderPool: All the " + TOSTR(_slots.size()) + " decoders are used by the batch")
+    auto &slot = _slots[index];
+    if (!slot.video_path.empty())
+    {
+        slot.decoder->release();
+        _video_slots.erase(slot.video_path);
+        slot.video_path.clear();
+        _epoch_closes++;
+    }
+    if (!slot.decoder)
+        slot.decoder = create_video_decoder(_decoder_config);
+    touch(index);
+    if (slot.decoder->Initialize(video_path.c_str()) != VideoDecoder::Status::OK)
+    {
+        slot.decoder->release();
+        return -1;
+    }
+    _epoch_opens++;
+    slot.video_path = video_path;
+    slot.in_batch = true;
+    _video_slots.emplace(video_path, index);
+    return index;
+}
+
+void VideoDecoderPool::end_batch()
+{
+    for (auto &slot : _slots)
+        slot.in_batch = false;
+}
+
+void VideoDecoderPool::end_epoch()
+{
+    LOG("VideoDecoderPool: Epoch " + TOSTR(_epoch) + " opened " + TOSTR(_epoch_opens) + " and closed " + TOSTR(_epoch_closes) + " videos with " + TOSTR(_slots.size()) + " decoders")
+    _epoch_opens = _epoch_closes = 0;
+    _epoch++;
+}
+#endif
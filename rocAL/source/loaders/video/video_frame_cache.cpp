@@ -0,0 +1,92 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#include "video_frame_cache.h"
+
+static std::string
+frame_key(const std::string &video_key, unsigned frame_number)
+{
+    return video_key + ":" + std::to_string(frame_number);
+}
+
+VideoFrameCache &
+VideoFrameCache::instance()
+{
+    static VideoFrameCache cache;
+    return cache;
+}
+
+void
+VideoFrameCache::set_capacity(size_t capacity)
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    _capacity = capacity;
+    evict(0);
+}
+
+size_t
+VideoFrameCache::capacity()
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    return _capacity;
+}
+
+VideoFrameCache::Frame
+VideoFrameCache::get(const std::string &video_key, unsigned frame_number)
+{
+    auto key = frame_key(video_key, frame_number);
+    std::lock_guard<std::mutex> lock(_lock);
+    auto it = _entries.find(key);
+    if (it == _entries.end())
+        return nullptr;
+    _lru.splice(_lru.begin(), _lru, it->second.lru_pos);
+    return it->second.data;
+}
+
+void
+VideoFrameCache::evict(size_t size)
+{
+    // Evicted frames still being copied out by a loader stay alive until it lets go of them
+    while (!_lru.empty() && _used + size > _capacity)
+    {
+        auto it = _entries.find(_lru.back());
+        _used -= it->second.data->size();
+        _entries.erase(it);
+        _lru.pop_back();
+    }
+}
+
+void
+VideoFrameCache::put(const std::string &video_key, unsigned frame_number, const unsigned char *data, size_t size)
+{
+    if (size > capacity())
+        return;
+    auto key = frame_key(video_key, frame_number);
+    auto frame = std::make_shared<const std::vector<unsigned char>>(data, data + size);
+    std::lock_guard<std::mutex> lock(_lock);
+    if (size > _capacity || _entries.find(key) != _entries.end())
+        return;
+    evict(size);
+    _lru.push_front(key);
+    _entries.emplace(key, Entry{frame, _lru.begin()});
+    _used += size;
+}
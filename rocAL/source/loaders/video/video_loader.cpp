@@ -114,9 +114,9 @@ void VideoLoader::stop_internal_thread()
     _stopped = true;
     _circ_buff.unblock_reader();
     _circ_buff.unblock_writer();
-    _circ_buff.reset();
     if (_load_thread.joinable())
         _load_thread.join();
+    _circ_buff.reset();
 }
 
 void VideoLoader::initialize(VideoReaderConfig reader_cfg, VideoDecoderConfig decoder_cfg, RocalMemType mem_type, unsigned batch_size, bool decoder_keep_original)
@@ -214,10 +214,10 @@ VideoLoader::load_routine()
             // read semaphore using release() call
             // , and calls the release() allows the reader thread to wake up and handle
             // the out-of-data case properly
-            // It also slows down the reader thread since there is no more data to read,
-            // till program ends or till reset is called
+            // There is no more data to read till program ends or till reset is called, both
+            // unblock the writer, so the thread waits for that instead of polling the reader
             _circ_buff.unblock_reader();
-            std::this_thread::sleep_for(std::chrono::seconds(1));
+            _circ_buff.block_until_writer_unblocked();
         }
     }
     return VideoLoaderModuleStatus::OK;
@@ -183,6 +183,10 @@ Timing VideoLoaderSharded::timing()
         max_read_time = (info.video_read_time > max_read_time) ? info.video_read_time : max_read_time;
         max_decode_time = (info.video_decode_time > max_decode_time) ? info.video_decode_time : max_decode_time;
         swap_handle_time += info.video_process_time;
+        t.video_frame_cache_hits += info.video_frame_cache_hits;
+        t.video_frame_cache_misses += info.video_frame_cache_misses;
+        t.video_decoder_opens += info.video_decoder_opens;
+        t.video_decoder_closes += info.video_decoder_closes;
     }
     t.video_decode_time = max_decode_time;
     t.video_read_time = max_read_time;
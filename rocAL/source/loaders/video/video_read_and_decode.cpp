@@ -22,6 +22,9 @@ THE SOFTWARE.
 
 #include "video_decoder_factory.h"
 #include "video_read_and_decode.h"
+#include "video_keyframe_index.h"
+#include "video_frame_cache.h"
+#include <sys/resource.h>
 
 namespace filesys = boost::filesystem;
 
@@ -51,6 +54,10 @@ VideoReadAndDecode::timing()
     Timing t;
     t.video_decode_time = _decode_time.get_timing();
     t.video_read_time = _file_load_time.get_timing();
+    t.video_frame_cache_hits = _frame_cache_hits;
+    t.video_frame_cache_misses = _frame_cache_misses;
+    t.video_decoder_opens = _decoder_pool.epoch_opens();
+    t.video_decoder_closes = _decoder_pool.epoch_closes();
     return t;
 }
 
@@ -62,7 +69,6 @@ VideoReadAndDecode::VideoReadAndDecode() : _file_load_time("FileLoadTime", DBG_T
 VideoReadAndDecode::~VideoReadAndDecode()
 {
     _video_reader = nullptr;
-    _video_decoder.clear();
 }
 
 void VideoReadAndDecode::create(VideoReaderConfig reader_config, VideoDecoderConfig decoder_config, int batch_size)
@@ -73,50 +79,34 @@ void VideoReadAndDecode::create(VideoReaderConfig reader_config, VideoDecoderCon
     _video_count = _video_prop.videos_count;
     _frame_rate = _video_prop.frame_rate;
     _batch_size = batch_size;
-    set_video_process_count(_video_count);
-    _video_decoder.resize(_video_process_count);
-    _video_names = _video_prop.video_file_names;
     _sequence_count = _batch_size / _sequence_length;
     _decompressed_buff_ptrs.resize(_sequence_count);
     _actual_decoded_width.resize(_sequence_count);
     _actual_decoded_height.resize(_sequence_count);
-    _video_decoder_config = decoder_config;
-
-    // Initialize the ffmpeg context once for the video files.
-    size_t i = 0;
-    for (; i < _video_process_count; i++)
+    // The decoders of the videos of a batch run in parallel, by default they split the thread budget evenly
+    if (decoder_config.thread_count() == 0)
     {
-        _video_decoder[i] = create_video_decoder(decoder_config);
-        std::vector<std::string> substrings;
-        char delim = '#';
-        substring_extraction(_video_names[i], delim, substrings);
-        video_map video_instance;
-        video_instance._video_map_idx = atoi(substrings[0].c_str());
-        video_instance._is_decoder_instance = true;
-        if (_video_decoder[i]->Initialize(substrings[1].c_str()) != VideoDecoder::Status::OK)
-            video_instance._is_decoder_instance = false;
-        _video_file_name_map.insert(std::pair<std::string, video_map>(_video_names[i], video_instance));
-    }
-    if (_video_process_count != _video_count)
-    {
-        while (i < _video_count)
-        {
-            std::vector<std::string> substrings;
-            char delim = '#';
-            substring_extraction(_video_names[i], delim, substrings);
-            video_map video_instance;
-            video_instance._video_map_idx = atoi(substrings[0].c_str());
-            video_instance._is_decoder_instance = false;
-            _video_file_name_map.insert(std::pair<std::string, video_map>(_video_names[i], video_instance));
-            i++;
-        }
+        size_t parallel_decoders = std::max<size_t>(std::min(_sequence_count, _video_count), 1);
+        decoder_config.set_thread_count(std::max<size_t>(decoder_config.thread_budget() / parallel_decoders, 1));
     }
+    _video_decoder_config = decoder_config;
+
+    // A batch takes a decoder for each of its videos, the pool keeps a decoder per core beyond that so that the videos of
+    // consecutive batches stay open, within half of the file descriptor limit of the process
+    size_t decoder_count = std::max<size_t>(_sequence_count, std::thread::hardware_concurrency());
+    struct rlimit file_limit;
+    if (getrlimit(RLIMIT_NOFILE, &file_limit) == 0 && file_limit.rlim_cur != RLIM_INFINITY)
+        decoder_count = std::min<size_t>(decoder_count, file_limit.rlim_cur / 2);
+    decoder_count = std::max(std::min(decoder_count, _video_count), std::min(_sequence_count, _video_count));
+    _decoder_pool.create(decoder_config, std::max<size_t>(decoder_count, 1));
+
     _video_reader = create_video_reader(reader_config);
 }
 
 void VideoReadAndDecode::reset()
 {
     _video_reader->reset();
+    _decoder_pool.end_epoch();
 }
 
 size_t
@@ -132,14 +122,92 @@ float VideoReadAndDecode::convert_framenum_to_timestamp(size_t frame_number)
     return timestamp;
 }
 
-void VideoReadAndDecode::decode_sequence(size_t sequence_index)
+void VideoReadAndDecode::decode_pass(size_t pass_index)
 {
-    if (_video_decoder[_sequence_video_idx[sequence_index]]->Decode(_decompressed_buff_ptrs[sequence_index], _sequence_start_frame_num[sequence_index], _sequence_length, _stride,
-                                                                    _max_decoded_width, _max_decoded_height, _max_decoded_stride, _out_pix_fmt) == VideoDecoder::Status::OK)
+    auto &pass = _decode_passes[pass_index];
+    auto &frame_cache = VideoFrameCache::instance();
+    const bool use_frame_cache = frame_cache.capacity() > 0;
+    const size_t image_size = _max_decoded_stride * _max_decoded_height;
+    // Frames are cached at the size and format they were converted to
+    std::string video_key;
+    if (use_frame_cache)
+        video_key = TOSTR(_max_decoded_width) + "x" + TOSTR(_max_decoded_height) + ":" + TOSTR(_out_pix_fmt) + ":" + _sequence_video_path[pass.front()];
+
+    // Only the frames after the cached ones at the start of a sequence are decoded
+    std::vector<VideoDecoder::Sequence> sequences;
+    for (auto sequence_index : pass)
+    {
+        unsigned start_frame = _sequence_start_frame_num[sequence_index];
+        unsigned char *buffer = _decompressed_buff_ptrs[sequence_index];
+        size_t cached_frames = 0;
+        if (use_frame_cache)
+        {
+            for (; cached_frames < _sequence_length; cached_frames++)
+            {
+                auto frame = frame_cache.get(video_key, start_frame + cached_frames * _stride);
+                if (!frame)
+                    break;
+                memcpy(buffer + cached_frames * image_size, frame->data(), image_size);
+            }
+            _frame_cache_hits += cached_frames;
+            _frame_cache_misses += _sequence_length - cached_frames;
+        }
+        if (cached_frames < _sequence_length)
+            sequences.push_back({buffer + cached_frames * image_size, (unsigned)(start_frame + cached_frames * _stride), _sequence_length - cached_frames});
+    }
+    std::stable_sort(sequences.begin(), sequences.end(), [](const VideoDecoder::Sequence &a, const VideoDecoder::Sequence &b)
+                     { return a.start_frame < b.start_frame; });
+    if (!sequences.empty() &&
+        _decoder_pool.decoder(_decode_pass_decoder_idx[pass_index])->DecodeSequences(sequences, _stride, _max_decoded_width, _max_decoded_height,
+                                                                            _max_decoded_stride, _out_pix_fmt) != VideoDecoder::Status::OK)
+        return;
+    for (auto sequence_index : pass)
     {
         _actual_decoded_width[sequence_index] = _max_decoded_width;
         _actual_decoded_height[sequence_index] = _max_decoded_height;
     }
+    if (use_frame_cache)
+    {
+        // Only the frames the decoder wrote, a sequence running past the end of the video keeps stale data after them
+        for (auto &sequence : sequences)
+            for (size_t f = 0; f < sequence.decoded; f++)
+                frame_cache.put(video_key, sequence.start_frame + f * _stride, sequence.buffer + f * image_size, image_size);
+    }
+}
+
+// Orders the sequences of every video by start frame and puts a sequence in the same pass as the previous one when the
+// decoder reaches its start frame without seeking: it starts before the previous sequences end or the keyframe it
+// would seek to is not after their end. Without a keyframe index only overlapping or adjacent sequences share a pass.
+void VideoReadAndDecode::schedule_decode_passes(std::map<int, std::vector<size_t>> &video_sequences)
+{
+    _decode_passes.clear();
+    _decode_pass_decoder_idx.clear();
+    for (auto &video : video_sequences)
+    {
+        auto &sequences = video.second;
+        std::stable_sort(sequences.begin(), sequences.end(), [this](size_t a, size_t b)
+                         { return _sequence_start_frame_num[a] < _sequence_start_frame_num[b]; });
+        std::vector<std::string> substrings;
+        char delim = '#';
+        substring_extraction(_sequence_video_path[sequences.front()], delim, substrings);
+        size_t prop_idx = atoi(substrings[0].c_str());
+        const std::vector<unsigned> empty_index;
+        const auto &keyframes = prop_idx < _video_prop.keyframes.size() ? _video_prop.keyframes[prop_idx] : empty_index;
+        size_t pass_end_frame = 0;
+        for (auto sequence_index : sequences)
+        {
+            size_t start_frame = _sequence_start_frame_num[sequence_index];
+            size_t seek_frame = keyframes.empty() ? start_frame : keyframe_at_or_before(keyframes, start_frame);
+            if (_decode_passes.empty() || _decode_pass_decoder_idx.back() != video.first || (seek_frame > pass_end_frame && start_frame > pass_end_frame + 1))
+            {
+                _decode_passes.emplace_back();
+                _decode_pass_decoder_idx.push_back(video.first);
+                pass_end_frame = 0;
+            }
+            _decode_passes.back().push_back(sequence_index);
+            pass_end_frame = std::max(pass_end_frame, start_frame + (_sequence_length - 1) * _stride);
+        }
+    }
 }
 
 VideoLoaderModuleStatus
@@ -177,10 +245,7 @@ VideoReadAndDecode::load(unsigned char *buff,
 
     _file_load_time.start(); // Debug timing
 
-    std::vector<size_t> sequential_decode_sequences;
-    std::vector<size_t> parallel_decode_sequences;
-    std::vector<int> video_index;
-    size_t parallel_sequence_count = 0;
+    std::map<int, std::vector<size_t>> video_sequences;
     _sequence_start_frame_num.resize(_sequence_count);
     _sequence_video_path.resize(_sequence_count);
     for (size_t i = 0; i < _sequence_count; i++)
@@ -190,68 +255,41 @@ VideoReadAndDecode::load(unsigned char *buff,
         _sequence_video_path[i] = sequence_info.video_file_name;
         _decompressed_buff_ptrs[i] = buff + (i * image_size * _sequence_length);
 
-        // Check if the video file is already initialized otherwise use an existing decoder instance to initialize the video
-        // std::cerr << "\nThe source video is " << _sequence_video_path[i] << " MAP : "<<_video_file_name_map.find(_sequence_video_path[i])->second._video_map_idx << "\tThe start index is : " << _sequence_start_frame_num[i] << "\n";
-        std::map<std::string, video_map>::iterator itr = _video_file_name_map.find(_sequence_video_path[i]);
-        if (itr->second._is_decoder_instance == false)
-        {
-            std::map<std::string, video_map>::iterator temp_itr;
-            for (temp_itr = _video_file_name_map.begin(); temp_itr != _video_file_name_map.end(); ++temp_itr)
-            {
-                if (temp_itr->second._is_decoder_instance == true)
-                {
-                    int video_idx = temp_itr->second._video_map_idx;
-                    if ((std::count(_sequence_video_idx.begin(), _sequence_video_idx.end(), video_idx) >= 1) && (_sequence_video_idx.size() != 0))
-                        continue;
-                    std::vector<std::string> substrings;
-                    char delim = '#';
-                    substring_extraction(itr->first, delim, substrings);
-                    if (_video_decoder[video_idx]->Initialize(substrings[1].c_str()) == VideoDecoder::Status::OK)
-                    {
-                        itr->second._video_map_idx = video_idx;
-                        itr->second._is_decoder_instance = true;
-                    }
-                    temp_itr->second._is_decoder_instance = false;
-                    break;
-                }
-            }
-        }
-        if (itr->second._is_decoder_instance == false)
+        // The sequences of a video that can't be opened are skipped
+        const std::string &video_name = _sequence_video_path[i];
+        int decoder_idx = _decoder_pool.acquire(video_name.substr(video_name.find('#') + 1));
+        if (decoder_idx < 0)
             continue;
-        _sequence_video_idx.push_back(itr->second._video_map_idx);
-
-        // Check if the sequences are from same or different video file
-        video_index.push_back(_video_file_name_map[_sequence_video_path[i]]._video_map_idx);
-        if (std::count(video_index.begin(), video_index.end(), video_index[i]) > 1)
-        {
-            sequential_decode_sequences.push_back(i);
-        }
-        else
-        {
-            parallel_decode_sequences.push_back(i);
-            parallel_sequence_count++;
-        }
-    }
-    if (parallel_sequence_count == 1)
-    {
-        sequential_decode_sequences.push_back(parallel_decode_sequences.back());
-        parallel_decode_sequences.clear();
+        video_sequences[decoder_idx].push_back(i);
     }
+    _decoder_pool.end_batch();
+    schedule_decode_passes(video_sequences);
 
     _file_load_time.end(); // Debug timing
 
     _decode_time.start(); // Debug timing
 
-    for (size_t i = 0; i < sequential_decode_sequences.size(); i++)
-        decode_sequence(sequential_decode_sequences[i]);
-
-    // Initialize threads to decode
-    std::vector<std::thread> decode_threads;
-    for (size_t i = 0; i < parallel_decode_sequences.size(); i++)
-        decode_threads.push_back(std::thread(&VideoReadAndDecode::decode_sequence, this, parallel_decode_sequences[i]));
-
-    for (auto &th : decode_threads)
-        th.join();
+    // Passes of different videos use different decoders and run in parallel
+    if (video_sequences.size() == 1)
+    {
+        for (size_t i = 0; i < _decode_passes.size(); i++)
+            decode_pass(i);
+    }
+    else
+    {
+        std::vector<std::thread> decode_threads;
+        for (auto &video : video_sequences)
+        {
+            int video_idx = video.first;
+            decode_threads.push_back(std::thread([this, video_idx]() {
+                for (size_t i = 0; i < _decode_passes.size(); i++)
+                    if (_decode_pass_decoder_idx[i] == video_idx)
+                        decode_pass(i);
+            }));
+        }
+        for (auto &th : decode_threads)
+            th.join();
+    }
 
     _decode_time.end(); // Debug timing
 
@@ -277,7 +315,6 @@ VideoReadAndDecode::load(unsigned char *buff,
     sequence_frame_timestamps_vec.insert(sequence_frame_timestamps_vec.begin(), sequence_frame_timestamps);
     _sequence_start_frame_num.clear();
     _sequence_video_path.clear();
-    _sequence_video_idx.clear();
     return VideoLoaderModuleStatus::OK;
 }
 #endif
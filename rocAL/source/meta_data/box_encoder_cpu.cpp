@@ -0,0 +1,217 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#if ENABLE_SIMD
+#include <immintrin.h>
+#endif
+#include "box_encoder_cpu.h"
+
+BoxEncoderCpu::BoxEncoderCpu(const std::vector<float> &anchors, float criteria, const std::vector<float> &means, const std::vector<float> &stds, bool offset, float scale)
+    : _anchor_count(anchors.size() / 4), _criteria(criteria), _offset(offset), _scale(scale)
+{
+    if (criteria < 0.f || criteria > 1.f || means.size() != 4 || stds.size() != 4)
+        THROW("BoxEncoder invalid input parameter")
+    for (unsigned i = 0; i < 4; i++)
+    {
+        _means[i] = means[i];
+        _inv_stds[i] = 1. / stds[i];
+    }
+    _anchors_l.resize(_anchor_count);
+    _anchors_t.resize(_anchor_count);
+    _anchors_r.resize(_anchor_count);
+    _anchors_b.resize(_anchor_count);
+    _anchors_area.resize(_anchor_count);
+    _anchors_xcycwh.resize(_anchor_count * 4);
+    _scaled_anchors_xcycwh.resize(_anchor_count * 4);
+    float half_scale = 0.5 * scale;
+    for (unsigned i = 0; i < _anchor_count; i++)
+    {
+        float l = anchors[i * 4], t = anchors[i * 4 + 1], r = anchors[i * 4 + 2], b = anchors[i * 4 + 3];
+        _anchors_l[i] = l;
+        _anchors_t[i] = t;
+        _anchors_r[i] = r;
+        _anchors_b[i] = b;
+        _anchors_area[i] = (b - t) * (r - l);
+        float *xcycwh = &_anchors_xcycwh[i * 4];
+        xcycwh[0] = 0.5 * (l + r);
+        xcycwh[1] = 0.5 * (t + b);
+        xcycwh[2] = r - l;
+        xcycwh[3] = b - t;
+        float *scaled = &_scaled_anchors_xcycwh[i * 4];
+        scaled[0] = (l + r) * half_scale;
+        scaled[1] = (t + b) * half_scale;
+        scaled[2] = (r - l) * scale;
+        scaled[3] = (b - t) * scale;
+    }
+}
+
+const char *BoxEncoderCpu::isa()
+{
+#if ENABLE_SIMD && __AVX2__
+    return "avx2";
+#else
+    return "scalar";
+#endif
+}
+
+void BoxEncoderCpu::match_boxes(const BoundingBoxCord *boxes, unsigned count, float *best_iou, int *best_box)
+{
+    static thread_local std::vector<unsigned> best_anchor;
+    best_anchor.resize(count);
+    for (unsigned box_idx = 0; box_idx < count; box_idx++)
+    {
+        const BoundingBoxCord &box = boxes[box_idx];
+        float box_area = (box.b - box.t) * (box.r - box.l);
+        // The first box initializes the best box of every anchor, the later ones take the anchors they overlap at least as much
+        bool first = box_idx == 0;
+        float box_best_iou = -1.f;
+        unsigned box_best_anchor = 0;
+        unsigned anchor_idx = 0;
+#if ENABLE_SIMD && __AVX2__
+        const __m256 pl = _mm256_set1_ps(box.l), pt = _mm256_set1_ps(box.t), pr = _mm256_set1_ps(box.r), pb = _mm256_set1_ps(box.b);
+        const __m256 parea = _mm256_set1_ps(box_area), pzero = _mm256_setzero_ps();
+        const __m256 pfirst = first ? _mm256_castsi256_ps(_mm256_set1_epi32(-1)) : pzero;
+        const __m256i pbox_idx = _mm256_set1_epi32(box_idx), pstep = _mm256_set1_epi32(8);
+        __m256 plane_best_iou = _mm256_set1_ps(-1.f);
+        __m256i plane_best_anchor = _mm256_setzero_si256(), panchor_idx = _mm256_setr_epi32(0, 1, 2, 3, 4, 5, 6, 7);
+        for (; anchor_idx + 8 <= _anchor_count; anchor_idx += 8)
+        {
+            __m256 xA = _mm256_max_ps(pl, _mm256_loadu_ps(&_anchors_l[anchor_idx]));
+            __m256 yA = _mm256_max_ps(pt, _mm256_loadu_ps(&_anchors_t[anchor_idx]));
+            __m256 xB = _mm256_min_ps(pr, _mm256_loadu_ps(&_anchors_r[anchor_idx]));
+            __m256 yB = _mm256_min_ps(pb, _mm256_loadu_ps(&_anchors_b[anchor_idx]));
+            __m256 intersection = _mm256_mul_ps(_mm256_max_ps(pzero, _mm256_sub_ps(xB, xA)), _mm256_max_ps(pzero, _mm256_sub_ps(yB, yA)));
+            __m256 iou = _mm256_div_ps(intersection, _mm256_sub_ps(_mm256_add_ps(parea, _mm256_loadu_ps(&_anchors_area[anchor_idx])), intersection));
+            __m256 anchor_best_iou = _mm256_loadu_ps(best_iou + anchor_idx);
+            __m256 take = _mm256_or_ps(pfirst, _mm256_cmp_ps(iou, anchor_best_iou, _CMP_GE_OQ));
+            _mm256_storeu_ps(best_iou + anchor_idx, _mm256_blendv_ps(anchor_best_iou, iou, take));
+            __m256 anchor_best_box = _mm256_castsi256_ps(_mm256_loadu_si256((const __m256i *)(best_box + anchor_idx)));
+            _mm256_storeu_si256((__m256i *)(best_box + anchor_idx), _mm256_castps_si256(_mm256_blendv_ps(anchor_best_box, _mm256_castsi256_ps(pbox_idx), take)));
+            __m256 better = _mm256_cmp_ps(iou, plane_best_iou, _CMP_GT_OQ);
+            plane_best_iou = _mm256_blendv_ps(plane_best_iou, iou, better);
+            plane_best_anchor = _mm256_castps_si256(_mm256_blendv_ps(_mm256_castsi256_ps(plane_best_anchor), _mm256_castsi256_ps(panchor_idx), better));
+            panchor_idx = _mm256_add_epi32(panchor_idx, pstep);
+        }
+        float lane_best_iou[8];
+        unsigned lane_best_anchor[8];
+        _mm256_storeu_ps(lane_best_iou, plane_best_iou);
+        _mm256_storeu_si256((__m256i *)lane_best_anchor, plane_best_anchor);
+        // Each lane holds the first of its best anchors, the first best anchor of the box is the lowest of the lanes with the highest IoU
+        for (unsigned lane = 0; lane < 8; lane++)
+        {
+            if (lane_best_iou[lane] > box_best_iou || (lane_best_iou[lane] == box_best_iou && lane_best_anchor[lane] < box_best_anchor))
+            {
+                box_best_iou = lane_best_iou[lane];
+                box_best_anchor = lane_best_anchor[lane];
+            }
+        }
+#endif
+        for (; anchor_idx < _anchor_count; anchor_idx++)
+        {
+            float xA = std::max(box.l, _anchors_l[anchor_idx]);
+            float yA = std::max(box.t, _anchors_t[anchor_idx]);
+            float xB = std::min(box.r, _anchors_r[anchor_idx]);
+            float yB = std::min(box.b, _anchors_b[anchor_idx]);
+            float intersection = std::max(0.f, xB - xA) * std::max(0.f, yB - yA);
+            float iou = intersection / (box_area + _anchors_area[anchor_idx] - intersection);
+            if (first || iou >= best_iou[anchor_idx])
+            {
+                best_iou[anchor_idx] = iou;
+                best_box[anchor_idx] = box_idx;
+            }
+            if (iou > box_best_iou)
+            {
+                box_best_iou = iou;
+                box_best_anchor = anchor_idx;
+            }
+        }
+        best_anchor[box_idx] = box_best_anchor;
+    }
+    // Every box is matched to its best anchor whatever the IoU, when several boxes have the same best anchor the last one keeps it
+    for (unsigned box_idx = 0; box_idx < count; box_idx++)
+    {
+        best_iou[best_anchor[box_idx]] = 2.f;
+        best_box[best_anchor[box_idx]] = box_idx;
+    }
+}
+
+void BoxEncoderCpu::encode_sample(const BoundingBoxCord *boxes, const int *labels, unsigned count, float *encoded_boxes, int *encoded_labels)
+{
+    // The unmatched anchors get the background label and either zero offsets or the anchor itself
+    if (_offset)
+        memset(encoded_boxes, 0, _anchor_count * 4 * sizeof(float));
+    else
+        memcpy(encoded_boxes, _anchors_xcycwh.data(), _anchor_count * 4 * sizeof(float));
+    memset(encoded_labels, 0, _anchor_count * sizeof(int));
+    if (count == 0)
+        return;
+
+    static thread_local std::vector<float> best_iou;
+    static thread_local std::vector<int> best_box;
+    best_iou.resize(_anchor_count);
+    best_box.resize(_anchor_count);
+    match_boxes(boxes, count, best_iou.data(), best_box.data());
+
+    float half_scale = 0.5 * _scale;
+    for (unsigned anchor_idx = 0; anchor_idx < _anchor_count; anchor_idx++)
+    {
+        if (!(best_iou[anchor_idx] > _criteria))
+            continue;
+        const BoundingBoxCord &box = boxes[best_box[anchor_idx]];
+        float *encoded_box = encoded_boxes + anchor_idx * 4;
+        if (_offset)
+        {
+            // Reference for offset calculation between the Ground Truth bounding boxes & anchor boxes in <xc,yc,w,h> format
+            // https://github.com/sgrvinod/a-PyTorch-Tutorial-to-Object-Detection#predictions-vis-%C3%A0-vis-priors
+            const float *anchor = &_scaled_anchors_xcycwh[anchor_idx * 4];
+            float xc = (box.l + box.r) * half_scale;
+            float yc = (box.t + box.b) * half_scale;
+            float w = (box.r - box.l) * _scale;
+            float h = (box.b - box.t) * _scale;
+            encoded_box[0] = ((xc - anchor[0]) / anchor[2] - _means[0]) * _inv_stds[0];
+            encoded_box[1] = ((yc - anchor[1]) / anchor[3] - _means[1]) * _inv_stds[1];
+            encoded_box[2] = (std::log(w / anchor[2]) - _means[2]) * _inv_stds[2];
+            encoded_box[3] = (std::log(h / anchor[3]) - _means[3]) * _inv_stds[3];
+        }
+        else
+        {
+            encoded_box[0] = 0.5 * (box.l + box.r);
+            encoded_box[1] = 0.5 * (box.t + box.b);
+            encoded_box[2] = box.r - box.l;
+            encoded_box[3] = box.b - box.t;
+        }
+        encoded_labels[anchor_idx] = labels[best_box[anchor_idx]];
+    }
+}
+
+void BoxEncoderCpu::Run(pMetaDataBatch full_batch_meta_data, float *encoded_boxes, int *encoded_labels)
+{
+    if (!full_batch_meta_data || !encoded_boxes || !encoded_labels)
+        THROW("BoxEncoderCpu::Run Invalid input metadata or output buffers")
+    auto &bb_batch = full_batch_meta_data->get_bb_batch();
+    #pragma omp parallel for
+    for (int i = 0; i < (int)bb_batch.samples(); i++)
+        encode_sample(bb_batch.cords_of(i), bb_batch.labels_of(i), bb_batch.count(i), encoded_boxes + (size_t)i * _anchor_count * 4, encoded_labels + (size_t)i * _anchor_count);
+}
@@ -57,6 +57,11 @@ void Caffe2MetaDataReader::add(std::string _image_name, int label)
 }
 
 void Caffe2MetaDataReader::lookup(const std::vector<std::string> &_image_names)
+{
+    lookup_by_id(_image_names, {});
+}
+
+void Caffe2MetaDataReader::lookup_by_id(const std::vector<std::string> &_image_names, const std::vector<int> &sample_ids)
 {
     if(_image_names.empty())
     {
@@ -68,11 +73,11 @@ void Caffe2MetaDataReader::lookup(const std::vector<std::string> &_image_names)
 
     for(unsigned i = 0; i < _image_names.size(); i++)
     {
-        auto _image_name = _image_names[i];
-        auto it = _map_content.find(_image_name);
-        if(_map_content.end() == it)
+        auto &_image_name = _image_names[i];
+        auto meta_data = _sample_index.get(_image_name, i < sample_ids.size() ? sample_ids[i] : -1);
+        if(!meta_data)
             THROW("ERROR: Given name not present in the map"+ _image_name )
-        _output->get_label_batch()[i] = it->second->get_label();
+        _output->get_label_batch()[i] = meta_data->get_label();
     }
 
 }
@@ -99,6 +104,7 @@ void Caffe2MetaDataReader::read_all(const std::string &path)
     file_size1 = in_file1.tellg();
     file_bytes = file_size + file_size1;
     read_lmdb_record(path, file_bytes);
+    _sample_index.build(_map_content);
     // print_map_contents();
 }
 
@@ -177,9 +183,11 @@ void Caffe2MetaDataReader::release(std::string _image_name)
         return;
     }
     _map_content.erase(_image_name);
+    _sample_index.erase(_image_name);
 }
 
 void Caffe2MetaDataReader::release() {
+    _sample_index.clear();
     _map_content.clear();
 }
 
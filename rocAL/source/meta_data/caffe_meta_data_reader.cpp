@@ -72,6 +72,7 @@ void CaffeMetaDataReader::print_map_contents()
 
 void CaffeMetaDataReader::release()
 {
+    _sample_index.clear();
     _map_content.clear();
 }
 
@@ -83,9 +84,15 @@ void CaffeMetaDataReader::release(std::string image_name)
         return;
     }
     _map_content.erase(image_name);
+    _sample_index.erase(image_name);
 }
 
-void CaffeMetaDataReader::lookup(const std::vector<std::string>& image_names)
+void CaffeMetaDataReader::lookup(const std::vector<std::string> &image_names)
+{
+    lookup_by_id(image_names, {});
+}
+
+void CaffeMetaDataReader::lookup_by_id(const std::vector<std::string> &image_names, const std::vector<int> &sample_ids)
 {
     if(image_names.empty())
     {
@@ -97,11 +104,11 @@ void CaffeMetaDataReader::lookup(const std::vector<std::string>& image_names)
 
     for(unsigned i = 0; i < image_names.size(); i++)
     {
-        auto image_name = image_names[i];
-        auto it = _map_content.find(image_name);
-        if(_map_content.end() == it)
+        auto &image_name = image_names[i];
+        auto meta_data = _sample_index.get(image_name, i < sample_ids.size() ? sample_ids[i] : -1);
+        if(!meta_data)
             THROW("ERROR: Given name not present in the map"+ image_name )
-        _output->get_label_batch()[i] = it->second->get_label();
+        _output->get_label_batch()[i] = meta_data->get_label();
     }
 }
 
@@ -119,6 +126,7 @@ void CaffeMetaDataReader::read_all(const std::string& _path)
     file_size1 = in_file1.tellg();
     file_bytes = file_size + file_size1;
     read_lmdb_record(_path, file_bytes);
+    _sample_index.build(_map_content);
     //print_map_contents();
 }
 
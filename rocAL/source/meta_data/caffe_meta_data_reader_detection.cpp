@@ -59,24 +59,29 @@ void CaffeMetaDataReaderDetection::add(std::string image_name, BoundingBoxCords
 }
 
 void CaffeMetaDataReaderDetection::lookup(const std::vector<std::string> &_image_names)
+{
+    lookup_by_id(_image_names, {});
+}
+
+void CaffeMetaDataReaderDetection::lookup_by_id(const std::vector<std::string> &_image_names, const std::vector<int> &sample_ids)
 {
     if (_image_names.empty())
     {
         WRN("No image names passed")
         return;
     }
-    if (_image_names.size() != (unsigned)_output->size())
-        _output->resize(_image_names.size());
+    _output->get_bb_batch().clear();
+    _output->get_img_sizes_batch().resize(_image_names.size());
 
     for (unsigned i = 0; i < _image_names.size(); i++)
     {
-        auto image_name = _image_names[i];
-        auto it = _map_content.find(image_name);
-        if (_map_content.end() == it)
+        auto &image_name = _image_names[i];
+        auto meta_data = _sample_index.get(image_name, i < sample_ids.size() ? sample_ids[i] : -1);
+        if (!meta_data)
             THROW("ERROR: Given name not present in the map" + image_name)
-        _output->get_bb_cords_batch()[i] = it->second->get_bb_cords();
-        _output->get_bb_labels_batch()[i] = it->second->get_bb_labels();
-        _output->get_img_sizes_batch()[i] = it->second->get_img_size();
+        auto &bb_cords = meta_data->get_bb_cords();
+        _output->get_bb_batch().add_sample(bb_cords.data(), meta_data->get_bb_labels().data(), bb_cords.size());
+        _output->get_img_sizes_batch()[i] = meta_data->get_img_size();
     }
 }
 
@@ -114,6 +119,7 @@ void CaffeMetaDataReaderDetection::read_all(const std::string &path)
     file_size1 = in_file1.tellg();
     file_bytes = file_size + file_size1;
     read_lmdb_record(path, file_bytes);
+    _sample_index.build(_map_content);
     // print_map_contents();
 }
 
@@ -203,10 +209,12 @@ void CaffeMetaDataReaderDetection::release(std::string _image_name)
         return;
     }
     _map_content.erase(_image_name);
+    _sample_index.erase(_image_name);
 }
 
 void CaffeMetaDataReaderDetection::release()
 {
+    _sample_index.clear();
     _map_content.clear();
 }
 
@@ -0,0 +1,268 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#include "coco_annotation_cache.h"
+#include <algorithm>
+#include <cstdio>
+#include <cstring>
+#include <fstream>
+#include <functional>
+#include <vector>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include "commons.h"
+#include "cache_files.h"
+
+static const char COCO_ANNOTATION_CACHE_MAGIC[8] = {'R', 'O', 'C', 'A', 'L', 'A', 'N', 'N'};
+static const uint32_t COCO_ANNOTATION_CACHE_VERSION = 1;
+static const std::string COCO_ANNOTATION_CACHE_EXTENSION = ".cache";
+
+// Cache file layout: CacheHeader, image_count CachedImage, the records of the content, then names_size bytes of names.
+// Box records are record_count float[4] ltrb cords followed by record_count int32 labels, key point records are
+// CachedKeyPoint. The records of image i are [first_record, first_record + record_count) of the image.
+struct CacheHeader
+{
+    char magic[8];
+    uint32_t version;
+    uint32_t content;
+    uint64_t source_size;
+    int64_t source_mtime;
+    uint32_t params[2];
+    uint64_t image_count;
+    uint64_t record_count;
+    uint64_t names_size;
+};
+
+struct CachedImage
+{
+    uint64_t name_offset;
+    uint32_t name_length;
+    int32_t width;
+    int32_t height;
+    uint32_t record_count;
+    uint64_t first_record;
+};
+
+struct CachedKeyPoint
+{
+    int32_t image_id;
+    int32_t annotation_id;
+    float center[2];
+    float scale[2];
+    float joints[NUMBER_OF_JOINTS][2];
+    float joints_visibility[NUMBER_OF_JOINTS][2];
+    float score;
+    float rotation;
+};
+
+static_assert(sizeof(CacheHeader) == 64 && sizeof(CachedImage) == 32, "The layout of the cache file changed");
+
+static size_t record_size(COCOAnnotationCache::Content content)
+{
+    return content == COCOAnnotationCache::Content::KEY_POINTS ? sizeof(CachedKeyPoint) : sizeof(float) * 4 + sizeof(int32_t);
+}
+
+static bool source_stat(const std::string &path, uint64_t &size, int64_t &mtime)
+{
+    struct stat st;
+    if (stat(path.c_str(), &st) != 0)
+        return false;
+    size = st.st_size;
+    mtime = (int64_t)st.st_mtim.tv_sec * 1000000000 + st.st_mtim.tv_nsec;
+    return true;
+}
+
+COCOAnnotationCache::COCOAnnotationCache(const std::string &annotations_path, Content content, std::array<uint32_t, 2> params)
+    : _annotations_path(annotations_path), _cache_path(annotations_path + COCO_ANNOTATION_CACHE_EXTENSION), _content(content), _params(params)
+{
+}
+
+bool COCOAnnotationCache::load(std::map<std::string, std::shared_ptr<MetaData>> &map_content)
+{
+    uint64_t source_size;
+    int64_t source_mtime;
+    if (!source_stat(_annotations_path, source_size, source_mtime))
+        return false;
+    int fd = ::open(_cache_path.c_str(), O_RDONLY);
+    if (fd < 0)
+        return false;
+    struct stat st;
+    if (fstat(fd, &st) != 0 || (size_t)st.st_size < sizeof(CacheHeader)) {
+        ::close(fd);
+        return false;
+    }
+    size_t cache_size = st.st_size;
+    auto cache = static_cast<const unsigned char *>(mmap(nullptr, cache_size, PROT_READ, MAP_PRIVATE, fd, 0));
+    ::close(fd);
+    if (cache == MAP_FAILED)
+        return false;
+    std::unique_ptr<const unsigned char, std::function<void(const unsigned char *)>> mapping(cache, [cache_size](const unsigned char *data)
+                                                                                             { munmap((void *)data, cache_size); });
+    auto header = reinterpret_cast<const CacheHeader *>(cache);
+    if (memcmp(header->magic, COCO_ANNOTATION_CACHE_MAGIC, sizeof(header->magic)) != 0 || header->version != COCO_ANNOTATION_CACHE_VERSION ||
+        header->content != (uint32_t)_content || header->params[0] != _params[0] || header->params[1] != _params[1]) {
+        LOG("COCOAnnotationCache: Ignoring the incompatible cache " + _cache_path)
+        return false;
+    }
+    if (header->source_size != source_size || header->source_mtime != source_mtime) {
+        LOG("COCOAnnotationCache: Rebuilding the stale cache " + _cache_path)
+        return false;
+    }
+    size_t records_offset = sizeof(CacheHeader) + header->image_count * sizeof(CachedImage);
+    size_t names_offset = records_offset + header->record_count * record_size(_content);
+    if (names_offset + header->names_size != cache_size) {
+        WRN("COCOAnnotationCache: Rebuilding the corrupted cache " + _cache_path)
+        return false;
+    }
+    auto images = reinterpret_cast<const CachedImage *>(cache + sizeof(CacheHeader));
+    auto names = reinterpret_cast<const char *>(cache + names_offset);
+    for (uint64_t i = 0; i < header->image_count; i++) {
+        if (images[i].name_offset + images[i].name_length > header->names_size || images[i].first_record + images[i].record_count > header->record_count) {
+            WRN("COCOAnnotationCache: Rebuilding the corrupted cache " + _cache_path)
+            map_content.clear();
+            return false;
+        }
+    }
+
+    map_content.clear();
+    if (_content == Content::BOUNDING_BOXES) {
+        auto cords = reinterpret_cast<const float *>(cache + records_offset);
+        auto labels = reinterpret_cast<const int32_t *>(cords + header->record_count * 4);
+        for (uint64_t i = 0; i < header->image_count; i++) {
+            auto &image = images[i];
+            BoundingBoxCords bb_cords;
+            bb_cords.reserve(image.record_count);
+            for (auto cord = cords + image.first_record * 4, end = cord + image.record_count * 4; cord < end; cord += 4)
+                bb_cords.emplace_back(cord[0], cord[1], cord[2], cord[3]);
+            BoundingBoxLabels bb_labels(labels + image.first_record, labels + image.first_record + image.record_count);
+            // The names were saved in the order of the map, so every entry goes at its end
+            map_content.emplace_hint(map_content.end(), std::string(names + image.name_offset, image.name_length),
+                                     std::make_shared<BoundingBox>(std::move(bb_cords), std::move(bb_labels), ImgSize{image.width, image.height}));
+        }
+    } else {
+        auto key_points = reinterpret_cast<const CachedKeyPoint *>(cache + records_offset);
+        for (uint64_t i = 0; i < header->image_count; i++) {
+            auto &image = images[i];
+            if (image.record_count == 0)
+                continue;
+            auto &key_point = key_points[image.first_record];
+            JointsData joints_data;
+            joints_data.image_id = key_point.image_id;
+            joints_data.annotation_id = key_point.annotation_id;
+            joints_data.image_path.assign(names + image.name_offset, image.name_length);
+            memcpy(joints_data.center, key_point.center, sizeof(joints_data.center));
+            memcpy(joints_data.scale, key_point.scale, sizeof(joints_data.scale));
+            joints_data.joints.resize(NUMBER_OF_JOINTS);
+            joints_data.joints_visibility.resize(NUMBER_OF_JOINTS);
+            for (unsigned j = 0; j < NUMBER_OF_JOINTS; j++) {
+                joints_data.joints[j].assign(key_point.joints[j], key_point.joints[j] + 2);
+                joints_data.joints_visibility[j].assign(key_point.joints_visibility[j], key_point.joints_visibility[j] + 2);
+            }
+            joints_data.score = key_point.score;
+            joints_data.rotation = key_point.rotation;
+            auto key_point_meta_data = std::make_shared<KeyPoint>(ImgSize{image.width, image.height}, &joints_data);
+            map_content.emplace_hint(map_content.end(), key_point_meta_data->get_joints_data().image_path, key_point_meta_data);
+        }
+    }
+    return true;
+}
+
+void COCOAnnotationCache::save(const std::map<std::string, std::shared_ptr<MetaData>> &map_content)
+{
+    CacheHeader header = {};
+    memcpy(header.magic, COCO_ANNOTATION_CACHE_MAGIC, sizeof(header.magic));
+    header.version = COCO_ANNOTATION_CACHE_VERSION;
+    header.content = (uint32_t)_content;
+    header.params[0] = _params[0];
+    header.params[1] = _params[1];
+    if (!source_stat(_annotations_path, header.source_size, header.source_mtime))
+        return;
+
+    std::vector<CachedImage> images;
+    std::vector<float> cords;
+    std::vector<int32_t> labels;
+    std::vector<CachedKeyPoint> key_points;
+    std::string names;
+    images.reserve(map_content.size());
+    for (auto &elem : map_content) {
+        CachedImage image = {};
+        image.name_offset = names.size();
+        image.name_length = elem.first.size();
+        image.width = elem.second->get_img_size().w;
+        image.height = elem.second->get_img_size().h;
+        names += elem.first;
+        if (_content == Content::BOUNDING_BOXES) {
+            auto &bb_cords = elem.second->get_bb_cords();
+            auto &bb_labels = elem.second->get_bb_labels();
+            image.first_record = labels.size();
+            image.record_count = bb_cords.size();
+            for (auto &cord : bb_cords)
+                cords.insert(cords.end(), {cord.l, cord.t, cord.r, cord.b});
+            labels.insert(labels.end(), bb_labels.begin(), bb_labels.end());
+        } else {
+            auto &joints_data = elem.second->get_joints_data();
+            CachedKeyPoint key_point = {};
+            key_point.image_id = joints_data.image_id;
+            key_point.annotation_id = joints_data.annotation_id;
+            memcpy(key_point.center, joints_data.center, sizeof(key_point.center));
+            memcpy(key_point.scale, joints_data.scale, sizeof(key_point.scale));
+            for (unsigned j = 0; j < NUMBER_OF_JOINTS && j < joints_data.joints.size(); j++) {
+                std::copy_n(joints_data.joints[j].begin(), std::min<size_t>(2, joints_data.joints[j].size()), key_point.joints[j]);
+                std::copy_n(joints_data.joints_visibility[j].begin(), std::min<size_t>(2, joints_data.joints_visibility[j].size()), key_point.joints_visibility[j]);
+            }
+            key_point.score = joints_data.score;
+            key_point.rotation = joints_data.rotation;
+            image.first_record = key_points.size();
+            image.record_count = 1;
+            key_points.push_back(key_point);
+        }
+        images.push_back(image);
+    }
+    header.image_count = images.size();
+    header.record_count = _content == Content::BOUNDING_BOXES ? labels.size() : key_points.size();
+    header.names_size = names.size();
+
+    // Written under a unique temporary name and renamed, so that pipelines starting together never read a partial cache
+    std::string temp_path = create_temp_file(_cache_path);
+    std::ofstream cache;
+    if (!temp_path.empty())
+        cache.open(temp_path, std::ios::binary | std::ios::trunc);
+    if (!cache.is_open()) {
+        WRN("COCOAnnotationCache: Cannot write the cache " + _cache_path + ", the annotations will be parsed again on the next run")
+        if (!temp_path.empty())
+            std::remove(temp_path.c_str());
+        return;
+    }
+    cache.write((const char *)&header, sizeof(header));
+    cache.write((const char *)images.data(), images.size() * sizeof(CachedImage));
+    cache.write((const char *)cords.data(), cords.size() * sizeof(float));
+    cache.write((const char *)labels.data(), labels.size() * sizeof(int32_t));
+    cache.write((const char *)key_points.data(), key_points.size() * sizeof(CachedKeyPoint));
+    cache.write(names.data(), names.size());
+    cache.close();
+    if (!cache || std::rename(temp_path.c_str(), _cache_path.c_str()) != 0) {
+        WRN("COCOAnnotationCache: Failed writing the cache " + _cache_path)
+        std::remove(temp_path.c_str());
+    }
+}
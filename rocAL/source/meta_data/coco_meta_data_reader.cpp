@@ -26,6 +26,7 @@ THE SOFTWARE.
 #include <algorithm>
 #include <fstream>
 #include "lookahead_parser.h"
+#include "coco_annotation_cache.h"
 
 using namespace std;
 
@@ -41,6 +42,11 @@ bool COCOMetaDataReader::exists(const std::string &image_name)
 }
 
 void COCOMetaDataReader::lookup(const std::vector<std::string> &image_names)
+{
+    lookup_by_id(image_names, {});
+}
+
+void COCOMetaDataReader::lookup_by_id(const std::vector<std::string> &image_names, const std::vector<int> &sample_ids)
 {
 
     if (image_names.empty())
@@ -48,18 +54,19 @@ void COCOMetaDataReader::lookup(const std::vector<std::string> &image_names)
         WRN("No image names passed")
         return;
     }
-    if (image_names.size() != (unsigned)_output->size())
-        _output->resize(image_names.size());
+    // the boxes of the batch are appended in order to the flat arrays of _output, which keep their capacity across batches
+    _output->get_bb_batch().clear();
+    _output->get_img_sizes_batch().resize(image_names.size());
 
     for (unsigned i = 0; i < image_names.size(); i++)
     {
-        auto image_name = image_names[i];
-        auto it = _map_content.find(image_name);
-        if (_map_content.end() == it)
+        auto &image_name = image_names[i];
+        auto meta_data = _sample_index.get(image_name, i < sample_ids.size() ? sample_ids[i] : -1);
+        if (!meta_data)
             THROW("ERROR: Given name not present in the map" + image_name)
-        _output->get_bb_cords_batch()[i] = it->second->get_bb_cords();
-        _output->get_bb_labels_batch()[i] = it->second->get_bb_labels();
-        _output->get_img_sizes_batch()[i] = it->second->get_img_size();
+        auto &bb_cords = meta_data->get_bb_cords();
+        _output->get_bb_batch().add_sample(bb_cords.data(), meta_data->get_bb_labels().data(), bb_cords.size());
+        _output->get_img_sizes_batch()[i] = meta_data->get_img_size();
     }
 }
 
@@ -100,6 +107,13 @@ void COCOMetaDataReader::print_map_contents()
 void COCOMetaDataReader::read_all(const std::string &path)
 {
     _coco_metadata_read_time.start(); // Debug timing
+    COCOAnnotationCache cache(path, COCOAnnotationCache::Content::BOUNDING_BOXES);
+    if (cache.load(_map_content))
+    {
+        _sample_index.build(_map_content);
+        _coco_metadata_read_time.end(); // Debug timing
+        return;
+    }
     std::ifstream f;
     f.open (path, std::ifstream::in|std::ios::binary);
     if (f.fail()) THROW("ERROR: Given annotations file not present " + path);
@@ -259,17 +273,11 @@ void COCOMetaDataReader::read_all(const std::string &path)
     }
     for (auto &elem : _map_content)
     {
-        bb_coords = elem.second->get_bb_cords();
-        bb_labels = elem.second->get_bb_labels();
-        BoundingBoxLabels continuous_label_id;
-        for (unsigned int i = 0; i < bb_coords.size(); i++)
-        {
-            auto _it_label = _label_info.find(bb_labels[i]);
-            int cnt_idx = _it_label->second;
-            continuous_label_id.push_back(cnt_idx);
-        }
-        elem.second->set_bb_labels(continuous_label_id);
+        for (auto &label : elem.second->get_bb_labels())
+            label = _label_info.find(label)->second;
     }
+    cache.save(_map_content);
+    _sample_index.build(_map_content);
     _coco_metadata_read_time.end(); // Debug timing
     //print_map_contents();
     // std::cout << "coco read time in sec: " << _coco_metadata_read_time.get_timing() / 1000 << std::endl;
@@ -283,10 +291,12 @@ void COCOMetaDataReader::release(std::string image_name)
         return;
     }
     _map_content.erase(image_name);
+    _sample_index.erase(image_name);
 }
 
 void COCOMetaDataReader::release()
 {
+    _sample_index.clear();
     _map_content.clear();
     _map_img_sizes.clear();
 }
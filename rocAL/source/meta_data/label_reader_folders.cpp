@@ -36,14 +36,12 @@ namespace filesys = boost::filesystem;
 
 LabelReaderFolders::LabelReaderFolders()
 {
-    _src_dir = nullptr;
-    _entity = nullptr;
-    _sub_dir = nullptr;
 }
 
 void LabelReaderFolders::init(const MetaDataConfig& cfg)
 {
     _path = cfg.path();
+    _index_path = cfg.index_path();
     _output = new LabelBatch();
 }
 bool LabelReaderFolders::exists(const std::string& image_name)
@@ -107,25 +105,14 @@ void LabelReaderFolders::lookup(const std::vector<std::string>& image_names)
 void LabelReaderFolders::read_all(const std::string& _path)
 {
     std::string _folder_path = _path;
-    if ((_sub_dir = opendir (_folder_path.c_str())) == nullptr)
-        THROW("ERROR: Failed opening the directory at " + _folder_path);
-
-    std::vector<std::string> entry_name_list;
     std::string _full_path = _folder_path;
-
-    while((_entity = readdir (_sub_dir)) != nullptr)
-    {
-        std::string entry_name(_entity->d_name);
-        if (strcmp(_entity->d_name, ".") == 0 || strcmp(_entity->d_name, "..") == 0) continue;
-        entry_name_list.push_back(entry_name);
-    }
-    std::sort(entry_name_list.begin(), entry_name_list.end());
-    closedir(_sub_dir);
+    // Same listing as the FileSourceReader, loaded from the manifest it wrote if they share the index path
+    _listing.load(_full_path, _index_path);
+    auto &entry_list = _listing.root_entries();
     uint label_counter = 0;
-    for (unsigned dir_count = 0; dir_count < entry_name_list.size(); ++dir_count) {
-        std::string subfolder_path = _full_path + "/" + entry_name_list[dir_count];
-        filesys::path pathObj(subfolder_path);
-        if(filesys::exists(pathObj) && filesys::is_regular_file(pathObj))
+    for (unsigned dir_count = 0; dir_count < entry_list.size(); ++dir_count) {
+        std::string subfolder_path = _full_path + "/" + entry_list[dir_count].first;
+        if(!entry_list[dir_count].second)
         {
             // ignore files with non-image extensions
             auto file_extension_idx = subfolder_path.find_last_of(".");
@@ -142,7 +129,7 @@ void LabelReaderFolders::read_all(const std::string& _path)
             }
             break;  // assume directory has only files.
         }
-        else if(filesys::exists(pathObj) && filesys::is_directory(pathObj))
+        else
         {
             _folder_path = subfolder_path;
             _subfolder_file_names.clear();
@@ -157,17 +144,11 @@ void LabelReaderFolders::read_all(const std::string& _path)
 
 void LabelReaderFolders::read_files(const std::string& _path)
 {
-    if ((_src_dir = opendir (_path.c_str())) == nullptr)
-        THROW("ERROR: Failed opening the directory at " + _path);
-
-    while((_entity = readdir (_src_dir)) != nullptr)
+    for (auto &filename : _listing.files(_path))
     {
-        if(_entity->d_type != DT_REG)
-            continue;
 
         std::string file_path = _path;
         file_path.append("/");
-        std::string filename(_entity->d_name);
         auto file_extension_idx = filename.find_last_of(".");
         if (file_extension_idx  != std::string::npos) {
             std::string file_extension = filename.substr(file_extension_idx+1);
@@ -176,12 +157,11 @@ void LabelReaderFolders::read_files(const std::string& _path)
             if ((file_extension != "jpg") && (file_extension != "jpeg") && (file_extension != "png") && (file_extension != "ppm") && (file_extension != "bmp") && (file_extension != "pgm") && (file_extension != "tif") && (file_extension != "tiff") && (file_extension != "webp"))
                 continue;
         }
-        file_path.append(_entity->d_name);
+        file_path.append(filename);
         _file_names.push_back(file_path);
-        _subfolder_file_names.push_back(_entity->d_name);
+        _subfolder_file_names.push_back(filename);
     }
     if(_file_names.empty())
         WRN("LabelReader: Could not find any file in " + _path)
-    closedir(_src_dir);
 }
 
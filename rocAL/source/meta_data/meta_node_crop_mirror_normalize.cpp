@@ -54,17 +54,14 @@ void CropMirrorNormalizeMetaNode::update_parameters(MetaDataBatch* input_meta_da
     vxCopyArrayRange((vx_array)_x1, 0, _batch_size, sizeof(uint),_x1_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_y1, 0, _batch_size, sizeof(uint),_y1_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_mirror, 0, _batch_size, sizeof(uint),_mirror_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
+    auto &input_bb = input_meta_data->get_bb_batch();
+    auto &output_bb = input_meta_data->get_bb_batch_scratch();
     for(int i = 0; i < _batch_size; i++)
     {
-        auto bb_count = input_meta_data->get_bb_labels_batch()[i].size();
-        int labels_buf[bb_count];
-        BoundingBoxCords coords_buf;
-        coords_buf.resize(bb_count);
-        memcpy(labels_buf, input_meta_data->get_bb_labels_batch()[i].data(),  sizeof(int)*bb_count);
-        memcpy((void *)coords_buf.data(), input_meta_data->get_bb_cords_batch()[i].data(), input_meta_data->get_bb_cords_batch()[i].size() * sizeof(BoundingBoxCord));
-        BoundingBoxCords bb_coords;
+        auto bb_count = input_bb.count(i);
+        const int *labels_buf = input_bb.labels_of(i);
+        BoundingBoxCord *coords_buf = input_bb.cords_of(i);
         BoundingBoxCord temp_box = {0, 0, 1, 1};
-        BoundingBoxLabels bb_labels;
         BoundingBoxCord crop_box;
         crop_box.l = (_x1_val[i]) / _src_width_val[i];
         crop_box.t = (_y1_val[i]) / _src_height_val[i];
@@ -91,18 +88,16 @@ void CropMirrorNormalizeMetaNode::update_parameters(MetaDataBatch* input_meta_da
                     coords_buf[j].r = 1 - coords_buf[j].l;
                     coords_buf[j].l = l;
                 }
-                bb_coords.push_back(coords_buf[j]);
-                bb_labels.push_back(labels_buf[j]);
+                output_bb.push_back(coords_buf[j], labels_buf[j]);
             }
         }
         // the following shouldn't happen since all crops should atleast have one bbox
-        if(bb_coords.size() == 0)
+        if(output_bb.pending() == 0)
         {
             std::cerr <<"Crop mirror Normalize - Zero Bounding boxes" << std::endl;
-            bb_coords.push_back(temp_box);
-            bb_labels.push_back(0);
+            output_bb.push_back(temp_box, 0);
         }
-        input_meta_data->get_bb_cords_batch()[i] = bb_coords;
-        input_meta_data->get_bb_labels_batch()[i] = bb_labels;
+        output_bb.end_sample();
     }
+    input_meta_data->swap_bb_batch();
 }
@@ -49,15 +49,13 @@ void CropResizeMetaNode::update_parameters(MetaDataBatch* input_meta_data)
     vxCopyArrayRange((vx_array)_y2, 0, _batch_size, sizeof(uint),_y2_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     BoundingBoxCord temp_box = {0, 0, 1, 1};
 
+    auto &input_bb = input_meta_data->get_bb_batch();
+    auto &output_bb = input_meta_data->get_bb_batch_scratch();
     for(int i = 0; i < _batch_size; i++)
     {
-        auto bb_count = input_meta_data->get_bb_labels_batch()[i].size();
-        int labels_buf[bb_count];
-        float coords_buf[bb_count*4];
-        memcpy(labels_buf, input_meta_data->get_bb_labels_batch()[i].data(),  sizeof(int)*bb_count);
-        memcpy(coords_buf, input_meta_data->get_bb_cords_batch()[i].data(), input_meta_data->get_bb_cords_batch()[i].size() * sizeof(BoundingBoxCord));
-        BoundingBoxCords bb_coords;
-        BoundingBoxLabels bb_labels;
+        auto bb_count = input_bb.count(i);
+        const int *labels_buf = input_bb.labels_of(i);
+        const float *coords_buf = reinterpret_cast<const float *>(input_bb.cords_of(i));
         BoundingBoxCord crop_box;
         _crop_w = _x2_val[i] - _x1_val[i];
         _crop_h = _y2_val[i] - _y1_val[i];
@@ -85,16 +83,14 @@ void CropResizeMetaNode::update_parameters(MetaDataBatch* input_meta_data)
                 box.r = (xB - crop_box.l) / (crop_box.r - crop_box.l);
                 box.b = (yB - crop_box.t) / (crop_box.b - crop_box.t);
                 
-                bb_coords.push_back(box);
-                bb_labels.push_back(labels_buf[j]);
+                output_bb.push_back(box, labels_buf[j]);
             }
         }
-        if(bb_coords.size() == 0)
+        if(output_bb.pending() == 0)
         {
-            bb_coords.push_back(temp_box);
-            bb_labels.push_back(0);
+            output_bb.push_back(temp_box, 0);
         }
-        input_meta_data->get_bb_cords_batch()[i] = bb_coords;
-        input_meta_data->get_bb_labels_batch()[i] = bb_labels;
+        output_bb.end_sample();
     }
+    input_meta_data->swap_bb_batch();
 }
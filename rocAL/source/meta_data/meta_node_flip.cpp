@@ -40,17 +40,12 @@ void FlipMetaNode::update_parameters(MetaDataBatch* input_meta_data)
     vxCopyArrayRange((vx_array)_src_width, 0, _batch_size, sizeof(uint),_src_width_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_src_height, 0, _batch_size, sizeof(uint),_src_height_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_flip_axis, 0, _batch_size, sizeof(int),_flip_axis_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
+    // flipping keeps the boxes of every sample, they are updated in place
+    auto &bb_batch = input_meta_data->get_bb_batch();
     for(int i = 0; i < _batch_size; i++)
     {
-        auto bb_count = input_meta_data->get_bb_labels_batch()[i].size();
-        BoundingBoxLabels labels_buf;
-        BoundingBoxCords coords_buf;
-        coords_buf.resize(bb_count);
-        labels_buf.resize(bb_count);
-        memcpy(labels_buf.data(), input_meta_data->get_bb_labels_batch()[i].data(),  sizeof(int)*bb_count);
-        memcpy((void *)coords_buf.data(), input_meta_data->get_bb_cords_batch()[i].data(), input_meta_data->get_bb_cords_batch()[i].size() * sizeof(BoundingBoxCord));
-        BoundingBoxCords bb_coords;
-        
+        auto bb_count = bb_batch.count(i);
+        BoundingBoxCord *coords_buf = bb_batch.cords_of(i);
         for(uint j = 0; j < bb_count; j++)
         {
             if(_flip_axis_val[i] == 0)
@@ -65,10 +60,6 @@ void FlipMetaNode::update_parameters(MetaDataBatch* input_meta_data)
                 coords_buf[j].b = 1 - coords_buf[j].t;
                 coords_buf[j].t = t;
             }
-            
-            bb_coords.push_back(coords_buf[j]);
         }
-        input_meta_data->get_bb_cords_batch()[i] = bb_coords;
-        input_meta_data->get_bb_labels_batch()[i] = labels_buf;
     }
 }
@@ -50,17 +50,14 @@ void ResizeCropMirrorMetaNode::update_parameters(MetaDataBatch* input_meta_data)
     vxCopyArrayRange((vx_array)_x2, 0, _batch_size, sizeof(uint),_x2_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_y2, 0, _batch_size, sizeof(uint),_y2_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_mirror, 0, _batch_size, sizeof(uint),_mirror_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
+    auto &input_bb = input_meta_data->get_bb_batch();
+    auto &output_bb = input_meta_data->get_bb_batch_scratch();
     for(int i = 0; i < _batch_size; i++)
     {
-        auto bb_count = input_meta_data->get_bb_labels_batch()[i].size();
-        int labels_buf[bb_count];
-        BoundingBoxCords box_coords_buf;
-        box_coords_buf.resize(bb_count);
-        memcpy(labels_buf, input_meta_data->get_bb_labels_batch()[i].data(),  sizeof(int)*bb_count);
-        memcpy((void *)box_coords_buf.data(), input_meta_data->get_bb_cords_batch()[i].data(), input_meta_data->get_bb_cords_batch()[i].size() * sizeof(BoundingBoxCord));
-        BoundingBoxCords bb_coords;
+        auto bb_count = input_bb.count(i);
+        const int *labels_buf = input_bb.labels_of(i);
+        BoundingBoxCord *box_coords_buf = input_bb.cords_of(i);
         BoundingBoxCord temp_box;
-        BoundingBoxLabels bb_labels;
         BoundingBoxCord crop_box;
         _crop_w = _x2_val[i] - _x1_val[i];
         _crop_h = _y2_val[i] - _y1_val[i];
@@ -87,18 +84,16 @@ void ResizeCropMirrorMetaNode::update_parameters(MetaDataBatch* input_meta_data)
                     box_coords_buf[j].r = 1 - box_coords_buf[j].l;
                     box_coords_buf[j].l = l;
                 }                  
-                bb_coords.push_back(box_coords_buf[j]);
-                bb_labels.push_back(labels_buf[j]);
+                output_bb.push_back(box_coords_buf[j], labels_buf[j]);
             }
         }
-        if(bb_coords.size() == 0)
+        if(output_bb.pending() == 0)
         {
             temp_box.l = temp_box.t = 0;
             temp_box.r = temp_box.b = 1;
-            bb_coords.push_back(temp_box);
-            bb_labels.push_back(0);
+            output_bb.push_back(temp_box, 0);
         }
-        input_meta_data->get_bb_cords_batch()[i] = bb_coords;
-        input_meta_data->get_bb_labels_batch()[i] = bb_labels;
+        output_bb.end_sample();
     }
+    input_meta_data->swap_bb_batch();
 }
@@ -43,15 +43,13 @@ void RotateMetaNode::update_parameters(MetaDataBatch* input_meta_data)
     vxCopyArrayRange((vx_array)_src_height, 0, _batch_size, sizeof(uint),_src_height_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_angle, 0, _batch_size, sizeof(float),_angle_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     BoundingBoxCord temp_box = {0, 0, 1, 1};
+    auto &input_bb = input_meta_data->get_bb_batch();
+    auto &output_bb = input_meta_data->get_bb_batch_scratch();
     for(int i = 0; i < _batch_size; i++)
     {
-        auto bb_count = input_meta_data->get_bb_labels_batch()[i].size();
-        int labels_buf[bb_count];
-        float coords_buf[bb_count*4];
-        memcpy(labels_buf, input_meta_data->get_bb_labels_batch()[i].data(),  sizeof(int)*bb_count);
-        memcpy(coords_buf, input_meta_data->get_bb_cords_batch()[i].data(), input_meta_data->get_bb_cords_batch()[i].size() * sizeof(BoundingBoxCord));
-        BoundingBoxCords bb_coords;
-        BoundingBoxLabels bb_labels;
+        auto bb_count = input_bb.count(i);
+        const int *labels_buf = input_bb.labels_of(i);
+        const float *coords_buf = reinterpret_cast<const float *>(input_bb.cords_of(i));
         BoundingBoxCord dest_image;
         dest_image.l = dest_image.t = 0;
         dest_image.r = _dst_width;
@@ -95,16 +93,14 @@ void RotateMetaNode::update_parameters(MetaDataBatch* input_meta_data)
                 box.t = std::max(dest_image.t, box.t);
                 box.r = std::min(dest_image.r, box.r);
                 box.b = std::min(dest_image.b, box.b);
-                bb_coords.push_back(box);
-                bb_labels.push_back(labels_buf[j]);
+                output_bb.push_back(box, labels_buf[j]);
             }
         }
-        if(bb_coords.size() == 0)
+        if(output_bb.pending() == 0)
         {
-            bb_coords.push_back(temp_box);
-            bb_labels.push_back(0);
+            output_bb.push_back(temp_box, 0);
         }
-        input_meta_data->get_bb_cords_batch()[i] = bb_coords;
-        input_meta_data->get_bb_labels_batch()[i] = bb_labels;
+        output_bb.end_sample();
     }
+    input_meta_data->swap_bb_batch();
 }
@@ -48,16 +48,13 @@ void SSDRandomCropMetaNode::update_parameters(MetaDataBatch *input_meta_data)
     vxCopyArrayRange((vx_array)_crop_height, 0, _batch_size, sizeof(uint),_crop_height_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_x1, 0, _batch_size, sizeof(uint),_x1_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
     vxCopyArrayRange((vx_array)_y1, 0, _batch_size, sizeof(uint),_y1_val.data(), VX_READ_ONLY, VX_MEMORY_TYPE_HOST);
+    auto &input_bb = input_meta_data->get_bb_batch();
+    auto &output_bb = input_meta_data->get_bb_batch_scratch();
     for(int i = 0; i < _batch_size; i++)
     {
-        auto bb_count = input_meta_data->get_bb_labels_batch()[i].size();
-        int labels_buf[bb_count];
-        BoundingBoxCords box_coords_buf;
-        box_coords_buf.resize(bb_count);
-        memcpy(labels_buf, input_meta_data->get_bb_labels_batch()[i].data(),  sizeof(int)*bb_count);
-        memcpy((void *)box_coords_buf.data(), input_meta_data->get_bb_cords_batch()[i].data(), input_meta_data->get_bb_cords_batch()[i].size() * sizeof(BoundingBoxCord));
-        BoundingBoxCords bb_coords;
-        BoundingBoxLabels bb_labels;
+        auto bb_count = input_bb.count(i);
+        const int *labels_buf = input_bb.labels_of(i);
+        BoundingBoxCord *box_coords_buf = input_bb.cords_of(i);
         BoundingBoxCord crop_box;
         crop_box.l = _x1_val[i];
         crop_box.t = _y1_val[i];
@@ -79,11 +76,10 @@ void SSDRandomCropMetaNode::update_parameters(MetaDataBatch *input_meta_data)
                 box_coords_buf[j].t = (yA - crop_box.t) / (crop_box.b - crop_box.t);
                 box_coords_buf[j].r = (xB - crop_box.l) / (crop_box.r - crop_box.l);
                 box_coords_buf[j].b = (yB - crop_box.t) / (crop_box.b - crop_box.t);
-                bb_coords.push_back(box_coords_buf[j]);
-                bb_labels.push_back(labels_buf[j]);
+                output_bb.push_back(box_coords_buf[j], labels_buf[j]);
             }
         }
-        input_meta_data->get_bb_cords_batch()[i] = bb_coords;
-        input_meta_data->get_bb_labels_batch()[i] = bb_labels;
+        output_bb.end_sample();
     }
+    input_meta_data->swap_bb_batch();
 }
\ No newline at end of file
@@ -0,0 +1,132 @@
+/*
+Copyright (c) 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#include <cstring>
+#include <cstdlib>
+#include "commons.h"
+#include "packed_meta_data.h"
+
+namespace
+{
+constexpr size_t SECTION_ALIGNMENT = 16;
+
+size_t align_up(size_t size) { return (size + SECTION_ALIGNMENT - 1) & ~(SECTION_ALIGNMENT - 1); }
+
+// Parses the leading number of an image name after its leading zeros, "000000397133.jpg" is 397133
+int image_id_from_name(const std::string &name)
+{
+    size_t start = name.find_first_not_of('0');
+    if (start == std::string::npos)
+        return name.empty() ? -1 : 0;
+    const char *begin = name.c_str() + start;
+    char *end = nullptr;
+    long id = std::strtol(begin, &end, 10);
+    if (end == begin)
+        return (start > 0) ? 0 : -1;
+    return static_cast<int>(id);
+}
+}
+
+const RocalBatchMetaData &PackedMetaData::pack(const ImageNameBatch &names, const pMetaDataBatch &meta_data)
+{
+    if (_valid)
+        return _view;
+    const size_t batch_size = names.size();
+    const bool has_labels = meta_data && meta_data->get_label_batch().size() == batch_size;
+    const bool has_boxes = meta_data && meta_data->get_bb_batch().samples() == batch_size;
+    const bool has_sizes = meta_data && meta_data->get_img_sizes_batch().size() == batch_size;
+
+    size_t total_name_size = 0, total_boxes = 0;
+    for (auto &name : names)
+        total_name_size += name.size();
+    if (has_boxes)
+        total_boxes = meta_data->get_bb_batch().total();
+
+    // Section sizes, every section starting on an aligned offset so that NumPy views of it are aligned
+    const size_t ints_per_image = sizeof(int) * batch_size;
+    const size_t offsets_size = sizeof(int) * (batch_size + 1);
+    size_t name_offsets_at = 0;
+    size_t image_ids_at = name_offsets_at + align_up(offsets_size);
+    size_t labels_at = image_ids_at + align_up(ints_per_image);
+    size_t box_counts_at = labels_at + (has_labels ? align_up(ints_per_image) : 0);
+    size_t box_offsets_at = box_counts_at + (has_boxes ? align_up(ints_per_image) : 0);
+    size_t boxes_at = box_offsets_at + (has_boxes ? align_up(offsets_size) : 0);
+    size_t box_labels_at = boxes_at + (has_boxes ? align_up(sizeof(BoundingBoxCord) * total_boxes) : 0);
+    size_t image_sizes_at = box_labels_at + (has_boxes ? align_up(sizeof(int) * total_boxes) : 0);
+    size_t names_at = image_sizes_at + (has_sizes ? align_up(sizeof(ImgSize) * batch_size) : 0);
+    size_t buffer_size = names_at + total_name_size;
+    if (_buffer.size() < buffer_size)
+        _buffer.resize(buffer_size);
+    unsigned char *buffer = _buffer.data();
+
+    int *name_offsets = reinterpret_cast<int *>(buffer + name_offsets_at);
+    int *image_ids = reinterpret_cast<int *>(buffer + image_ids_at);
+    char *packed_names = reinterpret_cast<char *>(buffer + names_at);
+    name_offsets[0] = 0;
+    for (size_t i = 0; i < batch_size; i++) {
+        memcpy(packed_names + name_offsets[i], names[i].data(), names[i].size());
+        name_offsets[i + 1] = name_offsets[i] + names[i].size();
+        image_ids[i] = image_id_from_name(names[i]);
+    }
+
+    _view = {};
+    _view.batch_size = batch_size;
+    _view.names = packed_names;
+    _view.name_offsets = name_offsets;
+    _view.image_ids = image_ids;
+    if (has_labels) {
+        int *labels = reinterpret_cast<int *>(buffer + labels_at);
+        memcpy(labels, meta_data->get_label_batch().data(), ints_per_image);
+        _view.labels = labels;
+    }
+    if (has_boxes) {
+        int *box_counts = reinterpret_cast<int *>(buffer + box_counts_at);
+        int *box_offsets = reinterpret_cast<int *>(buffer + box_offsets_at);
+        float *boxes = reinterpret_cast<float *>(buffer + boxes_at);
+        int *box_labels = reinterpret_cast<int *>(buffer + box_labels_at);
+        auto &bb = meta_data->get_bb_batch();
+        if (bb.cords.size() != total_boxes || bb.labels.size() != total_boxes)
+            THROW("Bounding box and label counts of the batch don't match " + TOSTR(bb.cords.size()) + " != " + TOSTR(bb.labels.size()))
+        for (size_t i = 0; i < batch_size; i++) {
+            box_counts[i] = bb.count(i);
+            box_offsets[i] = bb.offsets[i];
+        }
+        box_offsets[batch_size] = total_boxes;
+        memcpy(boxes, bb.cords.data(), sizeof(BoundingBoxCord) * total_boxes);
+        memcpy(box_labels, bb.labels.data(), sizeof(int) * total_boxes);
+        _view.total_boxes = total_boxes;
+        _view.box_counts = box_counts;
+        _view.box_offsets = box_offsets;
+        _view.boxes = boxes;
+        _view.box_labels = box_labels;
+    }
+    if (has_sizes) {
+        int *image_sizes = reinterpret_cast<int *>(buffer + image_sizes_at);
+        memcpy(image_sizes, meta_data->get_img_sizes_batch().data(), sizeof(ImgSize) * batch_size);
+        _view.image_sizes = image_sizes;
+    }
+    _view.buffer = buffer;
+    _view.buffer_size = buffer_size;
+    _valid = true;
+    return _view;
+}
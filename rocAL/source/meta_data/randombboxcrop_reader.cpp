@@ -151,15 +151,14 @@ void RandomBBoxCropReader::read_all()
     bool crop_success;
     BoundingBoxCord crop_box;
     uint bb_count;
-    _meta_bbox_map_content = _meta_data_reader->get_map_content();
     std::uniform_int_distribution<> option_dis(0, 6);
     std::uniform_real_distribution<float> _float_dis(0.3, 1.0);
 
     size_t sample = 0;
-    for (auto &elem : _meta_bbox_map_content)
+    for (auto &elem : _meta_data_reader->get_map_content())
     {
-        std::string image_name = elem.first;
-        BoundingBoxCords bb_coords = elem.second->get_bb_cords();
+        const std::string &image_name = elem.first;
+        const BoundingBoxCords &bb_coords = elem.second->get_bb_cords();
         bb_count = bb_coords.size();
         while (true)
         {
@@ -246,7 +245,7 @@ void RandomBBoxCropReader::read_all()
 }
 
 std::vector<std::vector<float>>
-RandomBBoxCropReader::get_batch_crop_coords(const std::vector<std::string> &image_names)
+RandomBBoxCropReader::get_batch_crop_coords(const std::vector<std::string> &image_names, const std::vector<int> &sample_ids)
 {
 
     if (image_names.empty())
@@ -265,19 +264,17 @@ RandomBBoxCropReader::get_batch_crop_coords(const std::vector<std::string> &imag
     bool crop_success;
     BoundingBoxCord crop_box;
     uint bb_count;
-    _meta_bbox_map_content = _meta_data_reader->get_map_content();
-
     std::uniform_int_distribution<> option_dis(0, 6);
     std::uniform_real_distribution<float> _float_dis(0.3, 1.0);
     _crop_coords.clear();
     for (unsigned int i = 0; i < image_names.size(); i++)
     {
-        auto image_name = image_names[i];
-        auto elem = _meta_bbox_map_content.find(image_name);
-        if (_meta_bbox_map_content.end() == elem)
+        auto &image_name = image_names[i];
+        auto meta_data = _meta_data_reader->sample(image_name, i < sample_ids.size() ? sample_ids[i] : -1);
+        if (!meta_data)
             THROW("ERROR: Given name not present in the map" + image_name)
-        BoundingBoxCords bb_coords = elem->second->get_bb_cords();
-        ImgSize img_size = elem->second->get_img_size();
+        const BoundingBoxCords &bb_coords = meta_data->get_bb_cords();
+        ImgSize img_size = meta_data->get_img_size();
         int img_width = img_size.w;
         bb_count = bb_coords.size();
         crop_success = false;
@@ -30,6 +30,7 @@ THE SOFTWARE.
 #include <google/protobuf/message_lite.h>
 #include "example.pb.h"
 #include "feature.pb.h"
+#include "tf_record_reader.h"
 
 using namespace std;
 
@@ -184,7 +185,7 @@ void TFMetaDataReader::read_files(const std::string& _path)
 
     while((_entity = readdir (_src_dir)) != nullptr)
     {
-        if(_entity->d_type != DT_REG)
+        if(_entity->d_type != DT_REG || is_tf_record_index_file(_entity->d_name))
             continue;
 
         _file_names.push_back(_entity->d_name);  
@@ -30,6 +30,7 @@ THE SOFTWARE.
 #include <google/protobuf/message_lite.h>
 #include "example.pb.h"
 #include "feature.pb.h"
+#include "tf_record_reader.h"
 
 using namespace std;
 
@@ -61,31 +62,36 @@ void TFMetaDataReaderDetection::add(std::string image_name, BoundingBoxCords bb_
 }
 
 void TFMetaDataReaderDetection::lookup(const std::vector<std::string> &image_names)
+{
+    lookup_by_id(image_names, {});
+}
+
+void TFMetaDataReaderDetection::lookup_by_id(const std::vector<std::string> &image_names, const std::vector<int> &sample_ids)
 {
     if(image_names.empty())
     {
         WRN("No image names passed")
         return;
     }
-    if(image_names.size() != (unsigned)_output->size())   
-        _output->resize(image_names.size());
+    _output->get_bb_batch().clear();
+    _output->get_img_sizes_batch().resize(image_names.size());
 
     for(unsigned i = 0; i < image_names.size(); i++)
     {
-        auto image_name = image_names[i];
-        auto it = _map_content.find(image_name);
-	
-        if(_map_content.end() == it)
+        auto &image_name = image_names[i];
+        auto meta_data = _sample_index.get(image_name, i < sample_ids.size() ? sample_ids[i] : -1);
+        if(!meta_data)
         {
-            _output->get_bb_cords_batch()[i] = {{0, 0, 0, 0}};
-            _output->get_bb_labels_batch()[i] = {{0}};
+            BoundingBoxCord empty_box(0, 0, 0, 0);
+            int empty_label = 0;
+            _output->get_bb_batch().add_sample(&empty_box, &empty_label, 1);
             _output->get_img_sizes_batch()[i] = {0, 0};
         }
         else
         {
-            _output->get_bb_cords_batch()[i] = it->second->get_bb_cords();
-            _output->get_bb_labels_batch()[i] = it->second->get_bb_labels();
-            _output->get_img_sizes_batch()[i] = it->second->get_img_size();
+            auto &bb_cords = meta_data->get_bb_cords();
+            _output->get_bb_batch().add_sample(bb_cords.data(), meta_data->get_bb_labels().data(), bb_cords.size());
+            _output->get_img_sizes_batch()[i] = meta_data->get_img_size();
         }
     }
 }
@@ -238,6 +244,7 @@ void TFMetaDataReaderDetection::read_all(const std::string &path)
         _last_rec = false;
         file_contents.close();
     }
+    _sample_index.build(_map_content);
     // google::protobuf::ShutdownProtobufLibrary();
     // print_map_contents();
 }
@@ -250,9 +257,11 @@ void TFMetaDataReaderDetection::release(std::string _image_name)
         return;
     }
     _map_content.erase(_image_name);
+    _sample_index.erase(_image_name);
 }
 
 void TFMetaDataReaderDetection::release() {
+    _sample_index.clear();
     _map_content.clear();
 }
 
@@ -263,7 +272,7 @@ void TFMetaDataReaderDetection::read_files(const std::string& _path)
 
     while((_entity = readdir (_src_dir)) != nullptr)
     {
-        if(_entity->d_type != DT_REG)
+        if(_entity->d_type != DT_REG || is_tf_record_index_file(_entity->d_name))
             continue;
 
         _file_names.push_back(_entity->d_name);  
@@ -58,7 +58,7 @@ bool VideoLabelReader::exists(const std::string &frame_name)
 void VideoLabelReader::add(std::string frame_name, int label, unsigned int video_frame_count, unsigned int start_frame)
 {
     Properties props;
-    open_video_context(frame_name.c_str(), props);
+    get_video_properties(frame_name.c_str(), props);
     unsigned frame_count = video_frame_count ? video_frame_count : props.frames_count;
     if ((video_frame_count + start_frame) > props.frames_count)
         THROW("The given frame numbers in txt file exceeds the maximum frames in the video" + frame_name)
@@ -141,7 +141,7 @@ void VideoLabelReader::read_text_file(const std::string &_path)
             std::istringstream line_ss(line);
             if (!(line_ss >> video_file_name >> label))
                 continue;
-            open_video_context(video_file_name.c_str(), props);
+            get_video_properties(video_file_name.c_str(), props);
             if (!_file_list_frame_num)
             {
                 float start_time = 0.0;
@@ -171,6 +171,7 @@ void VideoLabelReader::read_all(const std::string &_path)
 {
     std::string _folder_path = _path;
     filesys::path pathObj(_folder_path);
+    probe_source_videos(_path.c_str());
     if (filesys::exists(pathObj) && filesys::is_regular_file(pathObj))
     {
         if (pathObj.has_extension() && pathObj.extension().string() == ".txt")
@@ -0,0 +1,57 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#include "cache_files.h"
+#include <cstdlib>
+#include <sstream>
+#include <vector>
+#include <unistd.h>
+#include <boost/filesystem.hpp>
+
+std::string rocal_cache_file_path(const std::string &path, const std::string &prefix)
+{
+    std::string cache_dir;
+    if (const char *xdg_cache_home = std::getenv("XDG_CACHE_HOME"))
+        cache_dir = std::string(xdg_cache_home) + "/rocal";
+    else if (const char *home = std::getenv("HOME"))
+        cache_dir = std::string(home) + "/.cache/rocal";
+    else
+        cache_dir = "/tmp/rocal";
+    // A folder that can't be created fails the writes of the cache files, which only costs building them again
+    boost::system::error_code error;
+    boost::filesystem::create_directories(cache_dir, error);
+    std::stringstream name;
+    name << cache_dir << "/" << prefix << "_" << std::hex << std::hash<std::string>{}(boost::filesystem::absolute(path).string()) << ".txt";
+    return name.str();
+}
+
+std::string create_temp_file(const std::string &path)
+{
+    std::string name_template = path + ".XXXXXX";
+    std::vector<char> name(name_template.begin(), name_template.end());
+    name.push_back('\0');
+    int fd = mkstemp(name.data());
+    if (fd < 0)
+        return "";
+    close(fd);
+    return name.data();
+}
@@ -25,6 +25,7 @@ THE SOFTWARE.
 #include <vx_ext_amd.h>
 #include <VX/vx_types.h>
 #include <cstring>
+#include <atomic>
 #include <sched.h>
 #include <half/half.hpp>
 #include "master_graph.h"
@@ -35,6 +36,7 @@ THE SOFTWARE.
 #include "meta_data_graph_factory.h"
 #include "randombboxcrop_meta_data_reader_factory.h"
 #include "node_copy.h"
+#include "tensor_conversion.h"
 
 using half_float::half;
 
@@ -235,6 +237,7 @@ MasterGraph::run()
     } else {
         _ring_buffer.pop(); // Pop previously used output images and metadata from the ring buffer
     }
+    _packed_meta_data.invalidate();
 
     // If the last batch of processed imaged has been just popped from the ring_buffer it means user has previously consumed all the processed images.
     // User should check using the IsEmpty() API and not call run() or copy() API when there is no more data. run() will return MasterGraph::Status::NO_MORE_DATA flag to notify it.
@@ -273,6 +276,18 @@ MasterGraph::calculate_cpu_num_threads(size_t shard_count)
     return _cpu_num_threads;
 }
 
+size_t
+MasterGraph::reserve_cpu_threads(size_t shard_count)
+{
+    // The loader's threads run alongside the graph and the host tensor conversions, which run two threads per core of
+    // _cpu_num_threads. Half of the cores go to each so that together they don't run more threads than the CPU has.
+    const unsigned default_smt_count = 2;
+    size_t core_count = calculate_cpu_num_threads(shard_count);
+    size_t reserved_core_count = core_count / 2;
+    _cpu_num_threads = std::max<size_t>(core_count - reserved_core_count, 1);
+    return std::max<size_t>(reserved_core_count * default_smt_count, 1);
+}
+
 void
 MasterGraph::create_single_graph()
 {
@@ -311,6 +326,7 @@ MasterGraph::build()
     _ring_buffer.init(_mem_type, nullptr, output_byte_size(), _output_images.size());
 #endif
     if (_is_box_encoder) _ring_buffer.initBoxEncoderMetaData(_mem_type, _user_batch_size*_num_anchors*4*sizeof(float), _user_batch_size*_num_anchors*sizeof(int));
+    if (_meta_data_reader) _ring_buffer.initLabelsMetaData(_user_batch_size*sizeof(int));
     create_single_graph();
     start_processing();
     return Status::OK;
@@ -386,6 +402,17 @@ void MasterGraph::release()
     for(auto& image: _output_images)
         delete image;// It will call the vxReleaseImage internally in the destructor
     deallocate_output_tensor();
+#if ENABLE_HIP
+    if(_mem_type == RocalMemType::HIP)
+    {
+        if(_exported_tensor && hipFree(_exported_tensor) != hipSuccess)
+            ERR("Could not release the exported tensor")
+    }
+    else
+#endif
+        free(_exported_tensor);
+    _exported_tensor = nullptr;
+    _exported_tensor_size = 0;
 
 
     if(_graph != nullptr)
@@ -509,6 +536,7 @@ MasterGraph::reset()
     if(_output_thread.joinable())
         _output_thread.join();
     _ring_buffer.reset();
+    _packed_meta_data.invalidate();
     // clearing meta ring buffer
 #ifdef ROCAL_VIDEO
     if(_is_video_loader)
@@ -570,6 +598,62 @@ MasterGraph::timing()
 
 #define CHECK_CL_CALL_RET(x) { cl_int ret; ret = x; if( ret != CL_SUCCESS) THROW("ocl call failed "+STR(#x)+" error "+TOSTR(ret)) }
 
+std::vector<void*>
+MasterGraph::output_buffers()
+{
+    if(no_more_processed_data())
+        return {};
+#if ENABLE_OPENCL
+    if(_mem_type == RocalMemType::OCL)
+        THROW("Exporting the OCL output buffers is not supported")
+#endif
+    return _ring_buffer.get_read_buffers();
+}
+
+MasterGraph::Status
+MasterGraph::to_exported_tensor(void **out_ptr, RocalTensorFormat format, float multiplier0, float multiplier1,
+                             float multiplier2, float offset0, float offset1, float offset2, bool reverse_channels, RocalTensorDataType output_data_type)
+{
+    if(no_more_processed_data())
+        return MasterGraph::Status::NO_MORE_DATA;
+    auto output_mem_type = RocalOutputMemType::ROCAL_MEMCPY_HOST;
+    size_t size = output_sample_size() * _output_images.size() * tensor_element_size(output_data_type);
+#if ENABLE_HIP
+    if(_mem_type == RocalMemType::HIP)
+    {
+        output_mem_type = RocalOutputMemType::ROCAL_MEMCPY_GPU;
+        if(size > _exported_tensor_size)
+        {
+            if(_exported_tensor && hipFree(_exported_tensor) != hipSuccess)
+                ERR("Could not release the exported tensor")
+            _exported_tensor = nullptr;
+            _exported_tensor_size = 0;
+            hipError_t err = hipMalloc(&_exported_tensor, size);
+            if(err != hipSuccess)
+                THROW("hipMalloc of size " + TOSTR(size) + " failed " + TOSTR(err))
+            _exported_tensor_size = size;
+        }
+    }
+    else
+#elif ENABLE_OPENCL
+    if(_mem_type == RocalMemType::OCL)
+        THROW("Exporting the OCL output tensor is not supported")
+#endif
+    if(size > _exported_tensor_size)
+    {
+        const size_t alignment = 256;
+        free(_exported_tensor);
+        _exported_tensor = aligned_alloc(alignment, alignment * (size / alignment + 1));
+        _exported_tensor_size = _exported_tensor ? size : 0;
+        if(!_exported_tensor)
+            THROW("Allocating the exported tensor of size " + TOSTR(size) + " failed")
+    }
+    auto ret = to_tensor(_exported_tensor, format, multiplier0, multiplier1, multiplier2, offset0, offset1, offset2,
+                         reverse_channels, output_data_type, output_mem_type);
+    *out_ptr = _exported_tensor;
+    return ret;
+}
+
 MasterGraph::Status
 MasterGraph::to_tensor(void *out_ptr, RocalTensorFormat format, float multiplier0, float multiplier1,
                              float multiplier2, float offset0, float offset1, float offset2, bool reverse_channels, RocalTensorDataType output_data_type, RocalOutputMemType output_mem_type)
@@ -591,8 +675,8 @@ MasterGraph::to_tensor(void *out_ptr, RocalTensorFormat format, float multiplier
 #if ENABLE_OPENCL
     if(_output_image_info.mem_type() == RocalMemType::OCL)
     {
-        if(output_data_type == RocalTensorDataType::FP16)
-            THROW("FP16 tensor output for GPU affinity is not implemented")
+        if(output_data_type != RocalTensorDataType::FP32)
+            THROW("FP16 and UINT8 tensor output for GPU affinity is not implemented")
         // OCL device memory
         cl_int status;
 
@@ -647,6 +731,9 @@ MasterGraph::to_tensor(void *out_ptr, RocalTensorFormat format, float multiplier
             THROW("clEnqueueReadBuffer failed: " + TOSTR(status))
     }
 #elif ENABLE_HIP
+    if((_output_image_info.mem_type() == RocalMemType::HIP || output_mem_type == RocalOutputMemType::ROCAL_MEMCPY_GPU) &&
+       output_data_type == RocalTensorDataType::UINT8)
+        THROW("UINT8 tensor output for GPU memory is not implemented")
     if(_output_image_info.mem_type() == RocalMemType::HIP)
     {
         unsigned int fp16 = (output_data_type == RocalTensorDataType::FP16);
@@ -705,210 +792,20 @@ MasterGraph::to_tensor(void *out_ptr, RocalTensorFormat format, float multiplier
     }
 #endif
     if((_output_image_info.mem_type() == RocalMemType::HOST))
-    {        
+    {
         if(output_mem_type == RocalOutputMemType::ROCAL_MEMCPY_HOST)
         {
             float multiplier[3] = {multiplier0, multiplier1, multiplier2 };
             float offset[3] = {offset0, offset1, offset2 };
-            size_t dest_buf_offset_start = 0;
+            size_t dest_buf_offset = 0;
+            size_t element_size = tensor_element_size(output_data_type);
 
             auto output_buffers =_ring_buffer.get_read_buffers();
-            auto num_threads = _cpu_num_threads * 2;
             for( auto&& out_image: output_buffers)
             {
-                unsigned int single_image_size = w * c * h;
-                #pragma omp parallel for num_threads(num_threads)
-                for(unsigned int batchCount = 0; batchCount < n; batchCount ++)
-                {
-                    size_t dest_buf_offset = dest_buf_offset_start + single_image_size*batchCount;
-                    auto in_buffer = (unsigned char*)out_image + single_image_size*batchCount;
-
-                    if(format == RocalTensorFormat::NHWC)
-                    {
-                        if(output_data_type == RocalTensorDataType::FP32)
-                        {
-                            float *output_tensor_32 = static_cast<float *>(out_ptr);
-                            auto channel_size = w * h;
-                            for (unsigned channel_idx = 0; channel_idx < c; channel_idx++) {
-                                for (unsigned i = 0; i < channel_size; i++)
-                                    output_tensor_32[dest_buf_offset + channel_idx + i * c] =
-                                            offset[channel_idx] + multiplier[channel_idx] *
-                                                                    (reverse_channels ? (float) (in_buffer[i * c + c - channel_idx - 1])
-                                                                                    : (float) (in_buffer[i * c + channel_idx]));
-                            }
-                        }
-                        else if(output_data_type == RocalTensorDataType::FP16)
-                        {
-                            half *output_tensor_16 = static_cast<half *>(out_ptr);
-                            auto channel_size = w * h;
-                            for (unsigned channel_idx = 0; channel_idx < c; channel_idx++) {
-                                for (unsigned i = 0; i < channel_size; i++)
-                                    output_tensor_16[dest_buf_offset + channel_idx + i * c] =
-                                            offset[channel_idx] + multiplier[channel_idx] *
-                                                                (reverse_channels ? (half) (in_buffer[i * c + c - channel_idx - 1])
-                                                                                    : (half) (in_buffer[i * c + channel_idx]));
-                            }
-                        }
-                    }
-                    if(format == RocalTensorFormat::NCHW)
-                    {
-                        if(output_data_type == RocalTensorDataType::FP32)
-                        {
-                            float *output_tensor_32 = static_cast<float *>(out_ptr);
-                            auto channel_size  = w * h;
-                            if(c != 3)
-                            {
-                                for(unsigned i = 0; i < channel_size; i++)
-                                    output_tensor_32[dest_buf_offset + i] = offset[0] + multiplier[0]*(float)in_buffer[c*i];
-                            }
-                            else {
-        #if (ENABLE_SIMD && __AVX2__)
-                                float *B_buf = output_tensor_32 + dest_buf_offset;
-                                float *G_buf = B_buf + channel_size;
-                                float *R_buf = G_buf + channel_size;
-
-                                __m256i mask_B, mask_G, mask_R;
-                                if (reverse_channels) {
-                                    mask_B = _mm256_setr_epi32(0x80808000, 0x80808003, 0x80808006, 0x80808009, 0x80808000,
-                                                            0x80808003, 0x80808006, 0x80808009);
-                                    mask_G = _mm256_setr_epi32(0x80808001, 0x80808004, 0x80808007, 0x8080800A, 0x80808001,
-                                                            0x80808004, 0x80808007, 0x8080800A);
-                                    mask_R = _mm256_setr_epi32(0x80808002, 0x80808005, 0x80808008, 0x8080800B, 0x80808002,
-                                                            0x80808005, 0x80808008, 0x8080800B);
-                                } else {
-                                    mask_R = _mm256_setr_epi32(0x80808000, 0x80808003, 0x80808006, 0x80808009, 0x80808000,
-                                                            0x80808003, 0x80808006, 0x80808009);
-                                    mask_G = _mm256_setr_epi32(0x80808001, 0x80808004, 0x80808007, 0x8080800A, 0x80808001,
-                                                            0x80808004, 0x80808007, 0x8080800A);
-                                    mask_B = _mm256_setr_epi32(0x80808002, 0x80808005, 0x80808008, 0x8080800B, 0x80808002,
-                                                            0x80808005, 0x80808008, 0x8080800B);
-                                }
-                                __m256 pmul0 = _mm256_set1_ps(multiplier0);
-                                __m256 pmul1 = _mm256_set1_ps(multiplier1);
-                                __m256 pmul2 = _mm256_set1_ps(multiplier2);
-                                __m256 padd0 = _mm256_set1_ps(offset0);
-                                __m256 padd1 = _mm256_set1_ps(offset1);
-                                __m256 padd2 = _mm256_set1_ps(offset2);
-                                unsigned int alignedLength = (channel_size & ~7);    // multiple of 8
-                                unsigned int i = 0;
-
-                                __m256 fR, fG, fB;
-                                for (; i < alignedLength; i += 8) {
-                                    __m256i pix0 = _mm256_loadu_si256((const __m256i *) in_buffer);
-                                    pix0 = _mm256_permutevar8x32_epi32(pix0, _mm256_setr_epi32(0, 1, 2, 3, 3, 4, 5, 6));
-                                    fB = _mm256_cvtepi32_ps(_mm256_shuffle_epi8(pix0, mask_R));
-                                    fG = _mm256_cvtepi32_ps(_mm256_shuffle_epi8(pix0, mask_G));
-                                    fR = _mm256_cvtepi32_ps(_mm256_shuffle_epi8(pix0, mask_B));
-                                    fB = _mm256_mul_ps(fB, pmul0);
-                                    fG = _mm256_mul_ps(fG, pmul1);
-                                    fR = _mm256_mul_ps(fR, pmul2);
-                                    fB = _mm256_add_ps(fB, padd0);
-                                    fG = _mm256_add_ps(fG, padd1);
-                                    fR = _mm256_add_ps(fR, padd2);
-                                    _mm256_storeu_ps(B_buf, fB);
-                                    _mm256_storeu_ps(G_buf, fG);
-                                    _mm256_storeu_ps(R_buf, fR);
-                                    B_buf += 8;
-                                    G_buf += 8;
-                                    R_buf += 8;
-                                    in_buffer += 24;
-                                }
-                                for (; i < channel_size; i++, in_buffer += 3) {
-                                    *B_buf++ = (in_buffer[0] * multiplier0) + offset0;
-                                    *G_buf++ = (in_buffer[1] * multiplier1) + offset1;
-                                    *R_buf++ = (in_buffer[2] * multiplier2) + offset1;
-                                }
-        #else
-                                for(unsigned channel_idx = 0; channel_idx < c; channel_idx++) {
-                                    for(unsigned i = 0; i < channel_size; i++)
-                                        output_tensor_32[dest_buf_offset+channel_idx*channel_size + i] =
-                                                offset[channel_idx] + multiplier[channel_idx]*(reverse_channels ? (float)(in_buffer[(c*i+c-channel_idx-1)]) :
-                                                (float)(in_buffer[(c*i+channel_idx)]));
-                                }
-        #endif
-                            }
-                        }
-                        else if(output_data_type == RocalTensorDataType::FP16) 
-                        {
-                            half *output_tensor_16 = static_cast<half *>(out_ptr);
-                            auto channel_size = w * h;
-                            if(c != 3) {
-                                for(unsigned i = 0; i < channel_size; i++)
-                                    output_tensor_16[dest_buf_offset + i] = offset[0] + multiplier[0] * (half)in_buffer[c * i];
-                            }
-                            else {
-        #if (ENABLE_SIMD && __AVX2__)
-                                half *B_buf_16 = output_tensor_16 + dest_buf_offset;
-                                half *G_buf_16 = B_buf_16 + channel_size;
-                                half *R_buf_16 = G_buf_16 + channel_size;
-
-                                __m256i mask_B, mask_G, mask_R;
-                                if (reverse_channels) {
-                                    mask_B = _mm256_setr_epi32(0x80808000, 0x80808003, 0x80808006, 0x80808009, 0x80808000,
-                                                                0x80808003, 0x80808006, 0x80808009);
-                                    mask_G = _mm256_setr_epi32(0x80808001, 0x80808004, 0x80808007, 0x8080800A, 0x80808001,
-                                                                0x80808004, 0x80808007, 0x8080800A);
-                                    mask_R = _mm256_setr_epi32(0x80808002, 0x80808005, 0x80808008, 0x8080800B, 0x80808002,
-                                                                0x80808005, 0x80808008, 0x8080800B);
-                                } else {
-                                    mask_R = _mm256_setr_epi32(0x80808000, 0x80808003, 0x80808006, 0x80808009, 0x80808000,
-                                                                0x80808003, 0x80808006, 0x80808009);
-                                    mask_G = _mm256_setr_epi32(0x80808001, 0x80808004, 0x80808007, 0x8080800A, 0x80808001,
-                                                                0x80808004, 0x80808007, 0x8080800A);
-                                    mask_B = _mm256_setr_epi32(0x80808002, 0x80808005, 0x80808008, 0x8080800B, 0x80808002,
-                                                                0x80808005, 0x80808008, 0x8080800B);
-                                }
-                                __m256 pmul0 = _mm256_set1_ps(multiplier0);
-                                __m256 pmul1 = _mm256_set1_ps(multiplier1);
-                                __m256 pmul2 = _mm256_set1_ps(multiplier2);
-                                __m256 padd0 = _mm256_set1_ps(offset0);
-                                __m256 padd1 = _mm256_set1_ps(offset1);
-                                __m256 padd2 = _mm256_set1_ps(offset2);
-                                unsigned int alignedLength = (channel_size & ~7);    // multiple of 8
-                                unsigned int i = 0;
-
-                                __m256 fR, fG, fB;
-                                __m128i tempR, tempG, tempB;
-                                for (; i < alignedLength; i += 8) {
-                                    __m256i pix0 = _mm256_loadu_si256((const __m256i *) in_buffer);
-                                    pix0 = _mm256_permutevar8x32_epi32(pix0, _mm256_setr_epi32(0, 1, 2, 3, 3, 4, 5, 6));
-                                    fB = _mm256_cvtepi32_ps(_mm256_shuffle_epi8(pix0, mask_R));
-                                    fG = _mm256_cvtepi32_ps(_mm256_shuffle_epi8(pix0, mask_G));
-                                    fR = _mm256_cvtepi32_ps(_mm256_shuffle_epi8(pix0, mask_B));
-                                    fB = _mm256_fmadd_ps(fB, pmul0, padd0);
-                                    fG = _mm256_fmadd_ps(fG, pmul1, padd1);
-                                    fR = _mm256_fmadd_ps(fR, pmul2, padd2);
-                                    tempB = _mm256_cvtps_ph(fB, _MM_FROUND_TO_ZERO | _MM_FROUND_NO_EXC);
-                                    tempG = _mm256_cvtps_ph(fG, _MM_FROUND_TO_ZERO | _MM_FROUND_NO_EXC);
-                                    tempR = _mm256_cvtps_ph(fR, _MM_FROUND_TO_ZERO | _MM_FROUND_NO_EXC);
-                                    _mm_storeu_si128((__m128i *)B_buf_16, tempB);
-                                    _mm_storeu_si128((__m128i *)G_buf_16, tempG);
-                                    _mm_storeu_si128((__m128i *)R_buf_16, tempR);
-                                    B_buf_16 += 8;
-                                    G_buf_16 += 8;
-                                    R_buf_16 += 8;
-                                    in_buffer += 24;
-                                }
-                                for (; i < channel_size; i++, in_buffer += 3) {
-                                    *B_buf_16++ = (half) (in_buffer[0] * multiplier0) + offset0;
-                                    *G_buf_16++ = (half) (in_buffer[1] * multiplier1) + offset1;
-                                    *R_buf_16++ = (half) (in_buffer[2] * multiplier2) + offset2;
-                                }
-        #else
-                                for (unsigned channel_idx = 0; channel_idx < c; channel_idx++) {
-                                    for (unsigned i = 0; i < channel_size; i++)
-                                        output_tensor_16[dest_buf_offset + channel_idx * channel_size + i] =
-                                                offset[channel_idx] + multiplier[channel_idx] *
-                                                                    (reverse_channels ? (half) (in_buffer[(c * i + c - channel_idx - 1)])
-                                                                                        : (half) (in_buffer[(c * i + channel_idx)]));
-                                }
-        #endif
-                            }
-                        }
-                    }  // NCHW or NHWC
-                } // for loop batch
-
-                dest_buf_offset_start += single_output_image_size;
+                convert_u8_to_tensor(static_cast<unsigned char *>(out_image), static_cast<unsigned char *>(out_ptr) + dest_buf_offset * element_size,
+                                     n, h, w, c, false, format, output_data_type, multiplier, offset, reverse_channels, _cpu_num_threads * 2);
+                dest_buf_offset += single_output_image_size;
             }
         }
     }
@@ -1004,7 +901,8 @@ void MasterGraph::output_routine()
                 notify_user_thread();
                 // the following call is required in case the ring buffer is waiting for more data to be loaded and there is no more data to process.
                 _ring_buffer.release_if_empty();
-                std::this_thread::sleep_for(std::chrono::milliseconds(100));
+                // Nothing more to process till reset() or till the pipeline is released, both unblock the ring buffer's writer
+                _ring_buffer.block_until_writer_unblocked();
                 continue;
             }
             _rb_block_if_full_time.start();
@@ -1030,7 +928,7 @@ void MasterGraph::output_routine()
 
             // meta_data lookup is done before _meta_data_graph->process() is called to have the new meta_data ready for processing
             if (_meta_data_reader)
-                _meta_data_reader->lookup(this_cycle_names);
+                _meta_data_reader->lookup_by_id(this_cycle_names, decode_image_info._sample_ids);
 
             full_batch_image_names += this_cycle_names;
 
@@ -1068,23 +966,24 @@ void MasterGraph::output_routine()
                 if (full_batch_meta_data)
                     full_batch_meta_data->concatenate(_augmented_meta_data);
                 else
-                    full_batch_meta_data = _augmented_meta_data->clone();
+                    full_batch_meta_data = copy_augmented_meta_data();
             }
             _graph->process();
             _bencode_time.start();
             if(_is_box_encoder )
             {
+                // get bbox encoder write buffers
+                auto bbox_encode_write_buffers = _ring_buffer.get_box_encode_write_buffers();
 #if ENABLE_HIP
                 if(_mem_type == RocalMemType::HIP){
-                    // get bbox encoder read buffers
-                    auto bbox_encode_write_buffers = _ring_buffer.get_box_encode_write_buffers();
                     if (_box_encoder_gpu) _box_encoder_gpu->Run(full_batch_meta_data, (float *)bbox_encode_write_buffers.first, (int *)bbox_encode_write_buffers.second);
-                    //_meta_data_graph->update_box_encoder_meta_data_gpu(_anchors_gpu_buf, num_anchors, full_batch_meta_data, _criteria, _offset, _scale, _means, _stds);
                 }else
 #endif
-                    _meta_data_graph->update_box_encoder_meta_data(&_anchors, full_batch_meta_data, _criteria, _offset, _scale, _means, _stds);
+                    _box_encoder_cpu->Run(full_batch_meta_data, (float *)bbox_encode_write_buffers.first, (int *)bbox_encode_write_buffers.second);
             }
             _bencode_time.end();
+            if (full_batch_meta_data)
+                _ring_buffer.stage_labels(full_batch_meta_data->get_label_batch().data(), full_batch_meta_data->get_label_batch().size());
             _ring_buffer.set_meta_data(full_batch_image_names, full_batch_meta_data);
             _ring_buffer.push(); // Image data and metadata is now stored in output the ring_buffer, increases it's level by 1
         }
@@ -1117,7 +1016,8 @@ void MasterGraph::output_routine_video()
                 notify_user_thread();
                 // the following call is required in case the ring buffer is waiting for more data to be loaded and there is no more data to process.
                 _ring_buffer.release_if_empty();
-                std::this_thread::sleep_for(std::chrono::milliseconds(100));
+                // Nothing more to process till reset() or till the pipeline is released, both unblock the ring buffer's writer
+                _ring_buffer.block_until_writer_unblocked();
                 continue;
             }
 
@@ -1177,13 +1077,21 @@ void MasterGraph::output_routine_video()
                 if (full_batch_meta_data)
                     full_batch_meta_data->concatenate(_augmented_meta_data);
                 else
-                    full_batch_meta_data = _augmented_meta_data->clone();
+                    full_batch_meta_data = copy_augmented_meta_data();
             }
             _graph->process();
             if(_is_box_encoder )
             {
-                _meta_data_graph->update_box_encoder_meta_data(&_anchors, full_batch_meta_data, _criteria, _offset, _scale, _means, _stds);
+                auto bbox_encode_write_buffers = _ring_buffer.get_box_encode_write_buffers();
+#if ENABLE_HIP
+                if(_mem_type == RocalMemType::HIP){
+                    if (_box_encoder_gpu) _box_encoder_gpu->Run(full_batch_meta_data, (float *)bbox_encode_write_buffers.first, (int *)bbox_encode_write_buffers.second);
+                }else
+#endif
+                    _box_encoder_cpu->Run(full_batch_meta_data, (float *)bbox_encode_write_buffers.first, (int *)bbox_encode_write_buffers.second);
             }
+            if (full_batch_meta_data)
+                _ring_buffer.stage_labels(full_batch_meta_data->get_label_batch().data(), full_batch_meta_data->get_label_batch().size());
             _ring_buffer.set_meta_data(full_batch_image_names, full_batch_meta_data);
             _ring_buffer.push(); // Image data and metadata is now stored in output the ring_buffer, increases it's level by 1
         }
@@ -1274,11 +1182,12 @@ MetaDataBatch * MasterGraph::create_tf_record_meta_data_reader(const char *sourc
     return _meta_data_reader->get_output();
 }
 
-MetaDataBatch * MasterGraph::create_label_reader(const char *source_path, MetaDataReaderType reader_type)
+MetaDataBatch * MasterGraph::create_label_reader(const char *source_path, MetaDataReaderType reader_type, const char *index_path)
 {
     if( _meta_data_reader)
         THROW("A metadata reader has already been created")
     MetaDataConfig config(MetaDataType::Label, reader_type, source_path);
+    config.set_index_path(index_path);
     _meta_data_reader = create_meta_data_reader(config);
     _meta_data_reader->init(config);
     _meta_data_reader->read_all(source_path);
@@ -1354,11 +1263,7 @@ void MasterGraph::box_encoder(std::vector<float> &anchors, float criteria, const
         return;
     }
 #endif
-    _offset = offset;
-    _anchors = anchors;
-    _scale = scale;
-    _means = means;
-    _stds = stds;
+    _box_encoder_cpu = std::make_unique<BoxEncoderCpu>(anchors, criteria, means, stds, offset, scale);
 }
 
 MetaDataBatch * MasterGraph::create_caffe2_lmdb_record_meta_data_reader(const char *source_path, MetaDataReaderType reader_type , MetaDataType label_type)
@@ -1416,12 +1321,35 @@ const std::pair<ImageNameBatch,pMetaDataBatch>& MasterGraph::meta_data()
     return _ring_buffer.get_meta_data();
 }
 
+const RocalBatchMetaData& MasterGraph::packed_meta_data()
+{
+    if(_packed_meta_data.valid())
+        return _packed_meta_data.get();
+    auto &meta_data = this->meta_data();
+    return _packed_meta_data.pack(meta_data.first, meta_data.second);
+}
+
+pMetaDataBatch MasterGraph::copy_augmented_meta_data()
+{
+    for (auto &meta_data : _meta_data_pool)
+    {
+        if (meta_data.use_count() == 1)
+        {
+            std::atomic_thread_fence(std::memory_order_acquire); // pairs with the release of the last other reference
+            meta_data->copy(*_augmented_meta_data);
+            return meta_data;
+        }
+    }
+    _meta_data_pool.push_back(_augmented_meta_data->clone());
+    return _meta_data_pool.back();
+}
+
 size_t MasterGraph::bounding_box_batch_count(int *buf, pMetaDataBatch meta_data_batch)
 {
     size_t size = 0;
     for(unsigned i = 0; i < _user_batch_size; i++)
     {
-        buf[i] = _is_box_encoder? _num_anchors: meta_data_batch->get_bb_labels_batch()[i].size();
+        buf[i] = _is_box_encoder? _num_anchors: meta_data_batch->get_bb_batch().count(i);
         size += buf[i];
     }
     return size;
@@ -1481,131 +1409,14 @@ MasterGraph::copy_out_tensor_planar(void *out_ptr, RocalTensorFormat format, flo
         float multiplier[3] = {multiplier0, multiplier1, multiplier2 };
         float offset[3] = {offset0, offset1, offset2 };
         size_t dest_buf_offset = 0;
+        size_t element_size = tensor_element_size(output_data_type);
 
         auto output_buffers =_ring_buffer.get_read_buffers();
 
         for( auto&& out_image: output_buffers)
         {
-            for (unsigned batch = 0; batch < n ; batch++) {
-                const size_t batch_offset = w*h*c*batch;
-                auto in_buffer = (unsigned char *) out_image + batch_offset;
-                if (format == RocalTensorFormat::NHWC) {
-                    if (output_data_type == RocalTensorDataType::FP32) {
-                        float *output_tensor_32 = static_cast<float *>(out_ptr) + batch_offset;
-                        auto channel_size = w * h;
-                        for (unsigned channel_idx = 0; channel_idx < c; channel_idx++)
-                            for (unsigned i = 0; i < channel_size; i++)
-                                output_tensor_32[dest_buf_offset + channel_idx + i * c] =
-                                        offset[channel_idx] + multiplier[channel_idx] *
-                                                              (reverse_channels ? (float) (in_buffer[i +
-                                                                                                     (c - channel_idx -
-                                                                                                      1) *
-                                                                                                     channel_size])
-                                                                                : (float) (in_buffer[i + channel_idx *
-                                                                                                         channel_size]));
-                    } else if (output_data_type == RocalTensorDataType::FP16) {
-                        half *output_tensor_16 = static_cast<half *>(out_ptr) + batch_offset;
-                        auto channel_size = w * h;
-                        for (unsigned channel_idx = 0; channel_idx < c; channel_idx++)
-                            for (unsigned i = 0; i < channel_size; i++)
-                                output_tensor_16[dest_buf_offset + channel_idx + i * c] =
-                                        offset[channel_idx] + multiplier[channel_idx] *
-                                                              (reverse_channels ? (half) (in_buffer[
-                                                                      (c - channel_idx - 1) * channel_size + i])
-                                                                                : (half) (in_buffer[
-                                                                              channel_idx * channel_size + i]));
-                    }
-                }
-                if (format == RocalTensorFormat::NCHW) {
-                    if (output_data_type == RocalTensorDataType::FP32) {
-                        float *output_tensor_32 = static_cast<float *>(out_ptr) + batch_offset;
-                        //output_tensor_32 += batch_offset;
-                        auto channel_size = w * h;
-                        if (c != 3) {
-                            for (unsigned channel_idx = 0; channel_idx < c; channel_idx++)
-                                for (unsigned i = 0; i < channel_size; i++)
-                                    output_tensor_32[dest_buf_offset + channel_idx * channel_size + i] =
-                                            offset[channel_idx] + multiplier[channel_idx] *
-                                                                  (reverse_channels ? (float) (in_buffer[
-                                                                          (c - channel_idx - 1) * channel_size + i])
-                                                                                    : (float) (in_buffer[
-                                                                                  channel_idx * channel_size + i]));
-                        } else {
-#if (ENABLE_SIMD && __AVX2__)
-
-                            float *B_buf = output_tensor_32 + dest_buf_offset;
-                            float *G_buf = B_buf + channel_size;
-                            float *R_buf = G_buf + channel_size;
-                            unsigned char *in_buffer_R = in_buffer;
-                            unsigned char *in_buffer_G = in_buffer + channel_size;
-                            unsigned char *in_buffer_B = in_buffer_G + channel_size;
-
-                            __m256 pmul0 = _mm256_set1_ps(multiplier0);
-                            __m256 pmul1 = _mm256_set1_ps(multiplier1);
-                            __m256 pmul2 = _mm256_set1_ps(multiplier2);
-                            __m256 padd0 = _mm256_set1_ps(offset0);
-                            __m256 padd1 = _mm256_set1_ps(offset1);
-                            __m256 padd2 = _mm256_set1_ps(offset2);
-                            unsigned int alignedLength = (channel_size & ~7);    // multiple of 8
-                            unsigned int i = 0;
-
-                            __m256 fR, fG, fB;
-                            for (; i < alignedLength; i += 8) {
-                                __m128i pixR, pixG, pixB;
-                                if (reverse_channels) {
-                                    pixB = _mm_loadl_epi64((const __m128i *) in_buffer_R);
-                                    pixG = _mm_loadl_epi64((const __m128i *) in_buffer_G);
-                                    pixR = _mm_loadl_epi64((const __m128i *) in_buffer_B);
-                                } else {
-                                    pixR = _mm_loadl_epi64((const __m128i *) in_buffer_R);
-                                    pixG = _mm_loadl_epi64((const __m128i *) in_buffer_G);
-                                    pixB = _mm_loadl_epi64((const __m128i *) in_buffer_B);
-                                }
-                                fB = _mm256_cvtepi32_ps(_mm256_cvtepu8_epi32(pixR));
-                                fG = _mm256_cvtepi32_ps(_mm256_cvtepu8_epi32(pixG));
-                                fR = _mm256_cvtepi32_ps(_mm256_cvtepu8_epi32(pixB));
-                                fB = _mm256_mul_ps(fB, pmul0);
-                                fG = _mm256_mul_ps(fG, pmul1);
-                                fR = _mm256_mul_ps(fR, pmul2);
-                                fB = _mm256_add_ps(fB, padd0);
-                                fG = _mm256_add_ps(fG, padd1);
-                                fR = _mm256_add_ps(fR, padd2);
-                                _mm256_storeu_ps(B_buf, fB);
-                                _mm256_storeu_ps(G_buf, fG);
-                                _mm256_storeu_ps(R_buf, fR);
-                                B_buf += 8;
-                                G_buf += 8;
-                                R_buf += 8;
-                                in_buffer_R += 8, in_buffer_G += 8, in_buffer_B += 8;
-                            }
-                            for (; i < channel_size; i++) {
-                                *B_buf++ = (*in_buffer_R++ * multiplier0) + offset0;
-                                *G_buf++ = (*in_buffer_G++ * multiplier1) + offset1;
-                                *R_buf++ = (*in_buffer_B++ * multiplier2) + offset1;
-                            }
-
-#else
-                            for(unsigned channel_idx = 0; channel_idx < c; channel_idx++)
-                                for(unsigned i = 0; i < channel_size; i++)
-                                    output_tensor_32[dest_buf_offset+channel_idx*channel_size + i] =
-                                            offset[channel_idx] + multiplier[channel_idx]*(reverse_channels ? (float)(in_buffer[i+(c-channel_idx-1)*channel_size]) : (float)(in_buffer[i+channel_idx*channel_size]));
-#endif
-                        }
-                    } else if (output_data_type == RocalTensorDataType::FP16) {
-                        half *output_tensor_16 = static_cast<half *>(out_ptr) + batch_offset;
-                        auto channel_size = w * h;
-                        for (unsigned channel_idx = 0; channel_idx < c; channel_idx++)
-                            for (unsigned i = 0; i < channel_size; i++)
-                                output_tensor_16[dest_buf_offset + channel_idx * channel_size + i] =
-                                        offset[channel_idx] + multiplier[channel_idx] *
-                                                              (reverse_channels ? (half) (in_buffer[i +
-                                                                                                    (c - channel_idx -
-                                                                                                     1) * channel_size])
-                                                                                : (half) (in_buffer[i + channel_idx *
-                                                                                                        channel_size]));
-                    }
-                }
-            }
+            convert_u8_to_tensor(static_cast<unsigned char *>(out_image), static_cast<unsigned char *>(out_ptr) + dest_buf_offset * element_size,
+                                 n, h, w, c, true, format, output_data_type, multiplier, offset, reverse_channels, _cpu_num_threads * 2);
             dest_buf_offset += single_output_image_size;
         }
     }
@@ -1626,3 +1437,49 @@ MasterGraph::get_bbox_encoded_buffers(float **boxes_buf_ptr, int **labels_buf_pt
     }
     return Status::OK;
 }
+
+MasterGraph::Status
+MasterGraph::copy_staged_labels(void *buf, size_t count)
+{
+#if ENABLE_HIP
+    // The output routine copied the labels to the device already, enqueued on the null stream the copy is ordered
+    // before the work the caller enqueues after it on the null stream or on any blocking stream
+    hipStream_t stream = 0;
+    void *labels = _ring_buffer.get_labels_read_buffer(stream);
+    if (!labels)
+        return Status::NOT_IMPLEMENTED;
+    hipError_t err = hipMemcpyAsync(buf, labels, count * sizeof(int), hipMemcpyDeviceToDevice, stream);
+    if (err != hipSuccess)
+        THROW("hipMemcpyAsync failed with status " + TOSTR(err))
+    _ring_buffer.release_labels_read_buffer(stream);
+    return Status::OK;
+#else
+    return Status::NOT_IMPLEMENTED;
+#endif
+}
+
+MasterGraph::Status
+MasterGraph::copy_bbox_encoded_buffers(float *boxes_buf, int *labels_buf)
+{
+    if (!_is_box_encoder)
+        return Status::NOT_IMPLEMENTED;
+    auto encoded_boxes_and_lables = _ring_buffer.get_box_encode_read_buffers();
+    size_t num_encoded_boxes = _user_batch_size * _num_anchors;
+#if ENABLE_HIP
+    if (_mem_type == RocalMemType::HIP) {
+        hipError_t err = hipSuccess;
+        if (boxes_buf)
+            err = hipMemcpy(boxes_buf, encoded_boxes_and_lables.first, num_encoded_boxes * 4 * sizeof(float), hipMemcpyDeviceToHost);
+        if (err == hipSuccess && labels_buf)
+            err = hipMemcpy(labels_buf, encoded_boxes_and_lables.second, num_encoded_boxes * sizeof(int), hipMemcpyDeviceToHost);
+        if (err != hipSuccess)
+            THROW("hipMemcpy failed with status " + TOSTR(err))
+        return Status::OK;
+    }
+#endif
+    if (boxes_buf)
+        memcpy(boxes_buf, encoded_boxes_and_lables.first, num_encoded_boxes * 4 * sizeof(float));
+    if (labels_buf)
+        memcpy(labels_buf, encoded_boxes_and_lables.second, num_encoded_boxes * sizeof(int));
+    return Status::OK;
+}
@@ -21,6 +21,7 @@ THE SOFTWARE.
 */
 
 #include <device_manager.h>
+#include <cstring>
 #include "ring_buffer.h"
 
 RingBuffer::RingBuffer(unsigned buffer_depth):
@@ -74,9 +75,11 @@ void *RingBuffer::get_host_master_read_buffer() {
 std::pair<void*, void*> RingBuffer::get_box_encode_read_buffers()
 {
     block_if_empty();
-    if((_mem_type == RocalMemType::OCL) || (_mem_type == RocalMemType::HIP))
+    if(_mem_type == RocalMemType::HIP)
         return std::make_pair(_dev_bbox_buffer[_read_ptr], _dev_labels_buffer[_read_ptr]);
-    return std::make_pair(nullptr, nullptr);   // todo:: implement the same scheme for host as well
+    if (_host_bbox_buffer.empty())
+        return std::make_pair(nullptr, nullptr);
+    return std::make_pair(_host_bbox_buffer[_read_ptr], _host_labels_buffer[_read_ptr]);
 }
 
 std::vector<void*> RingBuffer::get_write_buffers()
@@ -91,13 +94,17 @@ std::vector<void*> RingBuffer::get_write_buffers()
 std::pair<void*, void*> RingBuffer::get_box_encode_write_buffers()
 {
     block_if_full();
-    if((_mem_type == RocalMemType::OCL) || (_mem_type == RocalMemType::HIP))
+    if(_mem_type == RocalMemType::HIP)
         return std::make_pair(_dev_bbox_buffer[_write_ptr], _dev_labels_buffer[_write_ptr]);
-    return std::make_pair(nullptr, nullptr); 
+    if (_host_bbox_buffer.empty())
+        return std::make_pair(nullptr, nullptr);
+    return std::make_pair(_host_bbox_buffer[_write_ptr], _host_labels_buffer[_write_ptr]);
 }
 void RingBuffer::unblock_reader()
 {
-    // Wake up the reader thread in case it's waiting for a load
+    // Wake up the reader thread in case it's waiting for a load, the lock makes sure a reader
+    // that just found the buffer empty is already waiting and does not miss the notification
+    std::unique_lock<std::mutex> lock(_lock);
     _wait_for_load.notify_all();
 }
 
@@ -115,10 +122,18 @@ void RingBuffer::release_if_empty()
 
 void RingBuffer::unblock_writer()
 {
-    // Wake up the writer thread in case it's waiting for an unload
+    // Wake up the writer thread in case it's waiting for an unload or for being unblocked
+    std::unique_lock<std::mutex> lock(_lock);
+    _writer_unblocked = true;
     _wait_for_unload.notify_all();
 }
 
+void RingBuffer::block_until_writer_unblocked()
+{
+    std::unique_lock<std::mutex> lock(_lock);
+    _wait_for_unload.wait(lock, [this] { return _writer_unblocked || _dont_block; });
+}
+
 void RingBuffer::init(RocalMemType mem_type, void *devres, unsigned sub_buffer_size, unsigned sub_buffer_count)
 {
     _mem_type = mem_type;
@@ -230,37 +245,97 @@ void RingBuffer::initBoxEncoderMetaData(RocalMemType mem_type, size_t encoded_bb
             }
         }
     }
-#elif ENABLE_OPENCL
-    DeviceResources *dev_ocl = static_cast<DeviceResources *>(_dev);
-    if(mem_type== RocalMemType::OCL)
+#endif
+    // The box encoder runs on the CPU for any other memory type and writes the encoded boxes to host buffers
+    if (_mem_type != RocalMemType::HIP)
     {
-        if(dev_ocl->cmd_queue == nullptr || dev_ocl->device_id == nullptr || dev_ocl->context == nullptr)
-            THROW("Error ocl structure needed since memory type is OCL");
-
-       cl_int err = CL_SUCCESS;
-       for(size_t buffIdx = 0; buffIdx < BUFF_DEPTH; buffIdx++)
+        _host_bbox_buffer.resize(BUFF_DEPTH);
+        _host_labels_buffer.resize(BUFF_DEPTH);
+        for (size_t buffIdx = 0; buffIdx < BUFF_DEPTH; buffIdx++)
         {
-            _dev_bbox_buffer[buffIdx] =  clCreateBuffer(dev_ocl->context, CL_MEM_READ_WRITE, encoded_bbox_size, NULL, &err);
-            if(err)
-            {
-                _dev_bbox_buffer.clear();
-                THROW("clCreateBuffer of size " + TOSTR(encoded_bbox_size) +" failed " + TOSTR(err));
-            }
-            _dev_labels_buffer[buffIdx] =  clCreateBuffer(dev_ocl->context, CL_MEM_READ_WRITE, encoded_labels_size, NULL, &err);
-            if(err)
-            {
-                _dev_labels_buffer.clear();
-                THROW("clCreateBuffer of size " + TOSTR(encoded_labels_size) +" failed " + TOSTR(err));
-            }
+            _host_bbox_buffer[buffIdx] = aligned_alloc(MEM_ALIGNMENT, MEM_ALIGNMENT * (encoded_bbox_size / MEM_ALIGNMENT + 1));
+            _host_labels_buffer[buffIdx] = aligned_alloc(MEM_ALIGNMENT, MEM_ALIGNMENT * (encoded_labels_size / MEM_ALIGNMENT + 1));
+            if (!_host_bbox_buffer[buffIdx] || !_host_labels_buffer[buffIdx])
+                THROW("Allocating the host box encoder buffers of size " + TOSTR(encoded_bbox_size) + " failed")
         }
     }
-#else    
+}
+
+void RingBuffer::initLabelsMetaData(size_t labels_size)
+{
+    _labels_size = labels_size;
+    _labels_staged.assign(BUFF_DEPTH, 0);
+#if ENABLE_HIP
+    if(_mem_type != RocalMemType::HIP)
+        return;
+    hipError_t err = hipStreamCreateWithFlags(&_labels_stream, hipStreamNonBlocking);
+    if(err != hipSuccess)
+        THROW("initLabelsMetaData::hipStreamCreateWithFlags failed " + TOSTR(err))
+    _pinned_labels_buffer.resize(BUFF_DEPTH, nullptr);
+    _dev_image_labels_buffer.resize(BUFF_DEPTH, nullptr);
+    _labels_copied.resize(BUFF_DEPTH, nullptr);
+    _labels_consumed.resize(BUFF_DEPTH, nullptr);
+    for(size_t buffIdx = 0; buffIdx < BUFF_DEPTH; buffIdx++)
     {
-        //todo:: for host
+        err = hipHostMalloc(&_pinned_labels_buffer[buffIdx], labels_size, hipHostMallocDefault);
+        if(err == hipSuccess)
+            err = hipMalloc(&_dev_image_labels_buffer[buffIdx], labels_size);
+        if(err == hipSuccess)
+            err = hipEventCreateWithFlags(&_labels_copied[buffIdx], hipEventDisableTiming);
+        if(err == hipSuccess)
+            err = hipEventCreateWithFlags(&_labels_consumed[buffIdx], hipEventDisableTiming);
+        if(err != hipSuccess)
+            THROW("Allocating the labels buffers of size " + TOSTR(labels_size) + " failed " + TOSTR(err))
     }
 #endif
 }
 
+void RingBuffer::stage_labels(const int *labels, size_t count)
+{
+#if ENABLE_HIP
+    if(_dev_image_labels_buffer.empty())
+        return;
+    size_t size = count * sizeof(int);
+    _labels_staged[_write_ptr] = 0;
+    if(count == 0 || size > _labels_size)
+        return;
+    // The last copy out of this staging buffer was enqueued BUFF_DEPTH batches ago, it is done by now in practice
+    hipError_t err = hipEventSynchronize(_labels_copied[_write_ptr]);
+    if(err != hipSuccess)
+        THROW("stage_labels::hipEventSynchronize failed " + TOSTR(err))
+    memcpy(_pinned_labels_buffer[_write_ptr], labels, size);
+    // Don't overwrite the device labels before the reader's copy of them from the last time this buffer was used
+    err = hipStreamWaitEvent(_labels_stream, _labels_consumed[_write_ptr], 0);
+    if(err == hipSuccess)
+        err = hipMemcpyAsync(_dev_image_labels_buffer[_write_ptr], _pinned_labels_buffer[_write_ptr], size, hipMemcpyHostToDevice, _labels_stream);
+    if(err == hipSuccess)
+        err = hipEventRecord(_labels_copied[_write_ptr], _labels_stream);
+    if(err != hipSuccess)
+        THROW("stage_labels::hipMemcpyAsync failed " + TOSTR(err))
+    _labels_staged[_write_ptr] = count;
+#endif
+}
+
+#if ENABLE_HIP
+void* RingBuffer::get_labels_read_buffer(hipStream_t stream)
+{
+    block_if_empty();
+    if(_dev_image_labels_buffer.empty() || !_labels_staged[_read_ptr])
+        return nullptr;
+    hipError_t err = hipStreamWaitEvent(stream, _labels_copied[_read_ptr], 0);
+    if(err != hipSuccess)
+        THROW("get_labels_read_buffer::hipStreamWaitEvent failed " + TOSTR(err))
+    return _dev_image_labels_buffer[_read_ptr];
+}
+
+void RingBuffer::release_labels_read_buffer(hipStream_t stream)
+{
+    hipError_t err = hipEventRecord(_labels_consumed[_read_ptr], stream);
+    if(err != hipSuccess)
+        THROW("release_labels_read_buffer::hipEventRecord failed " + TOSTR(err))
+}
+#endif
+
 void RingBuffer::push()
 {
     // pushing and popping to and from image and metadata buffer should be atomic so that their level stays the same at all times
@@ -285,6 +360,7 @@ void RingBuffer::reset()
     _read_ptr = 0;
     _level = 0;
     _dont_block = false;
+    _writer_unblocked = false;
     while(!_meta_ring_buffer.empty())
         _meta_ring_buffer.pop();
 }
@@ -304,6 +380,22 @@ void RingBuffer::release_gpu_res()
         }
         _dev_sub_buffer.clear();
     }
+    if (_labels_stream) {
+        if (hipStreamSynchronize(_labels_stream) != hipSuccess)
+            ERR("Could not synchronize the labels stream of the ring buffer")
+        for (size_t buffIdx = 0; buffIdx < _dev_image_labels_buffer.size(); buffIdx++) {
+            if (_pinned_labels_buffer[buffIdx]) hipHostFree(_pinned_labels_buffer[buffIdx]);
+            if (_dev_image_labels_buffer[buffIdx]) hipFree(_dev_image_labels_buffer[buffIdx]);
+            if (_labels_copied[buffIdx]) hipEventDestroy(_labels_copied[buffIdx]);
+            if (_labels_consumed[buffIdx]) hipEventDestroy(_labels_consumed[buffIdx]);
+        }
+        _pinned_labels_buffer.clear();
+        _dev_image_labels_buffer.clear();
+        _labels_copied.clear();
+        _labels_consumed.clear();
+        hipStreamDestroy(_labels_stream);
+        _labels_stream = nullptr;
+    }
 #elif ENABLE_OPENCL
     if (_mem_type == RocalMemType::OCL) {
         for (size_t buffIdx = 0; buffIdx < _dev_sub_buffer.size(); buffIdx++)
@@ -327,6 +419,10 @@ RingBuffer::~RingBuffer()
         _host_master_buffers.clear();
         _host_sub_buffers.clear();
     }
+    for (auto buffer : _host_bbox_buffer)
+        free(buffer);
+    for (auto buffer : _host_labels_buffer)
+        free(buffer);
 }
 
 bool RingBuffer::empty()
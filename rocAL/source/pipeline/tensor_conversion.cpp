@@ -0,0 +1,360 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <half/half.hpp>
+#if ENABLE_SIMD
+#include <immintrin.h>
+#endif
+#include "tensor_conversion.h"
+
+using half_float::half;
+
+namespace
+{
+// Pixels converted at once by a thread, the scratch used to reorder the channels of a tile stays in the L1 cache
+constexpr size_t TILE_PIXELS = 2048;
+
+enum class ConversionIsa
+{
+    SCALAR = 0,
+    AVX2,
+    AVX512
+};
+
+ConversionIsa detect_isa()
+{
+#if ENABLE_SIMD && __AVX2__
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx512f")) {
+        LOG("Tensor conversion uses AVX-512")
+        return ConversionIsa::AVX512;
+    }
+    LOG("Tensor conversion uses AVX2")
+    return ConversionIsa::AVX2;
+#else
+    LOG("Tensor conversion uses scalar code")
+    return ConversionIsa::SCALAR;
+#endif
+}
+
+ConversionIsa conversion_isa()
+{
+    static const ConversionIsa isa = detect_isa();
+    return isa;
+}
+
+template <typename T> inline T to_output(float value) { return static_cast<T>(value); }
+template <> inline uint8_t to_output<uint8_t>(float value) { return static_cast<uint8_t>(std::min(std::max(std::nearbyint(value), 0.0f), 255.0f)); }
+
+// out[i] = in[i] * mul[i % period] + off[i % period], the period being 1 for a single plane or 3 for interleaved pixels
+template <typename T>
+void affine_scalar(const uint8_t *in, T *out, size_t count, const float *mul, const float *off, unsigned period)
+{
+    for (size_t i = 0, ch = 0; i < count; i++) {
+        out[i] = to_output<T>(in[i] * mul[ch] + off[ch]);
+        if (++ch == period)
+            ch = 0;
+    }
+}
+
+#if ENABLE_SIMD && __AVX2__
+inline void store_avx2(float *out, __m256 value) { _mm256_storeu_ps(out, value); }
+inline void store_avx2(half *out, __m256 value) { _mm_storeu_si128((__m128i *)out, _mm256_cvtps_ph(value, _MM_FROUND_TO_NEAREST_INT | _MM_FROUND_NO_EXC)); }
+inline void store_avx2(uint8_t *out, __m256 value)
+{
+    __m256i value_32 = _mm256_cvtps_epi32(value);
+    __m128i value_16 = _mm_packs_epi32(_mm256_castsi256_si128(value_32), _mm256_extracti128_si256(value_32, 1));
+    _mm_storel_epi64((__m128i *)out, _mm_packus_epi16(value_16, value_16));
+}
+
+template <typename T>
+void affine_avx2(const uint8_t *in, T *out, size_t count, const float *mul, const float *off, unsigned period)
+{
+    // 24 elements per iteration are a whole number of periods, the k-th vector of the iteration starts at channel (8 * k) % period
+    __m256 pmul[3], padd[3];
+    for (unsigned k = 0; k < 3; k++) {
+        float m[8], o[8];
+        for (unsigned e = 0; e < 8; e++) {
+            m[e] = mul[(8 * k + e) % period];
+            o[e] = off[(8 * k + e) % period];
+        }
+        pmul[k] = _mm256_loadu_ps(m);
+        padd[k] = _mm256_loadu_ps(o);
+    }
+    size_t i = 0;
+    for (; i + 24 <= count; i += 24) {
+        for (unsigned k = 0; k < 3; k++) {
+            __m256 value = _mm256_cvtepi32_ps(_mm256_cvtepu8_epi32(_mm_loadl_epi64((const __m128i *)(in + i + 8 * k))));
+            store_avx2(out + i + 8 * k, _mm256_fmadd_ps(value, pmul[k], padd[k]));
+        }
+    }
+    affine_scalar(in + i, out + i, count - i, mul, off, period);
+}
+
+__attribute__((target("avx512f"))) inline void store_avx512(float *out, __m512 value) { _mm512_storeu_ps(out, value); }
+__attribute__((target("avx512f"))) inline void store_avx512(half *out, __m512 value) { _mm256_storeu_si256((__m256i *)out, _mm512_cvtps_ph(value, _MM_FROUND_TO_NEAREST_INT | _MM_FROUND_NO_EXC)); }
+__attribute__((target("avx512f"))) inline void store_avx512(uint8_t *out, __m512 value)
+{
+    __m512i value_32 = _mm512_max_epi32(_mm512_cvtps_epi32(value), _mm512_setzero_si512());
+    _mm_storeu_si128((__m128i *)out, _mm512_cvtusepi32_epi8(value_32));
+}
+
+template <typename T>
+__attribute__((target("avx512f"))) void affine_avx512(const uint8_t *in, T *out, size_t count, const float *mul, const float *off, unsigned period)
+{
+    // 48 elements per iteration are a whole number of periods, the k-th vector of the iteration starts at channel (16 * k) % period
+    __m512 pmul[3], padd[3];
+    for (unsigned k = 0; k < 3; k++) {
+        float m[16], o[16];
+        for (unsigned e = 0; e < 16; e++) {
+            m[e] = mul[(16 * k + e) % period];
+            o[e] = off[(16 * k + e) % period];
+        }
+        pmul[k] = _mm512_loadu_ps(m);
+        padd[k] = _mm512_loadu_ps(o);
+    }
+    size_t i = 0;
+    for (; i + 48 <= count; i += 48) {
+        for (unsigned k = 0; k < 3; k++) {
+            __m512 value = _mm512_cvtepi32_ps(_mm512_cvtepu8_epi32(_mm_loadu_si128((const __m128i *)(in + i + 16 * k))));
+            store_avx512(out + i + 16 * k, _mm512_fmadd_ps(value, pmul[k], padd[k]));
+        }
+    }
+    affine_avx2(in + i, out + i, count - i, mul, off, period);
+}
+
+// pshufb masks moving the bytes of 16 pixels between one plane per channel and three 16 bytes chunks of interleaved pixels,
+// mask[chunk][channel][i] is the source byte of byte i in the destination, 0x80 zeroes it
+struct InterleaveMasks
+{
+    __m128i to_chunk[3][3];   // selects from plane [channel] the bytes of interleaved [chunk]
+    __m128i to_plane[3][3];   // selects from interleaved [chunk] the bytes of plane [channel]
+    InterleaveMasks()
+    {
+        alignas(16) uint8_t to_chunk_bytes[3][3][16], to_plane_bytes[3][3][16];
+        for (unsigned chunk = 0; chunk < 3; chunk++) {
+            for (unsigned channel = 0; channel < 3; channel++) {
+                for (unsigned i = 0; i < 16; i++) {
+                    unsigned byte = chunk * 16 + i;
+                    to_chunk_bytes[chunk][channel][i] = (byte % 3 == channel) ? byte / 3 : 0x80;
+                    unsigned source = i * 3 + channel;
+                    to_plane_bytes[chunk][channel][i] = (source / 16 == chunk) ? source % 16 : 0x80;
+                }
+                to_chunk[chunk][channel] = _mm_load_si128((const __m128i *)to_chunk_bytes[chunk][channel]);
+                to_plane[chunk][channel] = _mm_load_si128((const __m128i *)to_plane_bytes[chunk][channel]);
+            }
+        }
+    }
+};
+
+const InterleaveMasks &interleave_masks()
+{
+    static const InterleaveMasks masks;
+    return masks;
+}
+#endif
+
+template <typename T>
+inline void affine(const uint8_t *in, T *out, size_t count, const float *mul, const float *off, unsigned period)
+{
+#if ENABLE_SIMD && __AVX2__
+    if (conversion_isa() == ConversionIsa::AVX512)
+        return affine_avx512(in, out, count, mul, off, period);
+    return affine_avx2(in, out, count, mul, off, period);
+#else
+    affine_scalar(in, out, count, mul, off, period);
+#endif
+}
+
+// Splits 3 channel interleaved pixels into one plane per channel
+void deinterleave_pixels(const uint8_t *in, uint8_t *plane0, uint8_t *plane1, uint8_t *plane2, size_t pixels)
+{
+    uint8_t *planes[3] = {plane0, plane1, plane2};
+    size_t i = 0;
+#if ENABLE_SIMD && __AVX2__
+    auto &masks = interleave_masks();
+    for (; i + 16 <= pixels; i += 16) {
+        __m128i chunk[3];
+        for (unsigned k = 0; k < 3; k++)
+            chunk[k] = _mm_loadu_si128((const __m128i *)(in + 3 * i + 16 * k));
+        for (unsigned channel = 0; channel < 3; channel++) {
+            __m128i plane = _mm_or_si128(_mm_or_si128(_mm_shuffle_epi8(chunk[0], masks.to_plane[0][channel]),
+                                                      _mm_shuffle_epi8(chunk[1], masks.to_plane[1][channel])),
+                                         _mm_shuffle_epi8(chunk[2], masks.to_plane[2][channel]));
+            _mm_storeu_si128((__m128i *)(planes[channel] + i), plane);
+        }
+    }
+#endif
+    for (; i < pixels; i++)
+        for (unsigned channel = 0; channel < 3; channel++)
+            planes[channel][i] = in[3 * i + channel];
+}
+
+// Interleaves three planes into 3 channel pixels
+void interleave_planes(const uint8_t *plane0, const uint8_t *plane1, const uint8_t *plane2, uint8_t *out, size_t pixels)
+{
+    const uint8_t *planes[3] = {plane0, plane1, plane2};
+    size_t i = 0;
+#if ENABLE_SIMD && __AVX2__
+    auto &masks = interleave_masks();
+    for (; i + 16 <= pixels; i += 16) {
+        __m128i plane[3];
+        for (unsigned channel = 0; channel < 3; channel++)
+            plane[channel] = _mm_loadu_si128((const __m128i *)(planes[channel] + i));
+        for (unsigned k = 0; k < 3; k++) {
+            __m128i chunk = _mm_or_si128(_mm_or_si128(_mm_shuffle_epi8(plane[0], masks.to_chunk[k][0]),
+                                                      _mm_shuffle_epi8(plane[1], masks.to_chunk[k][1])),
+                                         _mm_shuffle_epi8(plane[2], masks.to_chunk[k][2]));
+            _mm_storeu_si128((__m128i *)(out + 3 * i + 16 * k), chunk);
+        }
+    }
+#endif
+    for (; i < pixels; i++)
+        for (unsigned channel = 0; channel < 3; channel++)
+            out[3 * i + channel] = planes[channel][i];
+}
+
+// Reverses the channels of 3 channel interleaved pixels
+void reverse_pixels(const uint8_t *in, uint8_t *out, size_t pixels)
+{
+    size_t i = 0;
+#if ENABLE_SIMD && __AVX2__
+    // 5 pixels per shuffle, the 16th byte written belongs to the next 5 pixels and is rewritten with them
+    const __m128i mask = _mm_setr_epi8(2, 1, 0, 5, 4, 3, 8, 7, 6, 11, 10, 9, 14, 13, 12, 15);
+    for (; 3 * i + 16 <= 3 * pixels; i += 5)
+        _mm_storeu_si128((__m128i *)(out + 3 * i), _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(in + 3 * i)), mask));
+#endif
+    for (; i < pixels; i++) {
+        out[3 * i] = in[3 * i + 2];
+        out[3 * i + 1] = in[3 * i + 1];
+        out[3 * i + 2] = in[3 * i];
+    }
+}
+
+// Converts the pixels [first, first + count) of one image
+template <typename T>
+void convert_tile(const uint8_t *image, T *out, size_t hw, size_t c, size_t first, size_t count, bool planar_input,
+                  RocalTensorFormat format, const float *mul, const float *off, bool reverse_channels)
+{
+    if (c == 1) {
+        affine(image + first, out + first, count, mul, off, 1);
+        return;
+    }
+    if (c != 3) {
+        for (size_t p = first; p < first + count; p++)
+            for (size_t ch = 0; ch < c; ch++) {
+                size_t src = reverse_channels ? c - ch - 1 : ch;
+                size_t param = std::min<size_t>(ch, 2);
+                float value = planar_input ? image[src * hw + p] : image[p * c + src];
+                size_t dst = (format == RocalTensorFormat::NCHW) ? ch * hw + p : p * c + ch;
+                out[dst] = to_output<T>(value * mul[param] + off[param]);
+            }
+        return;
+    }
+    uint8_t scratch[3 * TILE_PIXELS + 16];
+    if (format == RocalTensorFormat::NCHW) {
+        const uint8_t *planes[3];
+        if (planar_input) {
+            for (unsigned ch = 0; ch < 3; ch++)
+                planes[ch] = image + ch * hw + first;
+        } else {
+            deinterleave_pixels(image + 3 * first, scratch, scratch + TILE_PIXELS, scratch + 2 * TILE_PIXELS, count);
+            for (unsigned ch = 0; ch < 3; ch++)
+                planes[ch] = scratch + ch * TILE_PIXELS;
+        }
+        for (unsigned ch = 0; ch < 3; ch++)
+            affine(planes[reverse_channels ? 2 - ch : ch], out + ch * hw + first, count, mul + ch, off + ch, 1);
+    } else {
+        const uint8_t *pixels = image + 3 * first;
+        if (planar_input) {
+            const uint8_t *planes[3];
+            for (unsigned ch = 0; ch < 3; ch++)
+                planes[ch] = image + (reverse_channels ? 2 - ch : ch) * hw + first;
+            interleave_planes(planes[0], planes[1], planes[2], scratch, count);
+            pixels = scratch;
+        } else if (reverse_channels) {
+            reverse_pixels(pixels, scratch, count);
+            pixels = scratch;
+        }
+        affine(pixels, out + 3 * first, 3 * count, mul, off, 3);
+    }
+}
+
+template <typename T>
+void convert_batch(const uint8_t *in, T *out, size_t n, size_t h, size_t w, size_t c, bool planar_input,
+                   RocalTensorFormat format, const float *mul, const float *off, bool reverse_channels, unsigned num_threads)
+{
+    const size_t hw = h * w;
+    const size_t image_size = hw * c;
+    const size_t tiles_per_image = (hw + TILE_PIXELS - 1) / TILE_PIXELS;
+    const long long tile_count = n * tiles_per_image;
+    #pragma omp parallel for num_threads(std::max(num_threads, 1u)) schedule(static)
+    for (long long tile = 0; tile < tile_count; tile++) {
+        size_t image_idx = tile / tiles_per_image;
+        size_t first = (tile % tiles_per_image) * TILE_PIXELS;
+        convert_tile(in + image_idx * image_size, out + image_idx * image_size, hw, c, first, std::min(TILE_PIXELS, hw - first),
+                     planar_input, format, mul, off, reverse_channels);
+    }
+}
+} // namespace
+
+void convert_u8_to_tensor(const unsigned char *in, void *out, size_t n, size_t h, size_t w, size_t c, bool planar_input,
+                          RocalTensorFormat format, RocalTensorDataType data_type, const float multiplier[3], const float offset[3],
+                          bool reverse_channels, unsigned num_threads)
+{
+    switch (data_type) {
+        case RocalTensorDataType::FP32:
+            convert_batch(in, static_cast<float *>(out), n, h, w, c, planar_input, format, multiplier, offset, reverse_channels, num_threads);
+            break;
+        case RocalTensorDataType::FP16:
+            convert_batch(in, static_cast<half *>(out), n, h, w, c, planar_input, format, multiplier, offset, reverse_channels, num_threads);
+            break;
+        case RocalTensorDataType::UINT8:
+            convert_batch(in, static_cast<uint8_t *>(out), n, h, w, c, planar_input, format, multiplier, offset, reverse_channels, num_threads);
+            break;
+        default:
+            THROW("Unsupported tensor data type")
+    }
+}
+
+size_t tensor_element_size(RocalTensorDataType data_type)
+{
+    switch (data_type) {
+        case RocalTensorDataType::FP32: return sizeof(float);
+        case RocalTensorDataType::FP16: return sizeof(half);
+        case RocalTensorDataType::UINT8: return sizeof(uint8_t);
+        default: THROW("Unsupported tensor data type")
+    }
+}
+
+const char *tensor_conversion_isa()
+{
+    switch (conversion_isa()) {
+        case ConversionIsa::AVX512: return "avx512";
+        case ConversionIsa::AVX2: return "avx2";
+        default: return "scalar";
+    }
+}
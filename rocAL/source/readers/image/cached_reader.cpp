@@ -0,0 +1,149 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#include <algorithm>
+#include <cstring>
+#include "cached_reader.h"
+
+ReaderCache &
+ReaderCache::instance()
+{
+    static ReaderCache cache;
+    return cache;
+}
+
+void
+ReaderCache::set_capacity(size_t capacity)
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    _capacity = capacity;
+    evict(0);
+}
+
+size_t
+ReaderCache::capacity()
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    return _capacity;
+}
+
+ReaderCache::Item
+ReaderCache::get(const std::string &key)
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    auto it = _entries.find(key);
+    if (it == _entries.end()) {
+        _misses++;
+        return nullptr;
+    }
+    _lru.splice(_lru.begin(), _lru, it->second.lru_pos);
+    _hits++;
+    return it->second.data;
+}
+
+void
+ReaderCache::evict(size_t size)
+{
+    // Evicted items still being copied out by a reader stay alive until it lets go of them
+    while (!_lru.empty() && _used + size > _capacity) {
+        auto it = _entries.find(_lru.back());
+        _used -= it->second.data->size();
+        _entries.erase(it);
+        _lru.pop_back();
+    }
+}
+
+void
+ReaderCache::put(const std::string &key, const unsigned char *data, size_t size)
+{
+    auto item = std::make_shared<const std::vector<unsigned char>>(data, data + size);
+    std::lock_guard<std::mutex> lock(_lock);
+    if (size > _capacity || _entries.find(key) != _entries.end())
+        return;
+    evict(size);
+    _lru.push_front(key);
+    _entries.emplace(key, Entry{item, _lru.begin()});
+    _used += size;
+}
+
+long long unsigned
+ReaderCache::hits()
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    return _hits;
+}
+
+long long unsigned
+ReaderCache::misses()
+{
+    std::lock_guard<std::mutex> lock(_lock);
+    return _misses;
+}
+
+CachedReader::CachedReader(std::shared_ptr<Reader> reader, const std::string &storage_path):
+    _reader(reader),
+    _key_prefix(storage_path + ":")
+{
+}
+
+size_t
+CachedReader::open()
+{
+    _cached = nullptr;
+    _size = _reader->open();
+    if (_size == 0)
+        return 0;
+    _key = _key_prefix + _reader->unique_id();
+    _cached = ReaderCache::instance().get(_key);
+    return _size;
+}
+
+size_t
+CachedReader::read_data(unsigned char *buf, size_t read_size)
+{
+    if (_cached) {
+        size_t actual_read_size = std::min(read_size, _cached->size());
+        memcpy(buf, _cached->data(), actual_read_size);
+        _reader->skip_data();
+        return actual_read_size;
+    }
+    size_t actual_read_size = _reader->read_data(buf, read_size);
+    // Partial reads are not cached, the next read of the item has to get all of it
+    if (read_size >= _size && actual_read_size >= _size)
+        ReaderCache::instance().put(_key, buf, _size);
+    return actual_read_size;
+}
+
+void
+CachedReader::skip_data()
+{
+    _cached = nullptr;
+    _reader->skip_data();
+}
+
+int
+CachedReader::close()
+{
+    _cached = nullptr;
+    return _reader->close();
+}
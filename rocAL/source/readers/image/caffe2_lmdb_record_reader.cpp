@@ -23,6 +23,7 @@ THE SOFTWARE.
 #include <cassert>
 #include <commons.h>
 #include "caffe2_lmdb_record_reader.h"
+#include "protobuf_wire.h"
 #include <boost/filesystem.hpp>
 #include <boost/algorithm/string.hpp>
 #include <iostream>
@@ -39,6 +40,8 @@ Caffe2LMDBRecordReader::Caffe2LMDBRecordReader()
     _src_dir = nullptr;
     _sub_dir = nullptr;
     _entity = nullptr;
+    _read_mdb_env = nullptr;
+    _read_mdb_txn = nullptr;
     _curr_file_idx = 0;
     _current_file_size = 0;
     _loop = false;
@@ -67,6 +70,7 @@ Reader::Status Caffe2LMDBRecordReader::initialize(ReaderConfig desc)
     _batch_count = desc.get_batch_size();
     _loop = desc.loop();
     _shuffle = desc.shuffle();
+    _meta_data_reader = desc.meta_data_reader();
     ret = folder_reading();
     // the following code is required to make every shard the same size:: required for multi-gpu training
     if (_shard_count > 1 && _batch_count > 1) {
@@ -77,9 +81,11 @@ Reader::Status Caffe2LMDBRecordReader::initialize(ReaderConfig desc)
             replicate_last_batch_to_pad_partial_shard();
         }
     }
+    if (_meta_data_reader)
+        _sample_ids.resolve(_file_names, [this](const std::string &key) { return _meta_data_reader->sample_id(key); });
     //shuffle dataset if set
     if( ret==Reader::Status::OK && _shuffle)
-        std::random_shuffle(_file_names.begin(), _file_names.end());
+        _sample_ids.shuffle(_file_names);
 
     return ret;
 
@@ -93,6 +99,7 @@ void Caffe2LMDBRecordReader::incremenet_read_ptr()
 size_t Caffe2LMDBRecordReader::open()
 {
     auto file_path = _file_names[_curr_file_idx];// Get next file name
+    _last_sample_id = _sample_ids[_curr_file_idx];
     _last_id = file_path;
     _current_file_size = _file_size[_file_names[_curr_file_idx]];
     return _current_file_size;
@@ -100,7 +107,7 @@ size_t Caffe2LMDBRecordReader::open()
 
 size_t Caffe2LMDBRecordReader::read_data(unsigned char* buf, size_t read_size)
 {
-    read_image(buf, _file_names[_curr_file_idx]);
+    read_image(buf, _file_names[_curr_file_idx], read_size);
     incremenet_read_ptr();
     return  read_size;
 
@@ -113,10 +120,12 @@ int Caffe2LMDBRecordReader::close()
 
 Caffe2LMDBRecordReader::~Caffe2LMDBRecordReader()
 {
-    _open_env = 0;
-    mdb_txn_abort(_read_mdb_txn);
-    mdb_close(_read_mdb_env, _read_mdb_dbi);
-    mdb_env_close(_read_mdb_env);
+    _image_data.clear();
+    if (_read_mdb_env) {
+        mdb_txn_abort(_read_mdb_txn);
+        mdb_close(_read_mdb_env, _read_mdb_dbi);
+        mdb_env_close(_read_mdb_env);
+    }
     _read_mdb_txn = nullptr;
     _read_mdb_env = nullptr;
     release();
@@ -131,7 +140,7 @@ Caffe2LMDBRecordReader::release()
 void Caffe2LMDBRecordReader::reset()
 {
     if(_shuffle)
-        std::random_shuffle(_file_names.begin(), _file_names.end());
+        _sample_ids.shuffle(_file_names);
     _read_counter = 0;
     _curr_file_idx = 0;
 }
@@ -183,7 +192,6 @@ void Caffe2LMDBRecordReader::replicate_last_batch_to_pad_partial_shard()
 
 Reader::Status Caffe2LMDBRecordReader::Caffe2_LMDB_reader()
 {
-    _open_env = 0;
     string tmp1 = _folder_path + "/data.mdb";
     string tmp2 = _folder_path + "/lock.mdb";
     uint file_size, file_size1;
@@ -210,28 +218,16 @@ size_t Caffe2LMDBRecordReader::get_file_shard_id()
 void Caffe2LMDBRecordReader::read_image_names()
 {
     int rc;
-    MDB_env *env;
-    MDB_dbi dbi;
     MDB_val key, data;
-    MDB_txn *txn;
     MDB_cursor *cursor;
-    string str_key, str_data;
+    string str_key;
 
-    // Creating an LMDB environment handle
-    CHECK_LMDB_RETURN_STATUS(mdb_env_create(&env));
-    // Setting the size of the memory map to use for this environment.
-    // The size of the memory map is also the maximum size of the database.
-    CHECK_LMDB_RETURN_STATUS(mdb_env_set_mapsize(env, _file_byte_size));
-    // Opening an environment handle.
-    CHECK_LMDB_RETURN_STATUS(mdb_env_open(env, _folder_path.c_str(), 0, 0664));
-    // Creating a transaction for use with the environment.
-    CHECK_LMDB_RETURN_STATUS(mdb_txn_begin(env, NULL, MDB_RDONLY, &txn));
-    // Opening a database in the environment.
-    CHECK_LMDB_RETURN_STATUS(mdb_dbi_open(txn, NULL, 0, &dbi));
+    // The read transaction stays open for the lifetime of the reader, the image bytes indexed below are read straight from the memory map
+    open_env_for_read_image();
 
     // Creating a cursor handle.
     // A cursor is associated with a specific transaction and database
-    CHECK_LMDB_RETURN_STATUS(mdb_cursor_open(txn, dbi, &cursor));
+    CHECK_LMDB_RETURN_STATUS(mdb_cursor_open(_read_mdb_txn, _read_mdb_dbi, &cursor));
 
     // Retrieve by cursor. It retrieves key/data pairs from the database
     while((rc = mdb_cursor_get(cursor, &key, &data, MDB_NEXT)) == 0)
@@ -244,20 +240,18 @@ void Caffe2LMDBRecordReader::read_image_names()
         }
         _in_batch_read_count++;
         _in_batch_read_count = (_in_batch_read_count%_batch_count == 0) ? 0 : _in_batch_read_count;
-        str_data = string((char *) data.mv_data);
-        caffe2_protos::TensorProtos tens_protos;
-        tens_protos.ParseFromArray((char *)data.mv_data, data.mv_size);
-        int protos_size = tens_protos.protos_size();
-        if(protos_size != 0)
+        // Locates protos(0).byte_data of the TensorProtos record without parsing it
+        const uint8_t *record = static_cast<const uint8_t *>(data.mv_data), *image_proto, *byte_data;
+        size_t image_proto_size, byte_data_size;
+        if(protobuf_find_length_delimited(record, data.mv_size, 1, true, image_proto, image_proto_size))
         {
-            caffe2_protos::TensorProto image_proto = tens_protos.protos(0);
-            bool chk_byte_data = image_proto.has_byte_data();
-            if(chk_byte_data)
+            if(protobuf_find_length_delimited(image_proto, image_proto_size, 5, false, byte_data, byte_data_size))
             {
                 _file_names.push_back(str_key.c_str());
                 _last_file_name = str_key.c_str();
-                _last_file_size = image_proto.byte_data().size();
+                _last_file_size = byte_data_size;
 	        _file_size.insert(pair<std::string, unsigned int>(_last_file_name, _last_file_size));
+                _image_data.insert(pair<std::string, const unsigned char *>(_last_file_name, byte_data));
             }
             else
             {
@@ -268,9 +262,6 @@ void Caffe2LMDBRecordReader::read_image_names()
     }
 
     mdb_cursor_close(cursor);
-    mdb_txn_abort(txn);
-    mdb_close(env, dbi);
-    mdb_env_close(env);
 }
 
 void Caffe2LMDBRecordReader::open_env_for_read_image()
@@ -281,65 +272,19 @@ void Caffe2LMDBRecordReader::open_env_for_read_image()
     CHECK_LMDB_RETURN_STATUS(mdb_env_set_mapsize(_read_mdb_env, _file_byte_size));
     // The size of the memory map is also the maximum size of the database.
     // Opening an environment handle.
-    CHECK_LMDB_RETURN_STATUS(mdb_env_open(_read_mdb_env, _folder_path.c_str(), MDB_RDONLY, 0664));
+    // MDB_NOTLS lets the loader thread read under the transaction begun by the thread that initialized the reader
+    CHECK_LMDB_RETURN_STATUS(mdb_env_open(_read_mdb_env, _folder_path.c_str(), MDB_RDONLY | MDB_NOTLS, 0664));
     // Creating a transaction for use with the environment.
     CHECK_LMDB_RETURN_STATUS(mdb_txn_begin(_read_mdb_env, NULL, MDB_RDONLY, &_read_mdb_txn));
     // Opening a database in the environment.
     CHECK_LMDB_RETURN_STATUS(mdb_open(_read_mdb_txn, NULL, 0, &_read_mdb_dbi));
-    _open_env = 1;
 }
 
-void Caffe2LMDBRecordReader::read_image(unsigned char* buff, std::string file_name)
+void Caffe2LMDBRecordReader::read_image(unsigned char* buff, const std::string &file_name, size_t max_size)
 {
-
-    if(_open_env == 0)
-        open_env_for_read_image();
-
-    // Creating a cursor handle.
-    // A cursor is associated with a specific transaction and database
-    CHECK_LMDB_RETURN_STATUS(mdb_cursor_open(_read_mdb_txn, _read_mdb_dbi, &_read_mdb_cursor));
-
-    string checkedStr = string((char *)file_name.c_str());
-    string newStr = checkedStr.substr(0, checkedStr.find(".")) + ".JPEG";
-
-    _read_mdb_key.mv_size = newStr.size();
-    _read_mdb_key.mv_data = (char *)newStr.c_str();
-
-    int _mdb_status = mdb_cursor_get(_read_mdb_cursor, &_read_mdb_key, &_read_mdb_value, MDB_SET_RANGE);
-    if(_mdb_status == MDB_NOTFOUND) {
-	    THROW("Key Not found");
-    }
-    else
-    {
-            // Parsing Image and Label Protos using the key and data values
-            // read from LMDB records
-            caffe2_protos::TensorProtos tens_protos;
-
-            tens_protos.ParseFromArray((char *)_read_mdb_value.mv_data, _read_mdb_value.mv_size);
-
-            // Checking size of the protos
-            int protos_size = tens_protos.protos_size();
-            if(protos_size != 0)
-            {
-                caffe2_protos::TensorProto image_proto = tens_protos.protos(0);
-                // Checking if image bytes is present or not
-                bool chk_byte_data = image_proto.has_byte_data();
-
-                if(chk_byte_data)
-                {
-                    memcpy(buff, image_proto.byte_data().c_str(), image_proto.byte_data().size());
-                }
-                else
-                {
-                    THROW("Image Parsing Failed");
-                }
-            }
-            else
-            {
-                THROW("Parsing Protos Failed");
-            }
-    }
-    // Closing cursor handles
-    mdb_cursor_close(_read_mdb_cursor);
-    _read_mdb_cursor = nullptr;
+    auto it = _image_data.find(file_name);
+    if(it == _image_data.end())
+        THROW("Key Not found");
+    // Sequential and shuffled reads are both a copy out of the memory map, no cursor seek nor protobuf parse per sample
+    memcpy(buff, it->second, std::min(max_size, static_cast<size_t>(_file_size[file_name])));
 }
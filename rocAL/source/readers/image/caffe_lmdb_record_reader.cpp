@@ -31,15 +31,17 @@ THE SOFTWARE.
 #include <fstream>
 #include <stdint.h>
 #include "caffe_lmdb_record_reader.h"
+#include "protobuf_wire.h"
 
 using namespace std;
-using caffe_protos::Datum;
 
 namespace filesys = boost::filesystem;
 
 CaffeLMDBRecordReader::CaffeLMDBRecordReader()
 {
     _sub_dir = nullptr;
+    _read_mdb_env = nullptr;
+    _read_mdb_txn = nullptr;
     _curr_file_idx = 0;
     _current_file_size = 0;
     _loop = false;
@@ -80,9 +82,11 @@ Reader::Status CaffeLMDBRecordReader::initialize(ReaderConfig desc)
             replicate_last_batch_to_pad_partial_shard();
         }
     }
+    if (_meta_data_reader)
+        _sample_ids.resolve(_file_names, [this](const std::string &key) { return _meta_data_reader->sample_id(key); });
     //shuffle dataset if set
     if( ret==Reader::Status::OK && _shuffle)
-        std::random_shuffle(_file_names.begin(), _file_names.end());
+        _sample_ids.shuffle(_file_names);
 
     return ret;
 
@@ -96,6 +100,7 @@ void CaffeLMDBRecordReader::incremenet_read_ptr()
 size_t CaffeLMDBRecordReader::open()
 {
     auto file_path = _file_names[_curr_file_idx]; // Get next file name
+    _last_sample_id = _sample_ids[_curr_file_idx];
     _last_id = file_path;
     _current_file_size = _file_size[_file_names[_curr_file_idx]];
     return _current_file_size;
@@ -103,7 +108,7 @@ size_t CaffeLMDBRecordReader::open()
 
 size_t CaffeLMDBRecordReader::read_data(unsigned char *buf, size_t read_size)
 {
-    read_image(buf, _file_names[_curr_file_idx]);
+    read_image(buf, _file_names[_curr_file_idx], read_size);
     incremenet_read_ptr();
     return read_size;
 }
@@ -115,32 +120,25 @@ int CaffeLMDBRecordReader::close()
 
 CaffeLMDBRecordReader::~CaffeLMDBRecordReader()
 {
-    _open_env = 0;
-    mdb_txn_abort(_read_mdb_txn);
-    mdb_close(_read_mdb_env, _read_mdb_dbi);
-    mdb_env_close(_read_mdb_env);
+    _image_data.clear();
+    if (_read_mdb_env) {
+        mdb_txn_abort(_read_mdb_txn);
+        mdb_close(_read_mdb_env, _read_mdb_dbi);
+        mdb_env_close(_read_mdb_env);
+    }
     _read_mdb_txn = nullptr;
     _read_mdb_env = nullptr;
-    release();
 }
 
 int CaffeLMDBRecordReader::release()
 {
-    mdb_cursor_close(_mdb_cursor);
-    mdb_txn_abort(_mdb_txn);
-    mdb_close(_mdb_env, _mdb_dbi);
-
-    mdb_env_close(_mdb_env);
-    _mdb_cursor = nullptr;
-    _mdb_txn = nullptr;
-    _mdb_env = nullptr;
     return 0;
 }
 
 void CaffeLMDBRecordReader::reset()
 {
     if (_shuffle)
-        std::random_shuffle(_file_names.begin(), _file_names.end());
+        _sample_ids.shuffle(_file_names);
     _read_counter = 0;
     _curr_file_idx = 0;
 }
@@ -176,7 +174,6 @@ void CaffeLMDBRecordReader::replicate_last_image_to_fill_last_shard()
 
 Reader::Status CaffeLMDBRecordReader::Caffe_LMDB_reader()
 {
-    _open_env = 0;
     string tmp1 = _folder_path + "/data.mdb";
     string tmp2 = _folder_path + "/lock.mdb";
     uint file_size, file_size1;
@@ -202,35 +199,18 @@ size_t CaffeLMDBRecordReader::get_file_shard_id()
 void CaffeLMDBRecordReader::read_image_names()
 {
     int rc;
-    // Creating an LMDB environment handle
-    CHECK_LMDB_RETURN_STATUS(mdb_env_create(&_mdb_env));
-    // Setting the size of the memory map to use for this environment.
-    // The size of the memory map is also the maximum size of the database.
-    CHECK_LMDB_RETURN_STATUS(mdb_env_set_mapsize(_mdb_env, _file_byte_size));
-    // Opening an environment handle.
-    CHECK_LMDB_RETURN_STATUS(mdb_env_open(_mdb_env, _path.c_str(), MDB_RDONLY, 0664));
-    // Creating a transaction for use with the environment
-    CHECK_LMDB_RETURN_STATUS(mdb_txn_begin(_mdb_env, NULL, MDB_RDONLY, &_mdb_txn));
-    // Opening a database in the environment.
-    CHECK_LMDB_RETURN_STATUS(mdb_open(_mdb_txn, NULL, 0, &_mdb_dbi));
+    MDB_cursor *cursor;
+    MDB_val key, value;
+    // The read transaction stays open for the lifetime of the reader, the image bytes indexed below are read straight from the memory map
+    open_env_for_read_image();
     // Creating a cursor handle.
     // A cursor is associated with a specific transaction and database
-    CHECK_LMDB_RETURN_STATUS(mdb_cursor_open(_mdb_txn, _mdb_dbi, &_mdb_cursor));
+    CHECK_LMDB_RETURN_STATUS(mdb_cursor_open(_read_mdb_txn, _read_mdb_dbi, &cursor));
 
     // Retrieve by cursor. It retrieves key/data pairs from the database
-    while ((rc = mdb_cursor_get(_mdb_cursor, &_mdb_key, &_mdb_value, MDB_NEXT)) == 0)
+    while ((rc = mdb_cursor_get(cursor, &key, &value, MDB_NEXT)) == 0)
     {
-        Datum datum;
-        caffe_protos::AnnotatedDatum annotatedDatum_protos;
-        annotatedDatum_protos.ParseFromArray((char *)_mdb_value.mv_data, _mdb_value.mv_size);
-        // Checking image Datum
-        int check_image_datum = annotatedDatum_protos.has_datum();
-
-        if (check_image_datum)
-            datum = annotatedDatum_protos.datum(); // parse datum for detection
-        else
-            datum.ParseFromArray((const void *)_mdb_value.mv_data, _mdb_value.mv_size); //parse datum for classification
-        if((!_meta_data_reader || _meta_data_reader->exists(string((char *)_mdb_key.mv_data).c_str())))
+        if((!_meta_data_reader || _meta_data_reader->exists(string((char *)key.mv_data).c_str())))
        {
            if (get_file_shard_id() != _shard_id)
             {
@@ -240,18 +220,23 @@ void CaffeLMDBRecordReader::read_image_names()
             }
             _in_batch_read_count++;
             _in_batch_read_count = (_in_batch_read_count % _batch_count == 0) ? 0 : _in_batch_read_count;
-            string image_key = string((char *)_mdb_key.mv_data);
+            string image_key = string((char *)key.mv_data);
             _file_names.push_back(image_key.c_str());
             _last_file_name = image_key.c_str();
             _file_count_all_shards++;
             incremenet_file_id();
-            _last_file_size = datum.data().size();
+            // Locates Datum.data without parsing the record, a detection record wraps the Datum in an AnnotatedDatum
+            const uint8_t *record = static_cast<const uint8_t *>(value.mv_data), *datum = record, *data = nullptr;
+            size_t record_size = value.mv_size, datum_size = record_size, data_size = 0;
+            protobuf_find_length_delimited(record, record_size, 1, false, datum, datum_size);
+            protobuf_find_length_delimited(datum, datum_size, 4, false, data, data_size);
+            _last_file_size = data_size;
             _file_size.insert(pair<std::string, unsigned int>(_last_file_name, _last_file_size));
+            _image_data.insert(pair<std::string, const unsigned char *>(_last_file_name, data));
         }
 
     }
-
-    release();
+    mdb_cursor_close(cursor);
 }
 
 void CaffeLMDBRecordReader::replicate_last_batch_to_pad_partial_shard()
@@ -277,53 +262,19 @@ void CaffeLMDBRecordReader::open_env_for_read_image()
     // The size of the memory map is also the maximum size of the database.
     CHECK_LMDB_RETURN_STATUS(mdb_env_set_mapsize(_read_mdb_env, _file_byte_size));
     // Opening an environment handle.
-    CHECK_LMDB_RETURN_STATUS(mdb_env_open(_read_mdb_env, _path.c_str(), MDB_RDONLY, 0664));
+    // MDB_NOTLS lets the loader thread read under the transaction begun by the thread that initialized the reader
+    CHECK_LMDB_RETURN_STATUS(mdb_env_open(_read_mdb_env, _path.c_str(), MDB_RDONLY | MDB_NOTLS, 0664));
     // Creating a transaction for use with the environment
     CHECK_LMDB_RETURN_STATUS(mdb_txn_begin(_read_mdb_env, NULL, MDB_RDONLY, &_read_mdb_txn));
     // Opening a database in the environment.
     CHECK_LMDB_RETURN_STATUS(mdb_open(_read_mdb_txn, NULL, 0, &_read_mdb_dbi));
-    _open_env = 1;
 }
 
-void CaffeLMDBRecordReader::read_image(unsigned char *buff, std::string file_name)
+void CaffeLMDBRecordReader::read_image(unsigned char *buff, const std::string &file_name, size_t max_size)
 {
-    if(_open_env == 0)
-    {
-	open_env_for_read_image();
-    }
-
-    // Creating a cursor handle.
-    // A cursor is associated with a specific transaction and database
-    CHECK_LMDB_RETURN_STATUS(mdb_cursor_open(_read_mdb_txn, _read_mdb_dbi, &_read_mdb_cursor));
-
-    string checkedStr = string((char *)file_name.c_str());
-    string newStr = checkedStr.substr(0, checkedStr.find(".")) + ".JPEG";
-
-    _read_mdb_key.mv_size = newStr.size();
-    _read_mdb_key.mv_data = (char *)newStr.c_str();
-
-    int _mdb_status = mdb_cursor_get(_read_mdb_cursor, &_read_mdb_key, &_read_mdb_value, MDB_SET_RANGE);
-    if(_mdb_status == MDB_NOTFOUND) {
+    auto it = _image_data.find(file_name);
+    if (it == _image_data.end())
         THROW("\nKey Not found");
-    }
-    else
-    {
-        Datum datum;
-        caffe_protos::AnnotatedDatum annotatedDatum_protos;
-        annotatedDatum_protos.ParseFromArray((char *)_read_mdb_value.mv_data, _read_mdb_value.mv_size);
-
-        // Checking image Datum
-        int check_image_datum = annotatedDatum_protos.has_datum();
-
-        if (check_image_datum)
-            datum = annotatedDatum_protos.datum(); // parse datum for detection
-        else
-            datum.ParseFromArray((const void *)_read_mdb_value.mv_data, _read_mdb_value.mv_size); //parse datum for classification
-
-        memcpy(buff, datum.data().c_str(), datum.data().size());
-
-    }
-
-    mdb_cursor_close(_read_mdb_cursor);
-    _read_mdb_cursor = nullptr;
+    // Sequential and shuffled reads are both a copy out of the memory map, no cursor seek nor protobuf parse per sample
+    memcpy(buff, it->second, std::min(max_size, static_cast<size_t>(_file_size[file_name])));
 }
@@ -34,9 +34,6 @@ namespace filesys = boost::filesystem;
 
 COCOFileSourceReader::COCOFileSourceReader()
 {
-    _src_dir = nullptr;
-    _sub_dir = nullptr;
-    _entity = nullptr;
     _curr_file_idx = 0;
     _current_file_size = 0;
     _current_fPtr = nullptr;
@@ -60,6 +57,7 @@ Reader::Status COCOFileSourceReader::initialize(ReaderConfig desc)
     auto ret = Reader::Status::OK;
     _file_id = 0;
     _folder_path = desc.path();
+    _index_path = desc.index_path();
     _json_path = desc.json_path();
     _shard_id = desc.get_shard_id();
     _shard_count = desc.get_shard_count();
@@ -86,9 +84,12 @@ Reader::Status COCOFileSourceReader::initialize(ReaderConfig desc)
             replicate_last_batch_to_pad_partial_shard();
         }
     }
+    // resolved once here so that the meta data of every opened item is found by its id
+    if (_meta_data_reader)
+        _sample_ids.resolve(_file_names, [this](const std::string &file_path) { return _meta_data_reader->sample_id(file_path.substr(file_path.find_last_of("\\/") + 1)); });
     //shuffle dataset if set
     if (ret == Reader::Status::OK && _shuffle)
-        std::random_shuffle(_file_names.begin(), _file_names.end());
+        _sample_ids.shuffle(_file_names);
     return ret;
 }
 
@@ -100,7 +101,9 @@ void COCOFileSourceReader::incremenet_read_ptr()
 size_t COCOFileSourceReader::open()
 {
     auto file_path = _file_names[_curr_file_idx]; // Get next file name
+    _last_sample_id = _sample_ids[_curr_file_idx];
     incremenet_read_ptr();
+    _last_file_path = file_path;
     _last_id = file_path;
     auto last_slash_idx = _last_id.find_last_of("\\/");
     if (std::string::npos != last_slash_idx)
@@ -185,42 +188,29 @@ int COCOFileSourceReader::release()
 void COCOFileSourceReader::reset()
 {
     if (_shuffle)
-        std::random_shuffle(_file_names.begin(), _file_names.end());
+        _sample_ids.shuffle(_file_names);
     _read_counter = 0;
     _curr_file_idx = 0;
 }
 
 Reader::Status COCOFileSourceReader::subfolder_reading()
 {
-    if ((_sub_dir = opendir(_folder_path.c_str())) == nullptr)
-        THROW("FileReader ShardID [" + TOSTR(_shard_id) + "] ERROR: Failed opening the directory at " + _folder_path);
-
-    std::vector<std::string> entry_name_list;
     std::string _full_path = _folder_path;
+    _listing.load(_full_path, _index_path);
+    auto &entry_list = _listing.root_entries();
 
-    while ((_entity = readdir(_sub_dir)) != nullptr)
-    {
-        std::string entry_name(_entity->d_name);
-        if (strcmp(_entity->d_name, ".") == 0 || strcmp(_entity->d_name, "..") == 0)
-            continue;
-        entry_name_list.push_back(entry_name);
-    }
-    std::sort(entry_name_list.begin(), entry_name_list.end());
-
-    std::string subfolder_path = _full_path + "/" + entry_name_list[0];
-
-    filesys::path pathObj(subfolder_path);
     auto ret = Reader::Status::OK;
-    if (filesys::exists(pathObj) && filesys::is_regular_file(pathObj))
+    if (!entry_list.empty() && !entry_list[0].second)
     {
         ret = open_folder();
     }
-    else if (filesys::exists(pathObj) && filesys::is_directory(pathObj))
+    else
     {
-        for (unsigned dir_count = 0; dir_count < entry_name_list.size(); ++dir_count)
+        for (unsigned dir_count = 0; dir_count < entry_list.size(); ++dir_count)
         {
-            std::string subfolder_path = _full_path + "/" + entry_name_list[dir_count];
-            _folder_path = subfolder_path;
+            if (!entry_list[dir_count].second)
+                continue;
+            _folder_path = _full_path + "/" + entry_list[dir_count].first;
             if (open_folder() != Reader::Status::OK)
                 WRN("FileReader ShardID [" + TOSTR(_shard_id) + "] File reader cannot access the storage at " + _folder_path);
         }
@@ -232,7 +222,6 @@ Reader::Status COCOFileSourceReader::subfolder_reading()
     }
     if (!_file_names.empty())
         LOG("FileReader ShardID [" + TOSTR(_shard_id) + "] Total of " + TOSTR(_file_names.size()) + " images loaded from " + _full_path)
-    closedir(_sub_dir);
     return ret;
 }
 void COCOFileSourceReader::replicate_last_image_to_fill_last_shard()
@@ -251,14 +240,9 @@ void COCOFileSourceReader::replicate_last_batch_to_pad_partial_shard()
 
 Reader::Status COCOFileSourceReader::open_folder()
 {
-    if ((_src_dir = opendir(_folder_path.c_str())) == nullptr)
-        THROW("FileReader ShardID [" + TOSTR(_shard_id) + "] ERROR: Failed opening the directory at " + _folder_path);
-
-    while ((_entity = readdir(_src_dir)) != nullptr)
+    for (auto &filename : _listing.files(_folder_path))
     {
-        if (_entity->d_type != DT_REG)
-            continue;
-        if(!_meta_data_reader || _meta_data_reader->exists(_entity->d_name)) {
+        if(!_meta_data_reader || _meta_data_reader->exists(filename)) {
             if (get_file_shard_id() != _shard_id)
             {
                 _file_count_all_shards++;
@@ -269,7 +253,7 @@ Reader::Status COCOFileSourceReader::open_folder()
             _in_batch_read_count = (_in_batch_read_count % _batch_count == 0) ? 0 : _in_batch_read_count;
             std::string file_path = _folder_path;
             file_path.append("/");
-            file_path.append(_entity->d_name);
+            file_path.append(filename);
             _file_names.push_back(file_path);
             _file_count_all_shards++;
             incremenet_file_id();
@@ -280,7 +264,6 @@ Reader::Status COCOFileSourceReader::open_folder()
     std::sort(_file_names.begin(), _file_names.end());
     _last_file_name = _file_names[_file_names.size()-1];
 
-    closedir(_src_dir);
     return Reader::Status::OK;
 }
 
@@ -22,6 +22,7 @@ THE SOFTWARE.
 
 #include "lookahead_parser.h"
 #include "coco_meta_data_reader_key_points.h"
+#include "coco_annotation_cache.h"
 #include <iostream>
 #include <utility>
 #include <algorithm>
@@ -104,6 +105,13 @@ void COCOMetaDataReaderKeyPoints::print_map_contents()
 void COCOMetaDataReaderKeyPoints::read_all(const std::string &path)
 {
     _coco_metadata_read_time.start(); // Debug timing
+    // The box scales depend on the aspect ratio of the output, a cache made for another output size is rebuilt
+    COCOAnnotationCache cache(path, COCOAnnotationCache::Content::KEY_POINTS, {_out_img_width, _out_img_height});
+    if (cache.load(_map_content))
+    {
+        _coco_metadata_read_time.end(); // Debug timing
+        return;
+    }
     std::ifstream f;
     f.open(path, std::ifstream::in | std::ios::binary);
     if (f.fail())
@@ -368,6 +376,7 @@ void COCOMetaDataReaderKeyPoints::read_all(const std::string &path)
             parser.SkipValue();
         }
     }
+    cache.save(_map_content);
     _coco_metadata_read_time.end(); // Debug timing
     // print_map_contents();
     // std::cout << "coco read time in sec: " << _coco_metadata_read_time.get_timing() / 1000 << std::endl;
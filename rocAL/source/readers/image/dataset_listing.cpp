@@ -0,0 +1,212 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#include <algorithm>
+#include <cstring>
+#include <dirent.h>
+#include <fstream>
+#include <functional>
+#include <sstream>
+#include <sys/stat.h>
+#include <unistd.h>
+#include "dataset_listing.h"
+#include "commons.h"
+#include "exception.h"
+
+static const char *MANIFEST_HEADER = "rocal_dataset_listing 1";
+
+static bool folder_mtime(const std::string &path, long long &sec, long long &nsec)
+{
+    struct stat st;
+    if (stat(path.c_str(), &st) != 0)
+        return false;
+    sec = st.st_mtim.tv_sec;
+    nsec = st.st_mtim.tv_nsec;
+    return true;
+}
+
+static std::string folder_path(const std::string &root, const std::string &name)
+{
+    return (name == ".") ? root : root + "/" + name;
+}
+
+const std::vector<std::string> &
+DatasetListing::files(const std::string &folder) const
+{
+    std::string name = ".";
+    if (folder != _root) {
+        if (folder.compare(0, _root.size() + 1, _root + "/") != 0)
+            THROW("Folder " + folder + " is not part of the dataset at " + _root)
+        name = folder.substr(_root.size() + 1);
+    }
+    auto it = _folders.find(name);
+    if (it == _folders.end())
+        THROW("Folder " + folder + " is not listed for the dataset at " + _root)
+    return it->second.file_names;
+}
+
+void
+DatasetListing::load(const std::string &root, const std::string &manifest_dir)
+{
+    _root = root;
+    _root_entries.clear();
+    _folders.clear();
+    std::string manifest_file;
+    if (!manifest_dir.empty()) {
+        std::stringstream name;
+        name << manifest_dir << "/rocal_dataset_listing_" << std::hex << std::hash<std::string>{}(root) << ".txt";
+        manifest_file = name.str();
+        if (load_manifest(manifest_file))
+            return;
+        _root_entries.clear();
+        _folders.clear();
+    }
+    walk();
+    if (!manifest_file.empty())
+        save_manifest(manifest_file);
+}
+
+void
+DatasetListing::walk()
+{
+    if (!folder_mtime(_root, _root_mtime_sec, _root_mtime_nsec))
+        THROW("ERROR: Failed opening the directory at " + _root);
+    auto list_folder = [this](const std::string &name) {
+        auto path = folder_path(_root, name);
+        Folder folder;
+        // The modification time is taken before reading the folder so that a concurrent change invalidates the manifest
+        folder_mtime(path, folder.mtime_sec, folder.mtime_nsec);
+        DIR *dir = opendir(path.c_str());
+        if (!dir)
+            THROW("ERROR: Failed opening the directory at " + path);
+        struct dirent *entity;
+        while ((entity = readdir(dir)) != nullptr)
+            if (entity->d_type == DT_REG)
+                folder.file_names.push_back(entity->d_name);
+        closedir(dir);
+        _folders.emplace(name, std::move(folder));
+    };
+    list_folder(".");
+    DIR *dir = opendir(_root.c_str());
+    if (!dir)
+        THROW("ERROR: Failed opening the directory at " + _root);
+    struct dirent *entity;
+    std::vector<std::string> entry_names;
+    while ((entity = readdir(dir)) != nullptr) {
+        if (strcmp(entity->d_name, ".") == 0 || strcmp(entity->d_name, "..") == 0)
+            continue;
+        entry_names.push_back(entity->d_name);
+    }
+    closedir(dir);
+    std::sort(entry_names.begin(), entry_names.end());
+    for (auto &name : entry_names) {
+        struct stat st;
+        if (stat(folder_path(_root, name).c_str(), &st) != 0)
+            continue;
+        if (S_ISDIR(st.st_mode)) {
+            _root_entries.emplace_back(name, true);
+            list_folder(name);
+        } else if (S_ISREG(st.st_mode)) {
+            _root_entries.emplace_back(name, false);
+        }
+    }
+}
+
+bool
+DatasetListing::load_manifest(const std::string &manifest_file)
+{
+    std::ifstream in(manifest_file);
+    if (!in)
+        return false;
+    std::string line;
+    if (!std::getline(in, line) || line != MANIFEST_HEADER)
+        return false;
+    if (!std::getline(in, line) || line != _root)
+        return false;
+    long long sec, nsec;
+    size_t count;
+    if (!(in >> _root_mtime_sec >> _root_mtime_nsec >> count) || !folder_mtime(_root, sec, nsec) ||
+        sec != _root_mtime_sec || nsec != _root_mtime_nsec)
+        return false;
+    in.ignore(1);
+    for (size_t i = 0; i < count; i++) {
+        if (!std::getline(in, line) || line.size() < 3)
+            return false;
+        _root_entries.emplace_back(line.substr(2), line[0] == 'd');
+    }
+    size_t folder_count;
+    if (!(in >> folder_count))
+        return false;
+    in.ignore(1);
+    for (size_t i = 0; i < folder_count; i++) {
+        std::string name;
+        Folder folder;
+        if (!std::getline(in, name) || !(in >> folder.mtime_sec >> folder.mtime_nsec >> count))
+            return false;
+        in.ignore(1);
+        // A stale folder means files were added, removed or renamed since the manifest was written
+        if (!folder_mtime(folder_path(_root, name), sec, nsec) || sec != folder.mtime_sec || nsec != folder.mtime_nsec)
+            return false;
+        folder.file_names.resize(count);
+        for (auto &file_name : folder.file_names)
+            if (!std::getline(in, file_name))
+                return false;
+        _folders.emplace(name, std::move(folder));
+    }
+    LOG("Loaded the listing of " + _root + " from " + manifest_file)
+    return true;
+}
+
+void
+DatasetListing::save_manifest(const std::string &manifest_file)
+{
+    // Written aside and renamed so that ranks listing the same dataset never read a partial manifest
+    std::string tmp_file = manifest_file + ".tmp." + std::to_string(getpid());
+    {
+        std::ofstream out(tmp_file);
+        if (!out) {
+            WRN("Could not write the dataset listing manifest " + manifest_file)
+            return;
+        }
+        out << MANIFEST_HEADER << "\n" << _root << "\n";
+        out << _root_mtime_sec << " " << _root_mtime_nsec << " " << _root_entries.size() << "\n";
+        for (auto &entry : _root_entries)
+            out << (entry.second ? 'd' : 'f') << " " << entry.first << "\n";
+        out << _folders.size() << "\n";
+        for (auto &folder : _folders) {
+            out << folder.first << "\n";
+            out << folder.second.mtime_sec << " " << folder.second.mtime_nsec << " " << folder.second.file_names.size() << "\n";
+            for (auto &file_name : folder.second.file_names)
+                out << file_name << "\n";
+        }
+        if (!out) {
+            WRN("Could not write the dataset listing manifest " + manifest_file)
+            std::remove(tmp_file.c_str());
+            return;
+        }
+    }
+    if (std::rename(tmp_file.c_str(), manifest_file.c_str()) != 0) {
+        WRN("Could not write the dataset listing manifest " + manifest_file)
+        std::remove(tmp_file.c_str());
+    }
+}
@@ -30,9 +30,6 @@ namespace filesys = boost::filesystem;
 
 FileSourceReader::FileSourceReader()
 {
-    _src_dir = nullptr;
-    _sub_dir = nullptr;
-    _entity = nullptr;
     _curr_file_idx = 0;
     _current_file_size = 0;
     _current_fPtr = nullptr;
@@ -56,6 +53,7 @@ Reader::Status FileSourceReader::initialize(ReaderConfig desc)
     auto ret = Reader::Status::OK;
     _file_id = 0;
     _folder_path = desc.path();
+    _index_path = desc.index_path();
     _shard_id = desc.get_shard_id();
     _shard_count = desc.get_shard_count();
     _batch_count = desc.get_batch_size();
@@ -87,6 +85,7 @@ size_t FileSourceReader::open()
 {
     auto file_path = _file_names[_curr_file_idx];// Get next file name
     incremenet_read_ptr();
+    _last_file_path = file_path;
     _last_id= file_path;
     auto last_slash_idx = _last_id.find_last_of("\\/");
     if (std::string::npos != last_slash_idx)
@@ -156,26 +155,14 @@ void FileSourceReader::reset()
 
 Reader::Status FileSourceReader::subfolder_reading()
 {
-    if ((_sub_dir = opendir (_folder_path.c_str())) == nullptr)
-        THROW("FileReader ShardID ["+ TOSTR(_shard_id)+ "] ERROR: Failed opening the directory at " + _folder_path);
-
-    std::vector<std::string> entry_name_list;
     std::string _full_path = _folder_path;
-
-    while((_entity = readdir (_sub_dir)) != nullptr)
-    {
-        std::string entry_name(_entity->d_name);
-        if (strcmp(_entity->d_name, ".") == 0 || strcmp(_entity->d_name, "..") == 0) continue;
-        entry_name_list.push_back(entry_name);
-    }
-    closedir(_sub_dir);
-    std::sort(entry_name_list.begin(), entry_name_list.end());
+    _listing.load(_full_path, _index_path);
+    auto &entry_list = _listing.root_entries();
 
     auto ret = Reader::Status::OK;
-    for (unsigned dir_count = 0; dir_count < entry_name_list.size(); ++dir_count) {
-        std::string subfolder_path = _full_path + "/" + entry_name_list[dir_count];
-        filesys::path pathObj(subfolder_path);
-        if(filesys::exists(pathObj) && filesys::is_regular_file(pathObj))
+    for (unsigned dir_count = 0; dir_count < entry_list.size(); ++dir_count) {
+        std::string subfolder_path = _full_path + "/" + entry_list[dir_count].first;
+        if(!entry_list[dir_count].second)
         {
             // ignore files with non-image extensions
             auto file_extension_idx = subfolder_path.find_last_of(".");
@@ -189,7 +176,7 @@ Reader::Status FileSourceReader::subfolder_reading()
             ret = open_folder();
             break;  // assume directory has only files.
         }
-        else if(filesys::exists(pathObj) && filesys::is_directory(pathObj))
+        else
         {
             _folder_path = subfolder_path;
             if(open_folder() != Reader::Status::OK)
@@ -222,16 +209,8 @@ void FileSourceReader::replicate_last_batch_to_pad_partial_shard()
 
 Reader::Status FileSourceReader::open_folder()
 {
-    if ((_src_dir = opendir (_folder_path.c_str())) == nullptr)
-        THROW("FileReader ShardID ["+ TOSTR(_shard_id)+ "] ERROR: Failed opening the directory at " + _folder_path);
-
-
-    while((_entity = readdir (_src_dir)) != nullptr)
+    for (auto &filename : _listing.files(_folder_path))
     {
-        if(_entity->d_type != DT_REG)
-            continue;
-
-        std::string filename(_entity->d_name);
         auto file_extension_idx = filename.find_last_of(".");
         if (file_extension_idx  != std::string::npos) {
             std::string file_extension = filename.substr(file_extension_idx+1);
@@ -250,7 +229,7 @@ Reader::Status FileSourceReader::open_folder()
         _in_batch_read_count = (_in_batch_read_count%_batch_count == 0) ? 0 : _in_batch_read_count;
         std::string file_path = _folder_path;
         file_path.append("/");
-        file_path.append(_entity->d_name);
+        file_path.append(filename);
         _file_names.push_back(file_path);
         _file_count_all_shards++;
         incremenet_file_id();
@@ -260,7 +239,6 @@ Reader::Status FileSourceReader::open_folder()
     std::sort(_file_names.begin(), _file_names.end());
     _last_file_name = _file_names[_file_names.size()-1];
 
-    closedir(_src_dir);
     return Reader::Status::OK;
 }
 
@@ -31,8 +31,9 @@ THE SOFTWARE.
 #include "caffe_lmdb_record_reader.h"
 #include "caffe2_lmdb_record_reader.h"
 #include "mxnet_recordio_reader.h"
+#include "cached_reader.h"
 
-std::shared_ptr<Reader> create_reader(ReaderConfig config) {
+static std::shared_ptr<Reader> create_storage_reader(ReaderConfig config) {
     switch(config.type()) {
         case StorageType ::FILE_SYSTEM:
         {
@@ -102,3 +103,25 @@ std::shared_ptr<Reader> create_reader(ReaderConfig config) {
             throw std::runtime_error ("Reader type is unsupported");
     }
 }
+
+std::shared_ptr<Reader> create_reader(ReaderConfig config) {
+    auto reader = create_storage_reader(config);
+    if (ReaderCache::instance().capacity() == 0)
+        return reader;
+    // Only readers whose unique_id() tells their items apart can be cached
+    switch(config.type()) {
+        case StorageType::FILE_SYSTEM:
+        case StorageType::COCO_FILE_SYSTEM:
+        case StorageType::TF_RECORD:
+        case StorageType::CAFFE_LMDB_RECORD:
+        case StorageType::CAFFE2_LMDB_RECORD:
+        case StorageType::MXNET_RECORDIO:
+            return std::make_shared<CachedReader>(reader, config.path());
+        default:
+            return reader;
+    }
+}
+
+void set_reader_cache_size(size_t cache_size) {
+    ReaderCache::instance().set_capacity(cache_size);
+}
@@ -23,17 +23,55 @@ THE SOFTWARE.
 #include <cassert>
 #include <commons.h>
 #include "tf_record_reader.h"
+#include "protobuf_wire.h"
+#include "cache_files.h"
 #include <boost/filesystem.hpp>
 #include <boost/algorithm/string.hpp>
 #include <iostream>
 #include <string>
 #include <vector>
+#include <cstdio>
 #include <sstream>
 #include <fstream>
 #include <stdint.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
 
 namespace filesys = boost::filesystem;
 
+static const std::string TF_RECORD_INDEX_EXTENSION = ".idx";
+static const std::string TF_RECORD_INDEX_HEADER = "rocal_tfrecord_index 2";
+
+//! Finds the first value of the bytes_list feature named key in a serialized tensorflow::Example without parsing (and
+//! copying) the whole message
+static bool find_bytes_feature(const uint8_t *example, size_t example_size, const std::string &key,
+                               const uint8_t *&value, size_t &value_size)
+{
+    // Example.features
+    const uint8_t *features, *field;
+    size_t features_size, field_size;
+    uint32_t field_number;
+    if (!protobuf_find_length_delimited(example, example_size, 1, true, features, features_size))
+        return false;
+    // Features.feature map entries
+    const uint8_t *ptr = features, *end = features + features_size;
+    while (protobuf_next_length_delimited(ptr, end, field_number, field, field_size)) {
+        if (field_number != 1)
+            continue;
+        const uint8_t *entry_key, *feature, *bytes_list;
+        size_t entry_key_size, feature_size, bytes_list_size;
+        if (!protobuf_find_length_delimited(field, field_size, 1, false, entry_key, entry_key_size) ||
+            !protobuf_find_length_delimited(field, field_size, 2, false, feature, feature_size) ||
+            std::string((const char *)entry_key, entry_key_size) != key)
+            continue;
+        // Feature.bytes_list, then BytesList.value
+        return protobuf_find_length_delimited(feature, feature_size, 1, true, bytes_list, bytes_list_size) &&
+               protobuf_find_length_delimited(bytes_list, bytes_list_size, 1, true, value, value_size);
+    }
+    return false;
+}
+
 TFRecordReader::TFRecordReader()
 {
     _src_dir = nullptr;
@@ -44,7 +82,6 @@ TFRecordReader::TFRecordReader()
     _loop = false;
     _shuffle = false;
     _file_id = 0;
-    _last_rec = false;
     _record_name_prefix = "";
     _file_count_all_shards = 0;
 }
@@ -70,9 +107,11 @@ Reader::Status TFRecordReader::initialize(ReaderConfig desc)
     _batch_count = desc.get_batch_size();
     _loop = desc.loop();
     _shuffle = desc.shuffle();
+    _meta_data_reader = desc.meta_data_reader();
     _record_name_prefix = desc.file_prefix();
     _encoded_key = _feature_key_map.at("image/encoded");
     _filename_key = _feature_key_map.at("image/filename");
+    _index_path = desc.index_path();
     ret = folder_reading();
     if (_shard_count > 1 && _batch_count > 1) {
         int _num_batches = _file_names.size()/_batch_count;
@@ -82,9 +121,11 @@ Reader::Status TFRecordReader::initialize(ReaderConfig desc)
             replicate_last_batch_to_pad_partial_shard();
         }
     }
+    if (_meta_data_reader)
+        _sample_ids.resolve(_file_names, [this](const std::string &file_path) { return _meta_data_reader->sample_id(file_path.substr(file_path.find_last_of("\\/") + 1)); });
     //shuffle dataset if set
     if (ret == Reader::Status::OK && _shuffle)
-        std::random_shuffle(_file_names.begin(), _file_names.end());
+        _sample_ids.shuffle(_file_names);
     return ret;
 }
 
@@ -96,6 +137,8 @@ void TFRecordReader::incremenet_read_ptr()
 size_t TFRecordReader::open()
 {
     auto file_path = _file_names[_curr_file_idx]; // Get next file name
+    _last_sample_id = _sample_ids[_curr_file_idx];
+    _last_file_path = file_path;
     _last_id = file_path;
     auto last_slash_idx = _last_id.find_last_of("\\/");
     if (std::string::npos != last_slash_idx)
@@ -108,9 +151,10 @@ size_t TFRecordReader::open()
 
 size_t TFRecordReader::read_data(unsigned char *buf, size_t read_size)
 {
-    auto ret = read_image(buf, _file_names[_curr_file_idx], _file_size[_file_names[_curr_file_idx]]);
-    if(ret != Reader::Status::OK )
-        THROW("TFRecordReader: Error in reading TF records");
+    auto it = _encoded_data.find(_file_names[_curr_file_idx]);
+    if (_encoded_data.end() == it)
+        THROW("ERROR: Given name not present in the map" + _file_names[_curr_file_idx])
+    memcpy(buf, it->second, std::min(read_size, (size_t)_current_file_size));
     incremenet_read_ptr();
     return read_size;
 }
@@ -123,6 +167,15 @@ int TFRecordReader::close()
 TFRecordReader::~TFRecordReader()
 {
     release();
+    unmap_records();
+}
+
+void TFRecordReader::unmap_records()
+{
+    for (auto &record : _mapped_records)
+        munmap(record.first, record.second);
+    _mapped_records.clear();
+    _encoded_data.clear();
 }
 
 int TFRecordReader::release()
@@ -133,7 +186,7 @@ int TFRecordReader::release()
 void TFRecordReader::reset()
 {
     if (_shuffle)
-        std::random_shuffle(_file_names.begin(), _file_names.end());
+        _sample_ids.shuffle(_file_names);
     _read_counter = 0;
     _curr_file_idx = 0;
 }
@@ -151,6 +204,8 @@ Reader::Status TFRecordReader::folder_reading()
         std::string entry_name(_entity->d_name);
         if (strcmp(_entity->d_name, ".") == 0 || strcmp(_entity->d_name, "..") == 0)
             continue;
+        if (is_tf_record_index_file(entry_name))
+            continue;
         entry_name_list.push_back(entry_name);
         // std::cerr<<"\n entry_name::"<<entry_name;
     }
@@ -196,25 +251,140 @@ Reader::Status TFRecordReader::tf_record_reader()
     std::string fname = _folder_path;
     // if _record_name_prefix is specified, read only the records with prefix
     if  (_record_name_prefix.empty() || fname.find(_record_name_prefix) != std::string::npos) {
-        uint file_size;
-        std::ifstream file_contents(fname.c_str(), std::ios::binary);
-        if (!file_contents)
+        int fd = ::open(fname.c_str(), O_RDONLY);
+        if (fd < 0)
             THROW("TFRecordReader: Failed to open file " + fname);
-        file_contents.seekg(0, std::ifstream::end);
-        file_size = file_contents.tellg();
-        // std::cerr<<"\n length of the file:: "<<length<<std::endl;
-        file_contents.seekg(0, std::ifstream::beg);
-        auto ret = read_image_names(file_contents, file_size);
+        size_t file_size = lseek(fd, 0, SEEK_END);
+        if (file_size == 0) {
+            ::close(fd);
+            WRN("TFRecordReader: Skipping empty record file " + fname)
+            return Reader::Status::OK;
+        }
+        // The records are only touched for the samples of this shard, mapping them avoids a stream and a copy per sample
+        auto records = static_cast<unsigned char *>(mmap(nullptr, file_size, PROT_READ, MAP_PRIVATE, fd, 0));
+        ::close(fd);
+        if (records == MAP_FAILED)
+            THROW("TFRecordReader: Failed to map file " + fname);
+        _mapped_records.emplace_back(records, file_size);
+        std::vector<RecordIndexEntry> entries;
+        auto index_file = record_index_file(fname);
+        if (!load_record_index(index_file, fname, entries)) {
+            build_record_index(records, file_size, entries);
+            save_record_index(index_file, fname, entries);
+        }
+        auto ret = read_image_names(records, entries);
         if (ret != Reader::Status::OK)
             THROW("TFRecordReader: Error in reading TF records");
-        _last_rec = false;
         if (_file_names.size() != _file_size.size())
             std::cerr << "\n Size of vectors are not same";
-        file_contents.close();
     }
     return Reader::Status::OK;
 }
 
+bool is_tf_record_index_file(const std::string &file_name)
+{
+    return boost::algorithm::ends_with(file_name, TF_RECORD_INDEX_EXTENSION) ||
+           file_name.find(TF_RECORD_INDEX_EXTENSION + ".") != std::string::npos;
+}
+
+std::string TFRecordReader::record_index_file(const std::string &record_file)
+{
+    // The indices are kept out of the records folder by default, the metadata readers list it too and it may be read-only
+    if (_index_path.empty())
+        return rocal_cache_file_path(record_file, "rocal_tfrecord_index");
+    return _index_path + "/" + filesys::path(record_file).filename().string() + TF_RECORD_INDEX_EXTENSION;
+}
+
+bool TFRecordReader::load_record_index(const std::string &index_file, const std::string &record_file, std::vector<RecordIndexEntry> &entries)
+{
+    std::ifstream index(index_file);
+    if (!index)
+        return false;
+    // The index is only valid for the same record file and the same feature keys it was built with
+    std::string header, encoded_key, filename_key;
+    size_t file_size, entry_count;
+    std::time_t modified_time;
+    std::getline(index, header);
+    index >> file_size >> modified_time >> entry_count;
+    index.ignore();
+    std::getline(index, encoded_key);
+    std::getline(index, filename_key);
+    if (!index || header != TF_RECORD_INDEX_HEADER || encoded_key != _encoded_key || filename_key != _filename_key ||
+        file_size != filesys::file_size(record_file) || modified_time != filesys::last_write_time(record_file)) {
+        LOG("TFRecordReader: Rebuilding the stale index " + index_file)
+        return false;
+    }
+    RecordIndexEntry entry;
+    while (index >> entry.encoded_offset >> entry.encoded_size) {
+        index.ignore();
+        std::getline(index, entry.file_name);
+        if (entry.encoded_offset + entry.encoded_size > file_size) {
+            WRN("TFRecordReader: Rebuilding the corrupted index " + index_file)
+            entries.clear();
+            return false;
+        }
+        entries.push_back(entry);
+    }
+    if (entries.size() != entry_count) {
+        WRN("TFRecordReader: Rebuilding the truncated index " + index_file)
+        entries.clear();
+        return false;
+    }
+    return true;
+}
+
+void TFRecordReader::save_record_index(const std::string &index_file, const std::string &record_file, const std::vector<RecordIndexEntry> &entries)
+{
+    // Written under a unique temporary name and renamed, so that pipelines starting together never read a partial index
+    std::string temp_file = create_temp_file(index_file);
+    std::ofstream index;
+    if (!temp_file.empty())
+        index.open(temp_file, std::ios::trunc);
+    if (!index.is_open()) {
+        WRN("TFRecordReader: Cannot write the index " + index_file + ", it will be rebuilt on the next run")
+        return;
+    }
+    index << TF_RECORD_INDEX_HEADER << "\n";
+    index << filesys::file_size(record_file) << " " << filesys::last_write_time(record_file) << " " << entries.size() << "\n";
+    index << _encoded_key << "\n" << _filename_key << "\n";
+    for (auto &entry : entries)
+        index << entry.encoded_offset << " " << entry.encoded_size << " " << entry.file_name << "\n";
+    index.close();
+    if (!index || std::rename(temp_file.c_str(), index_file.c_str()) != 0) {
+        WRN("TFRecordReader: Failed writing the index " + index_file)
+        std::remove(temp_file.c_str());
+    }
+}
+
+void TFRecordReader::build_record_index(const unsigned char *records, size_t records_size, std::vector<RecordIndexEntry> &entries)
+{
+    // Each record is uint64 length, uint32 length crc, data, uint32 data crc
+    size_t offset = 0;
+    while (offset < records_size) {
+        uint64_t data_length;
+        if (offset + sizeof(data_length) + sizeof(uint32_t) > records_size)
+            THROW("TFRecordReader: Error in reading TF records")
+        memcpy(&data_length, records + offset, sizeof(data_length));
+        const unsigned char *data = records + offset + sizeof(data_length) + sizeof(uint32_t);
+        if (data_length + sizeof(uint32_t) > records_size - (data - records))
+            THROW("TFRecordReader: Error in reading TF records")
+        RecordIndexEntry entry;
+        const unsigned char *value;
+        size_t value_size;
+        if (!find_bytes_feature(data, data_length, _encoded_key, value, value_size))
+            THROW("TFRecordReader: Feature " + _encoded_key + " is missing in the TF records")
+        entry.encoded_offset = value - records;
+        entry.encoded_size = value_size;
+        if (!_filename_key.empty()) {
+            if (!find_bytes_feature(data, data_length, _filename_key, value, value_size))
+                THROW("TFRecordReader: Feature " + _filename_key + " is missing in the TF records")
+            entry.file_name.assign((const char *)value, value_size);
+        }
+        entries.push_back(entry);
+        offset = (data - records) + data_length + sizeof(uint32_t);
+    }
+}
+
 size_t TFRecordReader::get_file_shard_id()
 {
     if (_batch_count == 0 || _shard_count == 0)
@@ -222,120 +392,37 @@ size_t TFRecordReader::get_file_shard_id()
     return _file_id  % _shard_count;
 }
 
-Reader::Status TFRecordReader::read_image_names(std::ifstream &file_contents, uint file_size)
+Reader::Status TFRecordReader::read_image_names(const unsigned char *records, const std::vector<RecordIndexEntry> &entries)
 {
     auto ret = Reader::Status::OK;
-    while (!_last_rec)
+    for (auto &entry : entries)
     {
-        uint length;
-        uint64_t data_length;
-        uint32_t length_crc, data_crc;
-
-        length = file_contents.tellg();
-        file_contents.read((char *)&data_length, sizeof(data_length));
-        if(!file_contents)
-            THROW("TFRecordReader: Error in reading TF records")
-        file_contents.read((char *)&length_crc, sizeof(length_crc));
-        if(!file_contents)
-            THROW("TFRecordReader: Error in reading TF records")
-        if (uint(length + data_length + 16) == file_size)
-        {
-            _last_rec = true;
-        }
-        std::unique_ptr<char[]> data(new char[data_length]);
-        file_contents.read(data.get(), data_length);
-        if(!file_contents)
-            THROW("TFRecordReader: Error in reading TF records")  
-        _single_example.ParseFromArray(data.get(), data_length);
-        _features = _single_example.features();
-        auto feature = _features.feature();
         std::string file_path = _folder_path;
         std::string fname;
         if (!_filename_key.empty()) {
-            _single_feature = feature.at(_filename_key);
-            fname = _single_feature.bytes_list().value()[0];
-            file_path.append("/");
-            file_path.append(fname);
+            fname = entry.file_name;
         } else {
             // generate filename based on file_id
             fname = std::to_string(_file_id);
-            file_path.append("/");
-            file_path.append(fname);
         }
-        _image_record_starting.insert(std::pair<std::string, uint>(fname, length));
+        file_path.append("/");
+        file_path.append(fname);
         _in_batch_read_count++;
         _in_batch_read_count = (_in_batch_read_count % _batch_count == 0) ? 0 : _in_batch_read_count;
         _last_file_name = file_path;
+        // samples of the other shards are kept addressable since they may be replicated to fill the last batch
+        _encoded_data.insert(std::pair<std::string, const unsigned char *>(file_path, records + entry.encoded_offset));
         if (get_file_shard_id() != _shard_id)
         {
             incremenet_file_id();
             _file_count_all_shards++;
-            file_contents.read((char *)&data_crc, sizeof(data_crc));
-            if(!file_contents)
-                THROW("TFRecordReader: Error in reading TF records")
             continue;
         }
         _file_names.push_back(file_path);
         incremenet_file_id();
         _file_count_all_shards++;
-        _single_feature = feature.at(_encoded_key);
-        _last_file_size = _single_feature.bytes_list().value()[0].size();
+        _last_file_size = entry.encoded_size;
         _file_size.insert(std::pair<std::string, unsigned int>(_last_file_name, _last_file_size));
-        file_contents.read((char *)&data_crc, sizeof(data_crc));
-        if(!file_contents)
-            THROW("TFRecordReader: Error in reading TF records")
-    }
-    return ret;
-}
-
-Reader::Status TFRecordReader::read_image(unsigned char *buff, std::string file_name, uint file_size)
-{
-    auto ret = Reader::Status::OK;
-    std::string temp = file_name.substr(0, file_name.find_last_of("\\/"));
-    const size_t last_slash_idx = file_name.find_last_of("\\/");
-    if (std::string::npos != last_slash_idx)
-    {
-        file_name.erase(0, last_slash_idx + 1);
-    }
-    std::ifstream file_contents(temp.c_str(), std::ios::binary);
-    if(!file_contents)
-        THROW("TFRecordReader: Failed to open file "+file_name);
-    auto it = _image_record_starting.find(file_name);
-    if (_image_record_starting.end() == it)
-    {
-        THROW("ERROR: Given name not present in the map" + file_name)
-    }
-    // std::cerr<<"\n image present at loc:: "<<it->second;
-    file_contents.seekg(it->second, std::ifstream::beg);
-    uint64_t data_length;
-    uint32_t length_crc, data_crc;
-    file_contents.read((char *)&data_length, sizeof(data_length));
-    if(!file_contents)
-        THROW("TFRecordReader: Error in reading TF records")
-    file_contents.read((char *)&length_crc, sizeof(length_crc));
-    if(!file_contents)
-        THROW("TFRecordReader: Error in reading TF records")
-    std::unique_ptr<char[]> data(new char[data_length]);
-    file_contents.read(data.get(), data_length);
-    if(!file_contents)
-        THROW("TFRecordReader: Error in reading TF records")
-    _single_example.ParseFromArray(data.get(), data_length);
-    _features = _single_example.features();
-    auto feature = _features.feature();
-    std::string fname;
-    if (!_filename_key.empty()) {
-        _single_feature = feature.at(_filename_key);
-        fname = _single_feature.bytes_list().value()[0];
-    }
-    // if _filename key is empty, just read the encoded/raw feature
-    if (_filename_key.empty() || (fname == file_name))
-    {
-        _single_feature = feature.at(_encoded_key);
-        memcpy(buff, _single_feature.bytes_list().value()[0].c_str(), _single_feature.bytes_list().value()[0].size());
     }
-    file_contents.read((char *)&data_crc, sizeof(data_crc));
-    if(!file_contents)
-        THROW("TFRecordReader: Error in reading TF records")
-    file_contents.close();
     return ret;
 }
@@ -0,0 +1,55 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#include "video_keyframe_index.h"
+#include <algorithm>
+#include "commons.h"
+
+#ifdef ROCAL_VIDEO
+void VideoKeyframeIndex::build(AVFormatContext *fmt_ctx, int video_stream_idx)
+{
+    _keyframes.clear();
+    AVStream *stream = fmt_ctx->streams[video_stream_idx];
+    if (stream->avg_frame_rate.num == 0)
+        return;
+    AVRational frame_duration = av_inv_q(stream->avg_frame_rate);
+    AVPacket pkt;
+    while (av_read_frame(fmt_ctx, &pkt) >= 0)
+    {
+        if (pkt.stream_index == video_stream_idx && (pkt.flags & AV_PKT_FLAG_KEY))
+        {
+            int64_t pts = (pkt.pts != AV_NOPTS_VALUE) ? pkt.pts : pkt.dts;
+            if (pts != AV_NOPTS_VALUE && pts >= 0)
+                _keyframes.push_back(av_rescale_q(pts, stream->time_base, frame_duration));
+        }
+        av_packet_unref(&pkt);
+    }
+    std::sort(_keyframes.begin(), _keyframes.end());
+    _keyframes.erase(std::unique(_keyframes.begin(), _keyframes.end()), _keyframes.end());
+}
+
+unsigned keyframe_at_or_before(const std::vector<unsigned> &keyframes, unsigned frame_number)
+{
+    auto next = std::upper_bound(keyframes.begin(), keyframes.end(), frame_number);
+    return next == keyframes.begin() ? 0 : *(next - 1);
+}
+#endif
@@ -21,6 +21,7 @@ THE SOFTWARE.
 */
 
 #include "video_properties.h"
+#include "video_keyframe_index.h"
 #include <cmath>
 
 #ifdef ROCAL_VIDEO
@@ -36,7 +37,7 @@ void substring_extraction(std::string const &str, const char delim, std::vector<
 }
 
 // Opens the context of the Video file to obtain the width, heigh and frame rate info.
-void open_video_context(const char *video_file_path, Properties &props)
+bool probe_video_context(const char *video_file_path, Properties &props)
 {
     AVFormatContext *pFormatCtx = NULL;
     AVCodecContext *pCodecCtx = NULL;
@@ -46,33 +47,49 @@ void open_video_context(const char *video_file_path, Properties &props)
     // open video file
     int ret = avformat_open_input(&pFormatCtx, video_file_path, NULL, NULL);
     if (ret != 0)
-    {
-        WRN("Unable to open video file: " + STR(video_file_path))
-        exit(0);
-    }
+        return false;
 
     // Retrieve stream information
     ret = avformat_find_stream_info(pFormatCtx, NULL);
-    assert(ret >= 0);
-    for (i = 0; i < pFormatCtx->nb_streams; i++)
+    for (i = 0; ret >= 0 && i < pFormatCtx->nb_streams; i++)
     {
         if (pFormatCtx->streams[i]->codec->codec_type == AVMEDIA_TYPE_VIDEO && videoStream < 0)
         {
             videoStream = i;
         }
     }
-    assert(videoStream != -1);
+    if (videoStream == -1)
+    {
+        avformat_close_input(&pFormatCtx);
+        return false;
+    }
 
     // Get a pointer to the codec context for the video stream
     pCodecCtx = pFormatCtx->streams[videoStream]->codec;
-    assert(pCodecCtx != NULL);
     props.width = pCodecCtx->width;
     props.height = pCodecCtx->height;
     props.frames_count = pFormatCtx->streams[videoStream]->nb_frames;
     props.avg_frame_rate_num = pFormatCtx->streams[videoStream]->avg_frame_rate.num;
     props.avg_frame_rate_den = pFormatCtx->streams[videoStream]->avg_frame_rate.den;
+    props.time_base_num = pFormatCtx->streams[videoStream]->time_base.num;
+    props.time_base_den = pFormatCtx->streams[videoStream]->time_base.den;
+
+    // The keyframes tell the loader which sequences of the video can be decoded in the same forward pass
+    VideoKeyframeIndex keyframe_index;
+    keyframe_index.build(pFormatCtx, videoStream);
+    props.keyframes = keyframe_index.release();
     avcodec_close(pCodecCtx);
     avformat_close_input(&pFormatCtx);
+    return true;
+}
+
+void open_video_context(const char *video_file_path, Properties &props)
+{
+    if (!probe_video_context(video_file_path, props))
+    {
+        WRN("Unable to open video file: " + STR(video_file_path))
+        exit(0);
+    }
 }
 
 void get_video_properties_from_txt_file(VideoProperties &video_props, const char *file_path, bool file_list_frame_num)
@@ -97,7 +114,7 @@ void get_video_properties_from_txt_file(VideoProperties &video_props, const char
             std::istringstream line_ss(line);
             if (!(line_ss >> video_file_name >> label))
                 continue;
-            open_video_context(video_file_name.c_str(), props);
+            get_video_properties(video_file_name.c_str(), props);
             if(max_width == props.width || max_width == 0)
                 max_width = props.width;
             else
@@ -124,6 +141,7 @@ void get_video_properties_from_txt_file(VideoProperties &video_props, const char
             }
             video_file_name = std::to_string(video_count) + "#" + video_file_name; // Video index is added to each video file name to identify repeated videos files.
             video_props.video_file_names.push_back(video_file_name);
+            video_props.keyframes.push_back(props.keyframes);
             video_props.labels.push_back(label);
             video_props.start_end_frame_num.push_back(std::make_tuple(start_frame_number, end_frame_number));
             video_props.start_end_timestamps.push_back(std::make_tuple(start_time, end_time));
@@ -152,6 +170,7 @@ void find_video_properties(VideoProperties &video_props, const char *source_path
     unsigned max_height = 0;
     std::string _full_path = source_path;
     filesys::path pathObj(_full_path);
+    probe_source_videos(source_path);
     if (filesys::exists(pathObj) && filesys::is_regular_file(pathObj))  // Single video file / text file as input
     {
         if (pathObj.has_extension() && pathObj.extension().string() == ".txt")
@@ -161,7 +180,7 @@ void find_video_properties(VideoProperties &video_props, const char *source_path
         else
         {
             // Single Video File Input
-            open_video_context(source_path, props);
+            get_video_properties(source_path, props);
             video_props.width = props.width;
             video_props.height = props.height;
             video_props.videos_count = 1;
@@ -173,6 +192,7 @@ void find_video_properties(VideoProperties &video_props, const char *source_path
             video_props.start_end_frame_num.push_back(std::make_tuple(0, (int)props.frames_count));
             video_file_path = std::to_string(0) + "#" + _full_path; // Video index is added to each video file name to identify repeated videos files.
             video_props.video_file_names.push_back(video_file_path);
+            video_props.keyframes.push_back(props.keyframes);
         }
     }
     else if (filesys::exists(pathObj) && filesys::is_directory(pathObj))
@@ -199,7 +219,7 @@ void find_video_properties(VideoProperties &video_props, const char *source_path
             filesys::path pathObj(subfolder_path);
             if (filesys::exists(pathObj) && filesys::is_regular_file(pathObj))
             {
-                open_video_context(subfolder_path.c_str(), props);
+                get_video_properties(subfolder_path.c_str(), props);
                 if(max_width == props.width || max_width == 0)
                     max_width = props.width;
                 else
@@ -215,6 +235,7 @@ void find_video_properties(VideoProperties &video_props, const char *source_path
                 video_props.frame_rate = video_frame_rate;
                 video_file_path = std::to_string(video_count) + "#" + subfolder_path; // Video index is added to each video file name to identify repeated videos files.
                 video_props.video_file_names.push_back(video_file_path);
+                video_props.keyframes.push_back(props.keyframes);
                 video_props.start_end_frame_num.push_back(std::make_tuple(0, (int)props.frames_count));
                 video_count++;
             }
@@ -239,7 +260,7 @@ void find_video_properties(VideoProperties &video_props, const char *source_path
                     file_path.append(video_files[i]);
                     _full_path = file_path;
 
-                    open_video_context(_full_path.c_str(), props);
+                    get_video_properties(_full_path.c_str(), props);
                     if(max_width == props.width || max_width == 0)
                         max_width = props.width;
                     else
@@ -250,6 +271,7 @@ void find_video_properties(VideoProperties &video_props, const char *source_path
                         THROW("The given video files are of different resolution\n")
                     video_file_path = std::to_string(video_count) + "#" + _full_path; // Video index is added to each video file name to identify repeated videos files.
                     video_props.video_file_names.push_back(video_file_path);
+                    video_props.keyframes.push_back(props.keyframes);
                     video_props.frames_count.push_back(props.frames_count);
                     float video_frame_rate = std::floor(props.avg_frame_rate_num / props.avg_frame_rate_den);
                     if (video_props.frame_rate != 0 && video_frame_rate != video_props.frame_rate)
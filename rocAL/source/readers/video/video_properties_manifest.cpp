@@ -0,0 +1,264 @@
+/*
+Copyright (c) 2019 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#include "video_properties.h"
+#include "video_keyframe_index.h"
+#include "cache_files.h"
+#include <algorithm>
+#include <atomic>
+#include <cstdio>
+#include <mutex>
+#include <thread>
+#include <unordered_map>
+#include <unistd.h>
+#include <sys/stat.h>
+
+#ifdef ROCAL_VIDEO
+static const char VIDEO_MANIFEST_HEADER[] = "rocal_video_manifest 2";
+
+namespace
+{
+struct ProbedVideo
+{
+    uint64_t size = 0;
+    int64_t mtime = 0;
+    Properties props;
+};
+
+// Properties of the videos probed by the process, keyed by the video path. The video file source and the video label
+// reader of a pipeline list the same videos, only the first one probes them.
+std::mutex probed_videos_lock;
+std::unordered_map<std::string, ProbedVideo> probed_videos;
+
+bool video_stat(const std::string &path, uint64_t &size, int64_t &mtime)
+{
+    struct stat st;
+    if (stat(path.c_str(), &st) != 0)
+        return false;
+    size = st.st_size;
+    mtime = (int64_t)st.st_mtim.tv_sec * 1000000000 + st.st_mtim.tv_nsec;
+    return true;
+}
+
+bool find_probed_video(const std::string &path, uint64_t size, int64_t mtime, Properties &props)
+{
+    std::lock_guard<std::mutex> lock(probed_videos_lock);
+    auto it = probed_videos.find(path);
+    if (it == probed_videos.end() || it->second.size != size || it->second.mtime != mtime)
+        return false;
+    props = it->second.props;
+    return true;
+}
+
+void add_probed_video(const std::string &path, ProbedVideo probed)
+{
+    std::lock_guard<std::mutex> lock(probed_videos_lock);
+    probed_videos[path] = std::move(probed);
+}
+
+std::vector<std::string> sorted_entries(const std::string &folder_path)
+{
+    std::vector<std::string> entries;
+    for (auto &entry : filesys::directory_iterator(folder_path))
+        entries.push_back(entry.path().filename().string());
+    std::sort(entries.begin(), entries.end());
+    return entries;
+}
+
+// Lists the videos of the source in the order find_video_properties visits them
+std::vector<std::string> list_source_videos(const std::string &source_path)
+{
+    std::vector<std::string> videos;
+    filesys::path path_obj(source_path);
+    if (filesys::exists(path_obj) && filesys::is_regular_file(path_obj))
+    {
+        if (path_obj.has_extension() && path_obj.extension().string() == ".txt")
+        {
+            std::ifstream text_file(source_path);
+            std::string line;
+            while (std::getline(text_file, line))
+            {
+                int label;
+                std::string video_file_name;
+                std::istringstream line_ss(line);
+                if (line_ss >> video_file_name >> label)
+                    videos.push_back(video_file_name);
+            }
+        }
+        else
+        {
+            videos.push_back(source_path);
+        }
+    }
+    else if (filesys::exists(path_obj) && filesys::is_directory(path_obj))
+    {
+        for (auto &entry_name : sorted_entries(source_path))
+        {
+            std::string entry_path = source_path + "/" + entry_name;
+            if (filesys::is_regular_file(entry_path))
+                videos.push_back(entry_path);
+            else if (filesys::is_directory(entry_path))
+                for (auto &file_name : sorted_entries(entry_path))
+                    videos.push_back(entry_path + "/" + file_name);
+        }
+    }
+    return videos;
+}
+
+void load_manifest(const std::string &manifest_path, std::unordered_map<std::string, ProbedVideo> &manifest)
+{
+    std::ifstream in(manifest_path);
+    std::string line;
+    if (!in || !std::getline(in, line) || line != VIDEO_MANIFEST_HEADER)
+        return;
+    while (std::getline(in, line))
+    {
+        ProbedVideo probed;
+        auto &props = probed.props;
+        std::istringstream line_ss(line);
+        std::string path;
+        if (!(line_ss >> probed.size >> probed.mtime >> props.width >> props.height >> props.frames_count >> props.avg_frame_rate_num >>
+              props.avg_frame_rate_den >> props.time_base_num >> props.time_base_den))
+            return;
+        size_t keyframe_count;
+        if (!(line_ss >> keyframe_count))
+            return;
+        props.keyframes.resize(keyframe_count);
+        for (auto &keyframe : props.keyframes)
+            if (!(line_ss >> keyframe))
+                return;
+        if (line_ss.get() != ' ' || !std::getline(line_ss, path))
+            return;
+        manifest[path] = std::move(probed);
+    }
+}
+
+void save_manifest(const std::string &manifest_path, const std::vector<std::string> &videos)
+{
+    // Written aside and renamed so that pipelines probing the same source never read a partial manifest
+    std::string temp_path = manifest_path + ".tmp." + std::to_string(getpid());
+    {
+        std::ofstream out(temp_path);
+        if (!out)
+        {
+            INFO("Cannot write the video manifest " + manifest_path + ", the videos will be probed again on the next run")
+            return;
+        }
+        out << VIDEO_MANIFEST_HEADER << "\n";
+        std::lock_guard<std::mutex> lock(probed_videos_lock);
+        for (auto &video : videos)
+        {
+            auto it = probed_videos.find(video);
+            if (it == probed_videos.end())
+                continue;
+            auto &props = it->second.props;
+            out << it->second.size << " " << it->second.mtime << " " << props.width << " " << props.height << " " << props.frames_count << " "
+                << props.avg_frame_rate_num << " " << props.avg_frame_rate_den << " " << props.time_base_num << " " << props.time_base_den << " "
+                << props.keyframes.size();
+            for (auto keyframe : props.keyframes)
+                out << " " << keyframe;
+            out << " " << video << "\n";
+        }
+        out.close();
+        if (!out)
+        {
+            WRN("Failed writing the video manifest " + manifest_path)
+            std::remove(temp_path.c_str());
+            return;
+        }
+    }
+    if (std::rename(temp_path.c_str(), manifest_path.c_str()) != 0)
+    {
+        WRN("Failed writing the video manifest " + manifest_path)
+        std::remove(temp_path.c_str());
+    }
+}
+}
+
+void probe_source_videos(const char *source_path)
+{
+    // The videos are listed with the paths the readers build from source_path, trailing slashes included
+    auto videos = list_source_videos(source_path);
+    std::string source(source_path);
+    while (source.size() > 1 && source.back() == '/')
+        source.pop_back();
+    std::sort(videos.begin(), videos.end());
+    videos.erase(std::unique(videos.begin(), videos.end()), videos.end());
+
+    // The manifest is kept in the rocAL cache folder, the dataset folders may be read-only and are listed as videos
+    const std::string manifest_path = rocal_cache_file_path(source, "rocal_video_manifest");
+    std::unordered_map<std::string, ProbedVideo> manifest;
+    load_manifest(manifest_path, manifest);
+    std::vector<std::string> unprobed_videos;
+    for (auto &video : videos)
+    {
+        uint64_t size;
+        int64_t mtime;
+        Properties props;
+        // Missing videos are reported by the readers listing them
+        if (!video_stat(video, size, mtime) || find_probed_video(video, size, mtime, props))
+            continue;
+        auto it = manifest.find(video);
+        if (it != manifest.end() && it->second.size == size && it->second.mtime == mtime)
+        {
+            add_probed_video(video, std::move(it->second));
+            continue;
+        }
+        unprobed_videos.push_back(video);
+    }
+    if (unprobed_videos.empty())
+        return;
+
+    // Opening a video and demuxing it for its keyframes is mostly waiting on the file system and the demuxer, every thread probes the next unprobed video
+    std::atomic<size_t> next_video(0);
+    auto probe_videos = [&]()
+    {
+        for (size_t i = next_video++; i < unprobed_videos.size(); i = next_video++)
+        {
+            ProbedVideo probed;
+            // Videos that can't be opened are left to open_video_context to report
+            if (video_stat(unprobed_videos[i], probed.size, probed.mtime) && probe_video_context(unprobed_videos[i].c_str(), probed.props))
+                add_probed_video(unprobed_videos[i], std::move(probed));
+        }
+    };
+    size_t thread_count = std::min<size_t>(std::max(1u, std::thread::hardware_concurrency()), unprobed_videos.size());
+    std::vector<std::thread> probe_threads;
+    for (size_t t = 0; t < thread_count; t++)
+        probe_threads.emplace_back(probe_videos);
+    for (auto &thread : probe_threads)
+        thread.join();
+    LOG("Probed " + TOSTR(unprobed_videos.size()) + " of the " + TOSTR(videos.size()) + " videos of " + source + " with " + TOSTR(thread_count) + " threads")
+    save_manifest(manifest_path, videos);
+}
+
+void get_video_properties(const char *video_file_path, Properties &props)
+{
+    ProbedVideo probed;
+    bool exists = video_stat(video_file_path, probed.size, probed.mtime);
+    if (exists && find_probed_video(video_file_path, probed.size, probed.mtime, props))
+        return;
+    open_video_context(video_file_path, probed.props);
+    props = probed.props;
+    if (exists)
+        add_probed_video(video_file_path, std::move(probed));
+}
+#endif
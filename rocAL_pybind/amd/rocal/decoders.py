@@ -22,9 +22,17 @@ import amd.rocal.types as types
 import rocal_pybind as b
 from amd.rocal.pipeline import Pipeline
 
+def _image_cache_type(cache_type):
+    # '' and 'lru' evict the least recently used images, 'threshold' keeps the first images above cache_threshold
+    if cache_type in ('', 'lru'):
+        return types.IMAGE_CACHE_LRU
+    if cache_type in ('threshold', 'first_n'):
+        return types.IMAGE_CACHE_FIRST_N
+    raise ValueError("Unsupported cache_type '{}', expected 'lru' or 'threshold'".format(cache_type))
+
 def image(*inputs, user_feature_key_map=None, path='', file_root='', annotations_file='', shard_id=0, num_shards=1, random_shuffle=False, 
           affine=True, bytes_per_sample_hint=0, cache_batch_copy=True, cache_debug=False, cache_size=0, cache_threshold=0, cache_type='', 
-          device_memory_padding=16777216, host_memory_padding=8388608, hybrid_huffman_threshold=1000000, output_type=types.RGB, 
+          cache_spill_path='', device_memory_padding=16777216, host_memory_padding=8388608, hybrid_huffman_threshold=1000000, output_type=types.RGB, 
           decoder_type=types.DECODER_TJPEG, preserve=False, seed=1, split_stages=False, use_chunk_allocator=False, use_fast_idct=False,
           device=None, decode_size_policy=types.USER_GIVEN_SIZE_ORIG, max_decoded_width=1000, max_decoded_height=1000):
     reader = Pipeline._current_pipeline._reader
@@ -45,7 +53,13 @@ def image(*inputs, user_feature_key_map=None, path='', file_root='', annotations
             "decode_size_policy": decode_size_policy,
             "max_width": max_decoded_width,
             "max_height": max_decoded_height,
-            "dec_type": decoder_type}
+            "dec_type": decoder_type,
+            "cache_size": cache_size,
+            "cache_type": _image_cache_type(cache_type),
+            "cache_threshold": cache_threshold,
+            "cache_batch_copy": cache_batch_copy,
+            "cache_spill_path": cache_spill_path,
+            "index_path": Pipeline._current_pipeline._index_path}
         decoded_image = b.COCO_ImageDecoderShard(Pipeline._current_pipeline._handle, *(kwargs_pybind.values()))
 
     elif (reader == "TFRecordReaderClassification" or reader == "TFRecordReaderDetection"):
@@ -61,7 +75,8 @@ def image(*inputs, user_feature_key_map=None, path='', file_root='', annotations
             "decode_size_policy": decode_size_policy,
             "max_width": max_decoded_width,
             "max_height": max_decoded_height,
-            "dec_type": decoder_type}
+            "dec_type": decoder_type,
+            "index_path": Pipeline._current_pipeline._index_path}
         decoded_image = b.TF_ImageDecoder(Pipeline._current_pipeline._handle, *(kwargs_pybind.values()))
 
     elif (reader == "Caffe2Reader" or reader == "Caffe2ReaderDetection"):
@@ -106,7 +121,13 @@ def image(*inputs, user_feature_key_map=None, path='', file_root='', annotations
             "decode_size_policy": decode_size_policy,
             "max_width": max_decoded_width,
             "max_height": max_decoded_height,
-            "dec_type": decoder_type}
+            "dec_type": decoder_type,
+            "cache_size": cache_size,
+            "cache_type": _image_cache_type(cache_type),
+            "cache_threshold": cache_threshold,
+            "cache_batch_copy": cache_batch_copy,
+            "cache_spill_path": cache_spill_path,
+            "index_path": Pipeline._current_pipeline._index_path}
         decoded_image = b.ImageDecoderShard(Pipeline._current_pipeline._handle, *(kwargs_pybind.values()))
 
     return (decoded_image)
@@ -129,7 +150,9 @@ def image_raw(*inputs, user_feature_key_map=None, path='', file_root='', annotat
             "shuffle": random_shuffle,
             "loop": False,
             "max_width": max_decoded_width,
-            "max_height": max_decoded_height}
+            "max_height": max_decoded_height,
+            "record_name_prefix": "",
+            "index_path": Pipeline._current_pipeline._index_path}
         decoded_image = b.TF_ImageDecoderRaw(Pipeline._current_pipeline._handle, *(kwargs_pybind.values()))
         return (decoded_image)
 
@@ -171,7 +194,8 @@ def image_random_crop(*inputs, user_feature_key_map=None, path='', file_root='',
             "decode_size_policy": decode_size_policy,
             "max_width": max_decoded_width,
             "max_height": max_decoded_height,
-            "dec_type": decoder_type}
+            "dec_type": decoder_type,
+            "index_path": Pipeline._current_pipeline._index_path}
         crop_output_image = b.TF_ImageDecoder(Pipeline._current_pipeline._handle ,*(kwargs_pybind.values()))
     elif (reader == "CaffeReader" or reader == "CaffeReaderDetection"):
         kwargs_pybind = {
@@ -27,6 +27,29 @@ import functools
 import inspect
 
 
+class DLPackTensor(object):
+    """A pipeline output exported through DLPack without a copy, valid till the next run() of the pipeline.
+    Every __dlpack__() call makes a new capsule of the same data, so torch, cupy, numpy and tensorflow can all
+    consume the batch, e.g. torch.from_dlpack(t) or tf.experimental.dlpack.from_dlpack(t.__dlpack__())
+    """
+    _dtypes = {types.UINT8: (1, 8), types.FLOAT: (2, 32), types.FLOAT16: (2, 16)} # DLPack type code and bits
+    _kDLCPU = 1
+    _kDLROCM = 10
+
+    def __init__(self, address, shape, tensor_dtype, on_device, device_id):
+        self.address = address
+        self.shape = tuple(shape)
+        self.dtype_code, self.dtype_bits = self._dtypes[tensor_dtype]
+        self.device = (self._kDLROCM, max(device_id, 0)) if on_device else (self._kDLCPU, 0)
+
+    def __dlpack__(self, stream=None):
+        # rocAL has finished writing the outputs when run() and the conversion return, there is nothing to wait for
+        return b.toDLPack(self.address, list(self.shape), self.dtype_code, self.dtype_bits, self.device[0], self.device[1])
+
+    def __dlpack_device__(self):
+        return self.device
+
+
 class Pipeline(object):
 
     """Pipeline class internally calls RocalCreate which returns context which will have all
@@ -144,7 +167,11 @@ class Pipeline(object):
         self._castLabels = False
         self._current_pipeline = None
         self._reader = None
+        self._index_path = ""
         self._define_graph_set = False
+        # reusable buffers for GetPaddedBBoxesAndLabels, grown on demand
+        self._bb_labels_padded = np.empty(0, dtype=np.int32)
+        self._bb_cords_padded = np.empty(0, dtype=np.float32)
         self.set_seed(self._seed)
 
     def build(self):
@@ -164,6 +191,56 @@ class Pipeline(object):
             print("Rocal Run failed")
         return status
 
+    def run_many(self, count, array, labels=None, multiplier=[1.0, 1.0, 1.0], offset=[0.0, 0.0, 0.0], reverse_channels=False,
+                 tensor_format=types.NCHW, tensor_dtype=types.FLOAT):
+        """ Runs the pipeline for up to count batches in one rocalRunMany call, copying the output tensor of each batch
+        to the consecutive batches of array and their labels to the consecutive batches of labels when given.
+        array and labels are numpy, cupy or torch arrays of count batches, returns the number of batches copied
+        """
+        def address(buffer):
+            if buffer is None:
+                return 0
+            if isinstance(buffer, np.ndarray):
+                return buffer.ctypes.data
+            if isinstance(buffer, cp.ndarray):
+                return buffer.data.ptr
+            return buffer.data_ptr() #torch tensor
+        return b.rocalRunMany(self._handle, count, address(array), tensor_format, tensor_dtype,
+                              multiplier[0], multiplier[1], multiplier[2], offset[0], offset[1], offset[2], (1 if reverse_channels else 0),
+                              self._output_memory_type, address(labels))
+
+    def getOutputsDLPack(self):
+        """ Returns the U8 outputs of the batch from the last run() as DLPackTensor, one per output image, without
+        copying them out of rocAL's ring buffer. NHWC, or NCHW for RGB_PLANAR, they are valid till the next run()
+        """
+        width = b.getOutputWidth(self._handle)
+        height = b.getOutputHeight(self._handle) // self._batch_size
+        color_format = b.getOutputColorFormat(self._handle)
+        channels = 1 if color_format == int(types.GRAY) else 3
+        shape = [self._batch_size, channels, height, width] if color_format == int(types.RGB_PLANAR) else [self._batch_size, height, width, channels]
+        return [DLPackTensor(address, shape, types.UINT8, not self._rocal_cpu, self._device_id) for address in b.rocalGetOutputBuffers(self._handle)]
+
+    def getTensorDLPack(self, tensor_layout=None, tensor_dtype=None, multiplier=None, offset=None, reverse_channels=None):
+        """ Converts the batch from the last run() like copyToExternalTensor but into a tensor owned by rocAL and
+        returns it as a DLPackTensor, the pipeline's layout, type and normalization are the defaults.
+        It is overwritten by the next getTensorDLPack() and is valid till the next run()
+        """
+        tensor_layout = self._tensor_layout if tensor_layout is None else tensor_layout
+        tensor_dtype = self._tensor_dtype if tensor_dtype is None else tensor_dtype
+        multiplier = self._multiplier if multiplier is None else multiplier
+        offset = self._offset if offset is None else offset
+        reverse_channels = self._reverse_channels if reverse_channels is None else reverse_channels
+        address = b.rocalToExportedTensor(self._handle, tensor_layout, tensor_dtype, multiplier[0], multiplier[1], multiplier[2],
+                                          offset[0], offset[1], offset[2], (1 if reverse_channels else 0))
+        if address == 0:
+            raise Exception("Exporting the output tensor failed")
+        width = b.getOutputWidth(self._handle)
+        height = b.getOutputHeight(self._handle) // self._batch_size
+        channels = 1 if b.getOutputColorFormat(self._handle) == int(types.GRAY) else 3
+        count = self._batch_size * b.getOutputImageCount(self._handle)
+        shape = [count, channels, height, width] if tensor_layout == types.NCHW else [count, height, width, channels]
+        return DLPackTensor(address, shape, tensor_dtype, not self._rocal_cpu, self._device_id)
+
     def define_graph(self):
         """This function is defined by the user to construct the
         graph of operations for their pipeline.
@@ -193,6 +270,9 @@ class Pipeline(object):
             elif tensor_dtype == types.FLOAT16:
                 b.rocalToTensor16(self._handle, np.ascontiguousarray(out, dtype=array.dtype), types.NHWC,
                                        multiplier[0], multiplier[1], multiplier[2], offset[0], offset[1], offset[2], (1 if reverse_channels else 0), self._output_memory_type)
+            elif tensor_dtype == types.UINT8:
+                b.rocalToTensor(self._handle, ctypes.c_void_p(array.ctypes.data), types.NHWC, types.UINT8,
+                                    multiplier[0], multiplier[1], multiplier[2], offset[0], offset[1], offset[2], (1 if reverse_channels else 0), self._output_memory_type)
         else:
             if tensor_dtype == types.FLOAT:
                 b.rocalCupyToTensor32(self._handle, array.data.ptr, types.NHWC,
@@ -209,6 +289,9 @@ class Pipeline(object):
             elif tensor_dtype == types.FLOAT16:
                 b.rocalToTensor16(self._handle, np.ascontiguousarray(out, dtype=array.dtype), types.NCHW,
                                         multiplier[0], multiplier[1], multiplier[2], offset[0], offset[1], offset[2], (1 if reverse_channels else 0), self._output_memory_type)
+            elif tensor_dtype == types.UINT8:
+                b.rocalToTensor(self._handle, ctypes.c_void_p(array.ctypes.data), types.NCHW, types.UINT8,
+                                    multiplier[0], multiplier[1], multiplier[2], offset[0], offset[1], offset[2], (1 if reverse_channels else 0), self._output_memory_type)
         else:
             if tensor_dtype == types.FLOAT:
                 b.rocalCupyToTensor32(self._handle, array.data.ptr, types.NCHW,
@@ -302,6 +385,54 @@ class Pipeline(object):
     def GetImgSizes(self, array):
         return b.getImgSizes(self._handle, array)
 
+    def GetBatchMetaData(self):
+        """Returns the meta data of the last batch as a dict of NumPy arrays viewing a buffer packed by rocAL, without copies.
+        The arrays are valid till the next run(), copy them to keep them longer.
+
+        names, name_offsets: the image names back to back as uint8 and the batch_size + 1 offsets delimiting them
+        image_ids: the ids parsed from the image names, -1 for names not starting with a number
+        labels: the image labels, None for readers without labels
+        box_counts, box_offsets, boxes, box_labels: the box count of every image, the batch_size + 1 offsets of the
+            boxes of every image in the [total_boxes, 4] boxes and [total_boxes] box_labels, None without bounding boxes
+        image_sizes: [batch_size, 2] image widths and heights, None for readers without image sizes
+        """
+        return b.getBatchMetaData(self._handle)
+
+    def GetImageNames(self, meta_data=None):
+        """Returns the image names of the last batch as a list of str"""
+        if meta_data is None:
+            meta_data = self.GetBatchMetaData()
+        names, offsets = meta_data["names"].tobytes(), meta_data["name_offsets"]
+        return [names[offsets[i]:offsets[i + 1]].decode() for i in range(offsets.size - 1)]
+
+    def GetPaddedBBoxesAndLabels(self, max_boxes=None, meta_data=None):
+        """Returns the bounding boxes and labels of the last batch zero padded to [batch_size, max_boxes, 4] and
+        [batch_size, max_boxes], and the number of boxes of each image. max_boxes defaults to the largest box count
+        in the batch, boxes beyond it are dropped. The padded arrays are views of buffers reused across batches, they are
+        valid till the next call, the counts are valid till the next run().
+        """
+        if meta_data is None:
+            meta_data = self.GetBatchMetaData()
+        counts = meta_data["box_counts"]
+        total = int(meta_data["box_offsets"][-1])
+        if max_boxes is None:
+            max_boxes = int(counts.max()) if counts.size else 0
+        size = self._batch_size * max_boxes
+        if size > self._bb_labels_padded.size:
+            self._bb_labels_padded = np.empty(size, dtype=np.int32)
+            self._bb_cords_padded = np.empty(size * 4, dtype=np.float32)
+        bb_padded = self._bb_cords_padded[:size * 4].reshape(self._batch_size, max_boxes, 4)
+        labels_padded = self._bb_labels_padded[:size].reshape(self._batch_size, max_boxes)
+        bb_padded.fill(0)
+        labels_padded.fill(0)
+        # image and in-image position of every box of the flat batch arrays
+        image_idx = np.repeat(np.arange(self._batch_size), counts)
+        box_idx = np.arange(total) - np.repeat(meta_data["box_offsets"][:-1], counts)
+        keep = box_idx < max_boxes
+        bb_padded[image_idx[keep], box_idx[keep]] = meta_data["boxes"][keep]
+        labels_padded[image_idx[keep], box_idx[keep]] = meta_data["box_labels"][keep]
+        return bb_padded, labels_padded, counts
+
     def GetBoundingBox(self,array):
         return array
 
@@ -58,7 +58,7 @@ class ROCALGenericImageIterator(object):
 
 
 class ROCALGenericIterator(object):
-    def __init__(self, pipeline, tensor_layout = types.NCHW, reverse_channels = False, multiplier = [1.0,1.0,1.0], offset = [0.0, 0.0, 0.0], tensor_dtype=types.FLOAT, display=False, device="cpu", device_id =0):
+    def __init__(self, pipeline, tensor_layout = types.NCHW, reverse_channels = False, multiplier = [1.0,1.0,1.0], offset = [0.0, 0.0, 0.0], tensor_dtype=types.FLOAT, display=False, device="cpu", device_id =0, prefetch_batches=1):
         self.loader = pipeline
         self.tensor_format =tensor_layout
         self.multiplier = multiplier
@@ -117,6 +117,20 @@ class ROCALGenericIterator(object):
                         self.out = cp.empty((self.bs*self.n, int(self.h/self.bs), self.w, self.p), dtype=cp.uint8)
                     self.labels = cp.empty(self.labels_size, dtype = cp.int32)
 
+        # Classification pipelines can run prefetch_batches batches in one run_many call into a ring of output tensors
+        self.prefetch_batches = prefetch_batches
+        if self.loader._name != "labelReader" or self.loader._oneHotEncoding or self.display:
+            self.prefetch_batches = 1
+        if self.prefetch_batches > 1:
+            if self.device == "cpu":
+                self.out_ring = np.empty((self.prefetch_batches,) + self.out.shape, dtype=self.out.dtype)
+                self.labels_ring = np.empty((self.prefetch_batches, self.bs), dtype=np.int32)
+            else:
+                with cp.cuda.Device(device=self.device_id):
+                    self.out_ring = cp.empty((self.prefetch_batches,) + self.out.shape, dtype=self.out.dtype)
+                    self.labels_ring = cp.empty((self.prefetch_batches, self.bs), dtype=cp.int32)
+        self.prefetched = 0
+        self.prefetch_idx = 0
 
         if self.bs != 0:
             self.len = b.getRemainingImages(self.loader._handle)//self.bs
@@ -127,6 +141,9 @@ class ROCALGenericIterator(object):
         return self.__next__()
 
     def __next__(self):
+        if self.prefetch_batches > 1:
+            return self.next_prefetched()
+
         if(b.isEmpty(self.loader._handle)):
             raise StopIteration
 
@@ -156,7 +173,22 @@ class ROCALGenericIterator(object):
 
             return self.out, self.labels_tensor
 
+    def next_prefetched(self):
+        if self.prefetch_idx == self.prefetched:
+            self.prefetched = self.loader.run_many(self.prefetch_batches, self.out_ring, self.labels_ring, self.multiplier, self.offset,
+                                                   self.reverse_channels, self.tensor_format, self.tensor_dtype)
+            self.prefetch_idx = 0
+            if self.prefetched == 0:
+                raise StopIteration
+        self.prefetch_idx += 1
+        if self.device == "cpu":
+            return self.out_ring[self.prefetch_idx - 1], self.labels_ring[self.prefetch_idx - 1].astype(dtype=np.int_)
+        with cp.cuda.Device(device=self.device_id):
+            return self.out_ring[self.prefetch_idx - 1], self.labels_ring[self.prefetch_idx - 1].astype(dtype=cp.int_)
+
     def reset(self):
+        self.prefetched = 0
+        self.prefetch_idx = 0
         b.rocalResetLoaders(self.loader._handle)
 
     def __iter__(self):
@@ -187,7 +219,8 @@ class ROCALClassificationIterator(ROCALGenericIterator):
        ROCALGenericIterator(pipelines, ["data", "label"], size)
 
     Please keep in mind that Tensors returned by the iterator are
-    still owned by ROCAL. They are valid till the next iterator call.
+    still owned by ROCAL. They are valid till the next iterator call,
+    or till prefetch_batches iterator calls later with prefetch_batches > 1.
     If the content needs to be preserved please copy it to another tensor.
 
     Parameters
@@ -218,6 +251,10 @@ class ROCALClassificationIterator(ROCALGenericIterator):
                  the next epoch. If set to False next epoch will end sooner as data from
                  it was consumed but dropped. If set to True next epoch would be the
                  same length as the first one.
+    prefetch_batches : int, optional, default = 1
+                 Number of batches run and copied into a ring of output tensors
+                 with one native call when the ring runs out, which saves the Python
+                 overhead of every batch for small images.
 
     Example
     -------
@@ -236,10 +273,12 @@ class ROCALClassificationIterator(ROCALGenericIterator):
                  last_batch_padded=False,
                  display=False,
                  device="cpu",
-                 device_id =0):
+                 device_id =0,
+                 prefetch_batches=1):
         pipe = pipelines
         super(ROCALClassificationIterator, self).__init__(pipe, tensor_layout = pipe._tensor_layout, tensor_dtype = pipe._tensor_dtype,
-                                                            multiplier=pipe._multiplier, offset=pipe._offset,display=display, device=device, device_id = device_id)
+                                                            multiplier=pipe._multiplier, offset=pipe._offset,display=display, device=device, device_id = device_id,
+                                                            prefetch_batches=prefetch_batches)
 
 
 class ROCAL_iterator(ROCALGenericImageIterator):
@@ -18,6 +18,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import sys
+import warnings
 import torch
 import numpy as np
 import rocal_pybind as b
@@ -69,7 +71,8 @@ class ROCALGenericImageIterator(object):
 
 
 class ROCALGenericIterator(object):
-    def __init__(self, pipeline, tensor_layout = types.NCHW, reverse_channels = False, multiplier = [1.0,1.0,1.0], offset = [0.0, 0.0, 0.0], tensor_dtype=types.FLOAT, display=False, device="cpu", device_id =0):
+    def __init__(self, pipeline, tensor_layout = types.NCHW, reverse_channels = False, multiplier = [1.0,1.0,1.0], offset = [0.0, 0.0, 0.0], tensor_dtype=types.FLOAT, display=False, device="cpu", device_id =0, prefetch_batches=1,
+                 pin_memory=False, output_buffers=1, output_tensors=None):
         self.loader = pipeline
         self.tensor_format =tensor_layout
         self.multiplier = multiplier
@@ -128,6 +131,34 @@ class ROCALGenericIterator(object):
                     self.out = torch.empty((self.bs*self.n, int(self.h/self.bs), self.w, self.p), dtype=torch.uint8, device=torch_gpu_device)
                 self.labels = torch.empty(self.labels_size, dtype = torch.int32, device = torch_gpu_device)
 
+        # Classification pipelines can run prefetch_batches batches in one run_many call into a ring of output tensors
+        self.prefetch_batches = prefetch_batches
+        if (self.loader._name == "Caffe2ReaderDetection") or (self.loader._name == "CaffeReaderDetection") or self.loader._oneHotEncoding or self.display:
+            self.prefetch_batches = 1
+        if self.prefetch_batches > 1:
+            self.out_ring = torch.empty((self.prefetch_batches,) + tuple(self.out.shape), dtype=self.out.dtype, device=self.out.device)
+            self.labels_ring = torch.empty((self.prefetch_batches, self.bs), dtype=torch.int32, device=self.labels.device)
+        self.prefetched = 0
+        self.prefetch_idx = 0
+
+        # CPU outputs can be page locked and rotated through, so that a non_blocking copy of a batch to the GPU
+        # runs while the next batches are written to the other buffers
+        if output_tensors is not None:
+            self.out_buffers = list(output_tensors)
+        else:
+            self.out_buffers = [self.out] + [torch.empty(self.out.shape, dtype=self.out.dtype, device=self.out.device) for _ in range(output_buffers - 1)]
+            if pin_memory and self.device == "cpu":
+                self.out_buffers = [out.pin_memory() for out in self.out_buffers]
+                self.labels = self.labels.pin_memory()
+                if self.prefetch_batches > 1:
+                    self.out_ring = self.out_ring.pin_memory()
+                    self.labels_ring = self.labels_ring.pin_memory()
+        self.out = self.out_buffers[0]
+        self.buffer_idx = 0
+        self.held_buffers = 0 # Number of times a buffer was reused while the consumer still referenced it
+        if len(self.out_buffers) > 1:
+            self.free_buffer_refcount = sys.getrefcount(self.out_buffers[-1])
+
         if self.bs != 0:
             self.len = b.getRemainingImages(self.loader._handle)//self.bs
         else:
@@ -137,64 +168,37 @@ class ROCALGenericIterator(object):
         return self.__next__()
 
     def __next__(self):
+        if self.prefetch_batches > 1:
+            return self.next_prefetched()
+
         if(b.isEmpty(self.loader._handle)):
             raise StopIteration
 
         if self.loader.run() != 0:
             raise StopIteration
 
+        if len(self.out_buffers) > 1:
+            self.next_output_buffer()
+
         self.loader.copyToExternalTensor(
             self.out, self.multiplier, self.offset, self.reverse_channels, self.tensor_format, self.tensor_dtype)
 
         if((self.loader._name == "Caffe2ReaderDetection") or (self.loader._name == "CaffeReaderDetection")):
-            self.lis = []  # Empty list for bboxes
-            self.lis_lab = []  # Empty list of labels
-
-            # Count of labels/ bboxes in a batch
-            self.bboxes_label_count = np.zeros(self.bs, dtype="int32")
-            self.count_batch = self.loader.GetBoundingBoxCount(self.bboxes_label_count)
-            # 1D labels array in a batch
-            self.labels = np.zeros(self.count_batch, dtype="int32")
-            self.loader.GetBBLabels(self.labels)
-            # 1D bboxes array in a batch
-            self.bboxes = np.zeros((self.count_batch*4), dtype="float32")
-            self.loader.GetBBCords(self.bboxes)
+            # Boxes and labels of the batch zero padded to the largest box count, in buffers reused across batches
+            meta_data = self.loader.GetBatchMetaData()
+            bb_padded, labels_padded, bboxes_label_count = self.loader.GetPaddedBBoxesAndLabels(meta_data=meta_data)
+            # The counts and image sizes are views of the meta data rocAL packs again for the next batch
+            self.bboxes_label_count = bboxes_label_count.copy()
             #Image sizes of a batch
-            self.img_size = np.zeros((self.bs * 2),dtype = "int32")
-            self.loader.GetImgSizes(self.img_size)
-
-            count =0
-            sum_count=0
-            for i in range(self.bs):
-                count = self.bboxes_label_count[i]
+            self.img_size = meta_data["image_sizes"].reshape(-1).copy() if meta_data["image_sizes"] is not None else np.zeros((self.bs * 2),dtype = "int32")
 
-                self.label_2d_numpy = (self.labels[sum_count : sum_count+count])
-                self.label_2d_numpy = np.reshape(self.label_2d_numpy, (-1, 1)).tolist()
-                self.bb_2d_numpy = (self.bboxes[sum_count*4 : (sum_count+count)*4])
-                self.bb_2d_numpy = np.reshape(self.bb_2d_numpy, (-1, 4)).tolist()
-
-                self.lis_lab.append(self.label_2d_numpy)
-                self.lis.append(self.bb_2d_numpy)
-
-                if self.display:
+            if self.display:
+                for i in range(self.bs):
                     img = (self.out)
-                    draw_patches(img[i], i, self.bb_2d_numpy)
+                    draw_patches(img[i], i, bb_padded[i][:self.bboxes_label_count[i]])
 
-                sum_count = sum_count + count
-
-            self.target = self.lis
-            self.target1 = self.lis_lab
-            max_cols = max([len(row) for batch in self.target for row in batch])
-            max_rows = max([len(batch) for batch in self.target])
-            self.bb_padded = [batch + [[0] * (max_cols)] * (max_rows - len(batch)) for batch in self.target]
-            self.bb_padded = torch.FloatTensor([row + [0] * (max_cols - len(row)) for batch in self.bb_padded for row in batch])
-            self.bb_padded = self.bb_padded.view(-1, max_rows, max_cols)
-
-            max_cols1 = max([len(row) for batch in self.target1 for row in batch])
-            max_rows1 = max([len(batch) for batch in self.target1])
-            self.labels_padded = [batch + [[0] * (max_cols1)] * (max_rows1 - len(batch)) for batch in self.target1]
-            self.labels_padded = torch.LongTensor([row + [0] * (max_cols1 - len(row)) for batch in self.labels_padded for row in batch])
-            self.labels_padded = self.labels_padded.view(-1, max_rows1, max_cols1)
+            self.bb_padded = torch.from_numpy(bb_padded)
+            self.labels_padded = torch.from_numpy(labels_padded).long().unsqueeze(-1)
 
             return self.out,self.bb_padded, self.labels_padded
 
@@ -212,7 +216,28 @@ class ROCALGenericIterator(object):
 
             return self.out, self.labels_tensor
 
+    def next_output_buffer(self):
+        self.buffer_idx = (self.buffer_idx + 1) % len(self.out_buffers)
+        if sys.getrefcount(self.out_buffers[self.buffer_idx]) > self.free_buffer_refcount:
+            self.held_buffers += 1
+            if self.held_buffers == 1:
+                warnings.warn("ROCAL output buffer " + str(self.buffer_idx) + " is overwritten while still referenced, "
+                              "increase output_buffers or copy the outputs to keep them")
+        self.out = self.out_buffers[self.buffer_idx]
+
+    def next_prefetched(self):
+        if self.prefetch_idx == self.prefetched:
+            self.prefetched = self.loader.run_many(self.prefetch_batches, self.out_ring, self.labels_ring, self.multiplier, self.offset,
+                                                   self.reverse_channels, self.tensor_format, self.tensor_dtype)
+            self.prefetch_idx = 0
+            if self.prefetched == 0:
+                raise StopIteration
+        self.prefetch_idx += 1
+        return self.out_ring[self.prefetch_idx - 1], self.labels_ring[self.prefetch_idx - 1].long()
+
     def reset(self):
+        self.prefetched = 0
+        self.prefetch_idx = 0
         b.rocalResetLoaders(self.loader._handle)
 
     def __iter__(self):
@@ -243,7 +268,8 @@ class ROCALClassificationIterator(ROCALGenericIterator):
        ROCALGenericIterator(pipelines, ["data", "label"], size)
 
     Please keep in mind that Tensors returned by the iterator are
-    still owned by ROCAL. They are valid till the next iterator call.
+    still owned by ROCAL. They are valid till the next iterator call,
+    or till prefetch_batches iterator calls later with prefetch_batches > 1.
     If the content needs to be preserved please copy it to another tensor.
 
     Parameters
@@ -274,6 +300,20 @@ class ROCALClassificationIterator(ROCALGenericIterator):
                  the next epoch. If set to False next epoch will end sooner as data from
                  it was consumed but dropped. If set to True next epoch would be the
                  same length as the first one.
+    prefetch_batches : int, optional, default = 1
+                 Number of batches run and copied into a ring of output tensors
+                 with one native call when the ring runs out, which saves the Python
+                 overhead of every batch for small images.
+    pin_memory : bool, optional, default = False
+                 Whether to allocate the outputs of a "cpu" device in page locked memory,
+                 so their copies to the GPU can be asynchronous.
+    output_buffers : int, optional, default = 1
+                 Number of output tensors the iterator rotates through. A batch stays
+                 valid for output_buffers iterator calls and `held_buffers` counts the
+                 times a buffer was overwritten while the consumer still referenced it.
+    output_tensors : list of torch.Tensor, optional, default = None
+                 Output tensors of the batch shape to rotate through instead of
+                 allocating them, e.g. pinned tensors from the caller's pool.
 
     Example
     -------
@@ -292,10 +332,16 @@ class ROCALClassificationIterator(ROCALGenericIterator):
                  last_batch_padded=False,
                  display=False,
                  device="cpu",
-                 device_id =0):
+                 device_id =0,
+                 prefetch_batches=1,
+                 pin_memory=False,
+                 output_buffers=1,
+                 output_tensors=None):
         pipe = pipelines
         super(ROCALClassificationIterator, self).__init__(pipe, tensor_layout = pipe._tensor_layout, tensor_dtype = pipe._tensor_dtype,
-                                                            multiplier=pipe._multiplier, offset=pipe._offset,display=display, device=device, device_id = device_id)
+                                                            multiplier=pipe._multiplier, offset=pipe._offset,display=display, device=device, device_id = device_id,
+                                                            prefetch_batches=prefetch_batches, pin_memory=pin_memory, output_buffers=output_buffers,
+                                                            output_tensors=output_tensors)
 
 
 class ROCAL_iterator(ROCALGenericImageIterator):
@@ -55,7 +55,8 @@ class ROCALGenericImageIterator(object):
         return self
 
 class ROCALGenericIteratorDetection(object):
-    def __init__(self, pipeline, tensor_layout = types.NCHW, reverse_channels = False, multiplier = None, offset = None, tensor_dtype=types.FLOAT, device = None, device_id = 0):
+    def __init__(self, pipeline, tensor_layout = types.NCHW, reverse_channels = False, multiplier = None, offset = None, tensor_dtype=types.FLOAT, device = None, device_id = 0,
+                 max_boxes = 100, ragged_boxes = False, dlpack = False):
         self.loader = pipeline
         self.tensor_format =tensor_layout
         self.multiplier = multiplier or [1.0, 1.0, 1.0]
@@ -72,12 +73,28 @@ class ROCALGenericIteratorDetection(object):
             self.loader._name = self.loader._reader
         color_format = b.getOutputColorFormat(self.loader._handle)
         self.p = (1 if (color_format == int(types.GRAY)) else 3)
+        self.max_boxes = max_boxes
+        self.ragged_boxes = ragged_boxes
+        # With dlpack the images are tf.Tensors viewing a tensor owned by rocAL instead of copies to self.out
+        self.dlpack = dlpack
+        if self.dlpack:
+            import tensorflow as tf
+            self.from_dlpack = tf.experimental.dlpack.from_dlpack
         if self.tensor_dtype == types.FLOAT:
             data_type="float32"
         elif self.tensor_dtype == types.FLOAT16:
             data_type="float16"
-        
-        if(types.NHWC == self.tensor_format):
+        elif self.tensor_dtype == types.UINT8:
+            data_type="uint8"
+        if (self.loader._name == "TFRecordReaderClassification"):
+            if(self.loader._oneHotEncoding == True):
+                self.labels = np.empty((self.bs)*(self.loader._numOfClasses),dtype = "int32")
+            else:
+                self.labels = np.empty((self.bs),dtype = "int32")
+
+        if self.dlpack:
+            self.out = None
+        elif(types.NHWC == self.tensor_format):
             if self.device == "cpu":
                 self.out = np.zeros((self.bs*self.n, int(self.h/self.bs), self.w, self.p), dtype = data_type)
             else:
@@ -107,75 +124,37 @@ class ROCALGenericIteratorDetection(object):
             self.reset()
             raise StopIteration
         
-        if(types.NCHW == self.tensor_format):
-            self.loader.copyToExternalTensorNCHW(self.out, self.multiplier, self.offset, self.reverse_channels, int(self.tensor_dtype))
+        if self.dlpack:
+            images = self.from_dlpack(self.loader.getTensorDLPack(self.tensor_format, self.tensor_dtype, self.multiplier, self.offset, self.reverse_channels).__dlpack__())
         else:
-            self.loader.copyToExternalTensorNHWC(self.out, self.multiplier, self.offset, self.reverse_channels, int(self.tensor_dtype))
+            if(types.NCHW == self.tensor_format):
+                self.loader.copyToExternalTensorNCHW(self.out, self.multiplier, self.offset, self.reverse_channels, int(self.tensor_dtype))
+            else:
+                self.loader.copyToExternalTensorNHWC(self.out, self.multiplier, self.offset, self.reverse_channels, int(self.tensor_dtype))
+            images = self.out
 
         if(self.loader._name == "TFRecordReaderDetection"):
-            self.bbox_list =[]
-            self.label_list=[]
-            self.num_bboxes_list=[]
-            #Count of labels/ bboxes in a batch
-            self.bboxes_label_count = np.zeros(self.bs, dtype="int32")
-            self.count_batch = self.loader.GetBoundingBoxCount(self.bboxes_label_count)
-            self.num_bboxes_list = self.bboxes_label_count.tolist()
-            # 1D labels array in a batch
-            self.labels = np.zeros(self.count_batch, dtype="int32")
-            self.loader.GetBBLabels(self.labels)
-            # 1D bboxes array in a batch
-            self.bboxes = np.zeros((self.count_batch*4), dtype="float32")
-            self.loader.GetBBCords(self.bboxes)
+            meta_data = self.loader.GetBatchMetaData()
             #1D Image sizes array of image in a batch
-            self.img_size = np.zeros((self.bs * 2),dtype = "int32")
-            self.loader.GetImgSizes(self.img_size)
-            count =0 # number of bboxes per image
-            sum_count=0 # sum of the no. of the bboxes
-            for i in range(self.bs):
-                count = self.bboxes_label_count[i]
-                self.label_2d_numpy = (self.labels[sum_count : sum_count+count])
-                self.label_2d_numpy = np.reshape(self.label_2d_numpy, (-1, 1)).tolist()
-                self.bb_2d_numpy = (self.bboxes[sum_count*4 : (sum_count+count)*4])
-                self.bb_2d_numpy = np.reshape(self.bb_2d_numpy, (-1, 4)).tolist()
-                self.label_list.append(self.label_2d_numpy)
-                self.bbox_list.append(self.bb_2d_numpy)
-                sum_count = sum_count +count
-
-            self.target = self.bbox_list
-            self.target1 = self.label_list
-            max_cols = max([len(row) for batch in self.target for row in batch])
-            # max_rows = max([len(batch) for batch in self.target])
-            max_rows = 100
-            bb_padded = [batch + [[0] * (max_cols)] * (max_rows - len(batch)) for batch in self.target]
-            bb_padded_1=[row + [0] * (max_cols - len(row)) for batch in bb_padded for row in batch]
-            arr = np.asarray(bb_padded_1)
-            self.res = np.reshape(arr, (-1, max_rows, max_cols))
-            max_cols = max([len(row) for batch in self.target1 for row in batch])
-            # max_rows = max([len(batch) for batch in self.target1])
-            max_rows = 100
-            lab_padded = [batch + [[0] * (max_cols)] * (max_rows - len(batch)) for batch in self.target1]
-            lab_padded_1=[row + [0] * (max_cols - len(row)) for batch in lab_padded for row in batch]
-            labarr = np.asarray(lab_padded_1)
-            self.l = np.reshape(labarr, (-1, max_rows, max_cols))
-            self.num_bboxes_arr = np.array(self.num_bboxes_list)
-
-            if self.tensor_dtype == types.FLOAT:
-                return self.out.astype(np.float32), self.res, self.l, self.num_bboxes_arr
-            elif self.tensor_dtype == types.FLOAT16:
-                return self.out.astype(np.float16), self.res, self.l, self.num_bboxes_arr
+            self.img_size = meta_data["image_sizes"].reshape(-1).copy() if meta_data["image_sizes"] is not None else np.zeros((self.bs * 2),dtype = "int32")
+            if self.ragged_boxes:
+                # Boxes and labels of all the images back to back with the box count of every image,
+                # e.g. for tf.RaggedTensor.from_row_lengths(boxes, counts). The meta data arrays are views of the packed
+                # buffer rocAL reuses for the next batch, they are copied so the outputs stay valid
+                self.res, self.l, self.num_bboxes_arr = meta_data["boxes"].copy(), meta_data["box_labels"][:, np.newaxis].copy(), meta_data["box_counts"].copy()
+            else:
+                # Boxes and labels of the batch zero padded to max_boxes per image, in buffers reused across batches.
+                # The boxes are float32 and the labels and counts int32, the types rocAL stores them in
+                self.res, labels_padded, bboxes_count = self.loader.GetPaddedBBoxesAndLabels(max_boxes=self.max_boxes, meta_data=meta_data)
+                self.num_bboxes_arr = bboxes_count.copy()
+                self.l = labels_padded[..., np.newaxis]
+            return images, self.res, self.l, self.num_bboxes_arr
         elif (self.loader._name == "TFRecordReaderClassification"):
             if(self.loader._oneHotEncoding == True):
-                self.labels = np.zeros((self.bs)*(self.loader._numOfClasses),dtype = "int32")
                 self.loader.GetOneHotEncodedLabels(self.labels, device="cpu")
-                self.labels = np.reshape(self.labels, (-1, self.bs, self.loader._numOfClasses))
-            else:
-                self.labels = np.zeros((self.bs),dtype = "int32")
-                self.loader.getImageLabels(self.labels)
-
-            if self.tensor_dtype == types.FLOAT:
-                return self.out.astype(np.float32), self.labels
-            elif self.tensor_dtype == types.TensorDataType.FLOAT16:
-                return self.out.astype(np.float16), self.labels
+                return images, np.reshape(self.labels, (-1, self.bs, self.loader._numOfClasses))
+            self.loader.getImageLabels(self.labels)
+            return images, self.labels
 
     def reset(self):
         b.rocalResetLoaders(self.loader._handle)
@@ -195,6 +174,10 @@ class ROCALIterator(ROCALGenericIteratorDetection):
     .. code-block:: python
        ROCALGenericIteratorDetection(pipelines, ["data", "label"], size)
 
+    The outputs are reused across batches, they are valid till the next iterator call.
+    Detection boxes are zero padded to max_boxes per image, with ragged_boxes the boxes and labels
+    of all the images are returned back to back with the box count of every image instead.
+    With dlpack the images are a tf.Tensor viewing a tensor owned by rocAL instead of a copy.
 
     """
     def __init__(self,
@@ -205,10 +188,14 @@ class ROCALIterator(ROCALGenericIteratorDetection):
                  dynamic_shape=False,
                  last_batch_padded=False,
                  device="cpu",
-                 device_id=0):
+                 device_id=0,
+                 max_boxes=100,
+                 ragged_boxes=False,
+                 dlpack=False):
         pipe = pipelines
         super(ROCALIterator, self).__init__(pipe, tensor_layout = pipe._tensor_layout, tensor_dtype = pipe._tensor_dtype,
-                                                            multiplier=pipe._multiplier, offset=pipe._offset, device=device, device_id=device_id)
+                                                            multiplier=pipe._multiplier, offset=pipe._offset, device=device, device_id=device_id,
+                                                            max_boxes=max_boxes, ragged_boxes=ragged_boxes, dlpack=dlpack)
 
 
 
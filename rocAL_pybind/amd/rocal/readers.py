@@ -22,14 +22,29 @@ import rocal_pybind as b
 from amd.rocal.pipeline import Pipeline
 import amd.rocal.types as types
 
+def _set_read_cache_size(read_cache_size):
+    # The compressed data cache is shared by all the readers of the process, readers created afterwards use it.
+    # None leaves the size set by an earlier pipeline, 0 disables the cache
+    if read_cache_size is not None:
+        b.setReaderCacheSize(Pipeline._current_pipeline._handle, read_cache_size)
+
+def _set_frame_cache_size(frame_cache_size):
+    # The decoded frame cache is shared by all the video readers of the process.
+    # None leaves the size set by an earlier pipeline, 0 disables the cache
+    if frame_cache_size is not None:
+        b.setVideoFrameCacheSize(Pipeline._current_pipeline._handle, frame_cache_size)
+
 def coco(*inputs, file_root, annotations_file='', bytes_per_sample_hint=0, dump_meta_files=False,
          dump_meta_files_path='', file_list='', initial_fill=1024,  lazy_init=False, ltrb=False, masks=False,
          meta_files_path='', num_shards=1, pad_last_batch=False, prefetch_queue_depth=1, preserve=False,
          random_shuffle=False, ratio=False, read_ahead=False, save_img_ids=False, seed=-1, shard_id=0,
          shuffle_after_epoch=False, size_threshold=0.1, skip_cached_images=False, skip_empty=False,
-         stick_to_shard=False, tensor_init_bytes=1048576):
+         stick_to_shard=False, tensor_init_bytes=1048576, read_cache_size=None, index_path=''):
 
     Pipeline._current_pipeline._reader = "COCOReader"
+    _set_read_cache_size(read_cache_size)
+    # the image decoder keeps the listing of file_root in a manifest in index_path, the folders are walked every run if empty
+    Pipeline._current_pipeline._index_path = index_path
     #Output
     labels = []
     bboxes = []
@@ -40,21 +55,27 @@ def coco(*inputs, file_root, annotations_file='', bytes_per_sample_hint=0, dump_
 def file(*inputs, file_root, bytes_per_sample_hint=0, file_list='', initial_fill='', lazy_init='',
          num_shards=1, pad_last_batch=False, prefetch_queue_depth=1, preserve=False, random_shuffle=False,
          read_ahead=False, seed=-1, shard_id=0, shuffle_after_epoch=False, skip_cached_images=False,
-         stick_to_shard=False, tensor_init_bytes=1048576, device=None):
+         stick_to_shard=False, tensor_init_bytes=1048576, device=None, read_cache_size=None, index_path=''):
 
     Pipeline._current_pipeline._reader = "labelReader"
+    _set_read_cache_size(read_cache_size)
+    # the label reader and the image decoder share the listing of file_root kept in a manifest in index_path
+    Pipeline._current_pipeline._index_path = index_path
     #Output
     labels = []
-    kwargs_pybind = {"source_path": file_root}
+    kwargs_pybind = {"source_path": file_root, "index_path": index_path}
     label_reader_meta_data = b.labelReader(Pipeline._current_pipeline._handle ,*(kwargs_pybind.values()))
     return (label_reader_meta_data, labels)
 
 def tfrecord(*inputs, path, user_feature_key_map, features, index_path="", reader_type=0,
              bytes_per_sample_hint=0, initial_fill=1024, lazy_init=False, num_shards=1, pad_last_batch=False,
              prefetch_queue_depth=1, preserve=False, random_shuffle=False, read_ahead=False, seed=-1, shard_id=0,
-             skip_cached_images=False, stick_to_shard=False, tensor_init_bytes=1048576,  device=None):
+             skip_cached_images=False, stick_to_shard=False, tensor_init_bytes=1048576,  device=None, read_cache_size=None):
 
     labels=[]
+    _set_read_cache_size(read_cache_size)
+    # the image decoder's TFRecordReader keeps its record offset indices in index_path, in the rocAL cache folder if empty
+    Pipeline._current_pipeline._index_path = index_path
     if reader_type == 1:
         Pipeline._current_pipeline._reader = "TFRecordReaderDetection"
         kwargs_pybind = {"path": path, "is_output": True, "user_key_for_label": user_feature_key_map["image/class/label"], "user_key_for_text": user_feature_key_map["image/class/text"], "user_key_for_xmin": user_feature_key_map["image/object/bbox/xmin"],
@@ -84,11 +105,12 @@ def tfrecord(*inputs, path, user_feature_key_map, features, index_path="", reade
 def caffe(*inputs, path, bbox=False, bytes_per_sample_hint=0, image_available=True, initial_fill=1024,
           label_available=True, lazy_init=False, num_shards=1, pad_last_batch=False, prefetch_queue_depth=1,
           preserve=False, random_shuffle=False, read_ahead=False, seed=-1, shard_id=0, skip_cached_images=False,
-          stick_to_shard=False, tensor_init_bytes=1048576, device=None):
+          stick_to_shard=False, tensor_init_bytes=1048576, device=None, read_cache_size=None):
 
     #Output
     bboxes = []
     labels = []
+    _set_read_cache_size(read_cache_size)
     kwargs_pybind = {"source_path": path}
     #Node Object
     if (bbox == True):
@@ -106,11 +128,12 @@ def caffe(*inputs, path, bbox=False, bytes_per_sample_hint=0, image_available=Tr
 def caffe2(*inputs, path, bbox=False, additional_inputs=0, bytes_per_sample_hint=0, image_available=True,
            initial_fill=1024, label_type=0, lazy_init=False, num_labels=1,  num_shards=1, pad_last_batch=False,
            prefetch_queue_depth=1, preserve=False, random_shuffle=False, read_ahead=False, seed=-1, shard_id=0,
-           skip_cached_images=False, stick_to_shard=False, tensor_init_bytes=1048576, device=None):
+           skip_cached_images=False, stick_to_shard=False, tensor_init_bytes=1048576, device=None, read_cache_size=None):
 
     #Output
     bboxes = []
     labels = []
+    _set_read_cache_size(read_cache_size)
     kwargs_pybind = {"source_path": path, "is_output":True}
     if (bbox == True):
         Pipeline._current_pipeline._reader = "Caffe2ReaderDetection"
@@ -130,14 +153,15 @@ def video(*inputs, sequence_length, additional_decode_surfaces=2, bytes_per_samp
           pad_last_batch=False, pad_sequences=False, prefetch_queue_depth=1, preserve=False, random_shuffle=False,
           read_ahead=False, seed=-1, shard_id=0, skip_cached_images=False, skip_vfr_check=False, step=1,
           stick_to_shard=False, stride=1, tensor_init_bytes=1048576, decoder_mode=types.SOFTWARE_DECODE,
-          device=None, name=None):
+          device=None, name=None, frame_cache_size=None, decode_threads=0):
 
     Pipeline._current_pipeline._reader = "VideoDecoder"
+    _set_frame_cache_size(frame_cache_size)
     #Output
     videos = []
     kwargs_pybind_reader = {"source_path": file_root,"sequence_length":sequence_length,"frame_step":step,"frame_stride":stride,"file_list_frame_num":file_list_frame_num} #VideoMetaDataReader
     b.VideoMetaDataReader(Pipeline._current_pipeline._handle ,*(kwargs_pybind_reader.values()))
-    kwargs_pybind_decoder = {"source_path": file_root,"color_format":image_type,"decoder_mode":decoder_mode,"shard_count":num_shards,"sequence_length":sequence_length,"shuffle":random_shuffle ,"is_output":False,"loop":False, "frame_step":step,"frame_stride":stride, "file_list_frame_num":file_list_frame_num } #VideoDecoder
+    kwargs_pybind_decoder = {"source_path": file_root,"color_format":image_type,"decoder_mode":decoder_mode,"shard_count":num_shards,"sequence_length":sequence_length,"shuffle":random_shuffle ,"is_output":False,"loop":False, "frame_step":step,"frame_stride":stride, "file_list_frame_num":file_list_frame_num, "decode_threads":decode_threads } #VideoDecoder
 
     videos = b.VideoDecoder(Pipeline._current_pipeline._handle ,*(kwargs_pybind_decoder.values()))
     return (videos)
@@ -150,9 +174,10 @@ def video_resize(*inputs, sequence_length, resize_width, resize_height, addition
                  read_ahead=False, seed=-1, shard_id=0, skip_cached_images=False, skip_vfr_check=False, step=3, stick_to_shard=False,
                  stride=3, tensor_init_bytes=1048576, decoder_mode=types.SOFTWARE_DECODE, device=None, name=None,
                  scaling_mode=types.SCALING_MODE_DEFAULT, interpolation_type=types.LINEAR_INTERPOLATION,
-                 resize_longer=0, resize_shorter=0, max_size=[]):
+                 resize_longer=0, resize_shorter=0, max_size=[], frame_cache_size=None, decode_threads=0):
 
     Pipeline._current_pipeline._reader = "VideoDecoderResize"
+    _set_frame_cache_size(frame_cache_size)
     #Output
     videos = []
     kwargs_pybind_reader = {"source_path": file_root,"sequence_length":sequence_length,"frame_step":step,"frame_stride":stride,"file_list_frame_num":file_list_frame_num} #VideoMetaDataReader
@@ -161,7 +186,8 @@ def video_resize(*inputs, sequence_length, resize_width, resize_height, addition
                             "sequence_length":sequence_length, "resize_width":resize_width, "resize_height":resize_height,
                             "shuffle":random_shuffle , "is_output":False, "loop":False, "frame_step":step,"frame_stride":stride,
                             "file_list_frame_num":file_list_frame_num, "scaling_mode":scaling_mode ,"max_size":max_size,
-                            "resize_shorter": resize_shorter, "resize_longer": resize_longer,"interpolation_type": interpolation_type }
+                            "resize_shorter": resize_shorter, "resize_longer": resize_longer,"interpolation_type": interpolation_type,
+                            "decode_threads": decode_threads }
 
     videos = b.VideoDecoderResize(Pipeline._current_pipeline._handle ,*(kwargs_pybind_decoder.values()))
     return (videos, meta_data)
@@ -69,6 +69,10 @@ from rocal_pybind.types import DECODER_HW_JEPG
 from rocal_pybind.types import DECODER_VIDEO_FFMPEG_SW
 from rocal_pybind.types import DECODER_VIDEO_FFMPEG_HW
 
+#     RocalImageCacheType
+from rocal_pybind.types import IMAGE_CACHE_LRU
+from rocal_pybind.types import IMAGE_CACHE_FIRST_N
+
 #     RocalResizeScalingMode
 from rocal_pybind.types import SCALING_MODE_DEFAULT
 from rocal_pybind.types import SCALING_MODE_STRETCH
@@ -122,6 +126,9 @@ _known_types = {
     DECODER_VIDEO_FFMPEG_SW: ("DECODER_VIDEO_FFMPEG_SW", DECODER_VIDEO_FFMPEG_SW),
     DECODER_VIDEO_FFMPEG_HW: ("DECODER_VIDEO_FFMPEG_HW", DECODER_VIDEO_FFMPEG_HW),
 
+    IMAGE_CACHE_LRU: ("IMAGE_CACHE_LRU", IMAGE_CACHE_LRU),
+    IMAGE_CACHE_FIRST_N: ("IMAGE_CACHE_FIRST_N", IMAGE_CACHE_FIRST_N),
+
     NEAREST_NEIGHBOR_INTERPOLATION: ("NEAREST_NEIGHBOR_INTERPOLATION", NEAREST_NEIGHBOR_INTERPOLATION),
     LINEAR_INTERPOLATION: ("LINEAR_INTERPOLATION", LINEAR_INTERPOLATION),
     CUBIC_INTERPOLATION: ("CUBIC_INTERPOLATION", CUBIC_INTERPOLATION),
@@ -0,0 +1,97 @@
+# Copyright (c) 2023 Advanced Micro Devices, Inc. All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from amd.rocal.plugin.generic import ROCALClassificationIterator
+from amd.rocal.pipeline import Pipeline
+import amd.rocal.fn as fn
+import amd.rocal.types as types
+import sys
+import threading
+import datetime
+
+def HybridTrainPipe(batch_size, num_threads, device_id, data_dir, rocal_cpu = True):
+    resize_width = 224
+    resize_height = 224
+    rocal_device = 'cpu' if rocal_cpu else 'gpu'
+    decoder_device = 'cpu'
+
+    # Create Pipeline instance
+    pipe = Pipeline(batch_size = batch_size, num_threads = num_threads, device_id = device_id, rocal_cpu = rocal_cpu, tensor_layout = types.NCHW, tensor_dtype = types.FLOAT)
+    with pipe:
+        jpegs, _ = fn.readers.file(file_root = data_dir)
+        images = fn.decoders.image(jpegs, file_root = data_dir, device = decoder_device, output_type = types.RGB, random_shuffle = True)
+        images = fn.resize(images, device = rocal_device, resize_x = resize_width, resize_y = resize_height)
+        output = fn.crop_mirror_normalize(images, device = rocal_device, crop = (resize_height, resize_width), mean = [0, 0, 0], std = [1, 1, 1], mirror = 0, output_dtype = types.FLOAT, output_layout = types.NCHW)
+        pipe.set_outputs(output)
+    return pipe
+
+def run_epochs(iterator, num_epochs, image_count):
+    for _ in range(num_epochs):
+        for _, (images, labels) in enumerate(iterator, 0):
+            image_count[0] += images.shape[0]
+        iterator.reset()
+
+def run_pipelines(iterators, num_epochs, use_threads):
+    image_counts = [[0] for _ in iterators]
+    start = datetime.datetime.now()
+    if use_threads:
+        threads = [threading.Thread(target = run_epochs, args = (iterator, num_epochs, count)) for iterator, count in zip(iterators, image_counts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        for iterator, count in zip(iterators, image_counts):
+            run_epochs(iterator, num_epochs, count)
+    end = datetime.datetime.now()
+    total_images = sum(count[0] for count in image_counts)
+    return total_images / (end - start).total_seconds()
+
+def main():
+    if len(sys.argv) < 4:
+        print ('Please pass image_folder cpu/gpu batch_size [num_epochs]')
+        exit(0)
+    _image_path = sys.argv[1]
+    _rocal_cpu = (sys.argv[2] == "cpu")
+    _batch_size = int(sys.argv[3])
+    _num_epochs = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+    _num_threads = 2
+    _device_id = 0
+
+    iterators = []
+    for _ in range(2):
+        pipe = HybridTrainPipe(batch_size = _batch_size, num_threads = _num_threads, device_id = _device_id, data_dir = _image_path, rocal_cpu = _rocal_cpu)
+        pipe.build()
+        iterators.append(ROCALClassificationIterator(pipe))
+
+    sequential_throughput = run_pipelines(iterators, _num_epochs, use_threads = False)
+    threaded_throughput = run_pipelines(iterators, _num_epochs, use_threads = True)
+    speedup = threaded_throughput / sequential_throughput
+    print("Sequential throughput       :", int(sequential_throughput), "images/sec")
+    print("Two-thread throughput       :", int(threaded_throughput), "images/sec")
+    print("Aggregate speedup           :", round(speedup, 2), "x")
+    # With the GIL released inside the blocking rocAL calls both pipelines make progress concurrently
+    if speedup < 1.5:
+        print("FAILED: pipelines running on separate Python threads are serialized")
+        exit(1)
+    print("PASSED")
+
+if __name__ == '__main__':
+    main()
@@ -68,12 +68,82 @@ namespace rocal{
         return ptr;
     }
 
+    // DLManagedTensor of dlpack.h, the ABI of the capsules the frameworks' from_dlpack() take
+    struct DLDevice { int32_t device_type; int32_t device_id; };
+    struct DLDataType { uint8_t code; uint8_t bits; uint16_t lanes; };
+    struct DLTensor { void *data; DLDevice device; int32_t ndim; DLDataType dtype; int64_t *shape; int64_t *strides; uint64_t byte_offset; };
+    struct DLManagedTensor { DLTensor dl_tensor; void *manager_ctx; void (*deleter)(DLManagedTensor *self); };
+
+    // The data stays owned by rocAL, an exported tensor only owns its shape
+    struct ExportedTensor
+    {
+        DLManagedTensor managed;
+        std::vector<int64_t> shape;
+    };
+
+    static void delete_exported_tensor(DLManagedTensor *self)
+    {
+        delete static_cast<ExportedTensor *>(self->manager_ctx);
+    }
+
+    static void release_dlpack_capsule(PyObject *capsule)
+    {
+        // A consumer renames the capsule to "used_dltensor" and calls the deleter when it is done with the tensor
+        if (PyCapsule_IsValid(capsule, "dltensor")) {
+            auto managed = static_cast<DLManagedTensor *>(PyCapsule_GetPointer(capsule, "dltensor"));
+            managed->deleter(managed);
+        }
+    }
+
+    py::capsule wrapper_to_dlpack(size_t data_ptr, std::vector<int64_t> shape, uint8_t type_code, uint8_t type_bits, int device_type, int device_id)
+    {
+        auto exported = new ExportedTensor;
+        exported->shape = std::move(shape);
+        DLTensor &tensor = exported->managed.dl_tensor;
+        tensor.data = (void *)data_ptr;
+        tensor.device = {device_type, device_id};
+        tensor.ndim = exported->shape.size();
+        tensor.dtype = {type_code, type_bits, 1};
+        tensor.shape = exported->shape.data();
+        tensor.strides = nullptr; // compact row major
+        tensor.byte_offset = 0;
+        exported->managed.manager_ctx = exported;
+        exported->managed.deleter = delete_exported_tensor;
+        return py::capsule(&exported->managed, "dltensor", &release_dlpack_capsule);
+    }
+
+    py::list wrapper_output_buffers(RocalContext context)
+    {
+        std::vector<void *> buffers(rocalGetAugmentationBranchCount(context));
+        py::list addresses;
+        if (rocalGetOutputBuffers(context, buffers.data()) != ROCAL_OK)
+            return addresses;
+        for (auto buffer : buffers)
+            addresses.append((size_t)buffer);
+        return addresses;
+    }
+
+    size_t wrapper_exported_tensor(RocalContext context, RocalTensorLayout tensor_format, RocalTensorOutputType tensor_output_type,
+                                float multiplier0, float multiplier1, float multiplier2, float offset0,
+                                float offset1, float offset2, bool reverse_channels)
+    {
+        void *ptr = nullptr;
+        py::gil_scoped_release release;
+        if (rocalToExportedTensor(context, &ptr, tensor_format, tensor_output_type, multiplier0, multiplier1, multiplier2,
+                                  offset0, offset1, offset2, reverse_channels) != ROCAL_OK)
+            return 0;
+        return (size_t)ptr;
+    }
+
     py::object wrapper_copy_to_output(RocalContext context, py::array_t<unsigned char> array)
     {
         auto buf = array.request();
         unsigned char* ptr = (unsigned char*) buf.ptr;
         // call pure C++ function
-        int status = rocalCopyToOutput(context, ptr, buf.size);
+        {
+            py::gil_scoped_release release;
+            int status = rocalCopyToOutput(context, ptr, buf.size);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -108,9 +178,12 @@ namespace rocal{
         auto ptr = ctypes_void_ptr(p);
         // call pure C++ function
 
-        int status = rocalToTensor(context, ptr, tensor_format, tensor_output_type, multiplier0,
-                                              multiplier1, multiplier2, offset0,
-                                              offset1, offset2, reverse_channels, output_mem_type);
+        {
+            py::gil_scoped_release release;
+            int status = rocalToTensor(context, ptr, tensor_format, tensor_output_type, multiplier0,
+                                                  multiplier1, multiplier2, offset0,
+                                                  offset1, offset2, reverse_channels, output_mem_type);
+        }
         // std::cerr<<"\n Copy failed with status :: "<<status;
         return py::cast<py::none>(Py_None);
     }
@@ -124,9 +197,12 @@ namespace rocal{
         auto buf = array.request();
         float* ptr = (float*) buf.ptr;
         // call pure C++ function
-        int status = rocalToTensor32(context, ptr, tensor_format, multiplier0,
-                                              multiplier1, multiplier2, offset0,
-                                              offset1, offset2, reverse_channels, output_mem_type);
+        {
+            py::gil_scoped_release release;
+            int status = rocalToTensor32(context, ptr, tensor_format, multiplier0,
+                                                  multiplier1, multiplier2, offset0,
+                                                  offset1, offset2, reverse_channels, output_mem_type);
+        }
         // std::cerr<<"\n Copy failed with status :: "<<status;
         return py::cast<py::none>(Py_None);
     }
@@ -140,9 +216,12 @@ namespace rocal{
         auto buf = array.request();
         float16* ptr = (float16*) buf.ptr;
         // call pure C++ function
-        int status = rocalToTensor16(context, ptr, tensor_format, multiplier0,
-                                              multiplier1, multiplier2, offset0,
-                                              offset1, offset2, reverse_channels, output_mem_type);
+        {
+            py::gil_scoped_release release;
+            int status = rocalToTensor16(context, ptr, tensor_format, multiplier0,
+                                                  multiplier1, multiplier2, offset0,
+                                                  offset1, offset2, reverse_channels, output_mem_type);
+        }
         // std::cerr<<"\n Copy failed with status :: "<<status;
         return py::cast<py::none>(Py_None);
     }
@@ -155,9 +234,12 @@ namespace rocal{
     {
         float * ptr = (float*)array_ptr;
         // call pure C++ function
-        int status = rocalToTensor32(context, ptr, tensor_format, multiplier0,
-                                              multiplier1, multiplier2, offset0,
-                                              offset1, offset2, reverse_channels, output_mem_type);
+        {
+            py::gil_scoped_release release;
+            int status = rocalToTensor32(context, ptr, tensor_format, multiplier0,
+                                                  multiplier1, multiplier2, offset0,
+                                                  offset1, offset2, reverse_channels, output_mem_type);
+        }
         // std::cerr<<"\n Copy failed with status :: "<<status;
         return py::cast<py::none>(Py_None);
     }
@@ -170,18 +252,36 @@ namespace rocal{
     {
         float16 * ptr = (float16*)array_ptr;
         // call pure C++ function
-        int status = rocalToTensor16(context, ptr, tensor_format, multiplier0,
-                                              multiplier1, multiplier2, offset0,
-                                              offset1, offset2, reverse_channels, output_mem_type);
+        {
+            py::gil_scoped_release release;
+            int status = rocalToTensor16(context, ptr, tensor_format, multiplier0,
+                                                  multiplier1, multiplier2, offset0,
+                                                  offset1, offset2, reverse_channels, output_mem_type);
+        }
         // std::cerr<<"\n Copy failed with status :: "<<status;
         return py::cast<py::none>(Py_None);
     }
 
+    unsigned wrapper_run_many(RocalContext context, unsigned batch_count, size_t array_ptr,
+                                RocalTensorLayout tensor_format, RocalTensorOutputType tensor_output_type, float multiplier0,
+                                float multiplier1, float multiplier2, float offset0,
+                                float offset1, float offset2,
+                                bool reverse_channels, RocalOutputMemType output_mem_type, size_t labels_ptr)
+    {
+        // Addresses of the numpy, cupy or torch buffers, labels_ptr is 0 to skip the labels
+        py::gil_scoped_release release;
+        return rocalRunMany(context, batch_count, (void *)array_ptr, tensor_format, tensor_output_type, multiplier0,
+                            multiplier1, multiplier2, offset0, offset1, offset2, reverse_channels, output_mem_type, (int *)labels_ptr);
+    }
+
     py::object wrapper_label_copy(RocalContext context, py::object p, RocalOutputMemType output_mem_type)
     {
         auto ptr = ctypes_void_ptr(p);
         // call pure C++ function
-        rocalGetImageLabels(context,ptr, output_mem_type);
+        {
+            py::gil_scoped_release release;
+            rocalGetImageLabels(context,ptr, output_mem_type);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -189,7 +289,10 @@ namespace rocal{
     {
         void * ptr = (void*)array_ptr;
         // call pure C++ function
-        rocalGetImageLabels(context,ptr, output_mem_type);
+        {
+            py::gil_scoped_release release;
+            rocalGetImageLabels(context,ptr, output_mem_type);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -198,7 +301,10 @@ namespace rocal{
         auto buf = array.request();
         int* ptr = (int*) buf.ptr;
         // call pure C++ function
-        rocalGetImageId(context,ptr);
+        {
+            py::gil_scoped_release release;
+            rocalGetImageId(context,ptr);
+        }
         return py::cast<py::none>(Py_None);
     }
     py::object wrapper_labels_BB_count_copy(RocalContext context, py::array_t<int> array)
@@ -207,7 +313,11 @@ namespace rocal{
         auto buf = array.request();
         int* ptr = (int*) buf.ptr;
         // call pure C++ function
-        int count =rocalGetBoundingBoxCount(context,ptr);
+        int count;
+        {
+            py::gil_scoped_release release;
+            count = rocalGetBoundingBoxCount(context,ptr);
+        }
         return py::cast(count);
     }
 
@@ -217,7 +327,10 @@ namespace rocal{
         auto buf = array.request();
         int* ptr = (int*) buf.ptr;
         // call pure C++ function
-        rocalGetBoundingBoxLabel(context,ptr);
+        {
+            py::gil_scoped_release release;
+            rocalGetBoundingBoxLabel(context,ptr);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -228,7 +341,10 @@ namespace rocal{
         auto labels_buf = labels_array.request();
         int* labels_ptr = (int*) labels_buf.ptr;
         // call pure C++ function
-        rocalCopyEncodedBoxesAndLables(context, bboxes_ptr , labels_ptr);
+        {
+            py::gil_scoped_release release;
+            rocalCopyEncodedBoxesAndLables(context, bboxes_ptr , labels_ptr);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -236,7 +352,10 @@ namespace rocal{
     {
         float* bboxes_buf_ptr; int* labels_buf_ptr;
         // call pure C++ function
-        rocalGetEncodedBoxesAndLables(context, &bboxes_buf_ptr, &labels_buf_ptr, num_anchors*batch_size);
+        {
+            py::gil_scoped_release release;
+            rocalGetEncodedBoxesAndLables(context, &bboxes_buf_ptr, &labels_buf_ptr, num_anchors*batch_size);
+        }
         // create numpy arrays for boxes and labels tensor from the returned ptr
         // no need to free the memory as this is freed by c++ lib
         py::array_t<float> bboxes_array = py::array_t<float>(
@@ -254,12 +373,47 @@ namespace rocal{
     }
 
 
+    py::dict wrapper_get_batch_meta_data(RocalContext context)
+    {
+        const RocalBatchMetaData *meta_data;
+        // call pure C++ function
+        {
+            py::gil_scoped_release release;
+            meta_data = rocalGetBatchMetaData(context);
+        }
+        // numpy arrays viewing the packed buffer, no need to free the memory as it is owned by the c++ lib
+        // and stays valid till the next run
+        auto none = py::cast<py::none>(Py_None);
+        ssize_t batch_size = meta_data->batch_size;
+        ssize_t total_boxes = meta_data->total_boxes;
+        py::dict batch;
+        batch["names"] = py::array_t<uint8_t>({(ssize_t)meta_data->name_offsets[batch_size]}, {sizeof(uint8_t)}, (const uint8_t *)meta_data->names, none);
+        batch["name_offsets"] = py::array_t<int>({batch_size + 1}, {sizeof(int)}, meta_data->name_offsets, none);
+        batch["image_ids"] = py::array_t<int>({batch_size}, {sizeof(int)}, meta_data->image_ids, none);
+        for (auto key : {"labels", "box_counts", "box_offsets", "boxes", "box_labels", "image_sizes"})
+            batch[key] = none;
+        if (meta_data->labels)
+            batch["labels"] = py::array_t<int>({batch_size}, {sizeof(int)}, meta_data->labels, none);
+        if (meta_data->box_counts) {
+            batch["box_counts"] = py::array_t<int>({batch_size}, {sizeof(int)}, meta_data->box_counts, none);
+            batch["box_offsets"] = py::array_t<int>({batch_size + 1}, {sizeof(int)}, meta_data->box_offsets, none);
+            batch["boxes"] = py::array_t<float>({total_boxes, (ssize_t)4}, {4 * sizeof(float), sizeof(float)}, meta_data->boxes, none);
+            batch["box_labels"] = py::array_t<int>({total_boxes}, {sizeof(int)}, meta_data->box_labels, none);
+        }
+        if (meta_data->image_sizes)
+            batch["image_sizes"] = py::array_t<int>({batch_size, (ssize_t)2}, {2 * sizeof(int), sizeof(int)}, meta_data->image_sizes, none);
+        return batch;
+    }
+
     py::object wrapper_BB_cord_copy(RocalContext context, py::array_t<float> array)
     {
         auto buf = array.request();
         float* ptr = (float*) buf.ptr;
         // call pure C++ function
-        rocalGetBoundingBoxCords(context,ptr);
+        {
+            py::gil_scoped_release release;
+            rocalGetBoundingBoxCords(context,ptr);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -268,7 +422,10 @@ namespace rocal{
         auto buf = array.request();
         int* ptr = (int*) buf.ptr;
         // call pure C++ function
-        rocalGetImageSizes(context,ptr);
+        {
+            py::gil_scoped_release release;
+            rocalGetImageSizes(context,ptr);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -276,7 +433,10 @@ namespace rocal{
     {
         auto ptr = ctypes_void_ptr(p);
         // call pure C++ function
-        rocalGetOneHotImageLabels(context, ptr, numOfClasses, dest);
+        {
+            py::gil_scoped_release release;
+            rocalGetOneHotImageLabels(context, ptr, numOfClasses, dest);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -284,7 +444,10 @@ namespace rocal{
     {
         void * ptr = (void*) array_ptr;
         // call pure C++ function
-        rocalGetOneHotImageLabels(context, ptr, numOfClasses, dest);
+        {
+            py::gil_scoped_release release;
+            rocalGetOneHotImageLabels(context, ptr, numOfClasses, dest);
+        }
         return py::cast<py::none>(Py_None);
     }
 
@@ -307,15 +470,19 @@ namespace rocal{
                 py::arg("cpu_thread_count") = 1,
                 py::arg("prefetch_queue_depth") = 3,
                 py::arg("output_data_type") = 0);
-        m.def("rocalVerify",&rocalVerify);
-        m.def("rocalRun",&rocalRun);
-        m.def("rocalRelease",&rocalRelease);
+        m.def("rocalVerify",&rocalVerify, py::call_guard<py::gil_scoped_release>());
+        m.def("rocalRun",&rocalRun, py::call_guard<py::gil_scoped_release>());
+        m.def("rocalRelease",&rocalRelease, py::call_guard<py::gil_scoped_release>());
         // rocal_api_types.h
         py::class_<TimingInfo>(m, "TimingInfo")
             .def_readwrite("load_time",&TimingInfo::load_time)
             .def_readwrite("decode_time",&TimingInfo::decode_time)
             .def_readwrite("process_time",&TimingInfo::process_time)
-            .def_readwrite("transfer_time",&TimingInfo::transfer_time);
+            .def_readwrite("transfer_time",&TimingInfo::transfer_time)
+            .def_readwrite("cache_hits",&TimingInfo::cache_hits)
+            .def_readwrite("cache_misses",&TimingInfo::cache_misses)
+            .def_readwrite("decoder_opens",&TimingInfo::decoder_opens)
+            .def_readwrite("decoder_closes",&TimingInfo::decoder_closes);
         py::module types_m = m.def_submodule("types");
         types_m.doc() = "Datatypes and options used by ROCAL";
         py::enum_<RocalStatus>(types_m, "RocalStatus", "Status info")
@@ -381,6 +548,10 @@ namespace rocal{
             .value("DECODER_VIDEO_FFMPEG_SW",ROCAL_DECODER_VIDEO_FFMPEG_SW)
             .value("DECODER_VIDEO_FFMPEG_HW",ROCAL_DECODER_VIDEO_FFMPEG_HW)
             .export_values();
+        py::enum_<RocalImageCacheType>(types_m,"RocalImageCacheType", "Rocal Image Cache Type")
+            .value("IMAGE_CACHE_LRU",ROCAL_IMAGE_CACHE_LRU)
+            .value("IMAGE_CACHE_FIRST_N",ROCAL_IMAGE_CACHE_FIRST_N)
+            .export_values();
         // rocal_api_info.h
         m.def("getOutputWidth",&rocalGetOutputWidth);
         m.def("getOutputHeight",&rocalGetOutputHeight);
@@ -413,6 +584,7 @@ namespace rocal{
         m.def("rocalCopyEncodedBoxesAndLables",&wrapper_encoded_bbox_label);
         m.def("rocalGetEncodedBoxesAndLables",&wrapper_get_encoded_bbox_label);
         m.def("getImgSizes",&wrapper_img_sizes_copy);
+        m.def("getBatchMetaData",&wrapper_get_batch_meta_data);
         m.def("getBoundingBoxCount",&wrapper_labels_BB_count_copy);
         m.def("getOneHotEncodedLabels",&wrapper_one_hot_label_copy);
         m.def("getCupyOneHotEncodedLabels",&wrapper_cupy_one_hot_label_copy);
@@ -443,6 +615,10 @@ namespace rocal{
         m.def("rocalToTensor16",&wrapper_tensor16);
         m.def("rocalCupyToTensor32",&wrapper_copy_cupy_tensor32);
         m.def("rocalCupyToTensor16",&wrapper_copy_cupy_tensor16);
+        m.def("rocalRunMany",&wrapper_run_many);
+        m.def("rocalGetOutputBuffers",&wrapper_output_buffers);
+        m.def("rocalToExportedTensor",&wrapper_exported_tensor);
+        m.def("toDLPack",&wrapper_to_dlpack);
         // rocal_api_data_loaders.h
         m.def("COCO_ImageDecoderSlice",&rocalJpegCOCOFileSourcePartial,"Reads file from the source given and decodes it according to the policy",
             py::return_value_policy::reference);
@@ -492,7 +668,9 @@ namespace rocal{
             py::arg("loop") = false,
             py::arg("frame_step"),
             py::arg("frame_stride"));
-        m.def("rocalResetLoaders",&rocalResetLoaders);
+        m.def("rocalResetLoaders",&rocalResetLoaders, py::call_guard<py::gil_scoped_release>());
+        m.def("setReaderCacheSize",&rocalSetReaderCacheSize);
+        m.def("setVideoFrameCacheSize",&rocalSetVideoFrameCacheSize);
         // rocal_api_augmentation.h
         m.def("SSDRandomCrop",&rocalSSDRandomCrop,
             py::return_value_policy::reference,
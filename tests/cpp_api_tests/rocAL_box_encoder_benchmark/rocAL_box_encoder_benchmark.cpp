@@ -0,0 +1,219 @@
+/*
+MIT License
+
+Copyright (c) 2018 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+#include <iostream>
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdlib>
+#include <memory>
+#include <vector>
+
+#include "meta_data.h"
+#include "box_encoder_cpu.h"
+
+using namespace std::chrono;
+
+// Benchmarks the CPU box encoder against the scalar encoder it replaced, on the SSD300 anchors and random ground truth boxes
+// The reference computes the full boxes x anchors IoU matrix of every image and then searches the best box of every anchor in it
+
+static std::vector<float> ssd300_anchors()
+{
+    const int fig_size = 300;
+    const int feat_size[] = {38, 19, 10, 5, 3, 1};
+    const int steps[] = {8, 16, 32, 64, 100, 300};
+    const int scales[] = {21, 45, 99, 153, 207, 261, 315};
+    const std::vector<std::vector<int>> aspect_ratios = {{2}, {2, 3}, {2, 3}, {2, 3}, {2}, {2}};
+    std::vector<float> anchors;
+    for (int idx = 0; idx < 6; idx++)
+    {
+        float sk1 = scales[idx] / (float)fig_size, sk2 = scales[idx + 1] / (float)fig_size, sk3 = std::sqrt(sk1 * sk2);
+        std::vector<std::pair<float, float>> sizes = {{sk1, sk1}, {sk3, sk3}};
+        for (int alpha : aspect_ratios[idx])
+        {
+            float w = sk1 * std::sqrt((float)alpha), h = sk1 / std::sqrt((float)alpha);
+            sizes.push_back({w, h});
+            sizes.push_back({h, w});
+        }
+        float fk = fig_size / (float)steps[idx];
+        for (auto &size : sizes)
+            for (int i = 0; i < feat_size[idx]; i++)
+                for (int j = 0; j < feat_size[idx]; j++)
+                {
+                    float cx = (j + 0.5f) / fk, cy = (i + 0.5f) / fk;
+                    anchors.push_back(std::min(std::max(cx - 0.5f * size.first, 0.f), 1.f));
+                    anchors.push_back(std::min(std::max(cy - 0.5f * size.second, 0.f), 1.f));
+                    anchors.push_back(std::min(std::max(cx + 0.5f * size.first, 0.f), 1.f));
+                    anchors.push_back(std::min(std::max(cy + 0.5f * size.second, 0.f), 1.f));
+                }
+    }
+    return anchors;
+}
+
+static float reference_iou(const BoundingBoxCord &box1, float box1_area, const BoundingBoxCord &box2)
+{
+    float xA = std::max(box1.l, box2.l);
+    float yA = std::max(box1.t, box2.t);
+    float xB = std::min(box1.r, box2.r);
+    float yB = std::min(box1.b, box2.b);
+    float intersection_area = std::max(0.f, xB - xA) * std::max(0.f, yB - yA);
+    float box2_area = (box2.b - box2.t) * (box2.r - box2.l);
+    return intersection_area / (box1_area + box2_area - intersection_area);
+}
+
+static void reference_encode(const std::vector<float> &anchors, const BoundingBoxCord *boxes, const int *labels, unsigned count, float criteria,
+                             bool offset, float scale, const std::vector<float> &means, const std::vector<float> &stds, float *encoded_boxes, int *encoded_labels)
+{
+    unsigned anchors_size = anchors.size() / 4;
+    const BoundingBoxCord *bbox_anchors = reinterpret_cast<const BoundingBoxCord *>(anchors.data());
+    std::vector<float> ious(count * anchors_size);
+    for (unsigned bb_idx = 0; bb_idx < count; bb_idx++)
+    {
+        float *iou_rows = ious.data() + bb_idx * anchors_size;
+        float box_area = (boxes[bb_idx].b - boxes[bb_idx].t) * (boxes[bb_idx].r - boxes[bb_idx].l);
+        int best_idx = 0;
+        for (unsigned anchor_idx = 0; anchor_idx < anchors_size; anchor_idx++)
+        {
+            iou_rows[anchor_idx] = reference_iou(boxes[bb_idx], box_area, bbox_anchors[anchor_idx]);
+            if (iou_rows[anchor_idx] > iou_rows[best_idx])
+                best_idx = anchor_idx;
+        }
+        iou_rows[best_idx] = 2.;
+    }
+    float inv_stds[4] = {(float)(1. / stds[0]), (float)(1. / stds[1]), (float)(1. / stds[2]), (float)(1. / stds[3])};
+    float half_scale = 0.5 * scale;
+    for (unsigned anchor_idx = 0; anchor_idx < anchors_size; anchor_idx++)
+    {
+        unsigned best_idx = 0;
+        for (unsigned bb_idx = 1; bb_idx < count; ++bb_idx)
+            if (ious[bb_idx * anchors_size + anchor_idx] >= ious[best_idx * anchors_size + anchor_idx])
+                best_idx = bb_idx;
+        const BoundingBoxCord &anchor = bbox_anchors[anchor_idx];
+        const BoundingBoxCord &box = boxes[best_idx];
+        float *out = encoded_boxes + anchor_idx * 4;
+        if (ious[best_idx * anchors_size + anchor_idx] > criteria)
+        {
+            if (offset)
+            {
+                float axc = (anchor.l + anchor.r) * half_scale, ayc = (anchor.t + anchor.b) * half_scale;
+                float aw = (anchor.r - anchor.l) * scale, ah = (anchor.b - anchor.t) * scale;
+                out[0] = (((box.l + box.r) * half_scale - axc) / aw - means[0]) * inv_stds[0];
+                out[1] = (((box.t + box.b) * half_scale - ayc) / ah - means[1]) * inv_stds[1];
+                out[2] = (std::log((box.r - box.l) * scale / aw) - means[2]) * inv_stds[2];
+                out[3] = (std::log((box.b - box.t) * scale / ah) - means[3]) * inv_stds[3];
+            }
+            else
+            {
+                out[0] = 0.5 * (box.l + box.r);
+                out[1] = 0.5 * (box.t + box.b);
+                out[2] = box.r - box.l;
+                out[3] = box.b - box.t;
+            }
+            encoded_labels[anchor_idx] = labels[best_idx];
+        }
+        else
+        {
+            if (offset)
+                out[0] = out[1] = out[2] = out[3] = 0;
+            else
+            {
+                out[0] = 0.5 * (anchor.l + anchor.r);
+                out[1] = 0.5 * (anchor.t + anchor.b);
+                out[2] = anchor.r - anchor.l;
+                out[3] = anchor.b - anchor.t;
+            }
+            encoded_labels[anchor_idx] = 0;
+        }
+    }
+}
+
+int main(int argc, const char **argv)
+{
+    int batch_size = argc > 1 ? atoi(argv[1]) : 256;
+    int num_batches = argc > 2 ? atoi(argv[2]) : 20;
+    int max_boxes = argc > 3 ? atoi(argv[3]) : 20;
+    bool offset = argc > 4 ? atoi(argv[4]) : 1;
+    if (batch_size <= 0 || num_batches <= 0 || max_boxes <= 0)
+    {
+        std::cout << "Usage: rocal_box_encoder_benchmark [batch size] [number of batches] [max boxes per image] [offset 0/1]\n";
+        return -1;
+    }
+    std::vector<float> anchors = ssd300_anchors();
+    std::vector<float> means = {0, 0, 0, 0}, stds = {0.1, 0.1, 0.2, 0.2};
+    float criteria = 0.5, scale = 1.0;
+    BoxEncoderCpu encoder(anchors, criteria, means, stds, offset, scale);
+    unsigned anchor_count = encoder.anchor_count();
+
+    srand(0);
+    auto batch = std::make_shared<BoundingBoxBatch>();
+    auto &bb_batch = batch->get_bb_batch();
+    for (int i = 0; i < batch_size; i++)
+    {
+        int count = 1 + rand() % max_boxes;
+        for (int j = 0; j < count; j++)
+        {
+            float l = (rand() % 900) / 1000.f, t = (rand() % 900) / 1000.f;
+            float r = std::min(1.f, l + 0.02f + (rand() % 500) / 1000.f), b = std::min(1.f, t + 0.02f + (rand() % 500) / 1000.f);
+            bb_batch.push_back(BoundingBoxCord(l, t, r, b), 1 + rand() % 80);
+        }
+        bb_batch.end_sample();
+    }
+    std::vector<float> encoded_boxes(batch_size * anchor_count * 4), reference_boxes(encoded_boxes.size());
+    std::vector<int> encoded_labels(batch_size * anchor_count), reference_labels(encoded_labels.size());
+
+    std::cout << "Encoding " << bb_batch.total() << " boxes of " << batch_size << " images against " << anchor_count << " anchors, offset " << offset
+              << ", " << BoxEncoderCpu::isa() << " IoUs" << std::endl;
+    auto start = high_resolution_clock::now();
+    for (int n = 0; n < num_batches; n++)
+    {
+        #pragma omp parallel for
+        for (int i = 0; i < batch_size; i++)
+            reference_encode(anchors, bb_batch.cords_of(i), bb_batch.labels_of(i), bb_batch.count(i), criteria, offset, scale, means, stds,
+                             &reference_boxes[(size_t)i * anchor_count * 4], &reference_labels[(size_t)i * anchor_count]);
+    }
+    double reference_ms = duration_cast<microseconds>(high_resolution_clock::now() - start).count() / 1000.0 / num_batches;
+    start = high_resolution_clock::now();
+    for (int n = 0; n < num_batches; n++)
+        encoder.Run(batch, encoded_boxes.data(), encoded_labels.data());
+    double encoder_ms = duration_cast<microseconds>(high_resolution_clock::now() - start).count() / 1000.0 / num_batches;
+
+    // An anchor mismatches if its label or any of its box values differ, an IoU differing in the last bit can flip a match on a near tie
+    size_t mismatches = 0;
+    for (size_t i = 0; i < encoded_labels.size(); i++)
+    {
+        bool same = encoded_labels[i] == reference_labels[i];
+        for (size_t k = i * 4; k < i * 4 + 4; k++)
+            same = same && std::abs(encoded_boxes[k] - reference_boxes[k]) <= 1e-5f;
+        mismatches += !same;
+    }
+    std::cout << "reference     " << reference_ms << " ms/batch" << std::endl;
+    std::cout << "BoxEncoderCpu " << encoder_ms << " ms/batch, " << reference_ms / encoder_ms << "x" << std::endl;
+    std::cout << "mismatched anchors " << mismatches << " of " << encoded_labels.size() << std::endl;
+    if (mismatches > encoded_labels.size() / 10000)
+    {
+        std::cout << "The encoded boxes don't match the reference" << std::endl;
+        return -1;
+    }
+    return 0;
+}
@@ -0,0 +1,137 @@
+/*
+MIT License
+
+Copyright (c) 2018 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+#include <iostream>
+#include <cstring>
+#include <chrono>
+#include <cstdio>
+#include <vector>
+#include <algorithm>
+
+#include "rocal_api.h"
+
+using namespace std::chrono;
+
+int test(const char* path, int num_epochs, int batch_size, int processing_device);
+int main(int argc, const char ** argv)
+{
+    // check command-line usage
+    const int MIN_ARG_COUNT = 2;
+    printf( "Usage: rocal_epoch_transition <image-dataset-folder> <num_epochs> <batch_size> <gpu=1/cpu=0>\n" );
+    if(argc < MIN_ARG_COUNT)
+        return -1;
+
+    int argIdx = 0;
+    const char * path = argv[++argIdx];
+    int num_epochs = 100;
+    int batch_size = 2;
+    int processing_device = 0;
+
+    if (argc >= argIdx + MIN_ARG_COUNT)
+        num_epochs = atoi(argv[++argIdx]);
+
+    if (argc >= argIdx + MIN_ARG_COUNT)
+        batch_size = atoi(argv[++argIdx]);
+
+    if (argc >= argIdx + MIN_ARG_COUNT)
+        processing_device = atoi(argv[++argIdx]);
+
+    return test(path, num_epochs, batch_size, processing_device);
+}
+
+int test(const char* path, int num_epochs, int batch_size, int processing_device)
+{
+    std::cout << ">>> Running on " << (processing_device ? "GPU" : "CPU") << " for " << num_epochs << " epochs" << std::endl;
+    printf(">>> Batch size = %d\n", batch_size);
+
+    auto handle = rocalCreate(batch_size, processing_device ? RocalProcessMode::ROCAL_PROCESS_GPU : RocalProcessMode::ROCAL_PROCESS_CPU, 0, 1);
+
+    if (rocalGetStatus(handle) != ROCAL_OK) {
+        std::cout << "Could not create the Rocal context\n";
+        return -1;
+    }
+
+    /*>>>>>>>>>>>>>>>>>>> Graph description <<<<<<<<<<<<<<<<<<<*/
+    // A single shard without looping, so that every epoch ends with the loaders running out of data
+    RocalImage image0 = rocalJpegFileSource(handle, path, RocalImageColor::ROCAL_COLOR_RGB24, 1, false, false, false,
+                                            ROCAL_USE_USER_GIVEN_SIZE, 224, 224);
+
+    if (rocalGetStatus(handle) != ROCAL_OK) {
+        std::cout << "JPEG source could not initialize : " << rocalGetErrorMessage(handle) << std::endl;
+        return -1;
+    }
+
+    rocalResize(handle, image0, 224, 224, true);
+
+    // Calling the API to verify and build the augmentation graph
+    rocalVerify(handle);
+
+    if (rocalGetStatus(handle) != ROCAL_OK) {
+        std::cout << "Could not verify the augmentation graph " << rocalGetErrorMessage(handle);
+        return -1;
+    }
+
+    std::vector<long long> reset_time, first_batch_time;
+    long long total_batches = 0;
+    high_resolution_clock::time_point t1 = high_resolution_clock::now();
+    for (int epoch = 0; epoch < num_epochs; epoch++) {
+        // Latency of an epoch transition is the time from the reset to the first batch of the new epoch
+        high_resolution_clock::time_point reset_start = high_resolution_clock::now();
+        if (epoch > 0)
+            rocalResetLoaders(handle);
+        high_resolution_clock::time_point reset_end = high_resolution_clock::now();
+        bool first_batch = true;
+        while (!rocalIsEmpty(handle)) {
+            if (rocalRun(handle) != 0)
+                break;
+            if (first_batch) {
+                first_batch = false;
+                if (epoch > 0) {
+                    reset_time.push_back(duration_cast<microseconds>(reset_end - reset_start).count());
+                    first_batch_time.push_back(duration_cast<microseconds>(high_resolution_clock::now() - reset_start).count());
+                }
+            }
+            total_batches++;
+        }
+    }
+    high_resolution_clock::time_point t2 = high_resolution_clock::now();
+    auto dur = duration_cast<microseconds>(t2 - t1).count();
+
+    if (!first_batch_time.empty()) {
+        long long reset_sum = 0, first_batch_sum = 0;
+        for (auto t : reset_time) reset_sum += t;
+        for (auto t : first_batch_time) first_batch_sum += t;
+        std::cout << "Epoch transitions      " << first_batch_time.size() << std::endl;
+        std::cout << "Reset time avg         " << reset_sum / (long long)reset_time.size() << " us max " << *std::max_element(reset_time.begin(), reset_time.end()) << " us" << std::endl;
+        std::cout << "Reset to first batch   " << first_batch_sum / (long long)first_batch_time.size() << " us max " << *std::max_element(first_batch_time.begin(), first_batch_time.end()) << " us" << std::endl;
+        std::cout << "Total transition time  " << first_batch_sum << " us" << std::endl;
+    }
+    std::cout << "Batches processed      " << total_batches << std::endl;
+    std::cout << ">>>>> Total Elapsed Time " << dur / 1000000 << " sec " << dur % 1000000 << " us " << std::endl;
+
+    rocalRelease(handle);
+
+    return 0;
+}
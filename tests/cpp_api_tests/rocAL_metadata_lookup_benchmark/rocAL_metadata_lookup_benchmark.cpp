@@ -0,0 +1,155 @@
+/*
+MIT License
+
+Copyright (c) 2018 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+
+#include <iostream>
+#include <cstring>
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <map>
+#include <memory>
+#include <string>
+#include <vector>
+
+#include "meta_data.h"
+#include "sample_index.h"
+
+using namespace std::chrono;
+
+// Benchmarks the per batch meta data lookup of the detection meta data readers on a synthetic annotation set
+// Every batch is looked up by name in the reader's std::map (the lookup before the sample index), by name in the
+// SampleIndex (the fallback for readers that don't report ids) and by the ids the image readers report
+typedef std::map<std::string, std::shared_ptr<MetaData>> MetaDataMap;
+
+static std::string image_name(int idx)
+{
+    char name[32];
+    snprintf(name, sizeof(name), "%012d.jpg", idx);
+    return name;
+}
+
+template <typename F>
+static double time_batches(BoundingBoxBatch &output, const std::vector<std::string> &names, int batch_size, int num_batches, F find)
+{
+    auto start = high_resolution_clock::now();
+    size_t pos = 0;
+    for (int batch = 0; batch < num_batches; batch++)
+    {
+        if (pos + batch_size > names.size())
+            pos = 0;
+        output.get_bb_batch().clear();
+        output.get_img_sizes_batch().resize(batch_size);
+        for (int i = 0; i < batch_size; i++, pos++)
+        {
+            MetaData *meta_data = find(names[pos], pos);
+            if (!meta_data)
+            {
+                std::cout << "Missing meta data for " << names[pos] << std::endl;
+                exit(-1);
+            }
+            auto &bb_cords = meta_data->get_bb_cords();
+            output.get_bb_batch().add_sample(bb_cords.data(), meta_data->get_bb_labels().data(), bb_cords.size());
+            output.get_img_sizes_batch()[i] = meta_data->get_img_size();
+        }
+    }
+    auto end = high_resolution_clock::now();
+    return duration_cast<microseconds>(end - start).count() / (double)num_batches;
+}
+
+int main(int argc, const char ** argv)
+{
+    // check command-line usage
+    printf("Usage: rocal_metadata_lookup_benchmark <num_images=1000000> <batch_size=256> <num_batches=2000> <max_boxes_per_image=8>\n");
+    int argIdx = 0;
+    int num_images = 1000000;
+    int batch_size = 256;
+    int num_batches = 2000;
+    int max_boxes = 8;
+    if (argc > ++argIdx)
+        num_images = atoi(argv[argIdx]);
+    if (argc > ++argIdx)
+        batch_size = atoi(argv[argIdx]);
+    if (argc > ++argIdx)
+        num_batches = atoi(argv[argIdx]);
+    if (argc > ++argIdx)
+        max_boxes = atoi(argv[argIdx]);
+    if (num_images < batch_size || batch_size <= 0 || max_boxes <= 0)
+    {
+        std::cout << "Invalid arguments" << std::endl;
+        return -1;
+    }
+
+    std::cout << ">>> Building " << num_images << " annotations" << std::endl;
+    srand(1);
+    MetaDataMap map_content;
+    std::vector<std::string> names(num_images);
+    for (int idx = 0; idx < num_images; idx++)
+    {
+        names[idx] = image_name(idx);
+        int count = 1 + rand() % max_boxes;
+        BoundingBoxCords cords;
+        BoundingBoxLabels labels;
+        for (int j = 0; j < count; j++)
+        {
+            float l = (rand() % 100) / 200.0f, t = (rand() % 100) / 200.0f;
+            cords.push_back(BoundingBoxCord(l, t, l + 0.25f, t + 0.25f));
+            labels.push_back(1 + rand() % 80);
+        }
+        map_content.emplace(names[idx], std::make_shared<BoundingBox>(cords, labels, ImgSize{640, 480}));
+    }
+
+    auto start = high_resolution_clock::now();
+    SampleIndex sample_index;
+    sample_index.build(map_content);
+    auto end = high_resolution_clock::now();
+    std::cout << ">>> Sample index built in " << duration_cast<milliseconds>(end - start).count() << " ms" << std::endl;
+
+    // The listing of an image reader, resolved to ids once and shuffled like a training epoch
+    start = high_resolution_clock::now();
+    SampleIds sample_ids;
+    sample_ids.resolve(names, [&sample_index](const std::string &name) { return sample_index.id(name); });
+    end = high_resolution_clock::now();
+    std::cout << ">>> Reader listing resolved to ids in " << duration_cast<milliseconds>(end - start).count() << " ms" << std::endl;
+    sample_ids.shuffle(names);
+
+    BoundingBoxBatch output;
+    printf(">>> Batch size = %d, batches = %d\n", batch_size, num_batches);
+    double map_time = time_batches(output, names, batch_size, num_batches, [&map_content](const std::string &name, size_t) -> MetaData * {
+        auto it = map_content.find(name);
+        return it == map_content.end() ? nullptr : it->second.get();
+    });
+    double name_time = time_batches(output, names, batch_size, num_batches, [&sample_index](const std::string &name, size_t) {
+        return sample_index.get(name, -1);
+    });
+    double id_time = time_batches(output, names, batch_size, num_batches, [&sample_index, &sample_ids](const std::string &name, size_t pos) {
+        return sample_index.get(name, sample_ids[pos]);
+    });
+    printf("%-28s %12s %14s\n", "lookup", "us/batch", "ns/sample");
+    printf("%-28s %12.2f %14.1f\n", "std::map by name", map_time, map_time * 1000 / batch_size);
+    printf("%-28s %12.2f %14.1f\n", "sample index by name", name_time, name_time * 1000 / batch_size);
+    printf("%-28s %12.2f %14.1f\n", "sample index by id", id_time, id_time * 1000 / batch_size);
+    return 0;
+}
@@ -0,0 +1,138 @@
+/*
+MIT License
+
+Copyright (c) 2018 - 2023 Advanced Micro Devices, Inc. All rights reserved.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+*/
+
+
+
+#include <iostream>
+#include <cstring>
+#include <chrono>
+#include <cstdio>
+#include <vector>
+
+#include "rocal_api.h"
+
+using namespace std::chrono;
+
+int test(const char* path, int batch_size, int num_iterations, int planar);
+int main(int argc, const char ** argv)
+{
+    // check command-line usage
+    const int MIN_ARG_COUNT = 2;
+    printf( "Usage: rocal_to_tensor_benchmark <image-dataset-folder> <batch_size> <num_iterations> <planar=1/interleaved=0>\n" );
+    if(argc < MIN_ARG_COUNT)
+        return -1;
+
+    int argIdx = 0;
+    const char * path = argv[++argIdx];
+    int batch_size = 32;
+    int num_iterations = 50;
+    int planar = 0;
+
+    if (argc >= argIdx + MIN_ARG_COUNT)
+        batch_size = atoi(argv[++argIdx]);
+
+    if (argc >= argIdx + MIN_ARG_COUNT)
+        num_iterations = atoi(argv[++argIdx]);
+
+    if (argc >= argIdx + MIN_ARG_COUNT)
+        planar = atoi(argv[++argIdx]);
+
+    return test(path, batch_size, num_iterations, planar);
+}
+
+int test(const char* path, int batch_size, int num_iterations, int planar)
+{
+    std::cout << ">>> Converting " << (planar ? "planar" : "interleaved") << " batches " << num_iterations << " times" << std::endl;
+    printf(">>> Batch size = %d\n", batch_size);
+
+    auto handle = rocalCreate(batch_size, RocalProcessMode::ROCAL_PROCESS_CPU, 0, 1);
+
+    if (rocalGetStatus(handle) != ROCAL_OK) {
+        std::cout << "Could not create the Rocal context\n";
+        return -1;
+    }
+
+    /*>>>>>>>>>>>>>>>>>>> Graph description <<<<<<<<<<<<<<<<<<<*/
+    RocalImageColor color_format = planar ? RocalImageColor::ROCAL_COLOR_RGB_PLANAR : RocalImageColor::ROCAL_COLOR_RGB24;
+    RocalImage image0 = rocalJpegFileSource(handle, path, color_format, 1, false, false, true,
+                                            ROCAL_USE_USER_GIVEN_SIZE, 224, 224);
+
+    if (rocalGetStatus(handle) != ROCAL_OK) {
+        std::cout << "JPEG source could not initialize : " << rocalGetErrorMessage(handle) << std::endl;
+        return -1;
+    }
+
+    rocalResize(handle, image0, 224, 224, true);
+
+    // Calling the API to verify and build the augmentation graph
+    rocalVerify(handle);
+
+    if (rocalGetStatus(handle) != ROCAL_OK) {
+        std::cout << "Could not verify the augmentation graph " << rocalGetErrorMessage(handle);
+        return -1;
+    }
+
+    // A single batch is processed and converted over and over, so that only the conversion is timed
+    if (rocalRun(handle) != 0) {
+        std::cout << "Could not process a batch " << rocalGetErrorMessage(handle) << std::endl;
+        return -1;
+    }
+
+    const size_t pixels = (size_t)rocalGetOutputWidth(handle) * rocalGetOutputHeight(handle) * rocalGetAugmentationBranchCount(handle);
+    const size_t channels = (rocalGetOutputColorFormat(handle) == RocalImageColor::ROCAL_COLOR_U8) ? 1 : 3;
+    const size_t input_bytes = pixels * channels;
+    std::vector<float> output(input_bytes);
+
+    struct DataType { RocalTensorOutputType type; const char *name; size_t size; };
+    const DataType data_types[] = {{ROCAL_FP32, "FP32", 4}, {ROCAL_FP16, "FP16", 2}, {ROCAL_U8, "U8  ", 1}};
+    const RocalTensorLayout layouts[] = {ROCAL_NHWC, ROCAL_NCHW};
+    const float multiplier[3] = {1 / 58.395f, 1 / 57.12f, 1 / 57.375f};
+    const float offset[3] = {-123.675f / 58.395f, -116.28f / 57.12f, -103.53f / 57.375f};
+
+    std::cout << "Input " << input_bytes << " bytes per conversion, GB/s counts the bytes read and written" << std::endl;
+    for (auto layout : layouts) {
+        for (auto &data_type : data_types) {
+            for (int reverse_channels = 0; reverse_channels < 2; reverse_channels++) {
+                if (rocalToTensor(handle, output.data(), layout, data_type.type, multiplier[0], multiplier[1], multiplier[2],
+                                  offset[0], offset[1], offset[2], reverse_channels, ROCAL_MEMCPY_HOST) != ROCAL_OK) {
+                    std::cout << "rocalToTensor failed " << rocalGetErrorMessage(handle) << std::endl;
+                    return -1;
+                }
+                high_resolution_clock::time_point t1 = high_resolution_clock::now();
+                for (int i = 0; i < num_iterations; i++)
+                    rocalToTensor(handle, output.data(), layout, data_type.type, multiplier[0], multiplier[1], multiplier[2],
+                                  offset[0], offset[1], offset[2], reverse_channels, ROCAL_MEMCPY_HOST);
+                high_resolution_clock::time_point t2 = high_resolution_clock::now();
+                double seconds = duration_cast<nanoseconds>(t2 - t1).count() / 1e9;
+                double bytes = (double)(input_bytes + input_bytes * data_type.size) * num_iterations;
+                printf("%s %s %-8s %8.3f ms %8.2f GB/s\n", layout == ROCAL_NHWC ? "NHWC" : "NCHW", data_type.name,
+                       reverse_channels ? "reverse" : "", seconds * 1000 / num_iterations, bytes / seconds / 1e9);
+            }
+        }
+    }
+
+    rocalRelease(handle);
+
+    return 0;
+}
@@ -0,0 +1,43 @@
+#!/bin/bash
+
+# Reads the video with overlapping sequences without and with the decoded frame cache
+INPUT_PATH=$1
+FRAME_CACHE_SIZE=${2:-512}   # size in MB of the decoded frame cache
+
+if [ -z "$INPUT_PATH" ]
+  then
+    echo "No input argument supplied"
+    exit
+fi
+
+# Handles relative input path
+if [ ! -d "$INPUT_PATH" ] && [[ "$INPUT_PATH" != /* ]]
+then
+  CWD=$(pwd)
+  INPUT_PATH="$CWD/$INPUT_PATH"
+fi
+
+# Building video unit test
+rm -rf build
+mkdir build
+cd build || exit
+cmake ..
+make
+
+READER_CASE=1
+DEVICE=0
+HARDWARE_DECODE_MODE=0
+BATCH_SIZE=4
+SEQUENCE_LENGTH=8
+STEP=2
+STRIDE=1
+RGB=1
+SAVE_FRAMES=0
+SHUFFLE=0
+
+for CACHE_SIZE in 0 $FRAME_CACHE_SIZE
+do
+  echo ">>>>> Frame cache size : $CACHE_SIZE MB"
+  ./rocAL_video_unittests "$INPUT_PATH" $READER_CASE $DEVICE $HARDWARE_DECODE_MODE $BATCH_SIZE $SEQUENCE_LENGTH $STEP $STRIDE \
+  $RGB $SAVE_FRAMES $SHUFFLE 0 0 1 0 0 0 0 $CACHE_SIZE | grep -E "Decode   time|Frame cache|Total Elapsed Time"
+done
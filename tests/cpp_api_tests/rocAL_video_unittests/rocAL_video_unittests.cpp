@@ -71,7 +71,7 @@ int main(int argc, const char **argv)
     const int MIN_ARG_COUNT = 2;
     if (argc < MIN_ARG_COUNT)
     {
-        printf("Usage: rocal_video_unittests <video_file/video_dataset_folder/text file> <reader_case> <processing_device=1/cpu=0> <hardware_decode_mode=0/1> <batch_size> <sequence_length> <frame_step> <frame_stride> <gray_scale/rgb> <display_on_off> <shuffle:0/1> <resize_width> <resize_height> <filelist_framenum:0/1> <enable_meta_data:0/1> <enable_framenumber:0/1> <enable_timestamps:0/1> <enable_sequence_rearrange:0/1>\n");
+        printf("Usage: rocal_video_unittests <video_file/video_dataset_folder/text file> <reader_case> <processing_device=1/cpu=0> <hardware_decode_mode=0/1> <batch_size> <sequence_length> <frame_step> <frame_stride> <gray_scale/rgb> <display_on_off> <shuffle:0/1> <resize_width> <resize_height> <filelist_framenum:0/1> <enable_meta_data:0/1> <enable_framenumber:0/1> <enable_timestamps:0/1> <enable_sequence_rearrange:0/1> <frame_cache_size_mb> <decode_threads>\n");
         return -1;
     }
 
@@ -97,6 +97,8 @@ int main(int argc, const char **argv)
     bool enable_sequence_rearrange = false;
     bool is_output = true;
     unsigned hardware_decode_mode = 0;
+    unsigned frame_cache_size = 0;
+    unsigned decode_threads = 0;
     if (argc >= argIdx + MIN_ARG_COUNT)
         reader_case = atoi(argv[++argIdx]);
     if (argc >= argIdx + MIN_ARG_COUNT)
@@ -131,6 +133,10 @@ int main(int argc, const char **argv)
         enable_timestamps = atoi(argv[++argIdx]) ? true : false;
     if (argc >= argIdx + MIN_ARG_COUNT)
         enable_sequence_rearrange = atoi(argv[++argIdx]) ? true : false;
+    if (argc >= argIdx + MIN_ARG_COUNT)
+        frame_cache_size = atoi(argv[++argIdx]);
+    if (argc >= argIdx + MIN_ARG_COUNT)
+        decode_threads = atoi(argv[++argIdx]);
 
     auto decoder_mode = ((hardware_decode_mode == 1) ? RocalDecodeDevice::ROCAL_HW_DECODE : RocalDecodeDevice::ROCAL_SW_DECODE);
     if (!IsPathExist(source_path))
@@ -146,6 +152,8 @@ int main(int argc, const char **argv)
     std::cerr << "Sequence length : " << sequence_length << std::endl;
     std::cerr << "Frame step : " << frame_step << std::endl;
     std::cerr << "Frame stride : " << frame_stride << std::endl;
+    std::cerr << "Frame cache size : " << frame_cache_size << " MB" << std::endl;
+    std::cerr << "Decode threads : " << decode_threads << std::endl;
     if (reader_case == 2)
     {
         std::cerr << "Resize Width : " << resize_width << std::endl;
@@ -160,6 +168,8 @@ int main(int argc, const char **argv)
         std::cout << "Could not create the Rocal contex\n";
         return -1;
     }
+    if (frame_cache_size)
+        rocalSetVideoFrameCacheSize(handle, frame_cache_size);
     if (reader_case == 3)
     {
         if (check_extension(source_path) < 0)
@@ -189,7 +199,7 @@ int main(int argc, const char **argv)
         default:
         {
             std::cout << "\n>>>> VIDEO READER\n";
-            input1 = rocalVideoFileSource(handle, source_path, color_format, decoder_mode, shard_count, sequence_length, shuffle, is_output, false, frame_step, frame_stride, file_list_frame_num);
+            input1 = rocalVideoFileSource(handle, source_path, color_format, decoder_mode, shard_count, sequence_length, shuffle, is_output, false, frame_step, frame_stride, file_list_frame_num, decode_threads);
             break;
         }
         case 2:
@@ -200,7 +210,8 @@ int main(int argc, const char **argv)
                 std::cerr << "\n[ERR]Resize width and height are passed as NULL values\n";
                 return -1;
             }
-            input1 = rocalVideoFileResize(handle, source_path, color_format, decoder_mode, shard_count, sequence_length, resize_width, resize_height, shuffle, is_output, false, frame_step, frame_stride, file_list_frame_num);
+            input1 = rocalVideoFileResize(handle, source_path, color_format, decoder_mode, shard_count, sequence_length, resize_width, resize_height, shuffle, is_output, false, frame_step, frame_stride, file_list_frame_num,
+                                          ROCAL_SCALING_MODE_DEFAULT, {}, 0, 0, ROCAL_LINEAR_INTERPOLATION, decode_threads);
             break;
         }
         case 3:
@@ -353,6 +364,8 @@ int main(int argc, const char **argv)
     std::cout << "Decode   time " << rocal_timing.decode_time << std::endl;
     std::cout << "Process  time " << rocal_timing.process_time << std::endl;
     std::cout << "Transfer time " << rocal_timing.transfer_time << std::endl;
+    std::cout << "Frame cache hits " << rocal_timing.cache_hits << " misses " << rocal_timing.cache_misses << std::endl;
+    std::cout << "Decoder opens " << rocal_timing.decoder_opens << " closes " << rocal_timing.decoder_closes << std::endl;
     std::cout << ">>>>> " << counter << " images/frames Processed. Total Elapsed Time " << dur / 1000000 << " sec " << dur % 1000000 << " us " << std::endl;
     rocalRelease(handle);
     mat_input.release();